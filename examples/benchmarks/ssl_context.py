@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+"""
+Micro-benchmark of the per-request SSL overhead of the connection to the appliance.
+
+It compares the previous behavior, where every request built a new SSL context (parsing the trusted
+bundle from disk) and did a full TLS handshake, with the cached SSL context and TLS session resumption.
+
+Usage:
+    python ssl_context.py [--ca-bundle BUNDLE] [--host APPLIANCE] [--iterations N]
+
+The handshake comparison only runs when an appliance (or any HTTPS server) is given with --host.
+"""
+
+import argparse
+import ssl
+import timeit
+
+from hpOneView.connection import connection
+
+
+def build_legacy_context(ca_bundle):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+    if ca_bundle:
+        context.verify_mode = ssl.CERT_REQUIRED
+        context.load_verify_locations(ca_bundle)
+    else:
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def new_connection(host, ca_bundle):
+    con = connection(host)
+    if ca_bundle:
+        con.set_trusted_ssl_bundle(ca_bundle)
+    return con
+
+
+def report(title, before, after, iterations):
+    before_ms = before / iterations * 1000
+    after_ms = after / iterations * 1000
+    print('%s' % title)
+    print('    before: %8.3f ms/request' % before_ms)
+    print('    after:  %8.3f ms/request' % after_ms)
+    if after_ms:
+        print('    speedup: %.1fx' % (before_ms / after_ms))
+
+
+def bench_context(host, ca_bundle, iterations):
+    con = new_connection(host, ca_bundle)
+
+    before = timeit.timeit(lambda: build_legacy_context(ca_bundle), number=iterations)
+    after = timeit.timeit(con.get_connection, number=iterations)
+    report('SSL context per request (bundle: %s)' % ca_bundle, before, after, iterations)
+
+
+def bench_handshake(host, ca_bundle, iterations):
+    import http.client
+
+    def legacy_connect():
+        conn = http.client.HTTPSConnection(host, context=build_legacy_context(ca_bundle))
+        conn.connect()
+        conn.close()
+
+    con = new_connection(host, ca_bundle)
+
+    def resumed_connect():
+        conn = con.get_connection()
+        conn.connect()
+        conn.close()
+
+    # Establish the first TLS session so that the following handshakes can resume it
+    resumed_connect()
+
+    before = timeit.timeit(legacy_connect, number=iterations)
+    after = timeit.timeit(resumed_connect, number=iterations)
+    report('TLS handshake per new connection (host: %s)' % host, before, after, iterations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SSL overhead per request')
+    parser.add_argument('--ca-bundle', default=ssl.get_default_verify_paths().cafile,
+                        help='Trusted SSL bundle in PEM format (default: system bundle)')
+    parser.add_argument('--host', help='Appliance hostname or IP, to measure the TLS handshakes')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    bench_context(args.host or '127.0.0.1', args.ca_bundle, args.iterations)
+    if args.host:
+        bench_handshake(args.host, args.ca_bundle, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -41,7 +41,10 @@ __status__ = 'Development'
 # THE SOFTWARE.
 ###
 
+import importlib
+import logging
 import sys
+import types
 
 PYTHON_VERSION = sys.version_info[:3]
 PY2 = (PYTHON_VERSION[0] == 2)
@@ -51,26 +54,78 @@ if PY2:
 elif PYTHON_VERSION < (3, 4):
     raise Exception('Must use Python 3.4 or later')
 
-from hpOneView.common import *
-from hpOneView.connection import *
-from hpOneView.servers import *
-from hpOneView.activity import *
-from hpOneView.networking import *
-from hpOneView.security import *
-from hpOneView.settings import *
-from hpOneView.exceptions import *
-from hpOneView.search import *
-from hpOneView.storage import *
-from hpOneView.fcsans import *
-from hpOneView.facilities import *
-from hpOneView.uncategorized import *
 from hpOneView.exception_handler import handle_exceptions
 
+# Modules of the legacy API, whose names are exported by the package
+LEGACY_MODULES = ('common', 'connection', 'servers', 'activity', 'networking', 'security', 'settings', 'exceptions',
+                  'search', 'storage', 'fcsans', 'facilities', 'uncategorized')
+
+
+def _get_public_names(module):
+    return getattr(module, '__all__', None) or [name for name in vars(module) if not name.startswith('_')]
+
+
+_imported_legacy_modules = set()
+
+
+def _import_legacy_module(module_name):
+    """
+    Imports a legacy module and adds its names to the package, as `from hpOneView.<module_name> import *` does.
+    """
+    module = importlib.import_module('hpOneView.' + module_name)
+    if module_name not in _imported_legacy_modules:
+        _imported_legacy_modules.add(module_name)
+        globals().update((name, getattr(module, name)) for name in _get_public_names(module))
+    return module
+
+
+def __getattr__(name):
+    """
+    Imports the legacy modules on first access of one of their names, instead of on import of the package.
+    """
+    if name == '__all__':
+        for module_name in LEGACY_MODULES:
+            _import_legacy_module(module_name)
+        return [name for name in globals() if not name.startswith('_')]
+    if not name.startswith('__'):
+        for module_name in LEGACY_MODULES:
+            module = _import_legacy_module(module_name)
+            if name in _get_public_names(module):
+                return globals()[name]
+    raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+
+
+def __dir__():
+    for module_name in LEGACY_MODULES:
+        _import_legacy_module(module_name)
+    return sorted(globals())
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # The import system binds a submodule to the package once loaded, which would hide the legacy class of the
+        # same name (hpOneView.connection)
+        if name in LEGACY_MODULES and isinstance(value, types.ModuleType) and name in _get_public_names(value):
+            _import_legacy_module(name)
+            return
+        super(_Package, self).__setattr__(name, value)
+
+
+if PYTHON_VERSION < (3, 7):
+    # Attribute access is not customizable in modules before Python 3.7 (PEP 562)
+    for _module_name in LEGACY_MODULES:
+        _import_legacy_module(_module_name)
+else:
+    sys.modules[__name__].__class__ = _Package
+
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 sys.excepthook = handle_exceptions
 
+
 def main():
+    from hpOneView.connection import connection
+
     parser = argparse.ArgumentParser(add_help=True, description='Usage')
     parser.add_argument('-a', '--appliance', dest='host', required=True,
                         help='HPE OneView Appliance hostname or IP')
@@ -199,12 +199,8 @@ class activity(object):
         self._con.post(uri['audit-logs'], auditLogRecord)
         return
 
-    def download_audit_logs(self, filename):
-        body = self._con.get(uri['audit-logs-download'])
-        f = open(filename, 'wb')
-        f.write(body)
-        f.close()
-        return
+    def download_audit_logs(self, filename, progress_callback=None):
+        return self._con.download(uri['audit-logs-download'], filename, progress_callback=progress_callback)
 
     ###########################################################################
     # Events
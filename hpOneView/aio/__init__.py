@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+hpOneView.aio
+~~~~~~~~~~~~
+
+asyncio client for the HPE OneView REST API. Requires Python 3.5 or later.
+"""
+
+from hpOneView.aio.connection import AsyncConnection
+from hpOneView.aio.oneview_client import AsyncOneViewClient
+from hpOneView.aio.resource import AsyncResourceClient, AsyncPageIterator
+from hpOneView.aio.task_monitor import AsyncTaskMonitor
+
+__all__ = ['AsyncConnection', 'AsyncOneViewClient', 'AsyncResourceClient', 'AsyncPageIterator', 'AsyncTaskMonitor']
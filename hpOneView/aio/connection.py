@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+connection.py
+~~~~~~~~~~~~
+
+This module maintains the asyncio communication with the appliance, over persistent HTTP/1.1 connections
+"""
+
+__title__ = 'connection'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import asyncio
+import http.client
+import logging
+import ssl
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from hpOneView.common import uri
+from hpOneView.connection_pool import DEFAULT_POOL_SIZE, DEFAULT_POOL_IDLE_TIMEOUT
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.json_codec import JsonCodec, make_json_codec
+from hpOneView.retry import IDEMPOTENT_METHODS, RetryPolicy
+
+HTTPS_PORT = 443
+# Limits for the response head, to fail on a malformed response instead of reading it forever
+MAX_HEADERS = 100
+MAX_LINE_SIZE = 65536
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHTTPResponse(object):
+    """
+    Status and headers of a response, with the interface of http.client.HTTPResponse used by the library.
+    """
+
+    def __init__(self, status, reason, headers):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+    def getheaders(self):
+        return list(self.headers.items())
+
+
+class AsyncConnection(object):
+    """
+    asyncio counterpart of hpOneView.connection.connection.
+
+    Requests share a pool of persistent connections: at most `connection_pool_size` connections are open at the
+    same time, and the requests beyond it wait for a free connection instead of opening a new one. A connection
+    must only be used from the event loop that made its first request.
+    """
+
+    def __init__(self, applianceIp, api_version=200):
+        self._host = applianceIp
+        self._apiVersion = api_version
+        self._headers = {
+            'X-API-Version': self._apiVersion,
+            'Accept': 'application/json',
+            'Content-Type': 'application/json'}
+        self._session = None
+        self._cred = None
+        self._sslTrustedBundle = None
+        self._sslTrustAll = True
+        self._ssl_context = None
+        self._validateVersion = False
+        self._pool_size = DEFAULT_POOL_SIZE
+        self._idle_timeout = DEFAULT_POOL_IDLE_TIMEOUT
+        self._idle = deque()
+        self._semaphore = None
+        self._retry_policy = RetryPolicy()
+        self._json_codec = JsonCodec()
+
+    def set_trusted_ssl_bundle(self, sslBundle):
+        self._sslTrustAll = False
+        self._sslTrustedBundle = sslBundle
+        self._ssl_context = None
+        self.__close_idle()
+
+    def set_connection_pool(self, size=None, idle_timeout=None):
+        """
+        Configures the pool of persistent connections to the appliance. Must be called before the first request.
+
+        Args:
+            size: Maximum number of connections open at the same time.
+            idle_timeout: Seconds an idle connection is kept before it is discarded.
+        """
+        if size is not None:
+            if size < 1:
+                raise ValueError('The connection pool size must be at least 1')
+            self._pool_size = size
+        if idle_timeout is not None:
+            self._idle_timeout = idle_timeout
+
+    def set_retry_policy(self, policy):
+        """
+        Sets the policy to retry the requests that fail with a connection error or a transient status.
+
+        Args:
+            policy: hpOneView.retry.RetryPolicy, or None to disable the retries.
+        """
+        self._retry_policy = policy
+
+    def get_retry_policy(self):
+        return self._retry_policy
+
+    def set_json_codec(self, codec):
+        """
+        Sets the codec of the JSON bodies.
+
+        Args:
+            codec: hpOneView.json_codec.JsonCodec, or the name of a codec: 'stdlib' (default), 'orjson', 'ujson', or
+                'auto' for the fastest one installed.
+        """
+        self._json_codec = make_json_codec(codec)
+
+    def get_json_codec(self):
+        return self._json_codec
+
+    async def close(self):
+        """
+        Closes the idle connections to the appliance.
+        """
+        self.__close_idle()
+
+    def get_host(self):
+        return self._host
+
+    def get_session_id(self):
+        return self._headers['auth']
+
+    def get_ssl_context(self):
+        if self._ssl_context is None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+            if self._sslTrustAll is False:
+                context.verify_mode = ssl.CERT_REQUIRED
+                context.load_verify_locations(self._sslTrustedBundle)
+            else:
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+    async def do_http(self, method, path, body, custom_headers=None):
+        http_headers = self._headers.copy()
+        if custom_headers:
+            http_headers.update(custom_headers)
+        payload = body.encode('utf-8') if isinstance(body, str) else (body or b'')
+        request = self.__format_request(method, path, http_headers, payload)
+
+        policy = self._retry_policy
+        attempts = policy.begin() if policy else None
+        while True:
+            try:
+                resp, tempbytes = await self.__send(method, request)
+            except (http.client.HTTPException, OSError) as e:
+                delay = policy.get_retry_delay(attempts, method, path, error=e) if policy else None
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            if policy and resp.status in policy.statuses:
+                delay = policy.get_retry_delay(attempts, method, path, status=resp.status,
+                                               retry_after=resp.getheader('Retry-After'))
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
+            return resp, self.__decode_body(tempbytes, body)
+
+    async def __send(self, method, request):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._pool_size)
+
+        async with self._semaphore:
+            while True:
+                reader, writer, reused = await self.__acquire()
+                try:
+                    writer.write(request)
+                    resp, tempbytes, keep_alive = await self.__read_response(reader, method)
+                except (http.client.HTTPException, asyncio.IncompleteReadError, OSError):
+                    writer.close()
+                    if reused and method in IDEMPOTENT_METHODS:
+                        # Other methods may have been processed already: the retry policy decides whether they are
+                        # sent again
+                        logger.debug('Reused connection failed, trying again with a new one')
+                        continue
+                    raise
+                except BaseException:
+                    # Cancelled while waiting for the response: the connection cannot be reused
+                    writer.close()
+                    raise
+
+                if keep_alive:
+                    self._idle.append((reader, writer, time.time()))
+                else:
+                    writer.close()
+                return resp, tempbytes
+
+    async def __acquire(self):
+        now = time.time()
+        while self._idle:
+            reader, writer, released_at = self._idle.pop()
+            if now - released_at > self._idle_timeout:
+                logger.debug('Discarding connection idle for more than %s seconds' % self._idle_timeout)
+                writer.close()
+            elif reader.at_eof() or writer.transport.is_closing():
+                logger.debug('Discarding connection closed by the peer')
+                writer.close()
+            else:
+                return reader, writer, True
+
+        parsed = urlsplit('//' + self._host)
+        context = self.get_ssl_context()
+        reader, writer = await asyncio.open_connection(parsed.hostname, parsed.port or HTTPS_PORT, ssl=context,
+                                                       server_hostname=parsed.hostname if context else None)
+        return reader, writer, False
+
+    def __close_idle(self):
+        while self._idle:
+            _, writer, _ = self._idle.pop()
+            writer.close()
+
+    def __format_request(self, method, path, headers, payload):
+        lines = ['%s %s HTTP/1.1' % (method, path), 'Host: %s' % self._host, 'Content-Length: %s' % len(payload)]
+        lines.extend('%s: %s' % (name, value) for name, value in headers.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload
+
+    @staticmethod
+    async def __read_line(reader):
+        line = await reader.readline()
+        if len(line) > MAX_LINE_SIZE:
+            raise http.client.LineTooLong('response line')
+        return line
+
+    async def __read_response(self, reader, method):
+        status_line = await self.__read_line(reader)
+        if not status_line:
+            raise http.client.RemoteDisconnected('Remote end closed connection without response')
+        try:
+            version, status, reason = (status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+            status = int(status)
+        except ValueError:
+            raise http.client.BadStatusLine(status_line)
+
+        headers = {}
+        while True:
+            line = await self.__read_line(reader)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise http.client.HTTPException('got more than %d headers' % MAX_HEADERS)
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            data = b''
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            data = await self.__read_chunked(reader)
+        elif 'content-length' in headers:
+            data = await reader.readexactly(int(headers['content-length']))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return AsyncHTTPResponse(status, reason, headers), data, keep_alive
+
+    async def __read_chunked(self, reader):
+        chunks = []
+        while True:
+            size_line = await self.__read_line(reader)
+            try:
+                size = int(size_line.split(b';', 1)[0], 16)
+            except ValueError:
+                raise http.client.IncompleteRead(b''.join(chunks))
+            if size == 0:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        # Trailers, up to the blank line
+        while (await self.__read_line(reader)) not in (b'\r\n', b'\n', b''):
+            pass
+        return b''.join(chunks)
+
+    def __decode_body(self, tempbytes, body):
+        if not tempbytes:
+            return body
+        try:
+            # Decoded from the bytes, without an intermediate str
+            return self._json_codec.loads(tempbytes)
+        except ValueError:
+            pass
+        try:
+            return tempbytes.decode('utf-8')
+        except UnicodeDecodeError:  # Might be binary data
+            return tempbytes
+
+    ###########################################################################
+    # Utility functions for making requests - the HTTP verbs
+    ###########################################################################
+    async def get(self, uri):
+        resp, body = await self.do_http('GET', uri, '')
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+        if resp.status == 302:
+            body = await self.get(resp.getheader('Location'))
+        return body
+
+    async def delete(self, uri, custom_headers=None):
+        return await self.__do_rest_call('DELETE', uri, '', custom_headers=custom_headers)
+
+    async def put(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('PUT', uri, body, custom_headers=custom_headers)
+
+    async def post(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('POST', uri, body, custom_headers=custom_headers)
+
+    async def patch(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('PATCH', uri, body, custom_headers=custom_headers)
+
+    async def __do_rest_call(self, http_method, uri, body, custom_headers):
+        resp, body = await self.do_http(method=http_method,
+                                        path=uri,
+                                        body=self._json_codec.dumps(body),
+                                        custom_headers=custom_headers)
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+        elif resp.status == 202:
+            task = await self.get(resp.getheader('Location'))
+            return task, body
+        return None, body
+
+    ###########################################################################
+    # Login/Logout to/from appliance
+    ###########################################################################
+    async def validateVersion(self):
+        version = await self.get(uri['version'])
+        if 'minimumVersion' in version:
+            if self._apiVersion < version['minimumVersion']:
+                raise HPOneViewException('Unsupported API Version')
+        if 'currentVersion' in version:
+            if self._apiVersion > version['currentVersion']:
+                raise HPOneViewException('Unsupported API Version')
+        self._validateVersion = True
+
+    async def login(self, cred):
+        if self._validateVersion is False:
+            await self.validateVersion()
+
+        self._cred = cred
+        try:
+            task, body = await self.post(uri['loginSessions'], self._cred)
+        except HPOneViewException:
+            logger.exception('Login failed')
+            raise
+        # Add the auth ID to the headers dictionary
+        self._headers['auth'] = body['sessionID']
+        self._session = True
+        logger.info('Logged in successfully')
+
+    async def logout(self):
+        try:
+            await self.delete(uri['loginSessions'])
+        except HPOneViewException:
+            logger.exception('Logout failed')
+            raise
+        del self._headers['auth']
+        self._session = False
+        logger.info('Logged out successfully')
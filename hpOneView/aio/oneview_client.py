@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+oneview_client.py
+~~~~~~~~~~~~
+
+asyncio counterpart of hpOneView.oneview_client, for applications that run in an event loop
+"""
+
+__title__ = 'AsyncOneViewClient'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import json
+
+from hpOneView.aio.connection import AsyncConnection
+from hpOneView.aio.resource import AsyncResourceClient
+from hpOneView.retry import RetryPolicy, DEFAULT_RETRY_ATTEMPTS, DEFAULT_RETRY_BACKOFF, DEFAULT_RETRY_MAX_BACKOFF, \
+    DEFAULT_RETRY_DEADLINE
+from hpOneView.resources.servers.connections import Connections
+from hpOneView.resources.networking.fc_networks import FcNetworks
+from hpOneView.resources.networking.fcoe_networks import FcoeNetworks
+from hpOneView.resources.networking.ethernet_networks import EthernetNetworks
+from hpOneView.resources.networking.connection_templates import ConnectionTemplates
+from hpOneView.resources.networking.fabrics import Fabrics
+from hpOneView.resources.networking.network_sets import NetworkSets
+from hpOneView.resources.data_services.metric_streaming import MetricStreaming
+from hpOneView.resources.networking.switches import Switches
+from hpOneView.resources.networking.switch_types import SwitchTypes
+from hpOneView.resources.activity.tasks import Tasks
+from hpOneView.resources.servers.enclosures import Enclosures
+from hpOneView.resources.servers.logical_enclosures import LogicalEnclosures
+from hpOneView.resources.servers.enclosure_groups import EnclosureGroups
+from hpOneView.resources.servers.server_hardware import ServerHardware
+from hpOneView.resources.servers.server_hardware_types import ServerHardwareTypes
+from hpOneView.resources.servers.id_pools_vsn_ranges import IdPoolsVsnRanges
+from hpOneView.resources.servers.id_pools_vmac_ranges import IdPoolsVmacRanges
+from hpOneView.resources.servers.id_pools_vwwn_ranges import IdPoolsVwwnRanges
+from hpOneView.resources.networking.interconnects import Interconnects
+from hpOneView.resources.networking.interconnect_types import InterconnectTypes
+from hpOneView.resources.networking.interconnect_link_topologies import InterconnectLinkTopologies
+from hpOneView.resources.networking.logical_downlinks import LogicalDownlinks
+from hpOneView.resources.facilities.power_devices import PowerDevices
+from hpOneView.resources.facilities.racks import Racks
+from hpOneView.resources.fc_sans.san_managers import SanManagers
+from hpOneView.resources.fc_sans.endpoints import Endpoints
+from hpOneView.resources.networking.logical_interconnects import LogicalInterconnects
+from hpOneView.resources.networking.logical_interconnect_groups import LogicalInterconnectGroups
+from hpOneView.resources.networking.logical_switch_groups import LogicalSwitchGroups
+from hpOneView.resources.servers.server_profiles import ServerProfiles
+from hpOneView.resources.servers.server_profile_templates import ServerProfileTemplate
+from hpOneView.resources.storage.storage_systems import StorageSystems
+from hpOneView.resources.storage.storage_pools import StoragePools
+from hpOneView.resources.storage.storage_volume_templates import StorageVolumeTemplates
+from hpOneView.resources.storage.storage_volume_attachments import StorageVolumeAttachments
+from hpOneView.resources.settings.firmware_drivers import FirmwareDrivers
+from hpOneView.resources.settings.firmware_bundles import FirmwareBundles
+from hpOneView.resources.storage.volumes import Volumes
+from hpOneView.resources.networking.uplink_sets import UplinkSets
+
+ASYNC_ONEVIEW_CLIENT_PROXY_NOT_SUPPORTED = 'Proxy is not supported by AsyncOneViewClient'
+
+# Resources of OneViewClient available in AsyncOneViewClient, with the class that defines their uri
+RESOURCES = (
+    ('connections', Connections),
+    ('connection_templates', ConnectionTemplates),
+    ('fc_networks', FcNetworks),
+    ('fcoe_networks', FcoeNetworks),
+    ('ethernet_networks', EthernetNetworks),
+    ('fabrics', Fabrics),
+    ('network_sets', NetworkSets),
+    ('server_hardware', ServerHardware),
+    ('server_hardware_types', ServerHardwareTypes),
+    ('id_pools_vsn_ranges', IdPoolsVsnRanges),
+    ('id_pools_vmac_ranges', IdPoolsVmacRanges),
+    ('id_pools_vwwn_ranges', IdPoolsVwwnRanges),
+    ('switches', Switches),
+    ('switch_types', SwitchTypes),
+    ('logical_switch_groups', LogicalSwitchGroups),
+    ('tasks', Tasks),
+    ('enclosure_groups', EnclosureGroups),
+    ('enclosures', Enclosures),
+    ('logical_enclosures', LogicalEnclosures),
+    ('metric_streaming', MetricStreaming),
+    ('interconnects', Interconnects),
+    ('interconnect_types', InterconnectTypes),
+    ('interconnect_link_topologies', InterconnectLinkTopologies),
+    ('logical_interconnect_groups', LogicalInterconnectGroups),
+    ('logical_interconnects', LogicalInterconnects),
+    ('logical_downlinks', LogicalDownlinks),
+    ('power_devices', PowerDevices),
+    ('racks', Racks),
+    ('san_managers', SanManagers),
+    ('endpoints', Endpoints),
+    ('server_profiles', ServerProfiles),
+    ('server_profile_templates', ServerProfileTemplate),
+    ('storage_systems', StorageSystems),
+    ('storage_pools', StoragePools),
+    ('storage_volume_templates', StorageVolumeTemplates),
+    ('storage_volume_attachments', StorageVolumeAttachments),
+    ('firmware_drivers', FirmwareDrivers),
+    ('firmware_bundles', FirmwareBundles),
+    ('uplink_sets', UplinkSets),
+    ('volumes', Volumes),
+)
+
+
+class AsyncOneViewClient(object):
+    """
+    asyncio counterpart of OneViewClient. It takes the same configuration and has the same resource properties,
+    each one an AsyncResourceClient for the uri of the resource.
+
+    Login is asynchronous, so the client must be used as an asynchronous context manager, or login must be awaited
+    before the first request::
+
+        async with AsyncOneViewClient(config) as oneview_client:
+            server_hardware = await oneview_client.server_hardware.get_all()
+    """
+
+    def __init__(self, config):
+        if config.get("proxy"):
+            raise ValueError(ASYNC_ONEVIEW_CLIENT_PROXY_NOT_SUPPORTED)
+        self.__config = config
+        self.__connection = AsyncConnection(config["ip"], config.get('api_version', 200))
+        self.__connection.set_connection_pool(size=config.get("connection_pool_size"),
+                                              idle_timeout=config.get("connection_pool_idle_timeout"))
+        if any(key in config for key in ("retry_max_attempts", "retry_backoff_factor", "retry_max_backoff",
+                                         "retry_deadline")):
+            self.__connection.set_retry_policy(
+                RetryPolicy(max_attempts=config.get("retry_max_attempts", DEFAULT_RETRY_ATTEMPTS),
+                            backoff_factor=config.get("retry_backoff_factor", DEFAULT_RETRY_BACKOFF),
+                            max_backoff=config.get("retry_max_backoff", DEFAULT_RETRY_MAX_BACKOFF),
+                            deadline=config.get("retry_deadline", DEFAULT_RETRY_DEADLINE)))
+        if config.get("json_codec"):
+            self.__connection.set_json_codec(config["json_codec"])
+        self.__resources = {}
+
+    @classmethod
+    def from_json_file(cls, file_name):
+        """
+        Construct AsyncOneViewClient using a json file
+
+        Args:
+            file_name: json full path
+
+        Returns: AsyncOneViewClient
+        """
+        with open(file_name) as json_data:
+            config = json.load(json_data)
+
+        return cls(config)
+
+    async def login(self):
+        await self.__connection.login(self.__config["credentials"])
+
+    async def close(self):
+        """
+        Closes the connections to the appliance. The session is not logged out.
+        """
+        await self.__connection.close()
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def connection(self):
+        return self.__connection
+
+    def _get_resource_client(self, name, uri):
+        if name not in self.__resources:
+            self.__resources[name] = AsyncResourceClient(self.__connection, uri)
+        return self.__resources[name]
+
+
+def _resource_property(name, resource_class):
+    return property(lambda self: self._get_resource_client(name, resource_class.URI),
+                    doc='AsyncResourceClient for {0}'.format(resource_class.URI))
+
+
+for _name, _resource_class in RESOURCES:
+    setattr(AsyncOneViewClient, _name, _resource_property(_name, _resource_class))
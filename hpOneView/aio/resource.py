@@ -0,0 +1,468 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+__title__ = 'resource'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import asyncio
+import logging
+from collections import deque
+from urllib.parse import quote
+
+from hpOneView.aio.task_monitor import AsyncTaskMonitor
+from hpOneView.exceptions import HPOneViewUnknownType
+from hpOneView.pagination import DEFAULT_PREFETCH_PAGES, START_PARAMETER, COUNT_PARAMETER, get_uri_parameter, \
+    set_uri_parameter
+from hpOneView.resources.resource import ResourceClient, RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED, \
+    RESOURCE_CLIENT_INVALID_FIELD, RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE
+
+logger = logging.getLogger(__name__)
+
+
+def get_members(response):
+    if response and 'members' in response:
+        return response['members']
+    return []
+
+
+class AsyncResourceClient(ResourceClient):
+    """
+    asyncio counterpart of hpOneView.resources.resource.ResourceClient, on top of an AsyncConnection.
+
+    The methods that make requests are coroutines and take the same arguments as in ResourceClient, except iter_all,
+    which returns an asynchronous iterator, and get_cursor, which returns an AsyncCollectionCursor.
+    """
+
+    def __init__(self, con, uri):
+        super(AsyncResourceClient, self).__init__(con, uri)
+        self._task_monitor = AsyncTaskMonitor(con)
+
+    async def get_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
+        """
+        Gets all items according with the given arguments, following the nextPageUri of each page.
+
+        Returns:
+            list: A list of items matching the specified filter.
+        """
+        uri = self.build_query_uri(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
+                                   fields=fields, uri=uri)
+        logger.debug('Getting all resources with uri: {0}'.format(uri))
+
+        items = []
+        while uri:
+            response = await self._connection.get(uri)
+            members = get_members(response)
+            items += members
+            uri = response.get('nextPageUri')
+            if not members or (count != -1 and len(items) >= count):
+                break
+
+        logger.debug('Total # of members found = {0}'.format(str(len(items))))
+        return items
+
+    def iter_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
+        """
+        Iterates over all items according with the given arguments, with `async for`. The next page is requested
+        while the members of the current one are consumed.
+
+        Returns:
+            AsyncPageIterator: The items matching the specified filter.
+        """
+        uri = self.build_query_uri(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
+                                   fields=fields, uri=uri)
+        logger.debug('Iterating over all resources with uri: {0}'.format(uri))
+
+        return AsyncPageIterator(self._connection, uri, count)
+
+    def get_cursor(self, start=0, page_size=-1, filter='', query='', sort='', view='', fields='', uri=None,
+                   prefetch=DEFAULT_PREFETCH_PAGES):
+        """
+        Gets a cursor over the pages of a query, with random access to any page, as ResourceClient.get_cursor.
+
+        Returns:
+            AsyncCollectionCursor
+        """
+        uri = self.build_query_uri(start=start, count=page_size, filter=filter, query=query, sort=sort, view=view,
+                                   fields=fields, uri=uri)
+        return AsyncCollectionCursor(self._connection, uri, prefetch=prefetch)
+
+    async def get_schema(self):
+        logger.debug('Get schema (uri = %s)' % self._uri)
+        return await self._connection.get(self._uri + '/schema')
+
+    async def get_utilization(self, id_or_uri, fields=None, filter=None, refresh=False, view=None):
+        return await self._connection.get(self.build_utilization_uri(id_or_uri, fields, filter, refresh, view))
+
+    async def get(self, id_or_uri):
+        uri = self.build_uri(id_or_uri)
+        logger.debug('Get resource (uri = %s, ID = %s)' % (uri, str(id_or_uri)))
+        return await self._connection.get(uri)
+
+    async def get_collection(self, id_or_uri, filter=''):
+        if filter:
+            filter = "?filter=" + quote(filter)
+
+        uri = "{uri}{filter}".format(uri=self.build_uri(id_or_uri), filter=filter)
+        logger.debug('Get resource collection (uri = %s)' % uri)
+        return get_members(await self._connection.get(uri))
+
+    async def get_by(self, field, value, uri=None):
+        if not field:
+            logger.exception(RESOURCE_CLIENT_INVALID_FIELD)
+            raise ValueError(RESOURCE_CLIENT_INVALID_FIELD)
+
+        filter = "\"'{0}'='{1}'\"".format(field, value)
+        return await self.get_all(filter=filter, uri=uri)
+
+    async def get_by_name(self, name):
+        result = await self.get_by('name', name)
+        return result[0] if result else None
+
+    async def delete(self, resource, force=False, timeout=-1, custom_headers=None):
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        if isinstance(resource, dict):
+            if not resource.get('uri'):
+                logger.exception(RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE)
+                raise HPOneViewUnknownType(RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE)
+            uri = resource['uri']
+        else:
+            uri = self._uri + "/" + resource
+
+        if force:
+            uri += '?force=True'
+
+        task, body = await self._connection.delete(uri, custom_headers=custom_headers)
+        if not task:
+            # Successful return from a synchronous delete operation.
+            return True
+
+        return await self._task_monitor.wait_for_task(task, timeout=timeout)
+
+    async def update_with_zero_body(self, uri, timeout=-1, custom_headers=None):
+        return await self.__do_put(uri, None, timeout, custom_headers)
+
+    async def update(self, resource, uri=None, force=False, timeout=-1, custom_headers=None):
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        if not uri:
+            uri = resource['uri']
+
+        if force:
+            uri += '?force=True'
+
+        return await self.__do_put(uri, resource, timeout, custom_headers)
+
+    async def create_with_zero_body(self, uri=None, timeout=-1, custom_headers=None):
+        return await self.__do_post(uri or self._uri, None, timeout, custom_headers)
+
+    async def create(self, resource, uri=None, timeout=-1, custom_headers=None):
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        return await self.__do_post(uri or self._uri, resource, timeout, custom_headers)
+
+    async def patch(self, id_or_uri, operation, path, value, timeout=-1, custom_headers=None):
+        uri = self.build_uri(id_or_uri)
+        patch_request = [{'op': operation, 'path': path, 'value': value}]
+        task, entity = await self._connection.patch(uri, patch_request, custom_headers=custom_headers)
+
+        if not task:
+            return entity
+
+        return await self._task_monitor.wait_for_task(task, timeout)
+
+    async def __do_post(self, uri, resource, timeout, custom_headers):
+        task, entity = await self._connection.post(uri, resource, custom_headers=custom_headers)
+
+        if not task:
+            return entity
+
+        return await self._task_monitor.wait_for_task(task, timeout)
+
+    async def __do_put(self, uri, resource, timeout, custom_headers):
+        task, body = await self._connection.put(uri, resource, custom_headers=custom_headers)
+
+        if not task:
+            return body
+
+        return await self._task_monitor.wait_for_task(task, timeout)
+
+
+class AsyncPageIterator(object):
+    """
+    Asynchronous iterator over the members of a collection, requested page by page.
+    """
+
+    def __init__(self, con, uri, count):
+        self._connection = con
+        self._uri = uri
+        self._count = count
+        self._found = 0
+        self._members = deque()
+        self._next_page = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._members:
+            if self._next_page is None:
+                if not self._uri:
+                    raise StopAsyncIteration
+                self._next_page = asyncio.ensure_future(self._connection.get(self._uri))
+
+            try:
+                response = await self._next_page
+            except BaseException:
+                self.close()
+                raise
+            self._next_page = None
+            self._members = deque(get_members(response))
+            self._found += len(self._members)
+            self._uri = response.get('nextPageUri')
+            if not self._members or (self._count != -1 and self._found >= self._count):
+                self._uri = None
+
+            if self._uri:
+                # The next page is requested while the caller consumes this one
+                self._next_page = asyncio.ensure_future(self._connection.get(self._uri))
+
+        return self._members.popleft()
+
+    def close(self):
+        """
+        Stops the iteration, cancelling the request of the next page.
+        """
+        if self._next_page is not None:
+            self._next_page.cancel()
+            self._next_page = None
+        self._uri = None
+        self._members.clear()
+
+
+class AsyncCollectionCursor(object):
+    """
+    asyncio counterpart of hpOneView.pagination.CollectionCursor: the methods that request pages are coroutines,
+    iter_pages returns an asynchronous iterator, and the members are iterated with `async for`. The next `prefetch`
+    pages are requested while the current one is consumed.
+
+    Attributes:
+        uri: uri of the query.
+        start: offset of the first page.
+        count: page size, None until known.
+        total: number of members of the collection, None until a page is requested.
+    """
+
+    def __init__(self, con, uri, prefetch=DEFAULT_PREFETCH_PAGES):
+        self._connection = con
+        self._prefetch = prefetch
+        self.uri = uri
+        self.start = get_uri_parameter(uri, START_PARAMETER, 0)
+        count = get_uri_parameter(uri, COUNT_PARAMETER, -1)
+        self.count = count if count > 0 else None
+        self.total = None
+
+    @property
+    def page_count(self):
+        """
+        Gets the number of pages from start to the end of the collection, None while the total is unknown.
+        """
+        if self.total is None:
+            return None
+        remaining = max(self.total - self.start, 0)
+        if not self.count:
+            return 1 if remaining else 0
+        return (remaining + self.count - 1) // self.count
+
+    async def get_page_uris(self):
+        """
+        Gets the uris of all the pages, requesting the first one if the total or the page size are unknown.
+        """
+        if self.total is None:
+            await self.get_page(0)
+        page_uris = []
+        for index in range(self.page_count):
+            page_uris.append(await self.get_page_uri(index))
+        return page_uris
+
+    async def get_page_uri(self, index):
+        """
+        Gets the uri of a page, requesting the first one if the page size is unknown.
+        """
+        if index > 0 and self.count is None:
+            await self.get_page(0)
+        if index > 0 and self.count is None:
+            raise IndexError('Page %s is out of the collection' % index)
+        page_uri = set_uri_parameter(self.uri, START_PARAMETER, self.start + index * (self.count or 0))
+        return set_uri_parameter(page_uri, COUNT_PARAMETER, self.count or -1)
+
+    async def get_page(self, index):
+        """
+        Gets a page of the collection.
+
+        Args:
+            index: index of the page, from 0.
+
+        Returns:
+            dict: The page, with its members, total and count.
+        """
+        page = await self._connection.get(await self.get_page_uri(index))
+        if self.__update(page) and index > 0:
+            # The offset was computed with a page size larger than the pages of the appliance
+            page = await self._connection.get(await self.get_page_uri(index))
+            self.__update(page)
+        return page
+
+    async def get_members(self, index):
+        """
+        Gets the members of a page of the collection.
+        """
+        return get_members(await self.get_page(index))
+
+    def iter_pages(self, first=0):
+        """
+        Iterates over the pages from the given index to the end of the collection, with `async for`.
+
+        Returns:
+            AsyncCursorPageIterator
+        """
+        return AsyncCursorPageIterator(self._connection, self, first, self._prefetch)
+
+    def __aiter__(self):
+        return AsyncCursorMemberIterator(self.iter_pages())
+
+    def __update(self, page):
+        """
+        Updates the total and the page size from a page. Returns whether the page size changed.
+        """
+        if not isinstance(page, dict):
+            return False
+        members = get_members(page)
+        if 'total' in page:
+            self.total = page['total']
+        if members and page.get('nextPageUri') and (self.count is None or len(members) < self.count):
+            # The appliance limits the page size
+            self.count = len(members)
+            return True
+        return False
+
+
+class AsyncCursorPageIterator(object):
+    """
+    Asynchronous iterator over the pages of an AsyncCollectionCursor. The next `prefetch` pages are requested while
+    the current one is consumed; without a total, the pages are followed by their nextPageUri.
+    """
+
+    def __init__(self, con, cursor, first, prefetch):
+        self._connection = con
+        self._cursor = cursor
+        self._next_index = first
+        self._prefetch = prefetch
+        self._last = None
+        self._page = None
+        self._pending = deque()
+        self._closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._page is not None and not get_members(self._page):
+            self.close()
+        if self._closed:
+            raise StopAsyncIteration
+
+        try:
+            page = await self.__get_next_page()
+        except BaseException:
+            self.close()
+            raise
+        if page is None:
+            self.close()
+            raise StopAsyncIteration
+
+        self._page = page
+        if self._last is not None:
+            while self._next_index < self._last and len(self._pending) < self._prefetch:
+                self._pending.append(asyncio.ensure_future(self._cursor.get_page(self._next_index)))
+                self._next_index += 1
+        return page
+
+    async def __get_next_page(self):
+        if self._page is None:
+            page = await self._cursor.get_page(self._next_index)
+            self._next_index += 1
+            self._last = self._cursor.page_count
+            return page
+        if self._last is None:
+            next_page_uri = self._page.get('nextPageUri')
+            return await self._connection.get(next_page_uri) if next_page_uri else None
+        if self._pending:
+            return await self._pending.popleft()
+        if self._next_index < self._last:
+            self._next_index += 1
+            return await self._cursor.get_page(self._next_index - 1)
+        return None
+
+    def close(self):
+        """
+        Stops the iteration, cancelling the requests of the prefetched pages.
+        """
+        while self._pending:
+            self._pending.popleft().cancel()
+        self._closed = True
+
+
+class AsyncCursorMemberIterator(object):
+    """
+    Asynchronous iterator over the members of the pages of an AsyncCursorPageIterator.
+    """
+
+    def __init__(self, pages):
+        self._pages = pages
+        self._members = deque()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._members:
+            self._members = deque(get_members(await self._pages.__anext__()))
+        return self._members.popleft()
+
+    def close(self):
+        """
+        Stops the iteration, cancelling the requests of the prefetched pages.
+        """
+        self._pages.close()
+        self._members.clear()
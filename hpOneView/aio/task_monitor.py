@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+__title__ = 'AsyncTaskMonitor'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import asyncio
+import logging
+import time
+
+from hpOneView.exceptions import HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError, HPOneViewUnknownType
+from hpOneView.resources.task_monitor import TASK_PENDING_STATES, TASK_ERROR_STATES, MSG_UNKNOWN_OBJECT_TYPE, \
+    MSG_TASK_TYPE_UNRECONIZED, MSG_UNKNOWN_EXCEPTION, MSG_TIMEOUT, MSG_INVALID_TASK, UNLIMITED_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTaskMonitor(object):
+    """
+    asyncio counterpart of hpOneView.resources.task_monitor.TaskMonitor: waiting for a task suspends the coroutine
+    instead of blocking the thread.
+    """
+
+    def __init__(self, con):
+        self._connection = con
+
+    @staticmethod
+    def get_current_seconds():
+        return int(time.time())
+
+    async def wait_for_task(self, task, timeout=-1):
+        """
+        Wait for task execution and return associated resource
+        Args:
+            task: task dict
+            timeout: timeout in seconds
+
+        Returns: associated resource when creating or updating; True when deleting
+        """
+        if not task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        logger.debug('Waiting for task')
+
+        start_time = self.get_current_seconds()
+
+        i = 0
+        while await self.is_task_running(task):
+            # wait 1 to 10 seconds
+            # the value increases to avoid flooding server with requests
+            i = i + 1 if i < 10 else 10
+
+            await asyncio.sleep(i)
+            if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
+                raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+
+        task = await self.get(task)
+
+        logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
+
+        task_response = await self.get_task_response(task)
+        logger.debug('Task completed')
+        return task_response
+
+    async def get_task_response(self, task):
+        """
+        Gets the result of a completed task.
+
+        Args:
+            task: completed task dict
+
+        Returns: associated resource when creating or updating; True when deleting
+
+        Raises:
+            HPOneViewTaskError: when the task failed
+        """
+        if task['taskState'] in TASK_ERROR_STATES and task['taskState'] != 'Warning':
+            msg = None
+            if 'taskErrors' in task and len(task['taskErrors']) > 0:
+                err = task['taskErrors'][0]
+                if 'message' in err:
+                    msg = err['message']
+
+            if msg:
+                raise HPOneViewTaskError(msg)
+            elif 'taskStatus' in task and task['taskStatus']:
+                raise HPOneViewTaskError(task['taskStatus'])
+            else:
+                raise HPOneViewTaskError(MSG_UNKNOWN_EXCEPTION)
+
+        deleted_resource = (task['name'] == 'Delete' or task['name'] == 'Remove')
+
+        if 'type' in task and task['type'].startswith('Task') and 'name' in task and not deleted_resource:
+            # get associated resource when is not a delete task
+            task, entity = await self.get_associated_resource(task)
+            return entity
+
+        if 'name' in task and task['name'] == 'Delete':
+            # delete task return true
+            return True
+
+        logger.warning('Task completed, unknown response: ' + str(task))
+        return task
+
+    async def is_task_running(self, task):
+        """
+        Check if a task is running according to TASK_PENDING_STATES
+
+        Args:
+            task: task dict
+
+        Returns:
+            True when is in TASK_PENDING_STATES; False when not
+        """
+        if 'uri' in task:
+            task = await self.get(task)
+            if 'taskState' in task and task['taskState'] in TASK_PENDING_STATES:
+                return True
+        return False
+
+    async def get(self, task):
+        """
+        Retrieve a task by its uri
+
+        Args:
+            task: task dict, must have 'uri' key
+
+        Returns:
+            task dict
+        """
+        return await self._connection.get(task['uri'])
+
+    async def get_associated_resource(self, task):
+        """
+        Retrieve a resource associated to a task
+
+        Args:
+            task: task dict
+
+        Returns:
+            tuple: task (updated), the entity found (dict)
+        """
+        if not task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        if task['category'] != 'tasks' and task['category'] != 'backups':
+            raise HPOneViewUnknownType(MSG_UNKNOWN_OBJECT_TYPE)
+
+        if task['type'] == 'TaskResourceV2':
+            resource_uri = task['associatedResource']['resourceUri']
+
+            if resource_uri and resource_uri.startswith("/rest/appliance/support-dumps/"):
+                # Specific for support dumps
+                return task, resource_uri
+
+        elif task['type'] == 'BACKUP':
+            task = await self._connection.get(task['taskUri'])
+            resource_uri = task['uri']
+        else:
+            raise HPOneViewInvalidResource(MSG_TASK_TYPE_UNRECONIZED % task['type'])
+
+        entity = {}
+
+        if resource_uri:
+            entity = await self._connection.get(resource_uri)
+
+        return task, entity
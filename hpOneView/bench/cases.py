@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+cases.py
+~~~~~~~~
+
+This module has the benchmarks of the hot paths of the library
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'cases'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import copy
+import json
+import os
+import subprocess
+import sys
+from collections import OrderedDict
+
+from hpOneView.bench.measure import measure
+from hpOneView.common import resource_compare
+from hpOneView.connection import connection
+from hpOneView.json_codec import STDLIB, get_installed_json_codecs, make_json_codec
+from hpOneView.recording import TransportRecorder, TransportReplayer
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.resources.task_monitor import TaskMonitor
+
+COLLECTION_URI = '/rest/alerts'
+TASKS_COLLECTION_URI = '/rest/bench-tasks'
+UPLOAD_URI = '/rest/firmware-bundles'
+IMPORT_PACKAGE_CODE = 'import hpOneView'
+IMPORT_CLIENT_CODE = 'import hpOneView.oneview_client'
+
+
+class BenchContext(object):
+    """
+    Connection to the simulator and options shared by the benchmarks.
+    """
+
+    def __init__(self, con, directory, iterations=200, pages=20, page_size=500, upload_size=16 * 1024 * 1024,
+                 profile_size=256):
+        self.connection = con
+        self.directory = directory
+        self.iterations = iterations
+        self.pages = pages
+        self.page_size = page_size
+        self.upload_size = upload_size
+        self.profile_size = profile_size
+
+    @property
+    def items(self):
+        return self.pages * self.page_size
+
+
+def bench_do_http(context):
+    """
+    Requests over a persistent connection.
+    """
+    con = context.connection
+    return measure(lambda _: con.do_http('GET', '/rest/version', ''), context.iterations)
+
+
+def bench_get_all(context):
+    """
+    Gets a collection of `pages` pages, one page after the other.
+    """
+    client = ResourceClient(context.connection, COLLECTION_URI)
+    return measure(lambda _: client.get_all(), max(context.iterations // 20, 3), units=context.items)
+
+
+def bench_get_all_concurrent(context):
+    """
+    Gets a collection of `pages` pages, requesting 4 pages at the same time.
+    """
+    client = ResourceClient(context.connection, COLLECTION_URI)
+    workers = context.connection.get_page_workers()
+    context.connection.set_page_workers(4)
+    try:
+        return measure(lambda _: client.get_all(), max(context.iterations // 20, 3), units=context.items)
+    finally:
+        context.connection.set_page_workers(workers)
+
+
+def bench_get_all_replayed(context):
+    """
+    Gets a collection of `pages` pages recorded from the simulator, replayed without a network: the decoding and the
+    pagination without the latency of the requests.
+    """
+    recording_path = os.path.join(context.directory, 'get_all.jsonl.gz')
+    con = context.connection
+    with TransportRecorder(recording_path) as recorder:
+        con.set_transport(recorder)
+        try:
+            ResourceClient(con, COLLECTION_URI).get_all()
+        finally:
+            con.set_transport(None)
+
+    replay_connection = connection(con.get_host())
+    replay_connection.set_transport(TransportReplayer(recording_path))
+    client = ResourceClient(replay_connection, COLLECTION_URI)
+    return measure(lambda _: client.get_all(), max(context.iterations // 20, 3), units=context.items)
+
+
+def bench_wait_for_task(context):
+    """
+    Waits for tasks that are already completed: the requests of the task and of its associated resource.
+    """
+    con = context.connection
+    task_monitor = TaskMonitor(con)
+
+    def start_task():
+        task, body = con.post(TASKS_COLLECTION_URI, {'name': 'bench'})
+        return task
+
+    return measure(task_monitor.wait_for_task, context.iterations, setup=start_task)
+
+
+def bench_post_multipart(context):
+    """
+    Uploads a file of `upload_size` bytes. The throughput is in bytes per second.
+    """
+    file_path = os.path.join(context.directory, 'upload.iso')
+    with open(file_path, 'wb') as upload_file:
+        upload_file.write(os.urandom(context.upload_size))
+    con = context.connection
+    return measure(lambda _: con.post_multipart(UPLOAD_URI, None, file_path, 'upload.iso'),
+                   max(context.iterations // 40, 3), units=context.upload_size)
+
+
+def make_json_decode_bench(codec_name):
+    def bench_json_decode(context):
+        """
+        Decodes the bytes of a page of `page_size` expanded server hardware, as the connection does with each
+        response. The throughput is in bytes per second.
+        """
+        codec = make_json_codec(codec_name)
+        data = json.dumps({'type': 'server-hardware-list-7', 'members': make_server_hardware(context.page_size),
+                           'count': context.page_size, 'total': context.page_size}).encode('utf-8')
+        return measure(lambda _: codec.loads(data), context.iterations, units=len(data))
+    return bench_json_decode
+
+
+def make_json_encode_bench(codec_name):
+    def bench_json_encode(context):
+        """
+        Encodes a server profile with `profile_size` connections, drives and BIOS settings, as the connection does
+        with the body of each request.
+        """
+        codec = make_json_codec(codec_name)
+        profile = make_profile(context.profile_size)
+        return measure(lambda _: codec.dumps(profile), context.iterations)
+    return bench_json_encode
+
+
+def bench_resource_compare(context):
+    """
+    Compares two equal server profiles with `profile_size` connections, drives and BIOS settings.
+    """
+    profile = make_profile(context.profile_size)
+    other = copy.deepcopy(profile)
+    return measure(lambda _: resource_compare(profile, other), context.iterations)
+
+
+def make_import_bench(code):
+    def bench_import(context):
+        """
+        Starts an interpreter that runs `code`, as short-lived scripts do. It includes the startup of the interpreter.
+        """
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                                          env.get('PYTHONPATH')]))
+        command = [sys.executable, '-c', code]
+        return measure(lambda _: subprocess.check_call(command, env=env), max(context.iterations // 20, 3))
+    return bench_import
+
+
+def make_server_hardware(count):
+    """
+    Builds a list of server hardware, as returned with view=expand.
+    """
+    return [{
+        'type': 'server-hardware-7',
+        'category': 'server-hardware',
+        'name': 'Encl%d, bay %d' % (i // 16 + 1, i % 16 + 1),
+        'uri': '/rest/server-hardware/30303437-3034-4D32-3230-3133%08d' % i,
+        'eTag': '1467928596468/%d' % i,
+        'created': '2016-07-07T22:36:36.468Z',
+        'modified': '2016-07-07T22:36:36.468Z',
+        'status': 'OK',
+        'state': 'NoProfileApplied',
+        'powerState': 'Off',
+        'model': 'ProLiant BL460c Gen9',
+        'serialNumber': 'SGH%07d' % i,
+        'processorCount': 2,
+        'processorCoreCount': 14,
+        'processorSpeedMhz': 2300,
+        'processorType': 'Intel(R) Xeon(R) CPU E5-2695 v3 @ 2.30GHz',
+        'memoryMb': 262144,
+        'romVersion': 'I36 v2.30 (09/24/2016)',
+        'mpFirmwareVersion': '2.40 Dec 02 2015',
+        'serverHardwareTypeUri': '/rest/server-hardware-types/5B42EABE-5140-4E24-A5D6-A2A4E8AC3B0A',
+        'serverGroupUri': '/rest/enclosure-groups/fe2d2c27-9b43-4e66-9f25-2f6e4f10d3b8',
+        'locationUri': '/rest/enclosures/09SGH100X6J1',
+        'mpHostInfo': {'mpHostName': 'ILO-SGH%07d' % i,
+                       'mpIpAddresses': [{'address': '172.16.%d.%d' % (i // 250, i % 250 + 1), 'type': 'DHCP'},
+                                         {'address': 'fe80::9eb6:54ff:fe97:%x' % i, 'type': 'LinkLocal'}]},
+        'portMap': {'deviceSlots': [{
+            'deviceName': 'HP FlexFabric 20Gb 2-port 650FLB Adapter',
+            'deviceNumber': slot,
+            'location': 'Flb',
+            'slotNumber': slot,
+            'physicalPorts': [{
+                'portNumber': port,
+                'type': 'Ethernet',
+                'mac': '9C:B6:54:97:%02X:%02X' % (slot, port),
+                'wwn': None,
+                'interconnectUri': '/rest/interconnects/%d' % port,
+                'interconnectPort': i % 16 + 1,
+                'virtualPorts': [{'portNumber': virtual_port, 'portFunction': 'abcd'[virtual_port - 1],
+                                  'mac': '9C:B6:54:97:%02X:%02X' % (port, virtual_port), 'wwnn': None,
+                                  'wwpn': None, 'currentAllocatedVirtualFunctionCount': 0}
+                                 for virtual_port in range(1, 5)],
+            } for port in range(1, 3)],
+        } for slot in range(1, 3)]},
+    } for i in range(count)]
+
+
+def make_profile(size):
+    """
+    Builds a large server profile.
+    """
+    return {
+        'type': 'ServerProfileV6',
+        'name': 'bench-profile',
+        'serverHardwareTypeUri': '/rest/server-hardware-types/1',
+        'connections': [{'id': i + 1, 'name': 'connection-%d' % i, 'functionType': 'Ethernet',
+                         'portId': 'Mezz 3:1-%s' % 'abcd'[i % 4], 'requestedMbps': '2500',
+                         'networkUri': '/rest/ethernet-networks/%d' % i,
+                         'boot': {'priority': 'NotBootable'}} for i in range(size)],
+        'localStorage': {
+            'controllers': [{'deviceSlot': 'Embedded', 'mode': 'RAID', 'initialize': False,
+                             'logicalDrives': [{'name': 'drive-%d' % i, 'raidLevel': 'RAID1', 'bootable': i == 0,
+                                                'numPhysicalDrives': 2} for i in range(size)]}],
+            'sasLogicalJBODs': [],
+        },
+        'bios': {'manageBios': True,
+                 'overriddenSettings': [{'id': 'Setting%d' % i, 'value': 'Enabled'} for i in range(size)]},
+        'boot': {'manageBoot': True, 'order': ['HardDisk', 'PXE', 'USB', 'CD']},
+    }
+
+
+CASES = OrderedDict([
+    ('do_http', bench_do_http),
+    ('get_all', bench_get_all),
+    ('get_all_concurrent', bench_get_all_concurrent),
+    ('get_all_replayed', bench_get_all_replayed),
+    ('wait_for_task', bench_wait_for_task),
+    ('post_multipart', bench_post_multipart),
+    ('json_decode', make_json_decode_bench(STDLIB)),
+    ('json_encode', make_json_encode_bench(STDLIB)),
+    ('resource_compare', bench_resource_compare),
+    ('import_package', make_import_bench(IMPORT_PACKAGE_CODE)),
+    ('import_client', make_import_bench(IMPORT_CLIENT_CODE)),
+])
+
+# The faster JSON codecs, when installed
+for _codec_name in get_installed_json_codecs():
+    if _codec_name != STDLIB:
+        CASES['json_decode_' + _codec_name] = make_json_decode_bench(_codec_name)
+        CASES['json_encode_' + _codec_name] = make_json_encode_bench(_codec_name)
+del _codec_name
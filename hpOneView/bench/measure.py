@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+measure.py
+~~~~~~~~~~
+
+This module times repeated calls of a function and traces their memory allocations
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'measure'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import gc
+import math
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+PERCENTILES = (50, 90, 99)
+# Calls traced for the allocations, tracing slows down the calls
+ALLOCATION_ITERATIONS = 10
+
+
+def percentile(sorted_values, percent):
+    """
+    Gets the percentile of sorted values, with the nearest-rank method.
+    """
+    if not sorted_values:
+        return None
+    rank = int(math.ceil(percent / 100.0 * len(sorted_values))) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+def measure(func, iterations, setup=None, warmup=1, units=1):
+    """
+    Calls a function repeatedly and gets its timing and allocations.
+
+    Args:
+        func: Function to measure. It gets the value returned by setup, when given.
+        iterations: Number of timed calls.
+        setup: Function called before each call, outside of the measure.
+        warmup: Number of calls before the measure.
+        units: Units of work done by each call (items, bytes...), to compute the throughput.
+
+    Returns:
+        dict: iterations, total_seconds, ops_per_second, units_per_second, mean_ms, min_ms, max_ms, p50_ms, p90_ms,
+            p99_ms and allocations
+    """
+    for _ in range(warmup):
+        func(setup() if setup else None)
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            argument = setup() if setup else None
+            start = timeit.default_timer()
+            func(argument)
+            timings.append(timeit.default_timer() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    total = sum(timings)
+    timings.sort()
+    result = {
+        'iterations': iterations,
+        'total_seconds': total,
+        'ops_per_second': iterations / total if total else None,
+        'units_per_second': iterations * units / total if total else None,
+        'mean_ms': total / iterations * 1000 if iterations else None,
+        'min_ms': timings[0] * 1000 if timings else None,
+        'max_ms': timings[-1] * 1000 if timings else None,
+    }
+    for percent in PERCENTILES:
+        value = percentile(timings, percent)
+        result['p%d_ms' % percent] = value * 1000 if value is not None else None
+    result['allocations'] = measure_allocations(func, min(iterations, ALLOCATION_ITERATIONS), setup)
+    return result
+
+
+def measure_allocations(func, iterations, setup=None):
+    """
+    Traces the memory allocated by the calls of a function.
+
+    Returns:
+        dict: peak_bytes, the maximum memory allocated by a call, and retained_bytes, the memory still allocated
+            after a call, on average. None when tracemalloc is not available or there are no iterations.
+    """
+    if tracemalloc is None or not iterations:
+        return None
+
+    peaks = []
+    retained = 0
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            argument = setup() if setup else None
+            gc.collect()
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+                start, _ = tracemalloc.get_traced_memory()
+            else:
+                # Before Python 3.9 the peak is only reset with the traces
+                tracemalloc.clear_traces()
+                start = 0
+            func(argument)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(max(peak - start, 0))
+            retained += current - start
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return {'peak_bytes': max(peaks), 'retained_bytes': retained // iterations}
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+runner.py
+~~~~~~~~~
+
+This module runs the benchmarks against an appliance simulator in a child process, and writes the results as JSON
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'runner'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+import hpOneView
+from hpOneView.bench.cases import CASES, COLLECTION_URI, BenchContext
+from hpOneView.connection import connection
+from hpOneView.testing.simulator import ApplianceSimulator
+
+BENCH_CREDENTIALS = {'userName': 'administrator', 'password': 'password'}
+
+logger = logging.getLogger(__name__)
+
+
+def _serve(pipe, options):
+    # Runs in the child process, until the parent asks to stop
+    simulator = ApplianceSimulator(**options)
+    simulator.start()
+    pipe.send(simulator.port)
+    pipe.recv()
+    simulator.stop()
+
+
+class SimulatorProcess(object):
+    """
+    Appliance simulator running in a child process, so that serving the requests does not compete with the
+    benchmarks for the interpreter.
+    """
+
+    def __init__(self, **options):
+        self._options = options
+        self._pipe = None
+        self._process = None
+        self.address = None
+
+    def __enter__(self):
+        self._pipe, child_pipe = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child_pipe, self._options))
+        self._process.daemon = True
+        self._process.start()
+        self.address = '127.0.0.1:%s' % self._pipe.recv()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._pipe.send('stop')
+        self._process.join()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m hpOneView.bench',
+                                     description='Benchmarks of the hot paths of the library, run against a local '
+                                                 'appliance simulator.')
+    parser.add_argument('--iterations', type=int, default=200, help='Timed calls of the fast benchmarks')
+    parser.add_argument('--pages', type=int, default=20, help='Pages of the collection of get_all')
+    parser.add_argument('--page-size', type=int, default=500, help='Members by page')
+    parser.add_argument('--upload-size', type=int, default=16 * 1024 * 1024, help='Bytes of the uploaded file')
+    parser.add_argument('--profile-size', type=int, default=256,
+                        help='Connections, drives and BIOS settings of the compared profiles')
+    parser.add_argument('--latency', type=float, default=0, help='Seconds added by the simulator to each response')
+    parser.add_argument('--only', action='append', choices=list(CASES), help='Runs only this benchmark')
+    parser.add_argument('--output', help='File for the JSON results (default: standard output)')
+    return parser.parse_args(argv)
+
+
+def run(args):
+    """
+    Runs the benchmarks.
+
+    Returns:
+        dict: Environment, options and results by benchmark.
+    """
+    results = OrderedDict()
+    directory = tempfile.mkdtemp(prefix='hpOneView-bench-')
+    options = {'datasets': {COLLECTION_URI: args.pages * args.page_size}, 'max_page_size': args.page_size,
+               'latency': args.latency}
+    try:
+        with SimulatorProcess(**options) as simulator:
+            con = connection(simulator.address)
+            con.login(BENCH_CREDENTIALS)
+            context = BenchContext(con, directory, iterations=args.iterations, pages=args.pages,
+                                   page_size=args.page_size, upload_size=args.upload_size,
+                                   profile_size=args.profile_size)
+            for name, case in CASES.items():
+                if args.only and name not in args.only:
+                    continue
+                logger.info('Running benchmark %s' % name)
+                results[name] = case(context)
+            con.close_connections()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return OrderedDict([
+        ('library_version', hpOneView.__version__),
+        ('python_version', platform.python_version()),
+        ('python_implementation', platform.python_implementation()),
+        ('platform', platform.platform()),
+        ('timestamp', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())),
+        ('options', dict((key, value) for key, value in vars(args).items() if key != 'output')),
+        ('results', results),
+    ])
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(data + '\n')
+    else:
+        sys.stdout.write(data + '\n')
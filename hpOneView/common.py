@@ -1626,16 +1626,25 @@ def make_alertMap_dict(notes, etag, state='Active', user='None',
 
 
 class pages(object):
+    """
+    This class is deprecated, use
+        hpOneView.pagination.CollectionCursor, or ResourceClient.get_cursor(), instead.
+
+    Iterates over the pages after the page got last by the thread with connection.get.
+    """
+
     def __init__(self, page, connection):
         self._con = connection
         self.currentPage = page
+        # A copy of the cursor of the page got last by the thread, so the other requests do not move it
+        self._cursor = connection.get_page_cursor().copy()
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        if self._con._nextPage is not None:
-            self.currentPage = self._con.getNextPage()
+        if self._cursor.next_page_uri is not None:
+            self.currentPage = self._cursor.get_next_page()
             return self.currentPage
         else:
             raise StopIteration
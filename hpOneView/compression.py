@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+compression.py
+~~~~~~~~~~~~
+
+This module decompresses the responses of the appliance encoded with gzip or deflate, as they are read
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'compression'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import http.client
+import threading
+import zlib
+
+GZIP = 'gzip'
+DEFLATE = 'deflate'
+IDENTITY = 'identity'
+
+ACCEPT_ENCODING = 'gzip, deflate'
+READ_CHUNK_SIZE = 65536
+
+_WBITS = {
+    GZIP: 16 + zlib.MAX_WBITS,
+    # zlib format, as specified; some servers send raw deflate data instead
+    DEFLATE: zlib.MAX_WBITS,
+}
+
+
+class ContentDecoder(object):
+    """
+    Decompresses a response body chunk by chunk.
+    """
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self._decompressor = zlib.decompressobj(_WBITS[encoding])
+        self._started = False
+
+    def decompress(self, data, max_length=0):
+        """
+        Decompresses the next chunk of the body.
+
+        Args:
+            data: Bytes received.
+            max_length: Maximum bytes returned, 0 for no limit. The data left is kept in `unconsumed_tail` and
+                decompressed first by the next calls, so a small compressed chunk cannot expand in memory at once.
+
+        Returns:
+            bytes: The decompressed data.
+        """
+        if not self._started and data:
+            self._started = True
+            try:
+                return self._decompressor.decompress(data, max_length)
+            except zlib.error:
+                if self.encoding != DEFLATE:
+                    raise
+                # Raw deflate data, without the zlib header
+                self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._decompressor.decompress(self._decompressor.unconsumed_tail + data, max_length)
+
+    @property
+    def unconsumed_tail(self):
+        """
+        Compressed data not decompressed yet because of the `max_length` of the last call.
+        """
+        return self._decompressor.unconsumed_tail
+
+    def flush(self):
+        return self._decompressor.flush()
+
+    @property
+    def complete(self):
+        """
+        Whether the end of the compressed data was decompressed, so the body was not truncated. Always True in
+        Python 2, which cannot tell.
+        """
+        return getattr(self._decompressor, 'eof', True)
+
+
+def get_content_decoder(content_encoding):
+    """
+    Gets the decoder of a response.
+
+    Args:
+        content_encoding: Value of the Content-Encoding header.
+
+    Returns:
+        ContentDecoder, or None when the body is not compressed, or compressed with an unsupported encoding.
+    """
+    if not content_encoding:
+        return None
+    encoding = content_encoding.strip().lower()
+    if encoding not in _WBITS:
+        return None
+    return ContentDecoder(encoding)
+
+
+class DecodingReader(object):
+    """
+    Reads the body of a compressed response, decompressed chunk by chunk. A truncated body raises IncompleteRead, as
+    a lost connection does.
+    """
+
+    def __init__(self, resp, decoder):
+        self._resp = resp
+        self._decoder = decoder
+        self._done = False
+        self.wire_bytes = 0
+
+    def read(self, size=READ_CHUNK_SIZE):
+        """
+        Reads the next decompressed chunk, from up to `size` bytes received.
+
+        Returns:
+            bytes: The chunk, of up to `size` bytes, empty at the end of the body.
+        """
+        while self._decoder.unconsumed_tail:
+            data = self._decoder.decompress(b'', size)
+            if data:
+                return data
+        while not self._done:
+            chunk = self._resp.read(size)
+            if not chunk:
+                self._done = True
+                if not self.wire_bytes:
+                    return b''
+                data = self._decoder.flush()
+                if not self._decoder.complete:
+                    raise http.client.IncompleteRead(data)
+                return data
+            self.wire_bytes += len(chunk)
+            data = self._decoder.decompress(chunk, size)
+            if data:
+                return data
+        return b''
+
+    def read_all(self, chunk_size=READ_CHUNK_SIZE):
+        return b''.join(iter(lambda: self.read(chunk_size), b''))
+
+
+class CompressionStats(object):
+    """
+    Counts the bytes of the responses as received and once decompressed, to measure the savings of compression.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._responses = 0
+        self._compressed_responses = 0
+        self._wire_bytes = 0
+        self._decoded_bytes = 0
+
+    def record(self, wire_bytes, decoded_bytes, compressed):
+        with self._lock:
+            self._responses += 1
+            if compressed:
+                self._compressed_responses += 1
+            self._wire_bytes += wire_bytes
+            self._decoded_bytes += decoded_bytes
+
+    @property
+    def stats(self):
+        """
+        Gets the counters.
+
+        Returns:
+            dict: responses, compressed_responses, wire_bytes (received), decoded_bytes (after decompression) and
+            the ratio of wire to decoded bytes.
+        """
+        with self._lock:
+            return {'responses': self._responses,
+                    'compressed_responses': self._compressed_responses,
+                    'wire_bytes': self._wire_bytes,
+                    'decoded_bytes': self._decoded_bytes,
+                    'ratio': self._wire_bytes / self._decoded_bytes if self._decoded_bytes else 1.0}
@@ -46,23 +46,94 @@ __status__ = 'Development'
 # THE SOFTWARE.
 ###
 
+import hashlib
 import http.client
-import json
 import logging
 import shutil  # for shutil.copyfileobj()
-import mmap  # so we can upload the iso without having to load it in memory
 import os
+import socket
 import ssl
+import threading
 import time
 
 from hpOneView.common import uri, get_members, get_member, make_eula_dict, make_initial_password_change_dict
+from hpOneView.compression import ACCEPT_ENCODING, IDENTITY, CompressionStats, DecodingReader, get_content_decoder
+from hpOneView.connection_pool import ConnectionPool, DEFAULT_POOL_SIZE, DEFAULT_POOL_IDLE_TIMEOUT
 from hpOneView.exceptions import HPOneViewException
+from hpOneView.json_codec import JsonCodec, make_json_codec
+from hpOneView.pagination import PageCursor
+from hpOneView.rate_limiter import UNLIMITED
+from hpOneView.retry import IDEMPOTENT_METHODS, RetryPolicy
+from hpOneView.session_store import get_session_key, is_session_of, make_session
+from hpOneView.tracing import NO_OP_TRACER, HTTP_METHOD_ATTRIBUTE, HTTP_STATUS_ATTRIBUTE, URI_ATTRIBUTE
 
 
 logger = logging.getLogger(__name__)
 
+MULTIPART_BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
+MULTIPART_CHUNK_SIZE = 1048576
+CRLF = '\r\n'
+
+DOWNLOAD_CHUNK_SIZE = 1048576
+# Times a download is resumed after losing the connection, before giving up
+DOWNLOAD_MAX_RESUMES = 3
+
+# errorCode of the 401 answered to a request whose session expired, or was ended in the appliance. Other 401
+# errors are raised without logging in again.
+SESSION_EXPIRED_ERROR_CODES = frozenset(['AUTHORIZATION'])
+
+# TLS session resumption requires Python 3.6 or later
+SSL_SESSION_SUPPORTED = hasattr(ssl, 'SSLSession')
+
+
+class _ResumableHTTPSConnection(http.client.HTTPSConnection):
+    """
+    HTTPS connection that resumes the TLS session of a previous connection to the same appliance,
+    so that a reconnection does not need a full handshake.
+    """
+
+    def __init__(self, host, port=None, context=None, session_cache=None):
+        http.client.HTTPSConnection.__init__(self, host, port, context=context)
+        self._session_cache = session_cache
+
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        server_hostname = self._tunnel_host if self._tunnel_host else self.host
+
+        session = self._session_cache.session if self._session_cache is not None else None
+        if session is not None:
+            try:
+                self.sock = self._context.wrap_socket(self.sock, server_hostname=server_hostname, session=session)
+            except ValueError:
+                # The session belongs to another SSL context
+                session = None
+        if session is None:
+            self.sock = self._context.wrap_socket(self.sock, server_hostname=server_hostname)
+
+        if self._session_cache is not None and SSL_SESSION_SUPPORTED:
+            logger.debug('TLS session reused: %s' % self.sock.session_reused)
+            self._session_cache.session = self.sock.session
+
+
+class _TLSSessionCache(object):
+    """
+    Holds the last TLS session negotiated with the appliance.
+    """
+
+    def __init__(self):
+        self.session = None
+
 
 class connection(object):
+    """
+    Connection to an appliance.
+
+    A connection, and the OneViewClient on top of it, can be shared by the threads of a pool once configured: the
+    requests use connections of a pool, the headers are replaced instead of changed, an expired session is replaced
+    by a single thread, and the pages got by each thread are followed by getNextPage and the other page helpers of
+    that thread only. The set_* methods configure the connection, and are not meant to be called while other
+    threads make requests, except set_compression.
+    """
 
     def __init__(self, applianceIp, api_version=200):
         self._session = None
@@ -78,11 +149,27 @@ class connection(object):
         self._doProxy = False
         self._sslTrustedBundle = None
         self._sslTrustAll = True
-        self._nextPage = None
-        self._prevPage = None
-        self._numTotalRecords = 0
-        self._numDisplayedRecords = 0
+        self._headers_lock = threading.Lock()
+        self._page_cursors = threading.local()
         self._validateVersion = False
+        self._page_workers = 1
+        self._resource_cache = None
+        self._retry_policy = RetryPolicy()
+        self._rate_limiter = None
+        self._session_store = None
+        self._json_codec = JsonCodec()
+        self._compression = False
+        self._compression_stats = CompressionStats()
+        self._hooks = ()
+        self._tracer = NO_OP_TRACER
+        self._transport = None
+        self._login_lock = threading.Lock()
+        self._login_stats = {'logins_again': 0, 'failed_logins_again': 0, 'login_again_seconds': 0.0,
+                             'max_login_again_seconds': 0.0}
+        self._ssl_context = None
+        self._ssl_context_lock = threading.Lock()
+        self._tls_session_cache = _TLSSessionCache()
+        self._pool = ConnectionPool(lambda: self.get_connection(), DEFAULT_POOL_SIZE, DEFAULT_POOL_IDLE_TIMEOUT)
 
     def validateVersion(self):
         version = self.get(uri['version'])
@@ -98,10 +185,202 @@ class connection(object):
         self._proxyHost = proxyHost
         self._proxyPort = proxyPort
         self._doProxy = True
+        self.__invalidate_ssl_context()
 
     def set_trusted_ssl_bundle(self, sslBundle):
         self._sslTrustAll = False
         self._sslTrustedBundle = sslBundle
+        self.__invalidate_ssl_context()
+
+    def __invalidate_ssl_context(self):
+        with self._ssl_context_lock:
+            self._ssl_context = None
+            self._tls_session_cache = _TLSSessionCache()
+        # Connections opened before must not be reused with the previous settings
+        self._pool.clear()
+
+    def set_connection_pool(self, size=None, idle_timeout=None):
+        """
+        Configures the pool of persistent connections to the appliance.
+
+        Args:
+            size: Maximum number of idle connections kept open for reuse. 0 disables the pool, so
+                each request uses a new connection.
+            idle_timeout: Seconds an idle connection is kept before it is discarded.
+        """
+        self._pool.configure(maxsize=size, idle_timeout=idle_timeout)
+
+    def set_page_workers(self, workers):
+        """
+        Sets the number of pages of a collection requested concurrently when getting all its items.
+        Once the first page reports the total, the remaining pages are requested in parallel by up to this
+        number of threads. The default, 1, requests one page after the other.
+
+        Args:
+            workers: Number of concurrent page requests.
+        """
+        if workers < 1:
+            raise ValueError('The number of page workers must be at least 1')
+        self._page_workers = workers
+
+    def get_page_workers(self):
+        return self._page_workers
+
+    def set_resource_cache(self, cache):
+        """
+        Sets the cache used by the resource clients of this connection to read resources.
+
+        Args:
+            cache: ResourceCache, or None to disable the cache (default).
+        """
+        self._resource_cache = cache
+
+    def get_resource_cache(self):
+        return self._resource_cache
+
+    def set_retry_policy(self, policy):
+        """
+        Sets the policy to retry the requests that fail with a connection error or a transient status.
+
+        Args:
+            policy: RetryPolicy, or None to disable the retries. By default, idempotent requests are retried up to
+                3 times, with an exponential back-off.
+        """
+        self._retry_policy = policy
+
+    def get_retry_policy(self):
+        return self._retry_policy
+
+    def set_rate_limiter(self, rate_limiter):
+        """
+        Sets the limits of the rate and concurrency of the requests to the appliance, shared by all the clients of
+        this connection.
+
+        Args:
+            rate_limiter: RateLimiter, or None to send the requests without limits (default).
+        """
+        self._rate_limiter = rate_limiter
+
+    def get_rate_limiter(self):
+        return self._rate_limiter
+
+    def set_json_codec(self, codec):
+        """
+        Sets the codec of the JSON bodies of the requests and responses. Responses are decoded straight from their
+        bytes.
+
+        Args:
+            codec: JsonCodec, or the name of a codec from hpOneView.json_codec: 'stdlib' (default), 'orjson', 'ujson',
+                or 'auto' for the fastest one installed.
+        """
+        self._json_codec = make_json_codec(codec)
+
+    def get_json_codec(self):
+        return self._json_codec
+
+    def set_compression(self, enabled):
+        """
+        Enables the compression of the responses. The appliance is asked for gzip or deflate encoded responses, which
+        are decompressed as they are received, including the downloads.
+
+        Args:
+            enabled: True to accept compressed responses, False to receive them uncompressed (default).
+        """
+        self._compression = enabled
+        self._set_header('Accept-Encoding', ACCEPT_ENCODING if enabled else None)
+
+    def get_compression(self):
+        return self._compression
+
+    def get_compression_stats(self):
+        """
+        Gets the bytes of the responses received while compression is enabled, before and after decompression.
+
+        Returns:
+            dict: responses, compressed_responses, wire_bytes, decoded_bytes and their ratio.
+        """
+        return self._compression_stats.stats
+
+    def add_hooks(self, hooks):
+        """
+        Adds callbacks called around the requests, such as a hpOneView.metrics.MetricsCollector.
+
+        Args:
+            hooks: hpOneView.hooks.RequestHooks
+        """
+        self._hooks = self._hooks + (hooks,)
+
+    def remove_hooks(self, hooks):
+        self._hooks = tuple(added for added in self._hooks if added is not hooks)
+
+    def get_hooks(self):
+        return self._hooks
+
+    def set_tracer(self, tracer):
+        """
+        Sets the tracer of the operations of the resource clients, of their requests, pages and task polls.
+
+        Args:
+            tracer: hpOneView.tracing.Tracer, such as a RecordingTracer or an OpenTelemetryTracer. None disables the
+                tracing.
+        """
+        self._tracer = tracer or NO_OP_TRACER
+
+    def get_tracer(self):
+        return self._tracer
+
+    def set_transport(self, transport):
+        """
+        Sets a transport that sends the requests in place of the connection, to record them or to replay them
+        without a network. Multipart uploads and downloads are not sent through it.
+
+        Args:
+            transport: hpOneView.recording.TransportRecorder or TransportReplayer. None sends the requests to the
+                appliance.
+        """
+        self._transport = transport
+
+    def get_transport(self):
+        return self._transport
+
+    def _notify_hooks(self, callback, *args):
+        """
+        Calls a callback of the hooks of the connection, logging their errors.
+        """
+        for hooks in self._hooks:
+            try:
+                getattr(hooks, callback)(*args)
+            except Exception:
+                logger.exception('Request hook %s failed' % callback)
+
+    def set_session_store(self, store):
+        """
+        Sets the store of the login sessions. On login, a session of the same user kept in the store is reused, without
+        validating the API version or creating a new session; the first request checks it, and the connection logs
+        in again if it expired. New sessions are kept in the store, and removed from it on logout.
+
+        Args:
+            store: SessionStore, such as a FileSessionStore to reuse the sessions across processes, or None to log in
+                on every login (default).
+        """
+        self._session_store = store
+
+    def get_session_store(self):
+        return self._session_store
+
+    def _limit(self, method, path):
+        """
+        Gets the context manager that enforces the rate limiter, if any, around a request.
+        """
+        if self._rate_limiter is None:
+            return UNLIMITED
+        return self._rate_limiter.limit(method, path)
+
+    def close_connections(self):
+        """
+        Closes the idle connections kept in the pool.
+        """
+        self._pool.clear()
 
     def get_session(self):
         return self._session
@@ -118,62 +397,220 @@ class connection(object):
     def make_url(self, path):
         return 'https://%s%s' % (self._host, path)
 
+    def _set_header(self, name, value):
+        """
+        Sets a header of the requests, or removes it when the value is None. The headers are replaced instead of
+        changed, so the requests in progress in other threads keep a consistent copy.
+        """
+        with self._headers_lock:
+            headers = dict(self._headers)
+            if value is None:
+                headers.pop(name, None)
+            else:
+                headers[name] = value
+            self._headers = headers
+
     def do_http(self, method, path, body, custom_headers=None):
-        http_headers = self._headers.copy()
+        headers = self._headers
+        auth = headers.get('auth')
+        resp, response_body = self.__do_http(method, path, body, headers, custom_headers)
+        if resp.status == 401 and self.__can_login_again(auth, path, response_body):
+            self.__login_again(auth)
+            resp, response_body = self.__do_http(method, path, body, self._headers, custom_headers)
+        return resp, response_body
+
+    def __do_http(self, method, path, body, headers, custom_headers):
+        http_headers = headers.copy()
         if custom_headers:
             http_headers.update(custom_headers)
 
-        bConnected = False
-        while bConnected is False:
+        policy = self._retry_policy
+        attempts = policy.begin() if policy else None
+        while True:
             try:
-                conn = self.get_connection()
-                conn.request(method, path, body, http_headers)
-                resp = conn.getresponse()
+                resp, tempbytes = self.__send_traced(method, path, body, http_headers)
+            except (http.client.HTTPException, socket.error) as e:
+                delay = policy.get_retry_delay(attempts, method, path, error=e) if policy else None
+                if delay is None:
+                    raise
+                self.__wait_retry(method, path, attempts, type(e).__name__, delay)
+                continue
+
+            if policy and resp.status in policy.statuses:
+                delay = policy.get_retry_delay(attempts, method, path, status=resp.status,
+                                               retry_after=resp.getheader('Retry-After'))
+                if delay is not None:
+                    self.__wait_retry(method, path, attempts, str(resp.status), delay)
+                    continue
+            return resp, self.__decode_body(tempbytes, body)
+
+    def __wait_retry(self, method, path, attempts, reason, delay):
+        if self._hooks:
+            # The policy already counted the failed attempt
+            self._notify_hooks('on_retry', method, path, attempts.count - 1, reason, delay)
+        time.sleep(delay)
+
+    def __send_traced(self, method, path, body, http_headers):
+        if not self._tracer.enabled:
+            return self.__send_with_hooks(method, path, body, http_headers)
+
+        attributes = {HTTP_METHOD_ATTRIBUTE: method, URI_ATTRIBUTE: path}
+        with self._tracer.start_span('HTTP ' + method, attributes) as span:
+            resp, tempbytes = self.__send_with_hooks(method, path, body, http_headers)
+            span.set_attribute(HTTP_STATUS_ATTRIBUTE, resp.status)
+            return resp, tempbytes
+
+    def __send_with_hooks(self, method, path, body, http_headers):
+        if not self._hooks:
+            return self.__send(method, path, body, http_headers)
+
+        self._notify_hooks('before_request', method, path, http_headers)
+        start = time.time()
+        try:
+            resp, tempbytes = self.__send(method, path, body, http_headers)
+        except Exception as e:
+            self._notify_hooks('on_error', method, path, e, time.time() - start)
+            raise
+        request_bytes = len(body.encode('utf-8') if isinstance(body, str) else body or b'')
+        self._notify_hooks('after_response', method, path, resp.status, time.time() - start, request_bytes,
+                           len(tempbytes))
+        return resp, tempbytes
+
+    def __can_login_again(self, auth, path, response_body):
+        """
+        Checks if a request rejected with 401 can be sent again with a new session: the session expired, or was
+        ended in the appliance, and the credentials of the login are known. The requests of the login itself are
+        not sent again, since the login waits for them while holding the login lock.
+        """
+        if self._cred is None or auth is None:
+            return False
+        if path.startswith(uri['loginSessions']) or path.startswith(uri['version']):
+            return False
+        return isinstance(response_body, dict) and response_body.get('errorCode') in SESSION_EXPIRED_ERROR_CODES
+
+    def __login_again(self, expired_auth):
+        """
+        Replaces an expired session. Only one thread logs in; the requests rejected at the same time wait for it,
+        and are sent again with the new session.
+        """
+        with self._login_lock:
+            if self._headers.get('auth') != expired_auth:
+                # Another thread already logged in again
+                return
+            logger.info('Session expired, logging in again')
+            start = time.time()
+            try:
+                self.__login(self._cred)
+            except HPOneViewException:
+                self._login_stats['failed_logins_again'] += 1
+                raise
+            finally:
+                elapsed = time.time() - start
+                self._login_stats['login_again_seconds'] += elapsed
+                self._login_stats['max_login_again_seconds'] = max(self._login_stats['max_login_again_seconds'],
+                                                                   elapsed)
+            self._login_stats['logins_again'] += 1
+
+    def get_login_stats(self):
+        """
+        Gets the counters of the logins after a session expired.
+
+        Returns:
+            dict: logins_again, failed_logins_again, and the total and maximum time spent logging in again, in
+            login_again_seconds and max_login_again_seconds.
+        """
+        with self._login_lock:
+            return dict(self._login_stats)
+
+    def __send(self, method, path, body, http_headers):
+        if self._transport is not None:
+            return self._transport.send(self.__send_request, method, path, body, http_headers)
+        return self.__send_request(method, path, body, http_headers)
+
+    def __send_request(self, method, path, body, http_headers):
+        while True:
+            with self._limit(method, path):
+                conn, reused = self._acquire_connection()
                 try:
-                    tempbytes = resp.read()
-                    tempbody = tempbytes.decode('utf-8')
-                except UnicodeDecodeError:  # Might be binary data
-                    tempbody = tempbytes
+                    conn.request(method, path, body, http_headers)
+                    resp = conn.getresponse()
+                    tempbytes = self.__read_response(resp)
+                except (http.client.HTTPException, socket.error):
                     conn.close()
-                    bConnected = True
-                    return resp, tempbody
-                if tempbody:
-                    try:
-                        body = json.loads(tempbody)
-                    except ValueError:
-                        body = tempbody
-                conn.close()
-                bConnected = True
-            except http.client.BadStatusLine:
-                print('Bad Status Line. Trying again...')
-                conn.close()
-                time.sleep(1)
-                continue
-        return resp, body
+                    if reused and method in IDEMPOTENT_METHODS:
+                        # The server closed the kept-alive connection, try again with a new one. Other methods may
+                        # have been processed already: the retry policy decides whether they are sent again.
+                        logger.debug('Reused connection failed, trying again with a new one')
+                        continue
+                    raise
+            self._release_connection(conn)
+            return resp, tempbytes
+
+    def __read_response(self, resp):
+        if not self._compression:
+            return resp.read()
+        decoder = get_content_decoder(resp.getheader('Content-Encoding'))
+        if decoder is None:
+            tempbytes = resp.read()
+            self._compression_stats.record(len(tempbytes), len(tempbytes), False)
+            return tempbytes
+        reader = DecodingReader(resp, decoder)
+        tempbytes = reader.read_all()
+        self._compression_stats.record(reader.wire_bytes, len(tempbytes), True)
+        return tempbytes
+
+    def __decode_body(self, tempbytes, body):
+        if not tempbytes:
+            return body
+        try:
+            # Decoded from the bytes, without an intermediate str
+            return self._json_codec.loads(tempbytes)
+        except ValueError:
+            pass
+        try:
+            return tempbytes.decode('utf-8')
+        except UnicodeDecodeError:  # Might be binary data
+            return tempbytes
+
+    def _pool_key(self):
+        if self._doProxy:
+            return self._host, self._proxyHost, self._proxyPort
+        return self._host, None, None
+
+    def _acquire_connection(self):
+        return self._pool.acquire(self._pool_key())
+
+    def _release_connection(self, conn):
+        self._pool.release(self._pool_key(), conn)
+
+    def get_ssl_context(self):
+        """
+        Gets the SSL context used by the connections to the appliance. It is built once, loading the trusted
+        SSL bundle when one was set, and reused until the SSL or proxy settings change.
+        """
+        with self._ssl_context_lock:
+            if self._ssl_context is None:
+                context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+                if self._sslTrustAll is False:
+                    context.verify_mode = ssl.CERT_REQUIRED
+                    context.load_verify_locations(self._sslTrustedBundle)
+                else:
+                    context.verify_mode = ssl.CERT_NONE
+                self._ssl_context = context
+            return self._ssl_context
 
     def get_connection(self):
-        context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-        if self._sslTrustAll is False:
-            context.verify_mode = ssl.CERT_REQUIRED
-            context.load_verify_locations(self._sslTrustedBundle)
-            if self._doProxy is False:
-                conn = http.client.HTTPSConnection(self._host,
-                                                   context=context)
-            else:
-                conn = http.client.HTTPSConnection(self._proxyHost,
-                                                   self._proxyPort,
-                                                   context=context)
-                conn.set_tunnel(self._host, 443)
+        context = self.get_ssl_context()
+        if self._doProxy is False:
+            conn = _ResumableHTTPSConnection(self._host,
+                                             context=context,
+                                             session_cache=self._tls_session_cache)
         else:
-            context.verify_mode = ssl.CERT_NONE
-            if self._doProxy is False:
-                conn = http.client.HTTPSConnection(self._host,
-                                                   context=context)
-            else:
-                conn = http.client.HTTPSConnection(self._proxyHost,
-                                                   self._proxyPort,
-                                                   context=context)
-                conn.set_tunnel(self._host, 443)
+            conn = _ResumableHTTPSConnection(self._proxyHost,
+                                             self._proxyPort,
+                                             context=context,
+                                             session_cache=self._tls_session_cache)
+            conn.set_tunnel(self._host, 443)
         return conn
 
     def encode_multipart_formdata(self, fields, files, baseName, verbose=False):
@@ -182,67 +619,207 @@ class connection(object):
         files is a sequence of (name, filename, value) elements for data
         to be uploaded as files
         Return (content_type, body) ready for httplib.HTTP instance
+
+        Writes the encoded body to <files>.b64. post_multipart no longer needs this copy, it streams the file.
         """
-        BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
-        CRLF = '\r\n'
-        content_type = 'multipart/form-data; boundary=%s' % BOUNDARY
+        content_type, preamble, epilogue = self.__get_multipart_parts(baseName)
         if verbose is True:
             print(('Encoding ' + baseName + ' for upload...'))
-        fin = open(files, 'rb')
-        fout = open(files + '.b64', 'wb')
-        fout.write(bytearray('--' + BOUNDARY + CRLF, 'utf-8'))
-        fout.write(bytearray('Content-Disposition: form-data'
-                             '; name="file"; filename="' +
-                             baseName + '"' + CRLF, "utf-8"))
-        fout.write(bytearray('Content-Type: application/octet-stream' + CRLF,
-                             'utf-8'))
-        fout.write(bytearray(CRLF, 'utf-8'))
-        shutil.copyfileobj(fin, fout)
-        fout.write(bytearray(CRLF, 'utf-8'))
-        fout.write(bytearray('--' + BOUNDARY + '--' + CRLF, 'utf-8'))
-        fout.write(bytearray(CRLF, 'utf-8'))
-        fout.close()
-        fin.close()
+        with open(files, 'rb') as fin, open(files + '.b64', 'wb') as fout:
+            fout.write(preamble)
+            shutil.copyfileobj(fin, fout)
+            fout.write(epilogue)
         return content_type
 
-    def post_multipart(self, uri, fields, files, baseName, verbose=False):
-        content_type = self.encode_multipart_formdata(fields, files, baseName,
-                                                      verbose)
-        inputfile = open(files + '.b64', 'rb')
-        mappedfile = mmap.mmap(inputfile.fileno(), 0, access=mmap.ACCESS_READ)
+    @staticmethod
+    def __get_multipart_parts(baseName):
+        """
+        Gets the content type of a multipart upload, with the bytes sent before and after the file content.
+        """
+        content_type = 'multipart/form-data; boundary=%s' % MULTIPART_BOUNDARY
+        preamble = ('--{0}{1}Content-Disposition: form-data; name="file"; filename="{2}"{1}'
+                    'Content-Type: application/octet-stream{1}{1}').format(MULTIPART_BOUNDARY, CRLF, baseName)
+        epilogue = '{1}--{0}--{1}{1}'.format(MULTIPART_BOUNDARY, CRLF)
+        return content_type, preamble.encode('utf-8'), epilogue.encode('utf-8')
+
+    def post_multipart(self, uri, fields, files, baseName, verbose=False, progress_callback=None):
+        """
+        Uploads a file as multipart/form-data. The file is streamed from disk in chunks of MULTIPART_CHUNK_SIZE bytes,
+        between the multipart preamble and epilogue; the Content-Length is computed up front.
+
+        Args:
+            uri: Upload uri.
+            fields: Not used.
+            files: Path of the file to upload.
+            baseName: File name sent to the appliance.
+            verbose: Prints the progress.
+            progress_callback: Function called after each chunk with the bytes sent, the total bytes and the average
+                upload rate in bytes per second.
+
+        Returns:
+            tuple: response, body
+        """
+        content_type, preamble, epilogue = self.__get_multipart_parts(baseName)
+        totalSize = len(preamble) + os.path.getsize(files) + len(epilogue)
         if verbose is True:
             print(('Uploading ' + files + '...'))
-        conn = self.get_connection()
-        # conn.set_debuglevel(1)
-        conn.connect()
-        conn.putrequest('POST', uri)
-        conn.putheader('uploadfilename', baseName)
-        conn.putheader('auth', self._headers['auth'])
-        conn.putheader('Content-Type', content_type)
-        totalSize = os.path.getsize(files + '.b64')
-        conn.putheader('Content-Length', totalSize)
-        conn.putheader('X-API-Version', self._apiVersion)
-        conn.endheaders()
-        while mappedfile.tell() < mappedfile.size():
-            # Send 1MB at a time
-            # NOTE: Be careful raising this value as the read chunk
-            # is stored in RAM
-            readSize = 1048576
-            conn.send(mappedfile.read(readSize))
-            if verbose is True:
-                print('%d bytes sent... \r' % mappedfile.tell())
-        mappedfile.close()
-        inputfile.close()
-        os.remove(files + '.b64')
-        response = conn.getresponse()
-        body = response.read().decode('utf-8')
-        if body:
+        with self._limit('POST', uri):
+            conn = self.get_connection()
             try:
-                body = json.loads(body)
-            except ValueError:
-                body = response.read().decode('utf-8')
-        conn.close()
-        return response, body
+                conn.connect()
+                conn.putrequest('POST', uri)
+                conn.putheader('uploadfilename', baseName)
+                conn.putheader('auth', self._headers['auth'])
+                conn.putheader('Content-Type', content_type)
+                conn.putheader('Content-Length', totalSize)
+                conn.putheader('X-API-Version', self._apiVersion)
+                conn.endheaders()
+                with open(files, 'rb') as inputfile:
+                    self.__send_multipart(conn, preamble, inputfile, epilogue, totalSize, verbose, progress_callback)
+                response = conn.getresponse()
+                tempbytes = response.read()
+            finally:
+                conn.close()
+        return response, self.__decode_body(tempbytes, '')
+
+    @staticmethod
+    def __send_multipart(conn, preamble, inputfile, epilogue, totalSize, verbose, progress_callback):
+        start_time = time.time()
+        # A single buffer is reused for all the chunks
+        # NOTE: Be careful raising the chunk size as the buffer is stored in RAM
+        buf = bytearray(MULTIPART_CHUNK_SIZE)
+        view = memoryview(buf)
+        conn.send(preamble)
+        sent = len(preamble)
+        while True:
+            size = inputfile.readinto(buf)
+            if not size:
+                break
+            conn.send(view[:size])
+            sent += size
+            if verbose is True:
+                print('%d bytes sent... \r' % sent)
+            if progress_callback:
+                connection.__report_progress(progress_callback, sent, totalSize, start_time)
+        conn.send(epilogue)
+        if progress_callback:
+            connection.__report_progress(progress_callback, totalSize, totalSize, start_time)
+
+    @staticmethod
+    def __report_progress(progress_callback, sent, totalSize, start_time):
+        elapsed = time.time() - start_time
+        progress_callback(sent, totalSize, sent / elapsed if elapsed > 0 else 0.0)
+
+    def download(self, uri, file_path, progress_callback=None, checksum='sha256', chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """
+        Downloads the response of a GET request to a file, written in chunks of chunk_size bytes as they are
+        received, so the response is never held in memory.
+
+        The response is written to <file_path>.part, renamed to file_path once complete. When the connection is
+        lost, the download is resumed from the bytes already written with a Range request, up to
+        DOWNLOAD_MAX_RESUMES times; a .part file left by a previous call is resumed the same way. When the
+        appliance does not honor the Range header, the download starts over.
+
+        Args:
+            uri: Download uri.
+            file_path: Path of the file to write.
+            progress_callback: Function called after each chunk with the bytes received, the total bytes (None when
+                the appliance does not send the size) and the average download rate in bytes per second.
+            checksum: Name of the hashlib algorithm used to compute the checksum of the file.
+            chunk_size: Size of the chunks read from the response.
+
+        Returns:
+            str: Hex digest of the file content.
+        """
+        part_path = file_path + '.part'
+        resumes = 0
+        with open(part_path, 'ab+') as output:
+            digest = self.__hash_file(output, checksum, chunk_size)
+            while True:
+                try:
+                    with self._limit('GET', uri):
+                        digest = self.__download_range(uri, output, digest, chunk_size, progress_callback)
+                    break
+                except (http.client.HTTPException, socket.error):
+                    output.flush()
+                    if resumes >= DOWNLOAD_MAX_RESUMES:
+                        raise
+                    resumes += 1
+                    logger.debug('Download of %s interrupted at %d bytes, resuming' % (uri, output.tell()))
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        os.rename(part_path, file_path)
+        return digest.hexdigest()
+
+    @staticmethod
+    def __hash_file(output, checksum, chunk_size):
+        digest = hashlib.new(checksum)
+        output.seek(0)
+        for chunk in iter(lambda: output.read(chunk_size), b''):
+            digest.update(chunk)
+        return digest
+
+    def __download_range(self, uri, output, digest, chunk_size, progress_callback):
+        offset = output.tell()
+        conn, resp = self.__open_download(uri, offset)
+        try:
+            if offset and resp.status != 206:
+                logger.debug('Range not honored, downloading %s from the start' % uri)
+                output.seek(0)
+                output.truncate()
+                digest = hashlib.new(digest.name)
+                offset = 0
+            decoder = get_content_decoder(resp.getheader('Content-Encoding')) if self._compression else None
+            reader = DecodingReader(resp, decoder) if decoder else resp
+            length = resp.getheader('Content-Length')
+            # The length of a compressed body is not the size of the file
+            total = offset + int(length) if length is not None and not decoder else None
+            received = offset
+            start_time = time.time()
+            for chunk in iter(lambda: reader.read(chunk_size), b''):
+                output.write(chunk)
+                digest.update(chunk)
+                received += len(chunk)
+                if progress_callback:
+                    elapsed = time.time() - start_time
+                    progress_callback(received, total, (received - offset) / elapsed if elapsed > 0 else 0.0)
+            if total is not None and received < total:
+                raise http.client.IncompleteRead(b'', total - received)
+            if self._compression:
+                self._compression_stats.record(reader.wire_bytes if decoder else received - offset, received - offset,
+                                               bool(decoder))
+        except BaseException:
+            conn.close()
+            raise
+        self._release_connection(conn)
+        return digest
+
+    def __open_download(self, uri, offset):
+        headers = self._headers.copy()
+        if offset:
+            headers['Range'] = 'bytes=%d-' % offset
+            if self._compression:
+                # The range is resumed from the size of the decompressed file
+                headers['Accept-Encoding'] = IDENTITY
+        conn, reused = self._acquire_connection()
+        try:
+            conn.request('GET', uri, '', headers)
+            resp = conn.getresponse()
+            if resp.status == 302 or resp.status >= 400:
+                body = self.__decode_body(resp.read(), '')
+        except BaseException:
+            conn.close()
+            raise
+        if resp.status == 416 and offset:
+            # The .part file does not match the resource anymore
+            self._release_connection(conn)
+            return self.__open_download(uri, 0)
+        if resp.status == 302 or resp.status >= 400:
+            self._release_connection(conn)
+            if resp.status == 302:
+                return self.__open_download(resp.getheader('Location'), offset)
+            raise HPOneViewException(body)
+        return conn, resp
 
     ###########################################################################
     # Utility functions for making requests - the HTTP verbs
@@ -254,33 +831,33 @@ class connection(object):
         if resp.status == 302:
             body = self.get(resp.getheader('Location'))
         if type(body) is dict:
-            if 'nextPageUri' in body:
-                self._nextPage = body['nextPageUri']
-            if 'prevPageUri' in body:
-                self._prevPage = body['prevPageUri']
-            if 'total' in body:
-                self._numTotalRecords = body['total']
-            if 'count' in body:
-                self._numDisplayedRecords = body['count']
+            self.get_page_cursor().update(body)
         return body
 
+    def get_page_cursor(self):
+        """
+        Gets the cursor of the pages got by the calling thread, used by getNextPage, getPrevPage, getLastPage and
+        getFirstPage.
+
+        Returns:
+            hpOneView.pagination.PageCursor
+        """
+        cursor = getattr(self._page_cursors, 'cursor', None)
+        if cursor is None:
+            cursor = self._page_cursors.cursor = PageCursor(self)
+        return cursor
+
     def getNextPage(self):
-        body = self.get(self._nextPage)
-        return get_members(body)
+        return self.get_page_cursor().get_next_page()
 
     def getPrevPage(self):
-        body = self.get(self._prevPage)
-        return get_members(body)
+        return self.get_page_cursor().get_prev_page()
 
     def getLastPage(self):
-        while self._nextPage is not None:
-            members = self.getNextPage()
-        return members
+        return self.get_page_cursor().get_last_page()
 
     def getFirstPage(self):
-        while self._prevPage is not None:
-            members = self.getPrevPage()
-        return members
+        return self.get_page_cursor().get_first_page()
 
     def delete(self, uri, custom_headers=None):
         return self.__do_rest_call('DELETE', uri, '', custom_headers=custom_headers)
@@ -346,7 +923,7 @@ class connection(object):
     def __do_rest_call(self, http_method, uri, body, custom_headers):
         resp, body = self.do_http(method=http_method,
                                   path=uri,
-                                  body=json.dumps(body),
+                                  body=self._json_codec.dumps(body),
                                   custom_headers=custom_headers)
         if resp.status >= 400:
             raise HPOneViewException(body)
@@ -379,21 +956,43 @@ class connection(object):
     # Login/Logout to/from appliance
     ###########################################################################
     def login(self, cred, verbose=False):
+        self._cred = cred
+        session = self.__get_stored_session(cred)
+        if session:
+            if self._validateVersion is False:
+                self.validateVersion()
+            self._set_header('auth', session['sessionID'])
+            self._session = True
+            logger.info('Reusing the stored session')
+        else:
+            self.__login(cred)
+        if verbose is True:
+            print(('Session Key: ' + self._headers['auth']))
+
+    def __get_stored_session(self, cred):
+        if self._session_store is None:
+            return None
+        session = self._session_store.get(get_session_key(self._host, cred))
+        if session and session.get('sessionID') and session.get('apiVersion') == self._apiVersion \
+                and is_session_of(session, cred):
+            return session
+        return None
+
+    def __login(self, cred):
         if self._validateVersion is False:
             self.validateVersion()
 
-        self._cred = cred
         try:
-            task, body = self.post(uri['loginSessions'], self._cred)
+            task, body = self.post(uri['loginSessions'], cred)
         except HPOneViewException:
             logger.exception('Login failed')
             raise
         auth = body['sessionID']
         # Add the auth ID to the headers dictionary
-        self._headers['auth'] = auth
+        self._set_header('auth', auth)
         self._session = True
-        if verbose is True:
-            print(('Session Key: ' + auth))
+        if self._session_store is not None:
+            self._session_store.set(get_session_key(self._host, cred), make_session(cred, auth, self._apiVersion))
         logger.info('Logged in successfully')
 
     def logout(self, verbose=False):
@@ -406,7 +1005,9 @@ class connection(object):
             raise
         if verbose is True:
             print('Logged Out')
-        del self._headers['auth']
+        self._set_header('auth', None)
         self._session = False
+        if self._session_store is not None and self._cred is not None:
+            self._session_store.delete(get_session_key(self._host, self._cred))
         logger.info('Logged out successfully')
         return None
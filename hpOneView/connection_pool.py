@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+connection_pool.py
+~~~~~~~~~~~~
+
+This module keeps persistent HTTPS connections to the appliance so they can be reused across requests
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'connection_pool'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import logging
+import select
+import socket
+import threading
+import time
+from collections import deque
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_POOL_IDLE_TIMEOUT = 60
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool(object):
+    """
+    Thread-safe pool of idle HTTP connections, grouped by key.
+
+    At most `maxsize` idle connections are kept for each key; connections released beyond that
+    are closed. A connection idle for longer than `idle_timeout` seconds, or whose socket was closed
+    by the peer, is discarded when acquired and a new one is created in its place.
+    A `maxsize` of 0 disables pooling: every released connection is closed.
+    """
+
+    def __init__(self, factory, maxsize=DEFAULT_POOL_SIZE, idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT):
+        """
+        Args:
+            factory: Callable that receives no arguments and returns a new, not yet connected, connection.
+            maxsize: Maximum number of idle connections kept per key.
+            idle_timeout: Seconds a connection may stay idle before being discarded.
+        """
+        self._factory = factory
+        self._maxsize = maxsize
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle = {}
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @property
+    def idle_timeout(self):
+        return self._idle_timeout
+
+    def configure(self, maxsize=None, idle_timeout=None):
+        """
+        Changes the pool limits. Idle connections exceeding the new size are closed.
+        """
+        with self._lock:
+            if maxsize is not None:
+                self._maxsize = maxsize
+            if idle_timeout is not None:
+                self._idle_timeout = idle_timeout
+            for idle in self._idle.values():
+                while len(idle) > self._maxsize:
+                    conn, _ = idle.popleft()
+                    conn.close()
+
+    def acquire(self, key):
+        """
+        Gets a connection for the given key, reusing an idle one when it is still alive.
+
+        Returns:
+            tuple: connection, True when the connection was reused from the pool
+        """
+        now = time.time()
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    break
+                conn, released_at = idle.pop()
+
+            if now - released_at > self._idle_timeout:
+                logger.debug('Discarding connection idle for more than %s seconds' % self._idle_timeout)
+                conn.close()
+            elif self.__is_dropped(conn):
+                logger.debug('Discarding connection closed by the peer')
+                conn.close()
+            else:
+                return conn, True
+
+        return self._factory(), False
+
+    def release(self, key, conn):
+        """
+        Returns a connection to the pool. The response must have been fully read.
+        Connections without an open socket are not kept.
+        """
+        if getattr(conn, 'sock', None) is None:
+            conn.close()
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self._maxsize:
+                idle.append((conn, time.time()))
+                return
+
+        conn.close()
+
+    def clear(self):
+        """
+        Closes all idle connections.
+        """
+        with self._lock:
+            idle_lists = list(self._idle.values())
+            self._idle = {}
+
+        for idle in idle_lists:
+            for conn, _ in idle:
+                conn.close()
+
+    def size(self, key=None):
+        """
+        Gets the number of idle connections, for a key or for the whole pool.
+        """
+        with self._lock:
+            if key is not None:
+                return len(self._idle.get(key, ()))
+            return sum(len(idle) for idle in self._idle.values())
+
+    @staticmethod
+    def __is_dropped(conn):
+        # An idle connection must not have anything to read: when its socket is readable,
+        # the server has closed it (EOF) or sent data we cannot use.
+        sock = getattr(conn, 'sock', None)
+        if sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (ValueError, socket.error):
+            return True
+        return bool(readable)
@@ -58,9 +58,28 @@ class HPOneViewTaskError(HPOneViewException):
     pass
 
 
+class HPOneViewMultipleTaskErrors(HPOneViewTaskError):
+    """
+    Raised when waiting for several tasks and at least one of them fails.
+
+    Attributes:
+        results: The result of each task, in the order of the tasks; None for the failed ones.
+        errors: The error of each task, in the order of the tasks; None for the successful ones.
+    """
+
+    def __init__(self, msg, results, errors):
+        HPOneViewTaskError.__init__(self, msg)
+        self.results = results
+        self.errors = errors
+
+
 class HPOneViewUnknownType(HPOneViewException):
     pass
 
 
 class HPOneViewTimeout(HPOneViewException):
     pass
+
+
+class HPOneViewReplayError(HPOneViewException):
+    pass
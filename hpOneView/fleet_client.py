@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+fleet_client.py
+~~~~~~~~~~~~
+
+This module implements a client for many HPE OneView appliances, querying all of them in parallel
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'FleetClient'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import json
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from hpOneView.oneview_client import OneViewClient
+
+# Key added to each resource returned by the fleet, with the address of its appliance
+APPLIANCE_KEY = 'applianceIp'
+MAX_FLEET_WORKERS = 32
+
+FLEET_CLIENT_NO_APPLIANCES = 'At least one appliance configuration is required'
+FLEET_CLIENT_DUPLICATED_APPLIANCE = 'Duplicated appliance: %s'
+FLEET_CLIENT_TIMEOUT = 'The appliance did not answer in %s seconds'
+
+logger = logging.getLogger(__name__)
+
+
+class FleetTimeout(Exception):
+    """
+    The appliance did not answer before the timeout of the fleet.
+    """
+
+
+class FleetResult(list):
+    """
+    Merged results of a query to all the appliances of a fleet.
+
+    The list has copies of the resources returned by all the appliances, each one tagged with the address of its
+    appliance in APPLIANCE_KEY. Queries that fail in an appliance do not abort the others: their exceptions are in
+    `errors`.
+
+    Attributes:
+        results: OrderedDict with the value returned by each appliance that answered, by appliance address.
+        errors: OrderedDict with the exception raised by each appliance that failed, by appliance address.
+    """
+
+    def __init__(self, results, errors):
+        super(FleetResult, self).__init__()
+        self.results = results
+        self.errors = errors
+        for appliance, result in results.items():
+            for resource in (result if isinstance(result, list) else [result]):
+                if isinstance(resource, dict):
+                    # The resources returned can be the objects of a resource cache, they are not modified
+                    resource = dict(resource)
+                    resource[APPLIANCE_KEY] = appliance
+                    self.append(resource)
+
+    @property
+    def partial(self):
+        """
+        True when at least one appliance failed.
+        """
+        return bool(self.errors)
+
+
+class FleetResource(object):
+    """
+    A resource of all the appliances of a fleet. Calling any method of the resource client, such as get_all or
+    get_by, calls it in every appliance in parallel, and returns a FleetResult.
+    """
+
+    def __init__(self, fleet, name):
+        self._fleet = fleet
+        self._name = name
+
+    def __getattr__(self, method_name):
+        if method_name.startswith('_'):
+            raise AttributeError(method_name)
+
+        def fan_out(*args, **kwargs):
+            return self._fleet.call(lambda client: getattr(getattr(client, self._name), method_name)(*args, **kwargs))
+
+        fan_out.__name__ = str(method_name)
+        return fan_out
+
+
+class FleetClient(object):
+    """
+    Client for many appliances, with the resource properties of OneViewClient. The appliances are logged in
+    concurrently; the ones that fail to log in are reported in `login_errors`, and as errors of every query.
+
+    Example:
+        with FleetClient.from_json_file('fleet.json') as fleet:
+            servers = fleet.server_hardware.get_all(filter="powerState='On'")
+            for server in servers:
+                print(server[APPLIANCE_KEY], server['name'])
+            for appliance, error in servers.errors.items():
+                print('%s failed: %s' % (appliance, error))
+    """
+
+    def __init__(self, configs, max_workers=None, timeout=None):
+        """
+        Args:
+            configs: List of OneViewClient configurations, one per appliance.
+            max_workers: Maximum number of appliances queried at the same time. Defaults to the number of appliances,
+                up to MAX_FLEET_WORKERS.
+            timeout: Seconds to wait for the appliances on each query. The ones that do not answer in time are
+                reported as FleetTimeout errors. None waits for all of them.
+        """
+        if not configs:
+            raise ValueError(FLEET_CLIENT_NO_APPLIANCES)
+        self.__configs = OrderedDict()
+        for config in configs:
+            if config['ip'] in self.__configs:
+                raise ValueError(FLEET_CLIENT_DUPLICATED_APPLIANCE % config['ip'])
+            self.__configs[config['ip']] = config
+
+        self.__timeout = timeout
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers or min(len(configs), MAX_FLEET_WORKERS))
+        self.__clients = OrderedDict()
+        self.__login_errors = OrderedDict()
+        self.__resources = {}
+
+        results = self.__run(OrderedDict((ip, self.__executor.submit(OneViewClient, config))
+                                         for ip, config in self.__configs.items()))
+        self.__clients.update(results.results)
+        self.__login_errors.update(results.errors)
+        for appliance, error in self.__login_errors.items():
+            logger.warning('Login to appliance %s failed: %s' % (appliance, error))
+
+    @classmethod
+    def from_json_file(cls, file_name, **kwargs):
+        """
+        Construct FleetClient using a json file with a list of OneViewClient configurations
+
+        Args:
+            file_name: json full path
+
+        Returns: FleetClient
+        """
+        with open(file_name) as json_data:
+            configs = json.load(json_data)
+
+        return cls(configs, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def clients(self):
+        """
+        OrderedDict with the OneViewClient of each appliance logged in, by appliance address.
+        """
+        return OrderedDict(self.__clients)
+
+    @property
+    def login_errors(self):
+        """
+        OrderedDict with the exception raised by each appliance that failed to log in, by appliance address.
+        """
+        return OrderedDict(self.__login_errors)
+
+    def call(self, func):
+        """
+        Calls a function with the OneViewClient of each appliance, in parallel.
+
+        Args:
+            func: Function that takes a OneViewClient.
+
+        Returns:
+            FleetResult
+        """
+        futures = OrderedDict((ip, self.__executor.submit(func, client)) for ip, client in self.__clients.items())
+        result = self.__run(futures)
+        result.errors.update(self.__login_errors)
+        return result
+
+    def close(self):
+        """
+        Closes the connections to the appliances.
+        """
+        self.__executor.shutdown(wait=False)
+        for client in self.__clients.values():
+            client.connection.close_connections()
+
+    def __run(self, futures):
+        wait(list(futures.values()), timeout=self.__timeout)
+        results = OrderedDict()
+        errors = OrderedDict()
+        for appliance, future in futures.items():
+            if not future.done():
+                future.cancel()
+                errors[appliance] = FleetTimeout(FLEET_CLIENT_TIMEOUT % self.__timeout)
+            elif future.exception() is not None:
+                errors[appliance] = future.exception()
+            else:
+                results[appliance] = future.result()
+        return FleetResult(results, errors)
+
+    def _get_resource(self, name):
+        if name not in self.__resources:
+            self.__resources[name] = FleetResource(self, name)
+        return self.__resources[name]
+
+
+def _make_resource_property(name):
+    return property(lambda self: self._get_resource(name),
+                    doc='FleetResource with the %s of all the appliances' % name.replace('_', ' '))
+
+
+for _name, _value in list(vars(OneViewClient).items()):
+    if isinstance(_value, property) and _name != 'connection':
+        setattr(FleetClient, _name, _make_resource_property(_name))
+del _name, _value
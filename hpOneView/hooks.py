@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+hooks.py
+~~~~~~~~~~~~
+
+This module defines the callbacks of the requests sent by a connection, to instrument them
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'hooks'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+
+class RequestHooks(object):
+    """
+    Callbacks of the requests of a connection, added with connection.add_hooks. Subclasses override the callbacks
+    they need; the others do nothing.
+
+    Callbacks are called in the thread of the request, and must be thread-safe when the connection is shared by
+    several threads. An exception raised by a callback is logged, and does not fail the request.
+    """
+
+    def before_request(self, method, path, headers):
+        """
+        Called before each attempt of a request.
+
+        Args:
+            method: HTTP method.
+            path: Path with the query.
+            headers: Dict of the headers of the request, which can be changed.
+        """
+        pass
+
+    def after_response(self, method, path, status, elapsed, request_bytes, response_bytes):
+        """
+        Called after each response, including the error statuses.
+
+        Args:
+            method: HTTP method.
+            path: Path with the query.
+            status: HTTP status of the response.
+            elapsed: Seconds from the request to the end of the response body.
+            request_bytes: Size of the request body.
+            response_bytes: Size of the response body, decompressed.
+        """
+        pass
+
+    def on_error(self, method, path, error, elapsed):
+        """
+        Called when an attempt of a request fails without a response, such as a lost connection or a timeout.
+
+        Args:
+            method: HTTP method.
+            path: Path with the query.
+            error: The exception, raised after the callback unless the request is retried.
+            elapsed: Seconds from the request to the error.
+        """
+        pass
+
+    def on_retry(self, method, path, attempt, reason, delay):
+        """
+        Called when a failed attempt is going to be retried.
+
+        Args:
+            method: HTTP method.
+            path: Path with the query.
+            attempt: Number of the failed attempt, from 1.
+            reason: The status of the response, or the name of the error.
+            delay: Seconds waited before the next attempt.
+        """
+        pass
+
+    def on_task_wait(self, task_uri, state, elapsed):
+        """
+        Called when a wait for a task ends: in TaskMonitor.wait_for_task, for each task of
+        TaskMonitor.wait_for_tasks, and when the TaskFuture of an operation called with timeout=NO_WAIT is done.
+
+        Args:
+            task_uri: Uri of the task.
+            state: Last state of the task, 'Timeout' when it did not complete in time, or 'Unknown' when the wait
+                failed.
+            elapsed: Seconds waited.
+        """
+        pass
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+json_codec.py
+~~~~~~~~~~~~
+
+This module encodes and decodes the JSON bodies of the requests, with the standard library or a faster library when
+it is installed
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'json_codec'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import json
+import sys
+from collections import OrderedDict
+
+STDLIB = 'stdlib'
+ORJSON = 'orjson'
+UJSON = 'ujson'
+# Fastest codec installed
+AUTO = 'auto'
+
+# json.loads takes bytes since Python 3.6 (in Python 2, bytes are str)
+_LOADS_BYTES = sys.version_info[0] == 2 or sys.version_info >= (3, 6)
+
+JSON_CODEC_UNKNOWN = 'Unknown JSON codec: %s'
+
+
+class JsonCodec(object):
+    """
+    JSON codec of the standard library.
+
+    Codecs decode the body of a response straight from its bytes, and encode the body of a request to a str.
+    Decoding raises ValueError when the bytes are not valid JSON.
+    """
+    name = STDLIB
+
+    def loads(self, data):
+        if not _LOADS_BYTES and isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON codec of orjson. Dicts with keys that are not str are encoded as with the standard library.
+    """
+    name = ORJSON
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+class UjsonCodec(JsonCodec):
+    """
+    JSON codec of ujson.
+    """
+    name = UJSON
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, escape_forward_slashes=False)
+
+
+# By preference, for AUTO
+CODECS = OrderedDict([
+    (ORJSON, OrjsonCodec),
+    (UJSON, UjsonCodec),
+    (STDLIB, JsonCodec),
+])
+
+
+def make_json_codec(codec=AUTO):
+    """
+    Gets a JSON codec.
+
+    Args:
+        codec: Name of the codec: 'stdlib', 'orjson', 'ujson', or 'auto' for the fastest one installed. A JsonCodec is
+            returned as is.
+
+    Returns:
+        JsonCodec
+
+    Raises:
+        ValueError: The codec is unknown.
+        ImportError: The library of the codec is not installed.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec == AUTO:
+        for codec_class in CODECS.values():
+            try:
+                return codec_class()
+            except ImportError:
+                continue
+    if codec not in CODECS:
+        raise ValueError(JSON_CODEC_UNKNOWN % codec)
+    return CODECS[codec]()
+
+
+def get_installed_json_codecs():
+    """
+    Gets the names of the codecs whose library is installed.
+    """
+    names = []
+    for name, codec_class in CODECS.items():
+        try:
+            codec_class()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
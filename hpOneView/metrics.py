@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+metrics.py
+~~~~~~~~~~~~
+
+This module collects the metrics of the requests of connections: latency histograms, bytes, statuses, errors,
+retries and task waits, exported as a dict or in the Prometheus text format
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'metrics'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import bisect
+import re
+import threading
+
+from hpOneView.hooks import RequestHooks
+
+# Upper bounds, in seconds, of the buckets of the latency histograms
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Upper bounds, in seconds, of the buckets of the task wait histograms
+DEFAULT_TASK_WAIT_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+DEFAULT_METRICS_PREFIX = 'oneview'
+
+ID_PLACEHOLDER = '{id}'
+_DIGIT = re.compile(r'\d')
+
+
+def get_uri_template(path):
+    """
+    Gets the template of a uri, to group the requests of the same endpoint: the query is removed, and the path
+    segments after the collection that contain digits (ids, serial numbers, uuids) are replaced by {id}. E.g.
+    /rest/server-hardware/30303437-3034-4D32/environmentalConfiguration?x=1 gives
+    /rest/server-hardware/{id}/environmentalConfiguration.
+    """
+    segments = path.split('?', 1)[0].split('/')
+    # '', 'rest', collection, ...
+    for index in range(3, len(segments)):
+        if _DIGIT.search(segments[index]):
+            segments[index] = ID_PLACEHOLDER
+    return '/'.join(segments)
+
+
+class Histogram(object):
+    """
+    Cumulative histogram of observed values, as in Prometheus.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def get_cumulative_counts(self):
+        """
+        Gets the number of values less than or equal to each bucket bound, the last one for +Inf.
+        """
+        cumulative = []
+        total = 0
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def to_dict(self):
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        return {'count': self.count,
+                'sum': self.sum,
+                'buckets': dict(zip(bounds, self.get_cumulative_counts()))}
+
+
+class MetricsCollector(RequestHooks):
+    """
+    Request hooks that collect metrics, by HTTP method and uri template (see get_uri_template):
+
+    - Latency histograms of the requests, from the request to the end of the response body.
+    - Bytes sent and received in the bodies.
+    - Responses by status, errors without a response by error name, and retries by reason.
+    - Histograms of the time waited for tasks by TaskMonitor.wait_for_task, by final task state.
+
+    A collector can be added to several connections::
+
+        collector = MetricsCollector()
+        oneview_client.connection.add_hooks(collector)
+        ...
+        print(collector.to_prometheus())
+    """
+
+    def __init__(self, latency_buckets=DEFAULT_LATENCY_BUCKETS, task_wait_buckets=DEFAULT_TASK_WAIT_BUCKETS,
+                 prefix=DEFAULT_METRICS_PREFIX):
+        """
+        Args:
+            latency_buckets: Upper bounds of the buckets of the request latency histograms, in seconds.
+            task_wait_buckets: Upper bounds of the buckets of the task wait histograms, in seconds.
+            prefix: Prefix of the names of the metrics in the Prometheus format.
+        """
+        self._latency_buckets = latency_buckets
+        self._task_wait_buckets = task_wait_buckets
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._request_bytes = {}
+        self._response_bytes = {}
+        self._responses = {}
+        self._errors = {}
+        self._retries = {}
+        self._task_waits = {}
+
+    def after_response(self, method, path, status, elapsed, request_bytes, response_bytes):
+        key = (method, get_uri_template(path))
+        with self._lock:
+            self.__observe(self._latencies, key, elapsed, self._latency_buckets)
+            self.__increment(self._request_bytes, key, request_bytes)
+            self.__increment(self._response_bytes, key, response_bytes)
+            self.__increment(self._responses, key + (str(status),))
+
+    def on_error(self, method, path, error, elapsed):
+        key = (method, get_uri_template(path))
+        with self._lock:
+            self.__observe(self._latencies, key, elapsed, self._latency_buckets)
+            self.__increment(self._errors, key + (type(error).__name__,))
+
+    def on_retry(self, method, path, attempt, reason, delay):
+        with self._lock:
+            self.__increment(self._retries, (method, get_uri_template(path), reason))
+
+    def on_task_wait(self, task_uri, state, elapsed):
+        with self._lock:
+            self.__observe(self._task_waits, (state,), elapsed, self._task_wait_buckets)
+
+    def reset(self):
+        """
+        Removes all the metrics collected.
+        """
+        with self._lock:
+            for metrics in (self._latencies, self._request_bytes, self._response_bytes, self._responses, self._errors,
+                            self._retries, self._task_waits):
+                metrics.clear()
+
+    def to_dict(self):
+        """
+        Gets the metrics.
+
+        Returns:
+            dict: 'requests', a list with the metrics of each method and uri template: method, uri, latency (count,
+            sum and cumulative buckets), request_bytes, response_bytes, statuses, errors and retries; and
+            'task_waits', with the histogram of each task state.
+        """
+        with self._lock:
+            requests = []
+            for key in sorted(set(self._latencies) | set(self._retries_by_endpoint())):
+                histogram = self._latencies.get(key)
+                requests.append({
+                    'method': key[0],
+                    'uri': key[1],
+                    'latency': histogram.to_dict() if histogram else Histogram(self._latency_buckets).to_dict(),
+                    'request_bytes': self._request_bytes.get(key, 0),
+                    'response_bytes': self._response_bytes.get(key, 0),
+                    'statuses': self.__get_by_label(self._responses, key),
+                    'errors': self.__get_by_label(self._errors, key),
+                    'retries': self.__get_by_label(self._retries, key),
+                })
+            task_waits = dict((key[0], histogram.to_dict()) for key, histogram in self._task_waits.items())
+            return {'requests': requests, 'task_waits': task_waits}
+
+    def to_prometheus(self):
+        """
+        Gets the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str
+        """
+        prefix = self._prefix
+        lines = []
+        with self._lock:
+            self.__write_histograms(lines, prefix + '_request_duration_seconds',
+                                    'Duration of the requests to the appliance.', ('method', 'uri'), self._latencies)
+            self.__write_counters(lines, prefix + '_request_bytes_total', 'Bytes of the request bodies.',
+                                  ('method', 'uri'), self._request_bytes)
+            self.__write_counters(lines, prefix + '_response_bytes_total', 'Bytes of the response bodies.',
+                                  ('method', 'uri'), self._response_bytes)
+            self.__write_counters(lines, prefix + '_responses_total', 'Responses by status.',
+                                  ('method', 'uri', 'status'), self._responses)
+            self.__write_counters(lines, prefix + '_request_errors_total', 'Requests failed without a response.',
+                                  ('method', 'uri', 'error'), self._errors)
+            self.__write_counters(lines, prefix + '_request_retries_total', 'Retries of failed requests.',
+                                  ('method', 'uri', 'reason'), self._retries)
+            self.__write_histograms(lines, prefix + '_task_wait_seconds', 'Time waited for tasks.', ('state',),
+                                    self._task_waits)
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def _retries_by_endpoint(self):
+        return set(key[:2] for key in self._retries)
+
+    @staticmethod
+    def __observe(histograms, key, value, buckets):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+    @staticmethod
+    def __increment(counters, key, value=1):
+        counters[key] = counters.get(key, 0) + value
+
+    @staticmethod
+    def __get_by_label(counters, key):
+        return dict((counter_key[-1], value) for counter_key, value in counters.items() if counter_key[:-1] == key)
+
+    @staticmethod
+    def __write_counters(lines, name, help_text, label_names, counters):
+        if not counters:
+            return
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s counter' % name)
+        for key in sorted(counters):
+            lines.append('%s{%s} %s' % (name, _format_labels(label_names, key), _format_value(counters[key])))
+
+    @staticmethod
+    def __write_histograms(lines, name, help_text, label_names, histograms):
+        if not histograms:
+            return
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s histogram' % name)
+        for key in sorted(histograms):
+            histogram = histograms[key]
+            labels = _format_labels(label_names, key)
+            bounds = [_format_value(bound) for bound in histogram.buckets] + ['+Inf']
+            for bound, count in zip(bounds, histogram.get_cumulative_counts()):
+                lines.append('%s_bucket{%s,le="%s"} %d' % (name, labels, bound, count))
+            lines.append('%s_sum{%s} %s' % (name, labels, _format_value(histogram.sum)))
+            lines.append('%s_count{%s} %d' % (name, labels, histogram.count))
+
+
+def _format_labels(names, values):
+    return ','.join('%s="%s"' % (name, _escape_label_value(value)) for name, value in zip(names, values))
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
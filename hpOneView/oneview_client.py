@@ -45,54 +45,29 @@ __status__ = 'Development'
 import json
 
 from hpOneView.connection import connection
-from hpOneView.resources.servers.connections import Connections
-from hpOneView.resources.networking.fc_networks import FcNetworks
-from hpOneView.resources.networking.fcoe_networks import FcoeNetworks
-from hpOneView.resources.networking.ethernet_networks import EthernetNetworks
-from hpOneView.resources.networking.connection_templates import ConnectionTemplates
-from hpOneView.resources.networking.fabrics import Fabrics
-from hpOneView.resources.networking.network_sets import NetworkSets
-from hpOneView.resources.data_services.metric_streaming import MetricStreaming
-from hpOneView.resources.networking.switches import Switches
-from hpOneView.resources.networking.switch_types import SwitchTypes
-from hpOneView.resources.activity.tasks import Tasks
-from hpOneView.resources.servers.enclosures import Enclosures
-from hpOneView.resources.servers.logical_enclosures import LogicalEnclosures
-from hpOneView.resources.servers.enclosure_groups import EnclosureGroups
-from hpOneView.resources.servers.server_hardware import ServerHardware
-from hpOneView.resources.servers.server_hardware_types import ServerHardwareTypes
-from hpOneView.resources.servers.id_pools_vsn_ranges import IdPoolsVsnRanges
-from hpOneView.resources.servers.id_pools_vmac_ranges import IdPoolsVmacRanges
-from hpOneView.resources.servers.id_pools_vwwn_ranges import IdPoolsVwwnRanges
-from hpOneView.resources.networking.interconnects import Interconnects
-from hpOneView.resources.networking.interconnect_types import InterconnectTypes
-from hpOneView.resources.networking.interconnect_link_topologies import InterconnectLinkTopologies
-from hpOneView.resources.networking.logical_downlinks import LogicalDownlinks
-from hpOneView.resources.facilities.power_devices import PowerDevices
-from hpOneView.resources.facilities.racks import Racks
-from hpOneView.resources.fc_sans.san_managers import SanManagers
-from hpOneView.resources.fc_sans.endpoints import Endpoints
-from hpOneView.resources.networking.logical_interconnects import LogicalInterconnects
-from hpOneView.resources.networking.logical_interconnect_groups import LogicalInterconnectGroups
-from hpOneView.resources.networking.logical_switch_groups import LogicalSwitchGroups
-from hpOneView.resources.servers.server_profiles import ServerProfiles
-from hpOneView.resources.servers.server_profile_templates import ServerProfileTemplate
-from hpOneView.resources.storage.storage_systems import StorageSystems
-from hpOneView.resources.storage.storage_pools import StoragePools
-from hpOneView.resources.storage.storage_volume_templates import StorageVolumeTemplates
-from hpOneView.resources.storage.storage_volume_attachments import StorageVolumeAttachments
-from hpOneView.resources.settings.firmware_drivers import FirmwareDrivers
-from hpOneView.resources.settings.firmware_bundles import FirmwareBundles
-from hpOneView.resources.storage.volumes import Volumes
-from hpOneView.resources.networking.uplink_sets import UplinkSets
 
 ONEVIEW_CLIENT_INVALID_PROXY = 'Invalid Proxy format'
+ONEVIEW_CLIENT_RECORD_AND_REPLAY = 'record_path and replay_path cannot be used together'
 
 
 class OneViewClient(object):
     def __init__(self, config):
         self.__connection = connection(config["ip"], config.get('api_version', 200))
         self.__set_proxy(config)
+        self.__set_connection_pool(config)
+        self.__set_resource_cache(config)
+        self.__set_retry_policy(config)
+        self.__set_rate_limiter(config)
+        self.__set_session_store(config)
+        self.__set_transport(config)
+        if config.get("page_workers"):
+            self.__connection.set_page_workers(config["page_workers"])
+        if config.get("json_codec"):
+            self.__connection.set_json_codec(config["json_codec"])
+        if config.get("compression"):
+            self.__connection.set_compression(True)
+        if config.get("tracer"):
+            self.__connection.set_tracer(config["tracer"])
         self.__connection.login(config["credentials"])
         self.__connections = None
         self.__connection_templates = None
@@ -167,13 +142,107 @@ class OneViewClient(object):
 
             self.__connection.set_proxy(splitted[0], splitted[1])
 
+    def __set_connection_pool(self, config):
+        """
+        Configure the pool of persistent connections if needed
+        Args:
+            config: Config dict
+
+        """
+        size = config.get("connection_pool_size")
+        idle_timeout = config.get("connection_pool_idle_timeout")
+        if size is not None or idle_timeout is not None:
+            self.__connection.set_connection_pool(size=size, idle_timeout=idle_timeout)
+
+    def __set_resource_cache(self, config):
+        """
+        Enable the resource cache if needed
+        Args:
+            config: Config dict
+
+        """
+        keys = ("resource_cache_ttl", "resource_cache_ttls", "resource_cache_max_bytes")
+        if any(key in config for key in keys):
+            from hpOneView.resource_cache import ResourceCache, DEFAULT_CACHE_TTL, DEFAULT_CACHE_MAX_BYTES
+            cache = ResourceCache(ttl=config.get("resource_cache_ttl", DEFAULT_CACHE_TTL),
+                                  ttls=config.get("resource_cache_ttls"),
+                                  max_bytes=config.get("resource_cache_max_bytes", DEFAULT_CACHE_MAX_BYTES))
+            self.__connection.set_resource_cache(cache)
+
+    def __set_retry_policy(self, config):
+        """
+        Configure the retries of failed requests if needed
+        Args:
+            config: Config dict
+
+        """
+        keys = ("retry_max_attempts", "retry_backoff_factor", "retry_max_backoff", "retry_deadline")
+        if any(key in config for key in keys):
+            from hpOneView.retry import RetryPolicy, DEFAULT_RETRY_ATTEMPTS, DEFAULT_RETRY_BACKOFF, \
+                DEFAULT_RETRY_MAX_BACKOFF, DEFAULT_RETRY_DEADLINE
+            policy = RetryPolicy(max_attempts=config.get("retry_max_attempts", DEFAULT_RETRY_ATTEMPTS),
+                                 backoff_factor=config.get("retry_backoff_factor", DEFAULT_RETRY_BACKOFF),
+                                 max_backoff=config.get("retry_max_backoff", DEFAULT_RETRY_MAX_BACKOFF),
+                                 deadline=config.get("retry_deadline", DEFAULT_RETRY_DEADLINE))
+            self.__connection.set_retry_policy(policy)
+
+    def __set_rate_limiter(self, config):
+        """
+        Enable the rate limiter if needed
+        Args:
+            config: Config dict
+
+        """
+        rate_limits = config.get("rate_limits")
+        if rate_limits:
+            from hpOneView.rate_limiter import RateLimiter, RequestBudget
+            budgets = dict((request_type, RequestBudget(**limits)) for request_type, limits in rate_limits.items())
+            self.__connection.set_rate_limiter(RateLimiter(**budgets))
+
     @property
     def connection(self):
         return self.__connection
 
+    def __set_session_store(self, config):
+        """
+        Enable the session store if needed
+        Args:
+            config: Config dict
+
+        """
+        store = config.get("session_store")
+        if not store:
+            return
+        from hpOneView.session_store import SessionStore, FileSessionStore
+        if store is True:
+            store = FileSessionStore()
+        elif store and not isinstance(store, SessionStore):
+            store = FileSessionStore(store)
+        self.__connection.set_session_store(store)
+
+    def __set_transport(self, config):
+        """
+        Record the requests to a file, or replay them from it, if needed
+        Args:
+            config: Config dict
+
+        """
+        if config.get("record_path") and config.get("replay_path"):
+            raise ValueError(ONEVIEW_CLIENT_RECORD_AND_REPLAY)
+        if config.get("record_path"):
+            from hpOneView.recording import TransportRecorder
+            self.__connection.set_transport(TransportRecorder(config["record_path"]))
+        elif config.get("replay_path"):
+            from hpOneView.recording import TransportReplayer
+            self.__connection.set_transport(TransportReplayer(config["replay_path"],
+                                                              replay_latency=config.get("replay_latency", False)))
+
+    # The resource modules are imported by their properties, on first access, so that importing the client stays
+    # cheap for short-lived scripts
     @property
     def connections(self):
         if not self.__connections:
+            from hpOneView.resources.servers.connections import Connections
             self.__connections = Connections(
                 self.__connection)
         return self.__connections
@@ -181,6 +250,7 @@ class OneViewClient(object):
     @property
     def connection_templates(self):
         if not self.__connection_templates:
+            from hpOneView.resources.networking.connection_templates import ConnectionTemplates
             self.__connection_templates = ConnectionTemplates(
                 self.__connection)
         return self.__connection_templates
@@ -188,42 +258,49 @@ class OneViewClient(object):
     @property
     def fc_networks(self):
         if not self.__fc_networks:
+            from hpOneView.resources.networking.fc_networks import FcNetworks
             self.__fc_networks = FcNetworks(self.__connection)
         return self.__fc_networks
 
     @property
     def fcoe_networks(self):
         if not self.__fcoe_networks:
+            from hpOneView.resources.networking.fcoe_networks import FcoeNetworks
             self.__fcoe_networks = FcoeNetworks(self.__connection)
         return self.__fcoe_networks
 
     @property
     def ethernet_networks(self):
         if not self.__ethernet_networks:
+            from hpOneView.resources.networking.ethernet_networks import EthernetNetworks
             self.__ethernet_networks = EthernetNetworks(self.__connection)
         return self.__ethernet_networks
 
     @property
     def fabrics(self):
         if not self.__fabrics:
+            from hpOneView.resources.networking.fabrics import Fabrics
             self.__fabrics = Fabrics(self.__connection)
         return self.__fabrics
 
     @property
     def network_sets(self):
         if not self.__network_sets:
+            from hpOneView.resources.networking.network_sets import NetworkSets
             self.__network_sets = NetworkSets(self.__connection)
         return self.__network_sets
 
     @property
     def server_hardware(self):
         if not self.__server_hardware:
+            from hpOneView.resources.servers.server_hardware import ServerHardware
             self.__server_hardware = ServerHardware(self.__connection)
         return self.__server_hardware
 
     @property
     def server_hardware_types(self):
         if not self.__server_hardware_types:
+            from hpOneView.resources.servers.server_hardware_types import ServerHardwareTypes
             self.__server_hardware_types = ServerHardwareTypes(
                 self.__connection)
         return self.__server_hardware_types
@@ -231,6 +308,7 @@ class OneViewClient(object):
     @property
     def id_pools_vsn_ranges(self):
         if not self.__id_pools_vsn_ranges:
+            from hpOneView.resources.servers.id_pools_vsn_ranges import IdPoolsVsnRanges
             self.__id_pools_vsn_ranges = IdPoolsVsnRanges(
                 self.__connection)
         return self.__id_pools_vsn_ranges
@@ -238,6 +316,7 @@ class OneViewClient(object):
     @property
     def id_pools_vmac_ranges(self):
         if not self.__id_pools_vmac_ranges:
+            from hpOneView.resources.servers.id_pools_vmac_ranges import IdPoolsVmacRanges
             self.__id_pools_vmac_ranges = IdPoolsVmacRanges(
                 self.__connection)
         return self.__id_pools_vmac_ranges
@@ -245,6 +324,7 @@ class OneViewClient(object):
     @property
     def id_pools_vwwn_ranges(self):
         if not self.__id_pools_vwwn_ranges:
+            from hpOneView.resources.servers.id_pools_vwwn_ranges import IdPoolsVwwnRanges
             self.__id_pools_vwwn_ranges = IdPoolsVwwnRanges(
                 self.__connection)
         return self.__id_pools_vwwn_ranges
@@ -252,18 +332,21 @@ class OneViewClient(object):
     @property
     def switches(self):
         if not self.__switches:
+            from hpOneView.resources.networking.switches import Switches
             self.__switches = Switches(self.__connection)
         return self.__switches
 
     @property
     def switch_types(self):
         if not self.__switch_types:
+            from hpOneView.resources.networking.switch_types import SwitchTypes
             self.__switch_types = SwitchTypes(self.__connection)
         return self.__switch_types
 
     @property
     def logical_switch_groups(self):
         if not self.__logical_switch_groups:
+            from hpOneView.resources.networking.logical_switch_groups import LogicalSwitchGroups
             self.__logical_switch_groups = LogicalSwitchGroups(
                 self.__connection)
         return self.__logical_switch_groups
@@ -271,54 +354,63 @@ class OneViewClient(object):
     @property
     def tasks(self):
         if not self.__tasks:
+            from hpOneView.resources.activity.tasks import Tasks
             self.__tasks = Tasks(self.__connection)
         return self.__tasks
 
     @property
     def enclosure_groups(self):
         if not self.__enclosure_groups:
+            from hpOneView.resources.servers.enclosure_groups import EnclosureGroups
             self.__enclosure_groups = EnclosureGroups(self.__connection)
         return self.__enclosure_groups
 
     @property
     def enclosures(self):
         if not self.__enclosures:
+            from hpOneView.resources.servers.enclosures import Enclosures
             self.__enclosures = Enclosures(self.__connection)
         return self.__enclosures
 
     @property
     def logical_enclosures(self):
         if not self.__logical_enclosures:
+            from hpOneView.resources.servers.logical_enclosures import LogicalEnclosures
             self.__logical_enclosures = LogicalEnclosures(self.__connection)
         return self.__logical_enclosures
 
     @property
     def metric_streaming(self):
         if not self.__metric_streaming:
+            from hpOneView.resources.data_services.metric_streaming import MetricStreaming
             self.__metric_streaming = MetricStreaming(self.__connection)
         return self.__metric_streaming
 
     @property
     def interconnects(self):
         if not self.__interconnects:
+            from hpOneView.resources.networking.interconnects import Interconnects
             self.__interconnects = Interconnects(self.__connection)
         return self.__interconnects
 
     @property
     def interconnect_types(self):
         if not self.__interconnect_types:
+            from hpOneView.resources.networking.interconnect_types import InterconnectTypes
             self.__interconnect_types = InterconnectTypes(self.__connection)
         return self.__interconnect_types
 
     @property
     def interconnect_link_topologies(self):
         if not self.__interconnect_link_topologies:
+            from hpOneView.resources.networking.interconnect_link_topologies import InterconnectLinkTopologies
             self.__interconnect_link_topologies = InterconnectLinkTopologies(self.__connection)
         return self.__interconnect_link_topologies
 
     @property
     def logical_interconnect_groups(self):
         if not self.__logical_interconnect_groups:
+            from hpOneView.resources.networking.logical_interconnect_groups import LogicalInterconnectGroups
             self.__logical_interconnect_groups = LogicalInterconnectGroups(
                 self.__connection)
         return self.__logical_interconnect_groups
@@ -326,6 +418,7 @@ class OneViewClient(object):
     @property
     def logical_interconnects(self):
         if not self.__logical_interconnects:
+            from hpOneView.resources.networking.logical_interconnects import LogicalInterconnects
             self.__logical_interconnects = LogicalInterconnects(
                 self.__connection)
         return self.__logical_interconnects
@@ -333,6 +426,7 @@ class OneViewClient(object):
     @property
     def logical_downlinks(self):
         if not self.__logical_downlinks:
+            from hpOneView.resources.networking.logical_downlinks import LogicalDownlinks
             self.__logical_downlinks = LogicalDownlinks(
                 self.__connection)
         return self.__logical_downlinks
@@ -340,83 +434,97 @@ class OneViewClient(object):
     @property
     def power_devices(self):
         if not self.__power_devices:
+            from hpOneView.resources.facilities.power_devices import PowerDevices
             self.__power_devices = PowerDevices(self.__connection)
         return self.__power_devices
 
     @property
     def racks(self):
         if not self.__racks:
+            from hpOneView.resources.facilities.racks import Racks
             self.__racks = Racks(self.__connection)
         return self.__racks
 
     @property
     def san_managers(self):
         if not self.__san_managers:
+            from hpOneView.resources.fc_sans.san_managers import SanManagers
             self.__san_managers = SanManagers(self.__connection)
         return self.__san_managers
 
     @property
     def endpoints(self):
         if not self.__endpoints:
+            from hpOneView.resources.fc_sans.endpoints import Endpoints
             self.__endpoints = Endpoints(self.__connection)
         return self.__endpoints
 
     @property
     def server_profiles(self):
         if not self.__server_profiles:
+            from hpOneView.resources.servers.server_profiles import ServerProfiles
             self.__server_profiles = ServerProfiles(self.__connection)
         return self.__server_profiles
 
     @property
     def server_profile_templates(self):
         if not self.__server_profile_templates:
+            from hpOneView.resources.servers.server_profile_templates import ServerProfileTemplate
             self.__server_profile_templates = ServerProfileTemplate(self.__connection)
         return self.__server_profile_templates
 
     @property
     def storage_systems(self):
         if not self.__storage_systems:
+            from hpOneView.resources.storage.storage_systems import StorageSystems
             self.__storage_systems = StorageSystems(self.__connection)
         return self.__storage_systems
 
     @property
     def storage_pools(self):
         if not self.__storage_pools:
+            from hpOneView.resources.storage.storage_pools import StoragePools
             self.__storage_pools = StoragePools(self.__connection)
         return self.__storage_pools
 
     @property
     def storage_volume_templates(self):
         if not self.__storage_volume_templates:
+            from hpOneView.resources.storage.storage_volume_templates import StorageVolumeTemplates
             self.__storage_volume_templates = StorageVolumeTemplates(self.__connection)
         return self.__storage_volume_templates
 
     @property
     def storage_volume_attachments(self):
         if not self.__storage_volume_attachments:
+            from hpOneView.resources.storage.storage_volume_attachments import StorageVolumeAttachments
             self.__storage_volume_attachments = StorageVolumeAttachments(self.__connection)
         return self.__storage_volume_attachments
 
     @property
     def firmware_drivers(self):
         if not self.__firmware_drivers:
+            from hpOneView.resources.settings.firmware_drivers import FirmwareDrivers
             self.__firmware_drivers = FirmwareDrivers(self.__connection)
         return self.__firmware_drivers
 
     @property
     def firmware_bundles(self):
         if not self.__firmware_bundles:
+            from hpOneView.resources.settings.firmware_bundles import FirmwareBundles
             self.__firmware_bundles = FirmwareBundles(self.__connection)
         return self.__firmware_bundles
 
     @property
     def uplink_sets(self):
         if not self.__uplink_sets:
+            from hpOneView.resources.networking.uplink_sets import UplinkSets
             self.__uplink_sets = UplinkSets(self.__connection)
         return self.__uplink_sets
 
     @property
     def volumes(self):
         if not self.__volumes:
+            from hpOneView.resources.storage.volumes import Volumes
             self.__volumes = Volumes(self.__connection)
         return self.__volumes
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+pagination.py
+~~~~~~~~~~~~
+
+This module keeps the position of the paginated requests, per call instead of per connection, and gives random
+access to the pages of a collection
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'pagination'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from hpOneView.common import get_members
+
+# Number of pages requested in the background while the current one is consumed
+DEFAULT_PREFETCH_PAGES = 2
+
+START_PARAMETER = 'start'
+COUNT_PARAMETER = 'count'
+
+
+def get_uri_parameter(page_uri, name, default=None):
+    """
+    Gets an integer parameter of the query of a uri, or the default when missing.
+    """
+    match = re.search(r'[?&]{0}=(-?\d+)'.format(name), page_uri or '')
+    return int(match.group(1)) if match else default
+
+
+def set_uri_parameter(page_uri, name, value):
+    """
+    Sets an integer parameter of the query of a uri, replacing it or adding it.
+    """
+    pattern = re.compile(r'([?&]){0}=-?\d+'.format(name))
+    if pattern.search(page_uri):
+        return pattern.sub(r'\g<1>{0}={1}'.format(name, value), page_uri, count=1)
+    return '{0}{1}{2}={3}'.format(page_uri, '&' if '?' in page_uri else '?', name, value)
+
+
+class PageCursor(object):
+    """
+    Position in a paginated collection: the uris of the next and previous pages, the total of members and the
+    count of the last page read.
+
+    Each thread of a connection has its own cursor, moved by connection.get, which keeps getNextPage and the other
+    legacy page helpers working when the connection is shared by several threads. Paginated reads that must not be
+    moved by the other requests of the thread use a copy.
+    """
+
+    def __init__(self, con, page=None):
+        self._connection = con
+        self.next_page_uri = None
+        self.prev_page_uri = None
+        self.total = 0
+        self.count = 0
+        if page:
+            self.update(page)
+
+    def update(self, page):
+        """
+        Moves the cursor to a page. Only the fields present in the page are updated.
+        """
+        if 'nextPageUri' in page:
+            self.next_page_uri = page['nextPageUri']
+        if 'prevPageUri' in page:
+            self.prev_page_uri = page['prevPageUri']
+        if 'total' in page:
+            self.total = page['total']
+        if 'count' in page:
+            self.count = page['count']
+
+    def copy(self):
+        cursor = PageCursor(self._connection)
+        cursor.next_page_uri = self.next_page_uri
+        cursor.prev_page_uri = self.prev_page_uri
+        cursor.total = self.total
+        cursor.count = self.count
+        return cursor
+
+    def get_next_page(self):
+        """
+        Gets the members of the next page, and moves the cursor to it.
+        """
+        return self.__get_page(self.next_page_uri)
+
+    def get_prev_page(self):
+        """
+        Gets the members of the previous page, and moves the cursor to it.
+        """
+        return self.__get_page(self.prev_page_uri)
+
+    def get_last_page(self):
+        """
+        Gets the members of the last page. None when the cursor is on the last page.
+
+        The last page is requested at once, at the offset computed from the total and the page size; the next pages
+        are followed one by one only when the total or the offsets are unknown.
+        """
+        if self.next_page_uri is None:
+            return None
+        count = get_uri_parameter(self.next_page_uri, COUNT_PARAMETER)
+        start = get_uri_parameter(self.next_page_uri, START_PARAMETER)
+        if count and count > 0 and start is not None and self.total:
+            offset = start % count
+            last_start = max(start, offset + ((self.total - 1 - offset) // count) * count)
+            members = self.__get_page(set_uri_parameter(self.next_page_uri, START_PARAMETER, last_start))
+            if self.next_page_uri is None:
+                return members
+        members = None
+        while self.next_page_uri is not None:
+            members = self.get_next_page()
+        return members
+
+    def get_first_page(self):
+        """
+        Gets the members of the first page, requested at once. None when the cursor is on the first page.
+        """
+        if self.prev_page_uri is None:
+            return None
+        if get_uri_parameter(self.prev_page_uri, START_PARAMETER) is not None:
+            members = self.__get_page(set_uri_parameter(self.prev_page_uri, START_PARAMETER, 0))
+            if self.prev_page_uri is None:
+                return members
+        members = None
+        while self.prev_page_uri is not None:
+            members = self.get_prev_page()
+        return members
+
+    def __get_page(self, page_uri):
+        page = self._connection.get(page_uri)
+        if isinstance(page, dict):
+            self.update(page)
+        return get_members(page)
+
+
+class CollectionCursor(object):
+    """
+    Cursor over the pages of a query on a collection, with random access: page k is requested at once, at the
+    offset start + k * count, without requesting the pages before it. A big collection can be browsed, or an
+    interrupted crawl resumed, from any page.
+
+    The page size is the count of the query, or the size of the first page when the query has no count. When the
+    appliance returns a smaller page than requested, and it is not the last one, the page size is corrected and the
+    page is requested again at the right offset. The total comes from the pages requested.
+
+    Iterating over the cursor yields the members of all the pages, lazily; the next `prefetch` pages are requested
+    in the background while the current one is consumed. ResourceClient.get_cursor creates a cursor for a query with
+    the arguments of get_all.
+
+    Attributes:
+        uri: uri of the query.
+        start: offset of the first page.
+        count: page size, None until known.
+        total: number of members of the collection, None until a page is requested.
+    """
+
+    def __init__(self, con, uri, prefetch=DEFAULT_PREFETCH_PAGES):
+        """
+        Args:
+            con: connection used for the requests.
+            uri: uri of the query, with its start and count.
+            prefetch: maximum number of pages requested in the background while iterating. 0 requests each page when
+                it is needed.
+        """
+        self._connection = con
+        self._prefetch = prefetch
+        self._lock = threading.Lock()
+        self.uri = uri
+        self.start = get_uri_parameter(uri, START_PARAMETER, 0)
+        count = get_uri_parameter(uri, COUNT_PARAMETER, -1)
+        self.count = count if count > 0 else None
+        self.total = None
+
+    @property
+    def page_count(self):
+        """
+        Gets the number of pages from start to the end of the collection, None while the total is unknown.
+        """
+        with self._lock:
+            if self.total is None:
+                return None
+            remaining = max(self.total - self.start, 0)
+            if not self.count:
+                return 1 if remaining else 0
+            return (remaining + self.count - 1) // self.count
+
+    @property
+    def page_uris(self):
+        """
+        Gets the uris of all the pages, requesting the first one if the total or the page size are unknown.
+        """
+        if self.total is None:
+            self.get_page(0)
+        return [self.get_page_uri(index) for index in range(self.page_count)]
+
+    def get_page_uri(self, index):
+        """
+        Gets the uri of a page, requesting the first one if the page size is unknown.
+        """
+        if index > 0 and self.count is None:
+            self.get_page(0)
+        with self._lock:
+            count = self.count
+        if index > 0 and count is None:
+            raise IndexError('Page %s is out of the collection' % index)
+        page_uri = set_uri_parameter(self.uri, START_PARAMETER, self.start + index * (count or 0))
+        return set_uri_parameter(page_uri, COUNT_PARAMETER, count or -1)
+
+    def get_page(self, index):
+        """
+        Gets a page of the collection.
+
+        Args:
+            index: index of the page, from 0.
+
+        Returns:
+            dict: The page, with its members, total and count.
+        """
+        page = self._connection.get(self.get_page_uri(index))
+        if self.__update(page, index) and index > 0:
+            # The offset was computed with a page size larger than the pages of the appliance
+            page = self._connection.get(self.get_page_uri(index))
+            self.__update(page, index)
+        return page
+
+    def get_members(self, index):
+        """
+        Gets the members of a page of the collection.
+        """
+        return get_members(self.get_page(index))
+
+    def iter_pages(self, first=0):
+        """
+        Iterates over the pages from the given index to the end of the collection, lazily, requesting the next
+        `prefetch` pages in the background.
+        """
+        page = self.get_page(first)
+        last = self.page_count
+        if last is None:
+            # Without a total, the pages are followed by their nextPageUri
+            for page in self.__follow_pages(page):
+                yield page
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self._prefetch) if self._prefetch else None
+        pending = deque()
+        next_index = first + 1
+        try:
+            while True:
+                while executor and next_index < last and len(pending) < self._prefetch:
+                    pending.append(executor.submit(self.get_page, next_index))
+                    next_index += 1
+                yield page
+                if not get_members(page):
+                    return
+                if pending:
+                    page = pending.popleft().result()
+                elif next_index < last:
+                    page = self.get_page(next_index)
+                    next_index += 1
+                else:
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+            if executor:
+                executor.shutdown(wait=False)
+
+    def __iter__(self):
+        for page in self.iter_pages():
+            for member in get_members(page):
+                yield member
+
+    def __follow_pages(self, page):
+        while True:
+            yield page
+            next_page_uri = page.get('nextPageUri')
+            if not next_page_uri or not get_members(page):
+                return
+            page = self._connection.get(next_page_uri)
+
+    def __update(self, page, index):
+        """
+        Updates the total and the page size from a page. Returns whether the page size changed.
+        """
+        if not isinstance(page, dict):
+            return False
+        members = get_members(page)
+        with self._lock:
+            if 'total' in page:
+                self.total = page['total']
+            if members and page.get('nextPageUri') and (self.count is None or len(members) < self.count):
+                # The appliance limits the page size
+                self.count = len(members)
+                return True
+        return False
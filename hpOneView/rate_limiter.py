@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+rate_limiter.py
+~~~~~~~~~~~~
+
+This module limits the rate and the concurrency of the requests sent to the appliance
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'rate_limiter'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import logging
+import threading
+import time
+
+READ = 'read'
+WRITE = 'write'
+POLL = 'poll'
+
+READ_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+# The task polls request a task, or the collection of tasks with a filter on their uris
+TASKS_URI = '/rest/tasks'
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBudget(object):
+    """
+    Limits of a type of requests.
+    """
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None):
+        """
+        Args:
+            rate: Requests per second, on average. None does not limit the rate.
+            burst: Requests that can be sent at once after a period without requests. Defaults to the rate,
+                with a minimum of 1.
+            max_in_flight: Requests waiting for a response at the same time. None does not limit them.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError('The rate must be greater than 0')
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError('The maximum number of requests in flight must be at least 1')
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate or 1, 1)
+        self.max_in_flight = max_in_flight
+
+
+class _Lane(object):
+    """
+    Token bucket and in-flight semaphore of a budget, with its counters.
+    """
+
+    def __init__(self, budget):
+        self._rate = budget.rate
+        self._burst = budget.burst
+        self._tokens = float(budget.burst)
+        self._updated_at = time.time()
+        self._slots = threading.BoundedSemaphore(budget.max_in_flight) if budget.max_in_flight else None
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._waiting = 0
+        self._in_flight = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def acquire(self):
+        start = time.time()
+        with self._lock:
+            self._waiting += 1
+        try:
+            if self._rate:
+                self.__take_token()
+            if self._slots:
+                self._slots.acquire()
+        finally:
+            waited = time.time() - start
+            with self._lock:
+                self._waiting -= 1
+                self._wait_seconds += waited
+                self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+
+    def release(self):
+        with self._lock:
+            self._in_flight -= 1
+        if self._slots:
+            self._slots.release()
+
+    def __take_token(self):
+        while True:
+            with self._lock:
+                now = time.time()
+                self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+    @property
+    def stats(self):
+        with self._lock:
+            return {'requests': self._requests,
+                    'in_flight': self._in_flight,
+                    'waiting': self._waiting,
+                    'wait_seconds': self._wait_seconds,
+                    'max_wait_seconds': self._max_wait_seconds}
+
+
+class _Permit(object):
+    def __init__(self, lane):
+        self._lane = lane
+
+    def __enter__(self):
+        self._lane.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._lane.release()
+
+
+class _Unlimited(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+UNLIMITED = _Unlimited()
+
+
+class RateLimiter(object):
+    """
+    Thread-safe limits of the requests of a connection, shared by all its clients. Requests are classified as
+    reads (GET, HEAD and OPTIONS), task polls (GET of a task or of /rest/tasks) or writes (any other method), each
+    type with its own budget: a request waits until the rate of its type allows it and a slot for requests in flight
+    is free.
+
+    Example:
+        con.set_rate_limiter(RateLimiter(read=RequestBudget(rate=20, max_in_flight=8),
+                                         write=RequestBudget(rate=2, max_in_flight=2),
+                                         poll=RequestBudget(rate=5)))
+    """
+
+    def __init__(self, read=None, write=None, poll=None):
+        """
+        Args:
+            read: RequestBudget of reads. None does not limit them.
+            write: RequestBudget of writes. None does not limit them.
+            poll: RequestBudget of task polls. None does not limit them.
+        """
+        self._lanes = {READ: _Lane(read or RequestBudget()),
+                       WRITE: _Lane(write or RequestBudget()),
+                       POLL: _Lane(poll or RequestBudget())}
+
+    @staticmethod
+    def get_request_type(method, path):
+        """
+        Gets the type of a request: READ, WRITE or POLL.
+        """
+        method = method.upper()
+        if method not in READ_METHODS:
+            return WRITE
+        if path.startswith(TASKS_URI) and path[len(TASKS_URI):len(TASKS_URI) + 1] in ('', '/', '?'):
+            return POLL
+        return READ
+
+    def limit(self, method, path):
+        """
+        Gets a context manager that waits for the budget of a request when entered, and frees its slot in flight
+        when exited.
+
+        Args:
+            method: HTTP method.
+            path: Path of the request.
+        """
+        return _Permit(self._lanes[self.get_request_type(method, path)])
+
+    @property
+    def stats(self):
+        """
+        Gets the counters by type of request.
+
+        Returns:
+            dict: By type, the requests sent, in_flight, waiting (requests queued for the budget), wait_seconds (total
+                time waited) and max_wait_seconds
+        """
+        return dict((request_type, lane.stats) for request_type, lane in self._lanes.items())
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+recording.py
+~~~~~~~~~~~~
+
+This module records the requests of a connection and their responses to a file, and replays them without a network
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'recording'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+
+from hpOneView.common import uri as uris
+from hpOneView.exceptions import HPOneViewReplayError
+
+UTF8_BODY = 'utf-8'
+BASE64_BODY = 'base64'
+
+# The bodies are recorded decoded, so the headers of their encoding on the wire are not recorded
+WIRE_HEADERS = frozenset(['content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'])
+
+# The session IDs of the responses, and their authentication headers, are replaced with a placeholder: the replayer
+# does not check the session of the requests
+REDACTED = 'REDACTED'
+REDACTED_HEADERS = frozenset(['auth', 'authorization', 'cookie', 'set-cookie'])
+SESSION_ID_PATTERN = re.compile(br'("sessionID"\s*:\s*)"[^"]*"', re.IGNORECASE)
+SESSION_ID_REPLACEMENT = ('\\1"%s"' % REDACTED).encode('ascii')
+
+REPLAY_NOT_RECORDED = 'No response recorded for %s %s'
+
+logger = logging.getLogger(__name__)
+
+
+def get_body_hash(body):
+    """
+    Gets the SHA-256 hex digest of a request body: a str, bytes or None.
+    """
+    if not body:
+        body = b''
+    elif not isinstance(body, bytes):
+        body = body.encode('utf-8')
+    return hashlib.sha256(body).hexdigest()
+
+
+class RecordedResponse(object):
+    """
+    Response replayed from a recording, with the interface of http.client.HTTPResponse used by the connection.
+    """
+
+    def __init__(self, status, reason, headers):
+        self.status = status
+        self.reason = reason
+        self._headers = headers
+
+    def getheader(self, name, default=None):
+        name = name.lower()
+        for key, value in self._headers:
+            if key.lower() == name:
+                return value
+        return default
+
+    def getheaders(self):
+        return list(self._headers)
+
+
+class TransportRecorder(object):
+    """
+    Transport of a connection that sends the requests to the appliance and records each request and its response to
+    a gzip compressed file, with a JSON object per line: method, uri, SHA-256 of the request body, status, reason,
+    headers and body of the response, and the seconds it took. The request bodies and headers, which can hold
+    credentials, are not recorded. By default, the session IDs and the authentication headers of the responses are
+    replaced with REDACTED, and the body of the login requests is not hashed, so a recording can be committed.
+
+    Set with connection.set_transport, and closed once the requests are done::
+
+        with TransportRecorder('inventory.jsonl.gz') as recorder:
+            oneview_client.connection.set_transport(recorder)
+            oneview_client.server_hardware.get_all()
+    """
+
+    def __init__(self, path, redact=True):
+        """
+        Args:
+            path: Path of the recording.
+            redact: Whether the session IDs and the authentication headers are replaced with REDACTED.
+        """
+        self._path = path
+        self._redact = redact
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'wb')
+        self._count = 0
+
+    def send(self, send_request, method, path, body, headers):
+        """
+        Sends a request with send_request, and records it.
+
+        Returns:
+            tuple: The response and its body, as returned by send_request.
+        """
+        start = time.time()
+        resp, tempbytes = send_request(method, path, body, headers)
+        elapsed = time.time() - start
+        headers = [[key, value] for key, value in resp.getheaders() if key.lower() not in WIRE_HEADERS]
+        body_sha256 = get_body_hash(body)
+        recorded_bytes = tempbytes
+        if self._redact:
+            headers = [[key, REDACTED if key.lower() in REDACTED_HEADERS else value] for key, value in headers]
+            recorded_bytes = SESSION_ID_PATTERN.sub(SESSION_ID_REPLACEMENT, tempbytes)
+            if path.startswith(uris['loginSessions']):
+                # The hash of the credentials could be brute forced
+                body_sha256 = None
+        entry = {'method': method,
+                 'uri': path,
+                 'body_sha256': body_sha256,
+                 'status': resp.status,
+                 'reason': resp.reason,
+                 'headers': headers,
+                 'elapsed': round(elapsed, 6)}
+        entry.update(self.__encode_body(recorded_bytes))
+        line = json.dumps(entry, separators=(',', ':')).encode('utf-8') + b'\n'
+        with self._lock:
+            if self._file is None:
+                raise ValueError('The recording of %s is closed' % self._path)
+            self._file.write(line)
+            self._count += 1
+        return resp, tempbytes
+
+    @property
+    def count(self):
+        """
+        Gets the number of responses recorded.
+        """
+        return self._count
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def __encode_body(tempbytes):
+        try:
+            return {'body': tempbytes.decode('utf-8'), 'encoding': UTF8_BODY}
+        except UnicodeDecodeError:
+            return {'body': base64.b64encode(tempbytes).decode('ascii'), 'encoding': BASE64_BODY}
+
+
+class _Replies(object):
+    def __init__(self):
+        self.entries = []
+        self.index = 0
+
+    def next(self):
+        # The responses are served in the recorded order, then the last one again
+        entry = self.entries[min(self.index, len(self.entries) - 1)]
+        self.index += 1
+        return entry
+
+
+class TransportReplayer(object):
+    """
+    Transport of a connection that serves the responses of a recording of TransportRecorder, without a network.
+
+    A request gets the responses recorded for the same method, uri and request body, in the recorded order; when
+    there are none, the responses recorded for the same method and uri, so the login works with other credentials.
+    Once the responses of a request are exhausted, the last one is served again. A request that was not recorded
+    raises HPOneViewReplayError.
+    """
+
+    def __init__(self, path, replay_latency=False):
+        """
+        Args:
+            path: Path of the recording.
+            replay_latency: Whether each response takes the seconds it took when recorded. By default, the responses
+                are served at once.
+        """
+        self._replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._by_body = {}
+        self._by_uri = {}
+        self._replayed = 0
+        self._missed = 0
+        with gzip.open(path, 'rb') as recording:
+            for line in recording:
+                if line.strip():
+                    self.__add(json.loads(line.decode('utf-8')))
+
+    def send(self, send_request, method, path, body, headers):
+        """
+        Serves the recorded response of a request. send_request is not called.
+
+        Returns:
+            tuple: RecordedResponse and the body bytes.
+        """
+        with self._lock:
+            replies = self._by_body.get((method, path, get_body_hash(body))) or self._by_uri.get((method, path))
+            if replies is None:
+                self._missed += 1
+            else:
+                self._replayed += 1
+                entry = replies.next()
+        if replies is None:
+            raise HPOneViewReplayError(REPLAY_NOT_RECORDED % (method, path))
+
+        if self._replay_latency:
+            time.sleep(entry['elapsed'])
+        return entry['response'], entry['tempbytes']
+
+    @property
+    def stats(self):
+        """
+        Gets the number of requests served from the recording, and of requests that were not recorded.
+
+        Returns:
+            dict: replayed, missed
+        """
+        with self._lock:
+            return {'replayed': self._replayed, 'missed': self._missed}
+
+    def __add(self, entry):
+        body = entry.get('body', '')
+        if entry.get('encoding') == BASE64_BODY:
+            tempbytes = base64.b64decode(body)
+        else:
+            tempbytes = body.encode('utf-8')
+        replay = {'response': RecordedResponse(entry['status'], entry.get('reason', ''),
+                                               [tuple(header) for header in entry.get('headers', [])]),
+                  'tempbytes': tempbytes,
+                  'elapsed': entry.get('elapsed', 0)}
+        for replies, key in ((self._by_body, (entry['method'], entry['uri'], entry.get('body_sha256'))),
+                             (self._by_uri, (entry['method'], entry['uri']))):
+            replies.setdefault(key, _Replies()).entries.append(replay)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+resource_cache.py
+~~~~~~~~~~~~
+
+This module keeps the responses of resource reads, to avoid requesting the same resources again
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'resource_cache'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from hpOneView.exceptions import HPOneViewException
+
+DEFAULT_CACHE_TTL = 60
+DEFAULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+HTTP_NOT_MODIFIED = 304
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry(object):
+    def __init__(self, resource_type, data, etag, expires_at):
+        self.resource_type = resource_type
+        self.data = data
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+class ResourceCache(object):
+    """
+    Thread-safe read-through cache of GET responses, keyed by uri.
+
+    An entry is served without a request for `ttl` seconds. Once expired, it is revalidated with a conditional
+    request (If-None-Match with the eTag of the resource): when the appliance answers 304 Not Modified, the entry is
+    served again for another `ttl` seconds, otherwise it is replaced. Entries are kept serialized, so each read
+    returns a new copy that the caller can modify, and their size counts towards `max_bytes`; the least recently
+    used entries are evicted beyond it.
+    """
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL, ttls=None, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        """
+        Args:
+            ttl: Seconds an entry is served without revalidation. 0 revalidates every read.
+            ttls: Dict with the ttl of specific resource types, by the uri of their collection. E.g.:
+                {'/rest/server-hardware-types': 3600}
+            max_bytes: Maximum size of the serialized entries.
+        """
+        self._ttl = ttl
+        self._ttls = dict(ttls or {})
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._epoch = 0
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+
+    def get_ttl(self, resource_type):
+        return self._ttls.get(resource_type, self._ttl)
+
+    def get(self, con, uri, resource_type):
+        """
+        Gets a resource from the cache, requesting it from the appliance when missing or stale.
+
+        Args:
+            con: connection used for the requests
+            uri: uri to GET
+            resource_type: uri of the collection of the resource, to select its ttl and to invalidate it
+
+        Returns:
+            The response body
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.pop(uri, None)
+            if entry is not None:
+                self._entries[uri] = entry
+                if entry.expires_at > now:
+                    self._hits += 1
+                    return json.loads(entry.data)
+            generation = self.__get_generation(resource_type)
+
+        headers = {'If-None-Match': entry.etag} if entry is not None and entry.etag else None
+        resp, body = con.do_http('GET', uri, '', custom_headers=headers)
+
+        if resp.status == HTTP_NOT_MODIFIED and entry is not None:
+            with self._lock:
+                self._hits += 1
+                self._revalidations += 1
+                entry.expires_at = now + self.get_ttl(resource_type)
+            logger.debug('Revalidated cached resource: %s' % uri)
+            return json.loads(entry.data)
+
+        with self._lock:
+            self._misses += 1
+
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+        if resp.status == 302:
+            body = con.get(resp.getheader('Location'))
+
+        if isinstance(body, dict):
+            self.__put(uri, resource_type, generation, json.dumps(body), body.get('eTag') or resp.getheader('ETag'),
+                       now + self.get_ttl(resource_type))
+        return body
+
+    def invalidate(self, resource_type, uri=None):
+        """
+        Removes the entries of a resource type, and the entries under a uri when it is given.
+        Reads of the resource type that are in progress are not cached.
+        """
+        path = uri.split('?')[0] if uri else None
+        with self._lock:
+            self._generations[resource_type] = self._generations.get(resource_type, 0) + 1
+            for key, entry in list(self._entries.items()):
+                if entry.resource_type == resource_type or (path and key.startswith(path)):
+                    self.__remove(key)
+
+    def clear(self):
+        """
+        Removes all the entries.
+        """
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def stats(self):
+        """
+        Gets the cache counters.
+
+        Returns:
+            dict: hits (including revalidations), misses, revalidations, evictions, entries and bytes
+        """
+        with self._lock:
+            return {'hits': self._hits,
+                    'misses': self._misses,
+                    'revalidations': self._revalidations,
+                    'evictions': self._evictions,
+                    'entries': len(self._entries),
+                    'bytes': self._size}
+
+    def __put(self, uri, resource_type, generation, data, etag, expires_at):
+        if len(data) > self._max_bytes:
+            return
+        with self._lock:
+            if self.__get_generation(resource_type) != generation:
+                # Invalidated while it was requested
+                return
+            self.__remove(uri)
+            self._entries[uri] = _CacheEntry(resource_type, data, etag, expires_at)
+            self._size += len(data)
+            while self._size > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self.__remove(oldest)
+                self._evictions += 1
+
+    def __get_generation(self, resource_type):
+        return self._epoch, self._generations.get(resource_type, 0)
+
+    def __remove(self, uri):
+        entry = self._entries.pop(uri, None)
+        if entry is not None:
+            self._size -= len(entry.data)
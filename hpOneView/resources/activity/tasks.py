@@ -93,3 +93,24 @@ class Tasks(object):
         """
         return self._client.get_all(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
                                     fields=fields)
+
+    def iter_all(self, start=0, count=-1, fields='', filter='', query='', sort='', view=''):
+        """
+        Iterates over the tasks page by page. Takes the same arguments as get_all.
+
+        Returns:
+            generator: The tasks, yielded as each page is received.
+        """
+        return self._client.iter_all(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
+                                     fields=fields)
+
+    def get_cursor(self, start=0, page_size=-1, fields='', filter='', query='', sort='', view=''):
+        """
+        Gets a cursor over the pages of the tasks, with random access to any page.
+        Takes the arguments of get_all, with the page size in place of count.
+
+        Returns:
+            hpOneView.pagination.CollectionCursor
+        """
+        return self._client.get_cursor(start=start, page_size=page_size, filter=filter, query=query, sort=sort,
+                                       view=view, fields=fields)
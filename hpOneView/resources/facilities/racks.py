@@ -76,6 +76,25 @@ class Racks(object):
         """
         return self._client.get_all(start, count, filter=filter, sort=sort, query=query)
 
+    def iter_all(self, start=0, count=-1, filter='', query='', sort=''):
+        """
+        Iterates over the racks page by page. Takes the same arguments as get_all.
+
+        Returns:
+            generator: The racks, yielded as each page is received.
+        """
+        return self._client.iter_all(start, count, filter=filter, sort=sort, query=query)
+
+    def get_cursor(self, start=0, page_size=-1, filter='', query='', sort=''):
+        """
+        Gets a cursor over the pages of the racks, with random access to any page.
+        Takes the arguments of get_all, with the page size in place of count.
+
+        Returns:
+            hpOneView.pagination.CollectionCursor
+        """
+        return self._client.get_cursor(start, page_size, filter=filter, sort=sort, query=query)
+
     def get(self, id_or_uri):
         """
         Gets a rack with the specified ID or URI
@@ -70,3 +70,22 @@ class Endpoints(object):
 
         """
         return self._client.get_all(start=start, count=count, query=query, sort=sort)
+
+    def iter_all(self, start=0, count=-1, query='', sort=''):
+        """
+        Iterates over the endpoints page by page. Takes the same arguments as get_all.
+
+        Returns:
+            generator: The endpoints, yielded as each page is received.
+        """
+        return self._client.iter_all(start=start, count=count, query=query, sort=sort)
+
+    def get_cursor(self, start=0, page_size=-1, query='', sort=''):
+        """
+        Gets a cursor over the pages of the endpoints, with random access to any page.
+        Takes the arguments of get_all, with the page size in place of count.
+
+        Returns:
+            hpOneView.pagination.CollectionCursor
+        """
+        return self._client.get_cursor(start=start, page_size=page_size, query=query, sort=sort)
@@ -73,6 +73,25 @@ class SanManagers(object):
         """
         return self._client.get_all(start=start, count=count, query=query, sort=sort)
 
+    def iter_all(self, start=0, count=-1, query='', sort=''):
+        """
+        Iterates over the SAN managers page by page. Takes the same arguments as get_all.
+
+        Returns:
+            generator: The SAN managers, yielded as each page is received.
+        """
+        return self._client.iter_all(start=start, count=count, query=query, sort=sort)
+
+    def get_cursor(self, start=0, page_size=-1, query='', sort=''):
+        """
+        Gets a cursor over the pages of the SAN managers, with random access to any page.
+        Takes the arguments of get_all, with the page size in place of count.
+
+        Returns:
+            hpOneView.pagination.CollectionCursor
+        """
+        return self._client.get_cursor(start=start, page_size=page_size, query=query, sort=sort)
+
     def get(self, id_or_uri):
         """
         Retrieves a single registered SAN Manager by id or uri
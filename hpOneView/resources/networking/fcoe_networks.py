@@ -75,6 +75,25 @@ class FcoeNetworks(object):
         """
         return self._client.get_all(start, count, filter=filter, sort=sort)
 
+    def iter_all(self, start=0, count=-1, filter='', sort=''):
+        """
+        Iterates over the FCoE networks page by page. Takes the same arguments as get_all.
+
+        Returns:
+            generator: The FCoE networks, yielded as each page is received.
+        """
+        return self._client.iter_all(start, count, filter=filter, sort=sort)
+
+    def get_cursor(self, start=0, page_size=-1, filter='', sort=''):
+        """
+        Gets a cursor over the pages of the FCoE networks, with random access to any page.
+        Takes the arguments of get_all, with the page size in place of count.
+
+        Returns:
+            hpOneView.pagination.CollectionCursor
+        """
+        return self._client.get_cursor(start, page_size, filter=filter, sort=sort)
+
     def delete(self, resource, force=False, timeout=-1):
         """
         Deletes a FCoE network.
@@ -37,10 +37,16 @@ __copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
 __license__ = 'MIT'
 __status__ = 'Development'
 
+import functools
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
-from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.resources.task_monitor import TaskMonitor, TaskFuture, NO_WAIT
 from hpOneView.exceptions import HPOneViewUnknownType
+from hpOneView.pagination import CollectionCursor, DEFAULT_PREFETCH_PAGES
+from hpOneView.tracing import PAGE_INDEX_ATTRIBUTE, PAGE_MEMBERS_ATTRIBUTE, RESOURCE_URI_ATTRIBUTE, URI_ATTRIBUTE, \
+    get_tracer
 
 RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED = 'Resource was not provided'
 RESOURCE_CLIENT_INVALID_FIELD = 'Invalid field was provided'
@@ -48,9 +54,28 @@ RESOURCE_CLIENT_INVALID_ID = 'Invalid id was provided'
 RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE = 'Unknown object type'
 UNRECOGNIZED_URI = 'Unrecognized URI for this resource'
 
+START_PARAMETER_PATTERN = re.compile(r'([?&])start=\d+')
+
 logger = logging.getLogger(__name__)
 
 
+def traced(method):
+    """
+    Traces a method of ResourceClient with a span named after it, when the tracer of the connection is enabled.
+    """
+    name = 'ResourceClient.' + method.__name__
+
+    @functools.wraps(method)
+    def traced_method(self, *args, **kwargs):
+        tracer = get_tracer(self._connection)
+        if not tracer.enabled:
+            return method(self, *args, **kwargs)
+        with tracer.start_span(name, {RESOURCE_URI_ATTRIBUTE: self._uri}):
+            return method(self, *args, **kwargs)
+
+    return traced_method
+
+
 class ResourceClient(object):
     """
     This class implements common functions for HpOneView API rest
@@ -61,6 +86,7 @@ class ResourceClient(object):
         self._uri = uri
         self._task_monitor = TaskMonitor(con)
 
+    @traced
     def get_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
         """
         Gets all items according with the given arguments.
@@ -103,35 +129,76 @@ class ResourceClient(object):
         Returns:
             list: A list of items matching the specified filter.
         """
-        if filter:
-            filter = "&filter=" + quote(filter)
+        uri = self.build_query_uri(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
+                                   fields=fields, uri=uri)
 
-        if query:
-            query = "&query=" + quote(query)
+        logger.debug('Getting all resources with uri: {0}'.format(uri))
 
-        if sort:
-            sort = "&sort=" + quote(sort)
+        result = self.__do_requests_to_getall(uri, count)
 
-        if view:
-            view = "&view=" + quote(view)
+        return result
 
-        if fields:
-            fields = "&fields=" + quote(fields)
+    def iter_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
+        """
+        Iterates over all items according with the given arguments, requesting them page by page.
 
-        path = uri if uri else self._uri
-        self.__validate_resource_uri(path)
+        It yields the same items as get_all, without holding them all in memory: the members of a page are yielded
+        while the next page is requested in the background.
 
-        symbol = '?' if '?' not in path else '&'
+        Args:
+            start:
+                The first item to return, using 0-based indexing.
+                If not specified, the default is 0 - start with the first available item.
+            count:
+                The number of resources to return. A count of -1 requests all the items (default).
+            filter:
+                A general filter/query string to narrow the list of items returned. The default is no filter - all
+                resources are returned.
+            query:
+                A single query parameter can do what would take multiple parameters or multiple GET requests using
+                filter. Use query for more complex queries. NOTE: This parameter is experimental for OneView 2.0.
+            sort:
+                The sort order of the returned data set. By default, the sort order is based on create time, with the
+                oldest entry first.
+            view:
+                Returns a specific subset of the attributes of the resource or collection by specifying the name of a
+                predefined view. The default view is expand (show all attributes of the resource, and all elements of
+                collections or resources).
+            fields:
+                Nome of the fields.
+            uri:
+                A specific URI (optional)
 
-        uri = "{0}{1}start={2}&count={3}{4}{5}{6}{7}{8}".format(path, symbol, start, count, filter, query, sort,
-                                                                view, fields)
+        Returns:
+            generator: The items matching the specified filter.
+        """
+        uri = self.build_query_uri(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
+                                   fields=fields, uri=uri)
 
-        logger.debug('Getting all resources with uri: {0}'.format(uri))
+        logger.debug('Iterating over all resources with uri: {0}'.format(uri))
 
-        result = self.__do_requests_to_getall(uri, count)
+        return self.__iter_requests_to_getall(uri, count)
 
-        return result
+    def get_cursor(self, start=0, page_size=-1, filter='', query='', sort='', view='', fields='', uri=None,
+                   prefetch=DEFAULT_PREFETCH_PAGES):
+        """
+        Gets a cursor over the pages of a query, with random access to any page without requesting the previous
+        ones, and lazy iteration over the members.
+
+        Args:
+            start: The first item of the first page, using 0-based indexing.
+            page_size: The number of items of each page. The page size of the appliance by default.
+            filter, query, sort, view, fields, uri: As in get_all.
+            prefetch: Maximum number of pages requested in the background while iterating.
 
+        Returns:
+            hpOneView.pagination.CollectionCursor
+        """
+        uri = self.build_query_uri(start=start, count=page_size, filter=filter, query=query, sort=sort, view=view,
+                                   fields=fields, uri=uri)
+        return CollectionCursor(self._connection, uri, prefetch=prefetch)
+
+    @traced
     def delete(self, resource, force=False, timeout=-1, custom_headers=None):
 
         if not resource:
@@ -153,22 +220,20 @@ class ResourceClient(object):
         logger.debug("Delete resource (uri = %s, resource = %s)" %
                      (self._uri, str(resource)))
 
+        self.__invalidate_cache(uri)
         task, body = self._connection.delete(uri, custom_headers=custom_headers)
 
-        if not task:
-            # 204 NO CONTENT
-            # Successful return from a synchronous delete operation.
-            return True
-
-        task = self._task_monitor.wait_for_task(task, timeout=timeout)
-
-        return task
+        # 204 NO CONTENT when there is no task
+        # Successful return from a synchronous delete operation.
+        return self.__finish_write(uri, task, True, timeout)
 
+    @traced
     def get_schema(self):
         logger.debug('Get schema (uri = %s, resource = %s)' %
                      (self._uri, self._uri))
         return self._connection.get(self._uri + '/schema')
 
+    @traced
     def get(self, id_or_uri):
         """
         Args:
@@ -179,8 +244,12 @@ class ResourceClient(object):
         uri = self.build_uri(id_or_uri)
         logger.debug('Get resource (uri = %s, ID = %s)' %
                      (uri, str(id_or_uri)))
+        cache = self._connection.get_resource_cache()
+        if cache:
+            return cache.get(self._connection, uri, self._uri)
         return self._connection.get(uri)
 
+    @traced
     def get_collection(self, id_or_uri, filter=''):
         """
         Retrieves a collection of resources.
@@ -205,6 +274,7 @@ class ResourceClient(object):
         response = self._connection.get(uri)
         return self.__get_members(response)
 
+    @traced
     def update_with_zero_body(self, uri, timeout=-1, custom_headers=None):
         """
         Makes a PUT request to update a resource, when no request body is required.
@@ -214,7 +284,7 @@ class ResourceClient(object):
                 Could be either the resource id or the resource uri.
             timeout:
                 Timeout in seconds. Wait task completion by default. The timeout does not abort the operation
-                in OneView, just stops waiting for its completion.
+                in OneView, just stops waiting for its completion. With NO_WAIT, returns a TaskFuture at once.
             custom_headers:
                 Allows set specific HTTP headers.
 
@@ -224,6 +294,7 @@ class ResourceClient(object):
 
         return self.__do_put(uri, None, timeout, custom_headers)
 
+    @traced
     def update(self, resource, uri=None, force=False, timeout=-1, custom_headers=None):
         """
         Makes a PUT request to update a resource, when a request body is required.
@@ -236,7 +307,7 @@ class ResourceClient(object):
                 on the resource itself. The default is false.
             timeout:
                 Timeout in seconds. Wait task completion by default. The timeout does not abort the operation
-                in OneView, just stops waiting for its completion.
+                in OneView, just stops waiting for its completion. With NO_WAIT, returns a TaskFuture at once.
             custom_headers:
                 Allows set specific HTTP headers.
 
@@ -257,6 +328,7 @@ class ResourceClient(object):
 
         return self.__do_put(uri, resource, timeout, custom_headers)
 
+    @traced
     def create_with_zero_body(self, uri=None, timeout=-1, custom_headers=None):
         """
         Makes a POST request to create a resource, when no request body is required.
@@ -266,7 +338,7 @@ class ResourceClient(object):
                 Could be either the resource id or the resource uri.
             timeout:
                 Timeout in seconds. Wait task completion by default. The timeout does not abort the operation
-                in OneView, just stops waiting for its completion.
+                in OneView, just stops waiting for its completion. With NO_WAIT, returns a TaskFuture at once.
             custom_headers:
                 Allows set specific HTTP headers.
 
@@ -279,6 +351,7 @@ class ResourceClient(object):
 
         return self.__do_post(uri, None, timeout, custom_headers)
 
+    @traced
     def create(self, resource, uri=None, timeout=-1, custom_headers=None):
         """
         Makes a POST request to create a resource, when a request body is required.
@@ -288,7 +361,7 @@ class ResourceClient(object):
                 Could be either the resource id or the resource uri.
             timeout:
                 Timeout in seconds. Wait task completion by default. The timeout does not abort the operation
-                in OneView, just stops waiting for its completion.
+                in OneView, just stops waiting for its completion. With NO_WAIT, returns a TaskFuture at once.
             custom_headers:
                 Allows set specific HTTP headers.
 
@@ -306,6 +379,7 @@ class ResourceClient(object):
 
         return self.__do_post(uri, resource, timeout, custom_headers)
 
+    @traced
     def patch(self, id_or_uri, operation, path, value, timeout=-1, custom_headers=None):
         """
         Uses the PATCH to update a resource.
@@ -317,7 +391,7 @@ class ResourceClient(object):
             path: Path
             value: Value
             timeout: Timeout in seconds. Wait task completion by default. The timeout does not abort the operation
-                in OneView, just stops waiting for its completion.
+                in OneView, just stops waiting for its completion. With NO_WAIT, returns a TaskFuture at once.
 
         Returns: Updated resource.
         """
@@ -327,13 +401,12 @@ class ResourceClient(object):
             uri, operation, path, value))
 
         patch_request = [{'op': operation, 'path': path, 'value': value}]
+        self.__invalidate_cache(uri)
         task, entity = self._connection.patch(uri, patch_request, custom_headers=custom_headers)
 
-        if not task:
-            return entity
-
-        return self._task_monitor.wait_for_task(task, timeout)
+        return self.__finish_write(uri, task, entity, timeout)
 
+    @traced
     def get_by(self, field, value, uri=None):
         """
         This function uses get_all passing a filter
@@ -358,8 +431,12 @@ class ResourceClient(object):
                      (uri, field, str(value)))
 
         filter = "\"'{0}'='{1}'\"".format(field, value)
+        cache = self._connection.get_resource_cache()
+        if cache:
+            return self.__get_all_cached(cache, filter, uri)
         return self.get_all(filter=filter, uri=uri)
 
+    @traced
     def get_by_name(self, name):
         """
         Retrieve a resource by his name
@@ -374,6 +451,7 @@ class ResourceClient(object):
         else:
             return result[0]
 
+    @traced
     def get_utilization(self, id_or_uri, fields=None, filter=None, refresh=False, view=None):
         """
         Retrieves historical utilization data for the specified resource, metrics, and time span.
@@ -438,7 +516,12 @@ class ResourceClient(object):
         Returns: dict
 
         """
+        return self._connection.get(self.build_utilization_uri(id_or_uri, fields, filter, refresh, view))
 
+    def build_utilization_uri(self, id_or_uri, fields=None, filter=None, refresh=False, view=None):
+        """
+        Builds the uri of the utilization data of a resource, with the arguments of get_utilization.
+        """
         if not id_or_uri:
             raise ValueError(RESOURCE_CLIENT_INVALID_ID)
 
@@ -459,9 +542,7 @@ class ResourceClient(object):
         if query:
             query = "?" + query[1:]
 
-        uri = "{0}/utilization{1}".format(self.build_uri(id_or_uri), query)
-
-        return self._connection.get(uri)
+        return "{0}/utilization{1}".format(self.build_uri(id_or_uri), query)
 
     def build_uri(self, id_or_uri):
         if not id_or_uri:
@@ -474,6 +555,36 @@ class ResourceClient(object):
         else:
             return self._uri + "/" + id_or_uri
 
+    def build_query_uri(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
+        """
+        Builds the uri of a query on the collection, with the arguments of get_all.
+
+        Returns:
+            str: The query uri
+        """
+        if filter:
+            filter = "&filter=" + quote(filter)
+
+        if query:
+            query = "&query=" + quote(query)
+
+        if sort:
+            sort = "&sort=" + quote(sort)
+
+        if view:
+            view = "&view=" + quote(view)
+
+        if fields:
+            fields = "&fields=" + quote(fields)
+
+        path = uri if uri else self._uri
+        self.__validate_resource_uri(path)
+
+        symbol = '?' if '?' not in path else '&'
+
+        return "{0}{1}start={2}&count={3}{4}{5}{6}{7}{8}".format(path, symbol, start, count, filter, query, sort,
+                                                                 view, fields)
+
     def __validate_resource_uri(self, path):
         if self._uri not in path:
             logger.exception('Get by uri : unrecognized uri: (%s)' % path)
@@ -491,33 +602,173 @@ class ResourceClient(object):
             return []
 
     def __do_post(self, uri, resource, timeout, custom_headers):
+        self.__invalidate_cache(uri)
         task, entity = self._connection.post(uri, resource, custom_headers=custom_headers)
 
-        if not task:
-            return entity
-
-        return self._task_monitor.wait_for_task(task, timeout)
+        return self.__finish_write(uri, task, entity, timeout)
 
     def __do_put(self, uri, resource, timeout, custom_headers):
+        self.__invalidate_cache(uri)
         task, body = self._connection.put(uri, resource, custom_headers=custom_headers)
 
+        return self.__finish_write(uri, task, body, timeout)
+
+    def __finish_write(self, uri, task, result, timeout):
+        # The cache entries are invalidated before the write and once it is completed, so the reads made in the
+        # meantime are not kept
+        self.__invalidate_cache(uri)
         if not task:
-            return body
+            return self.__completed(result, timeout)
+
+        result = self._task_monitor.wait_for_task(task, timeout)
+        if isinstance(result, TaskFuture):
+            result.add_done_callback(lambda future: self.__invalidate_cache(uri))
+        else:
+            self.__invalidate_cache(uri)
+        return result
 
-        return self._task_monitor.wait_for_task(task, timeout)
+    @staticmethod
+    def __completed(result, timeout):
+        # Operations completed without a task return a future that is already done when called with NO_WAIT
+        if timeout == NO_WAIT:
+            return TaskFuture.from_result(result)
+        return result
 
     def __do_requests_to_getall(self, uri, count):
         items = []
-        request_needed = True
+        workers = self._connection.get_page_workers()
+        page_index = 0
 
-        while request_needed:
+        while uri:
             logger.debug('Making HTTP request to get all resources. Uri: {0}'.format(uri))
-            response = self._connection.get(uri)
-            members = self.__get_members(response)
-            uri = response.get('nextPageUri')
-            items += members
-            logger.debug("Response getAll: nextPageUri = {0}, members list length: {1}".format(uri, str(len(members))))
-            request_needed = uri and not len(members) == 0 and (len(items) < count or count == -1)
+            response = self.__get_page(uri, page_index)
+            page_index += 1
+            uri = self.__add_page(items, response, count)
+
+            if uri and workers > 1:
+                page_uris = self.__get_next_page_uris(response, uri, count, len(items))
+                if len(page_uris) > 1:
+                    uri = self.__do_concurrent_requests_to_getall(items, page_uris, count, workers, page_index)
+                    page_index += len(page_uris)
 
         logger.debug('Total # of members found = {0}'.format(str(len(items))))
         return items
+
+    def __iter_requests_to_getall(self, uri, count):
+        found = 0
+        page_index = 0
+        parent = get_tracer(self._connection).get_current_span()
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            logger.debug('Making HTTP request to iterate over all resources. Uri: {0}'.format(uri))
+            next_page = executor.submit(self.__get_page, uri, page_index, parent)
+
+            while next_page:
+                members = self.__get_members(next_page.result())
+                uri = next_page.result().get('nextPageUri')
+                found += len(members)
+                logger.debug("Response iterAll: nextPageUri = {0}, members list length: {1}".format(
+                    uri, str(len(members))))
+
+                next_page = None
+                if uri and not len(members) == 0 and (found < count or count == -1):
+                    # The next page is requested while the caller consumes this one
+                    logger.debug('Making HTTP request to iterate over all resources. Uri: {0}'.format(uri))
+                    page_index += 1
+                    next_page = executor.submit(self.__get_page, uri, page_index, parent)
+
+                for member in members:
+                    yield member
+        finally:
+            if next_page:
+                next_page.cancel()
+            executor.shutdown(wait=False)
+
+    def __get_page(self, uri, page_index, parent=None):
+        """
+        Gets a page of a collection, traced with a span when the tracer is enabled. The parent span is given for the
+        pages requested by worker threads.
+        """
+        tracer = get_tracer(self._connection)
+        if not tracer.enabled:
+            return self._connection.get(uri)
+
+        attributes = {URI_ATTRIBUTE: uri, PAGE_INDEX_ATTRIBUTE: page_index}
+        with tracer.start_span('ResourceClient.page', attributes, parent) as span:
+            response = self._connection.get(uri)
+            span.set_attribute(PAGE_MEMBERS_ATTRIBUTE, len(self.__get_members(response)))
+            return response
+
+    def __get_all_cached(self, cache, filter, uri):
+        """
+        Gets all items matching the filter, with the first page read through the cache.
+        """
+        uri = self.build_query_uri(filter=filter, uri=uri)
+        items = []
+        next_uri = self.__add_page(items, cache.get(self._connection, uri, self._uri), -1)
+        if next_uri:
+            items += self.__do_requests_to_getall(next_uri, -1)
+        return items
+
+    def __invalidate_cache(self, uri=None):
+        cache = self._connection.get_resource_cache()
+        if cache:
+            cache.invalidate(self._uri, uri)
+
+    def __add_page(self, items, response, count):
+        """
+        Adds the members of a page to the items and returns the uri of the next page to request, if any.
+        """
+        members = self.__get_members(response)
+        uri = response.get('nextPageUri')
+        items += members
+        logger.debug("Response getAll: nextPageUri = {0}, members list length: {1}".format(uri, str(len(members))))
+        request_needed = uri and not len(members) == 0 and (len(items) < count or count == -1)
+        return uri if request_needed else None
+
+    def __get_next_page_uris(self, response, next_page_uri, count, items_found):
+        """
+        Computes the uris of the pages still needed, from the total and the page size reported by the first page.
+        """
+        page_size = len(self.__get_members(response))
+        total = response.get('total')
+        match = re.search(r'[?&]start=(\d+)', next_page_uri)
+        if not page_size or not total or not match:
+            return []
+
+        page_uris = []
+        start = int(match.group(1))
+        while start < total and (count == -1 or items_found < count):
+            page_uris.append(START_PARAMETER_PATTERN.sub(r'\g<1>start={0}'.format(start), next_page_uri))
+            start += page_size
+            items_found += page_size
+        return page_uris
+
+    def __do_concurrent_requests_to_getall(self, items, page_uris, count, workers, page_index):
+        """
+        Requests the pages concurrently and adds their members to the items, in order.
+
+        The pages are checked against the nextPageUri chain: the result is the same as requesting each page
+        after the previous one. If the chain diverges from the computed uris, the remaining pages are discarded
+        and the uri to continue from is returned.
+        """
+        logger.debug('Making {0} concurrent HTTP requests to get all resources'.format(len(page_uris)))
+
+        parent = get_tracer(self._connection).get_current_span()
+        with ThreadPoolExecutor(max_workers=min(workers, len(page_uris))) as executor:
+            futures = [executor.submit(self.__get_page, page_uri, page_index + index, parent)
+                       for index, page_uri in enumerate(page_uris)]
+            try:
+                for index, future in enumerate(futures):
+                    uri = self.__add_page(items, future.result(), count)
+                    if not uri:
+                        break
+                    next_index = index + 1
+                    if next_index < len(page_uris) and uri != page_uris[next_index]:
+                        logger.debug('Unexpected nextPageUri: {0}, continuing from it'.format(uri))
+                        break
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        return uri
@@ -78,6 +78,25 @@ class Connections(object):
         """
         return self._client.get_all(start, count, filter=filter, sort=sort, view=view, fields=fields)
 
+    def iter_all(self, start=0, count=-1, filter='', sort='', view='', fields=''):
+        """
+        Iterates over the connections page by page. Takes the same arguments as get_all.
+
+        Returns:
+            generator: The connections, yielded as each page is received.
+        """
+        return self._client.iter_all(start, count, filter=filter, sort=sort, view=view, fields=fields)
+
+    def get_cursor(self, start=0, page_size=-1, filter='', sort='', view='', fields=''):
+        """
+        Gets a cursor over the pages of the connections, with random access to any page.
+        Takes the arguments of get_all, with the page size in place of count.
+
+        Returns:
+            hpOneView.pagination.CollectionCursor
+        """
+        return self._client.get_cursor(start, page_size, filter=filter, sort=sort, view=view, fields=fields)
+
     def get_by(self, field, value):
         """
         Get all connections that match the filter
@@ -154,6 +154,25 @@ class ServerHardware(object):
         """
         return self._client.get_all(start, count, filter=filter, sort=sort)
 
+    def iter_all(self, start=0, count=-1, filter='', sort=''):
+        """
+        Iterates over the server hardware resources page by page. Takes the same arguments as get_all.
+
+        Returns:
+            generator: The server hardware resources, yielded as each page is received.
+        """
+        return self._client.iter_all(start, count, filter=filter, sort=sort)
+
+    def get_cursor(self, start=0, page_size=-1, filter='', sort=''):
+        """
+        Gets a cursor over the pages of the server hardware resources, with random access to any page.
+        Takes the arguments of get_all, with the page size in place of count.
+
+        Returns:
+            hpOneView.pagination.CollectionCursor
+        """
+        return self._client.get_cursor(start, page_size, filter=filter, sort=sort)
+
     def add(self, information, timeout=-1):
         """
         Adds a rack-mount server for management by the appliance. This API initiates the asynchronous addition of
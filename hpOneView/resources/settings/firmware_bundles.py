@@ -53,7 +53,7 @@ class FirmwareBundles(object):
         self._client = ResourceClient(con, self.URI)
         self._task_monitor = TaskMonitor(con)
 
-    def upload(self, file_path, timeout=-1):
+    def upload(self, file_path, timeout=-1, progress_callback=None):
         """
         Upload an SPP ISO image file or a hotfix file to the appliance.
         The API supports upload of one hotfix at a time into the system.
@@ -64,13 +64,17 @@ class FirmwareBundles(object):
             timeout:
                 Timeout in seconds. Wait task completion by default. The timeout does not abort the operation
                 in OneView, just stops waiting for its completion.
+            progress_callback:
+                Function called while the file is uploaded, with the bytes sent, the total bytes and the upload rate
+                in bytes per second.
 
         Returns:
           dict: Information about the updated firmware bundle.
 
         """
         upload_file_name = os.path.basename(file_path)
-        response, body = self._connection.post_multipart(self.URI, None, file_path, upload_file_name)
+        response, body = self._connection.post_multipart(self.URI, None, file_path, upload_file_name,
+                                                         progress_callback=progress_callback)
         if response.status >= 400:
             raise HPOneViewException(body.get('message'))
 
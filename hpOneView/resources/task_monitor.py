@@ -38,8 +38,14 @@ __license__ = 'MIT'
 __status__ = 'Development'
 
 import logging
+import threading
 import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import quote
 from hpOneView.exceptions import HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError, HPOneViewUnknownType
+from hpOneView.exceptions import HPOneViewException, HPOneViewMultipleTaskErrors
+from hpOneView.tracing import TASK_STATE_ATTRIBUTE, TASK_URI_ATTRIBUTE, TASKS_RUNNING_ATTRIBUTE, get_tracer
 
 TASK_PENDING_STATES = ['New', 'Starting', 'Pending', 'Running', 'Suspended', 'Stopping']
 TASK_ERROR_STATES = ['Error', 'Warning', 'Terminated', 'Killed']
@@ -50,9 +56,28 @@ MSG_TASK_TYPE_UNRECONIZED = "Task type: '%s' resource is not a recognized versio
 MSG_UNKNOWN_EXCEPTION = 'Unknown Exception'
 MSG_TIMEOUT = 'Waited %s seconds for task to complete, aborting'
 MSG_INVALID_TASK = 'Invalid task was provided'
+MSG_TASKS_FAILED = '%s of %s tasks failed. First error: %s'
+
+TASKS_URI = '/rest/tasks'
+# Maximum number of task uris in the filter of one request, to keep the request uri short
+TASKS_PER_REQUEST = 40
+# Maximum number of associated resources requested at the same time when the tasks complete
+MAX_CONCURRENT_RESOURCE_REQUESTS = 8
 
 UNLIMITED_TIMEOUT = -1
 
+# States reported to the hooks when a wait ends without the state of the task
+TASK_WAIT_TIMEOUT_STATE = 'Timeout'
+TASK_WAIT_UNKNOWN_STATE = 'Unknown'
+# Timeout value to return a TaskFuture instead of waiting for the task
+NO_WAIT = 'NO_WAIT'
+
+# Seconds between two polls of the background task poller. The interval grows while no task is submitted.
+MIN_POLL_INTERVAL = 1
+MAX_POLL_INTERVAL = 10
+# Failed polls of all the tasks together before the poller requests the tasks one by one for a round
+FAILED_POLLS_BEFORE_FALLBACK = 2
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,41 +94,179 @@ class TaskMonitor(object):
         Wait for task execution and return associated resource
         Args:
             task: task dict
-            timeout: timeout in seconds
+            timeout: timeout in seconds. With NO_WAIT, returns at once a TaskFuture tracked by the shared background
+                poller of the connection.
 
-        Returns: associated resource when creating or updating; True when deleting
+        Returns: associated resource when creating or updating; True when deleting. A TaskFuture with NO_WAIT.
         """
         if not task:
             raise HPOneViewUnknownType(MSG_INVALID_TASK)
 
+        if timeout == NO_WAIT:
+            return TaskPoller.get_poller(self._connection).submit(task)
+
         logger.debug('Waiting for task')
 
         # gets current cpu second for timeout
         start_time = self.get_current_seconds()
+        wait_start = time.time()
+        state = TASK_WAIT_UNKNOWN_STATE
+
+        with get_tracer(self._connection).start_span('TaskMonitor.wait_for_task',
+                                                     {TASK_URI_ATTRIBUTE: task.get('uri')}) as span:
+            try:
+                i = 0
+                while self.is_task_running(task):
+                    # wait 1 to 10 seconds
+                    # the value increases to avoid flooding server with requests
+                    i = i + 1 if i < 10 else 10
+
+                    logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
+                    logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
+
+                    time.sleep(i)
+                    if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
+                        state = TASK_WAIT_TIMEOUT_STATE
+                        raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+
+                task = self.get(task)
+                state = task.get('taskState', state)
+
+                logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
+                logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
+
+                task_response = self.get_task_response(task)
+                logger.debug('Task completed')
+                return task_response
+            finally:
+                span.set_attribute(TASK_STATE_ATTRIBUTE, state)
+                self._notify_task_wait(task.get('uri'), state, wait_start)
+
+    def wait_for_tasks(self, tasks, timeout=-1):
+        """
+        Wait for the execution of several tasks and return their associated resources.
 
-        i = 0
-        while self.is_task_running(task):
-            # wait 1 to 10 seconds
-            # the value increases to avoid flooding server with requests
-            i = i + 1 if i < 10 else 10
+        The tasks are tracked together: each polling round requests all the running tasks with a filtered GET on
+        /rest/tasks (one request per TASKS_PER_REQUEST tasks), instead of one request per task. When all the tasks are
+        completed, the associated resources are requested concurrently.
+
+        Args:
+            tasks: list of task dicts
+            timeout: timeout in seconds for all the tasks
 
-            logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
-            logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
+        Returns:
+            list: The associated resource of each task (True for delete tasks), in the order of the given tasks
+
+        Raises:
+            HPOneViewMultipleTaskErrors: when any of the tasks fails; it holds the result and the error of each task,
+                in the order of the given tasks.
+        """
+        for task in tasks:
+            if not task:
+                raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        logger.debug('Waiting for %s tasks' % len(tasks))
+
+        start_time = self.get_current_seconds()
+        wait_start = time.time()
+        latest = {task['uri']: task for task in tasks if 'uri' in task}
+        running = list(latest.keys())
+        state = TASK_WAIT_UNKNOWN_STATE
+
+        tracer = get_tracer(self._connection)
+        i = 0
+        try:
+            while True:
+                with tracer.start_span('TaskMonitor.poll_tasks', {TASKS_RUNNING_ATTRIBUTE: len(running)}):
+                    latest.update(self.get_tasks_by_uri(running))
+                for task_uri in running:
+                    if latest[task_uri].get('taskState') not in TASK_PENDING_STATES:
+                        self._notify_task_wait(task_uri, latest[task_uri].get('taskState'), wait_start)
+                running = [task_uri for task_uri in running
+                           if latest[task_uri].get('taskState') in TASK_PENDING_STATES]
+                logger.debug("Waiting for tasks. Tasks running: %s of %s" % (len(running), len(latest)))
+                if not running:
+                    break
+
+                i = i + 1 if i < 10 else 10
+                time.sleep(i)
+                if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
+                    state = TASK_WAIT_TIMEOUT_STATE
+                    raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+        finally:
+            for task_uri in running:
+                self._notify_task_wait(task_uri, state, wait_start)
+
+        completed = [latest[task['uri']] if 'uri' in task else task for task in tasks]
+        return self.__get_tasks_responses(completed)
+
+    def _notify_task_wait(self, task_uri, state, wait_start):
+        if self._connection.get_hooks():
+            self._connection._notify_hooks('on_task_wait', task_uri, state, time.time() - wait_start)
+
+    def get_tasks_by_uri(self, task_uris):
+        """
+        Gets the tasks with a filtered request per TASKS_PER_REQUEST uris. The tasks missing from the responses,
+        or from a filtered request rejected by the appliance, are requested one by one.
 
-            time.sleep(i)
-            if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
-                raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+        Args:
+            task_uris: list of task uris
 
-        task = self.get(task)
+        Returns:
+            dict: tasks by uri
+        """
+        tasks = {}
+        for index in range(0, len(task_uris), TASKS_PER_REQUEST):
+            chunk = task_uris[index:index + TASKS_PER_REQUEST]
+            task_filter = ' OR '.join("uri='{0}'".format(task_uri) for task_uri in chunk)
+            uri = '{0}?filter={1}&count={2}'.format(TASKS_URI, quote('"{0}"'.format(task_filter)), len(chunk))
+            try:
+                response = self._connection.get(uri)
+            except HPOneViewException as e:
+                logger.debug('Filtered request of %s tasks failed, requesting them one by one: %s' % (len(chunk), e))
+                continue
+            for task in response.get('members') or []:
+                if task.get('uri') in chunk:
+                    tasks[task['uri']] = task
+
+        for task_uri in task_uris:
+            if task_uri not in tasks:
+                tasks[task_uri] = self.get({'uri': task_uri})
+        return tasks
+
+    def __get_tasks_responses(self, tasks):
+        def get_response(task):
+            try:
+                return self.get_task_response(task), None
+            except HPOneViewTaskError as e:
+                return None, e
+
+        workers = max(1, min(len(tasks), MAX_CONCURRENT_RESOURCE_REQUESTS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            responses = list(executor.map(get_response, tasks))
+
+        results = [result for result, _ in responses]
+        errors = [error for _, error in responses]
+        failed = [error for error in errors if error is not None]
+        if failed:
+            raise HPOneViewMultipleTaskErrors(MSG_TASKS_FAILED % (len(failed), len(tasks), failed[0].msg),
+                                              results, errors)
+
+        logger.debug('Tasks completed')
+        return results
+
+    def get_task_response(self, task):
+        """
+        Gets the result of a completed task.
 
-        logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
-        logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
+        Args:
+            task: completed task dict
 
-        task_response = self.__get_task_response(task)
-        logger.debug('Task completed')
-        return task_response
+        Returns: associated resource when creating or updating; True when deleting
 
-    def __get_task_response(self, task):
+        Raises:
+            HPOneViewTaskError: when the task failed
+        """
         if task['taskState'] in TASK_ERROR_STATES and task['taskState'] != 'Warning':
             msg = None
             if 'taskErrors' in task and len(task['taskErrors']) > 0:
@@ -145,7 +308,9 @@ class TaskMonitor(object):
 
         """
         if 'uri' in task:
-            task = self.get(task)
+            with get_tracer(self._connection).start_span('TaskMonitor.poll', {TASK_URI_ATTRIBUTE: task['uri']}) as span:
+                task = self.get(task)
+                span.set_attribute(TASK_STATE_ATTRIBUTE, task.get('taskState'))
             if 'taskState' in task and task['taskState'] in TASK_PENDING_STATES:
                 return True
         return False
@@ -202,3 +367,224 @@ class TaskMonitor(object):
             entity = self._connection.get(resource_uri)
 
         return task, entity
+
+
+class TaskFuture(Future):
+    """
+    Future for the result of a OneView task, returned by the operations called with timeout=NO_WAIT.
+
+    The result is the associated resource when creating or updating, True when deleting. A failed task sets a
+    HPOneViewTaskError as the exception. Cancelling the future stops tracking the task; it does not abort the
+    operation in OneView.
+    """
+
+    def __init__(self, task):
+        super(TaskFuture, self).__init__()
+        self._task = task
+        self._wait_start = time.time()
+
+    @property
+    def task(self):
+        """
+        The task dict as of the latest poll.
+        """
+        return self._task
+
+    @property
+    def percent_complete(self):
+        """
+        The computedPercentComplete of the task as of the latest poll.
+        """
+        return self._task.get('computedPercentComplete')
+
+    @property
+    def task_state(self):
+        """
+        The taskState of the task as of the latest poll.
+        """
+        return self._task.get('taskState')
+
+    def _update(self, task):
+        self._task = task
+
+    @classmethod
+    def from_result(cls, result, task=None):
+        """
+        Creates a future that is already done, for operations that completed without a task.
+        """
+        future = cls(task or {})
+        future.set_running_or_notify_cancel()
+        future.set_result(result)
+        return future
+
+
+class TaskPoller(object):
+    """
+    Tracks the TaskFutures of a connection with a single background thread.
+
+    Each polling round requests all the running tasks together (see TaskMonitor.get_tasks_by_uri). A failed round
+    leaves the futures pending; after FAILED_POLLS_BEFORE_FALLBACK failed rounds in a row, the tasks are requested one
+    by one, and a future fails only when the request of its own task is rejected. The thread starts when a task is
+    submitted and stops when no task is left to track.
+    """
+    _pollers = weakref.WeakKeyDictionary()
+    _pollers_lock = threading.Lock()
+
+    def __init__(self, con):
+        # The poller must not keep the connection alive: it is cached with the connection as a weak key
+        self._task_monitor = TaskMonitor(weakref.proxy(con))
+        self._condition = threading.Condition()
+        self._futures = {}
+        self._thread = None
+        self._interval = MIN_POLL_INTERVAL
+        self._failed_polls = 0
+
+    @classmethod
+    def get_poller(cls, con):
+        """
+        Gets the poller shared by all the resources of a connection.
+        """
+        with cls._pollers_lock:
+            poller = cls._pollers.get(con)
+            if poller is None:
+                poller = cls(con)
+                cls._pollers[con] = poller
+            return poller
+
+    def submit(self, task):
+        """
+        Starts tracking a task.
+
+        Args:
+            task: task dict, must have 'uri' key
+
+        Returns:
+            TaskFuture: future for the task result
+        """
+        if 'uri' not in task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        future = TaskFuture(task)
+        with self._condition:
+            self._futures.setdefault(task['uri'], []).append(future)
+            self._interval = MIN_POLL_INTERVAL
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run, name='TaskPoller')
+                self._thread.daemon = True
+                self._thread.start()
+            else:
+                self._condition.notify()
+        return future
+
+    def pending(self):
+        """
+        Gets the number of tasks being tracked.
+        """
+        with self._condition:
+            return len(self._futures)
+
+    def __run(self):
+        last_poll = 0
+        while True:
+            with self._condition:
+                if last_poll:
+                    self.__wait(last_poll)
+                self.__discard_cancelled()
+                if not self._futures:
+                    self._thread = None
+                    return
+                task_uris = list(self._futures.keys())
+
+            last_poll = time.time()
+            errors = {}
+            if self._failed_polls < FAILED_POLLS_BEFORE_FALLBACK:
+                try:
+                    tasks = self._task_monitor.get_tasks_by_uri(task_uris)
+                except Exception as e:
+                    # The tasks are still running in OneView, they are polled again in the next round
+                    self._failed_polls += 1
+                    logger.warning('Failed to poll %s tasks: %s' % (len(task_uris), e))
+                    continue
+            else:
+                tasks, errors = self.__poll_one_by_one(task_uris)
+            self._failed_polls = 0
+
+            logger.debug('Polled %s tasks' % len(task_uris))
+            self.__complete(list(errors.items()), self.__set_exception)
+            completed = []
+            with self._condition:
+                for task_uri, task in tasks.items():
+                    for future in self._futures.get(task_uri, []):
+                        future._update(task)
+                    if task.get('taskState') not in TASK_PENDING_STATES:
+                        completed.append((task_uri, task))
+            self.__complete(completed, self.__set_result)
+
+    def __poll_one_by_one(self, task_uris):
+        # A future fails only when the appliance rejects the request of its own task; on other errors the task is
+        # polled again in the next round
+        tasks = {}
+        errors = {}
+        for task_uri in task_uris:
+            try:
+                tasks[task_uri] = self._task_monitor.get({'uri': task_uri})
+            except HPOneViewException as e:
+                errors[task_uri] = e
+            except Exception as e:
+                logger.warning('Failed to poll task %s: %s' % (task_uri, e))
+        return tasks, errors
+
+    def __wait(self, last_poll):
+        # Waits 1 to 10 seconds since the last poll, the interval increases to avoid flooding the server with
+        # requests. A submitted task resets the interval, so it is polled at most MIN_POLL_INTERVAL later.
+        wait = last_poll + self._interval - time.time()
+        while wait > 0:
+            self._condition.wait(wait)
+            wait = last_poll + self._interval - time.time()
+        self._interval = min(self._interval + 1, MAX_POLL_INTERVAL)
+
+    def __discard_cancelled(self):
+        for task_uri in list(self._futures.keys()):
+            futures = [future for future in self._futures[task_uri] if not future.cancelled()]
+            if futures:
+                self._futures[task_uri] = futures
+            else:
+                del self._futures[task_uri]
+
+    def __complete(self, items, set_outcome):
+        with self._condition:
+            items = [(self._futures.pop(task_uri, []), value) for task_uri, value in items]
+
+        if len(items) > 1:
+            workers = min(len(items), MAX_CONCURRENT_RESOURCE_REQUESTS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda item: set_outcome(*item), items))
+        else:
+            for futures, value in items:
+                set_outcome(futures, value)
+
+    def __set_result(self, futures, task):
+        futures = [future for future in futures if future.set_running_or_notify_cancel()]
+        if not futures:
+            return
+        try:
+            result = self._task_monitor.get_task_response(task)
+        except Exception as e:
+            self.__notify_task_wait(futures, task.get('taskState'))
+            for future in futures:
+                future.set_exception(e)
+        else:
+            self.__notify_task_wait(futures, task.get('taskState'))
+            for future in futures:
+                future.set_result(result)
+
+    def __set_exception(self, futures, error):
+        futures = [future for future in futures if future.set_running_or_notify_cancel()]
+        self.__notify_task_wait(futures, TASK_WAIT_UNKNOWN_STATE)
+        for future in futures:
+            future.set_exception(error)
+
+    def __notify_task_wait(self, futures, state):
+        # Reported before the futures are done, so that the wait is counted when the caller gets the result
+        for future in futures:
+            self._task_monitor._notify_task_wait(future.task.get('uri'), state, future._wait_start)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+retry.py
+~~~~~~~~~~~~
+
+This module decides when a failed request is sent again, and how long to wait before it
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'retry'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import errno
+import http.client
+import logging
+import random
+import socket
+import threading
+import time
+from email.utils import parsedate_tz, mktime_tz
+
+# Methods that can be sent again without repeating their effect
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+# Too Many Requests, Bad Gateway, Service Unavailable and Gateway Timeout
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+
+DEFAULT_RETRY_ATTEMPTS = 4
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_MAX_BACKOFF = 30
+DEFAULT_RETRY_DEADLINE = 120
+
+logger = logging.getLogger(__name__)
+
+
+class RetryAttempts(object):
+    """
+    Attempts of one request.
+    """
+
+    def __init__(self, deadline):
+        self.count = 1
+        self.deadline = deadline
+
+
+class RetryPolicy(object):
+    """
+    Retries requests that fail with a connection error, or with one of the `statuses`, with an exponential
+    back-off: the n-th retry waits a random time between 0 and backoff_factor * 2 ** (n - 1) seconds, at most
+    max_backoff. A Retry-After header sent by the appliance sets the wait instead.
+
+    Only the `methods` are retried, except on connection refused, since the request was not sent then. A request
+    is given up after max_attempts attempts, or when the next one would start after `deadline` seconds.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_RETRY_ATTEMPTS, backoff_factor=DEFAULT_RETRY_BACKOFF,
+                 max_backoff=DEFAULT_RETRY_MAX_BACKOFF, deadline=DEFAULT_RETRY_DEADLINE, jitter=True,
+                 methods=IDEMPOTENT_METHODS, statuses=RETRY_STATUSES, on_retry=None):
+        """
+        Args:
+            max_attempts: Maximum number of attempts of a request, including the first one.
+            backoff_factor: Seconds of the first back-off, doubled on each retry.
+            max_backoff: Maximum seconds of a back-off.
+            deadline: Seconds after the first attempt when no more retries are started.
+            jitter: Whether each back-off is a random time up to its value, so that clients that failed
+                together do not retry together.
+            methods: HTTP methods retried.
+            statuses: HTTP statuses retried.
+            on_retry: Function called before each retry with the method, the path, the number of the failed attempt,
+                the reason (the status or the name of the error) and the seconds it waits.
+        """
+        if max_attempts < 1:
+            raise ValueError('The maximum number of attempts must be at least 1')
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.jitter = jitter
+        self.methods = frozenset(method.upper() for method in methods)
+        self.statuses = frozenset(statuses)
+        self.on_retry = on_retry
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        self._retries = 0
+        self._gave_up = 0
+        self._backoff_seconds = 0.0
+        self._reasons = {}
+
+    def begin(self):
+        """
+        Starts counting the attempts of a request.
+
+        Returns:
+            RetryAttempts
+        """
+        return RetryAttempts(time.time() + self.deadline)
+
+    def get_retry_delay(self, attempts, method, path, status=None, error=None, retry_after=None):
+        """
+        Decides whether a failed attempt is retried.
+
+        Args:
+            attempts: RetryAttempts of the request.
+            method: HTTP method.
+            path: Path of the request.
+            status: HTTP status of the response, if any.
+            error: Exception raised by the attempt, if any.
+            retry_after: Value of the Retry-After header of the response, if any.
+
+        Returns:
+            Seconds to wait before the next attempt, or None when the request must not be retried.
+        """
+        if status is not None:
+            if status not in self.statuses or method not in self.methods:
+                return None
+            reason = str(status)
+        else:
+            if not self.is_retryable_error(method, error):
+                return None
+            reason = type(error).__name__
+
+        delay = self.__get_retry_after(retry_after)
+        if delay is None:
+            delay = self.get_backoff(attempts.count)
+        if attempts.count >= self.max_attempts or time.time() + delay > attempts.deadline:
+            with self._lock:
+                self._gave_up += 1
+            logger.warning('Giving up %s %s after %d attempts: %s' % (method, path, attempts.count, reason))
+            return None
+
+        with self._lock:
+            self._retries += 1
+            self._backoff_seconds += delay
+            self._reasons[reason] = self._reasons.get(reason, 0) + 1
+        logger.warning('Retrying %s %s in %.2f seconds, attempt %d of %d failed: %s' %
+                       (method, path, delay, attempts.count, self.max_attempts, reason))
+        if self.on_retry:
+            self.on_retry(method, path, attempts.count, reason, delay)
+        attempts.count += 1
+        return delay
+
+    def is_retryable_error(self, method, error):
+        if not isinstance(error, (socket.error, http.client.HTTPException)):
+            return False
+        # A refused connection did not send the request
+        return method in self.methods or getattr(error, 'errno', None) == errno.ECONNREFUSED
+
+    def get_backoff(self, retry):
+        """
+        Gets the seconds to wait before a retry.
+
+        Args:
+            retry: Number of the retry, from 1.
+        """
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** (retry - 1)))
+        if self.jitter:
+            return self._random.uniform(0, backoff)
+        return backoff
+
+    @staticmethod
+    def __get_retry_after(retry_after):
+        if not retry_after:
+            return None
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+        date = parsedate_tz(retry_after)
+        if date is None:
+            return None
+        return max(mktime_tz(date) - time.time(), 0.0)
+
+    @property
+    def stats(self):
+        """
+        Gets the retry counters.
+
+        Returns:
+            dict: retries, gave_up (requests that failed after being retried, or whose retry would exceed the limits),
+                backoff_seconds (total time waited) and reasons (retries by status or error name)
+        """
+        with self._lock:
+            return {'retries': self._retries,
+                    'gave_up': self._gave_up,
+                    'backoff_seconds': self._backoff_seconds,
+                    'reasons': dict(self._reasons)}
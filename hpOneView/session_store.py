@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+session_store.py
+~~~~~~~~~~~~
+
+This module keeps the login sessions, so that other connections and processes can reuse them instead of logging in
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'session_store'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+import os
+import tempfile
+import threading
+
+DEFAULT_SESSION_STORE_PATH = os.path.join(os.path.expanduser('~'), '.hpOneView', 'sessions.json')
+
+# PBKDF2 iterations of the hash of the credentials kept with each session
+CREDENTIALS_HASH_ITERATIONS = 10000
+
+logger = logging.getLogger(__name__)
+
+
+def get_session_key(host, cred):
+    """
+    Gets the key of the session of a user in an appliance.
+
+    Args:
+        host: Appliance address.
+        cred: Login credentials, with the userName and optionally the authLoginDomain.
+
+    Returns:
+        str: <authLoginDomain>\\<userName>@<host>, without the domain when it is empty.
+    """
+    user = cred.get('userName', '')
+    if cred.get('authLoginDomain'):
+        user = '%s\\%s' % (cred['authLoginDomain'], user)
+    return '%s@%s' % (user, host)
+
+
+def get_credentials_hash(cred, salt):
+    """
+    Gets the salted hash of the login credentials, kept with a session so it is only reused with the same credentials.
+
+    Args:
+        cred: Login credentials.
+        salt: Hexadecimal salt of the session.
+
+    Returns:
+        str: Hexadecimal PBKDF2-SHA256 hash of the credentials.
+    """
+    data = json.dumps(cred, sort_keys=True).encode('utf-8')
+    digest = hashlib.pbkdf2_hmac('sha256', data, binascii.unhexlify(salt), CREDENTIALS_HASH_ITERATIONS)
+    return binascii.hexlify(digest).decode('ascii')
+
+
+def make_session(cred, session_id, api_version):
+    """
+    Makes the session to store for a login.
+
+    Returns:
+        dict: The sessionID, the apiVersion, and the salt and credentialsHash of the credentials.
+    """
+    salt = binascii.hexlify(os.urandom(16)).decode('ascii')
+    return {'sessionID': session_id, 'apiVersion': api_version, 'salt': salt,
+            'credentialsHash': get_credentials_hash(cred, salt)}
+
+
+def is_session_of(session, cred):
+    """
+    Checks whether a stored session was created with the credentials.
+
+    Returns:
+        bool: False for a session stored without the hash of its credentials, or with other credentials.
+    """
+    salt = session.get('salt')
+    expected = session.get('credentialsHash')
+    if not salt or not expected:
+        return False
+    try:
+        return hmac.compare_digest(get_credentials_hash(cred, salt), expected)
+    except (binascii.Error, TypeError, ValueError):
+        return False
+
+
+class SessionStore(object):
+    """
+    Keeps the sessions in memory, shared by the connections of the process that use the same store.
+
+    Other backends (a keyring, a shared cache...) subclass it and override get, set and delete. A session is a dict
+    with the sessionID, the apiVersion validated when it was created and a salted hash of the credentials of its
+    login; passwords are never stored.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def get(self, key):
+        """
+        Gets a session.
+
+        Returns:
+            dict: The session, or None when there is none for the key.
+        """
+        with self._lock:
+            session = self._sessions.get(key)
+            return dict(session) if session else None
+
+    def set(self, key, session):
+        with self._lock:
+            self._sessions[key] = dict(session)
+
+    def delete(self, key):
+        with self._lock:
+            self._sessions.pop(key, None)
+
+
+class FileSessionStore(SessionStore):
+    """
+    Keeps the sessions in a JSON file, readable and writable only by its owner (mode 0600), so they are reused by the
+    following processes of the same user.
+
+    The file is read on each get, and replaced atomically on each change. When several processes change it at the
+    same time, the last one wins: a lost session only costs a new login.
+    """
+
+    def __init__(self, path=DEFAULT_SESSION_STORE_PATH):
+        """
+        Args:
+            path: Path of the file. Its directory is created, with mode 0700, when missing.
+        """
+        super(FileSessionStore, self).__init__()
+        self.path = path
+
+    def get(self, key):
+        with self._lock:
+            session = self.__load().get(key)
+            return session if isinstance(session, dict) else None
+
+    def set(self, key, session):
+        with self._lock:
+            sessions = self.__load()
+            sessions[key] = dict(session)
+            self.__save(sessions)
+
+    def delete(self, key):
+        with self._lock:
+            sessions = self.__load()
+            if sessions.pop(key, None) is not None:
+                self.__save(sessions)
+
+    def __load(self):
+        try:
+            with open(self.path) as sessions_file:
+                sessions = json.load(sessions_file)
+        except (IOError, OSError):
+            return {}
+        except ValueError:
+            logger.warning('Ignoring the invalid session store: %s' % self.path)
+            return {}
+        return sessions if isinstance(sessions, dict) else {}
+
+    def __save(self, sessions):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        # mkstemp creates the file with mode 0600
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.sessions-')
+        try:
+            with os.fdopen(fd, 'w') as sessions_file:
+                json.dump(sessions, sessions_file)
+            if os.name == 'nt' and os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
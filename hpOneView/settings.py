@@ -11,7 +11,6 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from builtins import open
 from future import standard_library
 
 standard_library.install_aliases()
@@ -80,9 +79,10 @@ class settings(object):
     ###########################################################################
     # SPP Upload
     ###########################################################################
-    def upload_spp(self, sppPath, sppName, verbose=False, blocking=True):
+    def upload_spp(self, sppPath, sppName, verbose=False, blocking=True, progress_callback=None):
         response, body = self._con.post_multipart(uri['fwUpload'], '',
-                                                  sppPath, sppName, verbose)
+                                                  sppPath, sppName, verbose,
+                                                  progress_callback=progress_callback)
         if response.status >= 400:
             raise HPOneViewException(body)
         if response.status == 202 and verbose is True:
@@ -123,12 +123,9 @@ class settings(object):
                 request)
         return body
 
-    def download_support_dump(self, dumpInfo):
-        body = self._con.get(dumpInfo['uri'])
-        f = open(dumpInfo['uri'].split('/')[-1], 'wb')
-        f.write(body)
-        f.close()
-        return
+    def download_support_dump(self, dumpInfo, progress_callback=None):
+        return self._con.download(dumpInfo['uri'], dumpInfo['uri'].split('/')[-1],
+                                  progress_callback=progress_callback)
 
     def generate_backup(self, blocking=True, verbose=False):
         resp, body = self._con.do_http('POST', uri['backups'], None)
@@ -142,12 +139,9 @@ class settings(object):
         backup = self._con.get(backupResource['resourceUri'])
         return backup
 
-    def download_backup(self, backup):
-        body = self._con.get(backup['downloadUri'])
-        f = open(backup['downloadUri'].split('/')[-1] + '.bkp', 'wb')
-        f.write(body)
-        f.close()
-        return
+    def download_backup(self, backup, progress_callback=None):
+        return self._con.download(backup['downloadUri'], backup['downloadUri'].split('/')[-1] + '.bkp',
+                                  progress_callback=progress_callback)
 
     def upload_backup(self, path, name, verbose=False, blocking=True):
         response, body = self._con.post_multipart(uri['archive'], '',
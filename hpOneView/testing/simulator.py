@@ -0,0 +1,597 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+simulator.py
+~~~~~~~~~~~~
+
+This module runs a local HTTPS server that behaves like a OneView appliance, to test and benchmark the library
+without one.
+
+Usage:
+    python -m hpOneView.testing.simulator --port 8443 --dataset /rest/server-hardware=10000
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'simulator'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import ssl
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, parse_qs
+
+# Self-signed certificate and key of the simulator. They are public: only use them for local testing.
+DEFAULT_CERTFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'simulator.pem')
+DEFAULT_MAX_PAGE_SIZE = 500
+MIN_API_VERSION = 120
+MAX_API_VERSION = 300
+
+LOGIN_SESSIONS_URI = '/rest/login-sessions'
+TASKS_URI = '/rest/tasks'
+VERSION_URI = '/rest/version'
+
+# Sizes of the large installations whose issues the simulator helps to reproduce
+LARGE_DATASETS = {
+    '/rest/server-hardware': 10000,
+    '/rest/alerts': 50000,
+}
+
+READ_CHUNK_SIZE = 65536
+
+# zlib window bits of the content encodings, by preference
+CONTENT_ENCODINGS = (('gzip', 16 + zlib.MAX_WBITS), ('deflate', zlib.MAX_WBITS))
+
+# Equality filters, alone or joined with OR: "name='a' OR name='b'"
+FILTER_PATTERN = re.compile(r"""^"?'?[\w.]+'?\s*==?\s*'[^']*'(\s+OR\s+'?[\w.]+'?\s*==?\s*'[^']*')*"?$""", re.IGNORECASE)
+FILTER_TERM_PATTERN = re.compile(r"""'?([\w.]+)'?\s*==?\s*'([^']*)'""")
+START_PATTERN = re.compile(r'([?&])start=-?\d+')
+RANGE_PATTERN = re.compile(r'^bytes=(\d+)-(\d*)$')
+
+logger = logging.getLogger(__name__)
+
+
+class _Response(object):
+    def __init__(self, status, body=None, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    def get_data(self):
+        if self.body is None:
+            return b''
+        if isinstance(self.body, bytes):
+            return self.body
+        return json.dumps(self.body).encode('utf-8')
+
+
+class _Upload(object):
+    def __init__(self, size):
+        self.size = size
+
+
+def _error(status, error_code, message):
+    return _Response(status, {'errorCode': error_code, 'message': message, 'details': '', 'recommendedActions': []})
+
+
+class ApplianceSimulator(object):
+    """
+    Local HTTPS server that implements the parts of the OneView REST API used by the library:
+
+    - Version and login sessions. Every other request requires the session ID in the auth header.
+    - Paginated collections, with start, count, equality filters joined with OR, total and nextPageUri.
+    - Resources with eTags: conditional GETs with If-None-Match, and updates rejected with 412 when the eTag
+      sent does not match.
+    - Create, update, patch, delete and multipart uploads, answered with 202 and the Location of a task that
+      runs for `task_duration` seconds. Changes are applied when the request is received.
+    - File downloads, with Range requests.
+    - Responses compressed with gzip or deflate, as requested by the Accept-Encoding header.
+
+    The knobs are attributes that can be changed while the server runs:
+
+    - latency, jitter: Seconds added to each response, latency plus a random value between -jitter and jitter.
+    - error_rate, error_status: Probability, from 0 to 1, of answering a request with error_status.
+    - task_duration: Seconds a task runs before it completes.
+    - task_error_rate: Probability, from 0 to 1, of a task ending in the Error state.
+    - max_page_size: Maximum number of members of a page.
+    - honor_range: Whether Range requests get partial content or the whole file.
+    - compression: Whether responses are compressed when the client accepts it.
+    - credentials: Dict with the password by user name. None accepts any user.
+
+    Example:
+        with ApplianceSimulator(datasets={'/rest/server-hardware': 10000}, latency=0.05) as simulator:
+            con = connection(simulator.address)
+            con.login({'userName': 'administrator', 'password': 'password'})
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, datasets=None, credentials=None, latency=0, jitter=0,
+                 error_rate=0, error_status=500, task_duration=0, task_error_rate=0,
+                 max_page_size=DEFAULT_MAX_PAGE_SIZE, honor_range=True, compression=True, certfile=DEFAULT_CERTFILE,
+                 seed=None):
+        """
+        Args:
+            host: Address to listen on.
+            port: Port to listen on. 0 picks a free port.
+            datasets: Dict with the number of resources generated by collection uri. E.g.:
+                {'/rest/server-hardware': 10000, '/rest/alerts': 50000}
+            certfile: PEM file with the certificate and the key of the server.
+            seed: Seed of the random values, to reproduce a run.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.task_duration = task_duration
+        self.task_error_rate = task_error_rate
+        self.max_page_size = max_page_size
+        self.honor_range = honor_range
+        self.compression = compression
+        self.credentials = credentials
+
+        self._host = host
+        self._port = port
+        self._certfile = certfile
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._collections = {TASKS_URI: []}
+        self._resources = {}
+        self._tasks = {}
+        self._downloads = {}
+        self._sessions = set()
+        self._next_id = 0
+        self._stats = {'requests': 0, 'errors': 0, 'bytes_uploaded': 0, 'bytes_downloaded': 0, 'tasks': 0}
+        self._server = None
+        self._thread = None
+
+        for collection_uri, count in (datasets or {}).items():
+            self.add_resources(collection_uri, count)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def address(self):
+        """
+        Host and port of the server, to use as the appliance address of a connection.
+        """
+        return '%s:%s' % (self._host, self.port)
+
+    @property
+    def stats(self):
+        """
+        Gets the counters of the server: requests, injected errors, bytes uploaded and downloaded, tasks started
+        and active sessions.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['sessions'] = len(self._sessions)
+            return stats
+
+    def start(self):
+        """
+        Starts serving in a background thread.
+        """
+        context = ssl.SSLContext(getattr(ssl, 'PROTOCOL_TLS_SERVER', ssl.PROTOCOL_SSLv23))
+        context.load_cert_chain(self._certfile)
+        self._server = _SimulatorServer((self._host, self._port), _SimulatorHandler)
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self._server.simulator = self
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), name='oneview-simulator')
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info('Appliance simulator listening on %s' % self.address)
+
+    def stop(self):
+        """
+        Stops the server.
+        """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def add_resources(self, collection_uri, count, template=None):
+        """
+        Generates resources in a collection.
+
+        Args:
+            collection_uri: Uri of the collection, created when missing.
+            count: Number of resources.
+            template: Dict with the attributes of each resource.
+        """
+        category = collection_uri.rstrip('/').split('/')[-1]
+        with self._lock:
+            members = self._collections.setdefault(collection_uri, [])
+            for index in range(len(members), len(members) + count):
+                resource = {'type': category, 'category': category, 'name': '%s-%d' % (category, index),
+                            'status': 'OK'}
+                resource.update(template or {})
+                self.__add(collection_uri, resource)
+
+    def add_download(self, uri, content):
+        """
+        Serves a file.
+
+        Args:
+            uri: Uri of the file.
+            content: Bytes of the file.
+        """
+        with self._lock:
+            self._downloads[uri] = content
+
+    def expire_sessions(self):
+        """
+        Ends all the sessions, as when they time out in the appliance.
+        """
+        with self._lock:
+            self._sessions.clear()
+
+    def handle(self, method, path, headers, body):
+        """
+        Answers a request.
+
+        Args:
+            method: HTTP method.
+            path: Path with the query.
+            headers: Dict-like request headers.
+            body: Decoded JSON body, or an _Upload with the size of a multipart body.
+
+        Returns:
+            _Response
+        """
+        delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self._stats['requests'] += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self._stats['errors'] += 1
+                return _error(self.error_status, 'SIMULATED_ERROR', 'Error injected by the simulator')
+
+            split = urlsplit(path)
+            resource_path = split.path.rstrip('/') or '/'
+            if resource_path == VERSION_URI:
+                return _Response(200, {'minimumVersion': MIN_API_VERSION, 'currentVersion': MAX_API_VERSION})
+            if resource_path == LOGIN_SESSIONS_URI:
+                return self.__handle_login(method, headers, body)
+            if headers.get('auth') not in self._sessions:
+                return _error(401, 'AUTHORIZATION', 'Authentication required')
+            if resource_path in self._downloads and method == 'GET':
+                return self.__download(resource_path, headers)
+            if resource_path in self._collections:
+                return self.__handle_collection(method, path, resource_path, headers, body)
+            if resource_path in self._resources:
+                return self.__handle_resource(method, resource_path, headers, body)
+            if method == 'POST' and resource_path.startswith('/rest/'):
+                self._collections[resource_path] = []
+                return self.__handle_collection(method, path, resource_path, headers, body)
+            return _error(404, 'RESOURCE_NOT_FOUND', 'Resource not found: %s' % resource_path)
+
+    def __handle_login(self, method, headers, body):
+        if method == 'DELETE':
+            self._sessions.discard(headers.get('auth'))
+            return _Response(204)
+        if method != 'POST' or not isinstance(body, dict):
+            return _error(400, 'INVALID_REQUEST', 'Invalid login request')
+
+        user_name = body.get('userName')
+        if self.credentials is not None and self.credentials.get(user_name) != body.get('password'):
+            return _error(401, 'AUTHN_AUTH_FAIL', 'Invalid user name or password')
+        session_id = 'simulator-' + uuid.uuid4().hex
+        self._sessions.add(session_id)
+        return _Response(200, {'sessionID': session_id})
+
+    def __handle_collection(self, method, path, collection_uri, headers, body):
+        if method == 'GET':
+            return self.__get_page(path, collection_uri)
+        if method == 'POST':
+            if isinstance(body, _Upload):
+                self._stats['bytes_uploaded'] += body.size
+                resource = {'name': headers.get('uploadfilename'), 'size': body.size}
+            else:
+                resource = dict(body or {})
+            category = collection_uri.split('/')[-1]
+            resource.setdefault('type', category)
+            resource.setdefault('category', category)
+            resource = self.__add(collection_uri, resource)
+            return self.__start_task('Create', resource)
+        return _error(405, 'METHOD_NOT_ALLOWED', 'Method not allowed: %s' % method)
+
+    def __handle_resource(self, method, resource_uri, headers, body):
+        resource = self._resources[resource_uri]
+        if method == 'GET':
+            if resource_uri in self._tasks:
+                self.__update_task(resource)
+            if self.__strip_etag(headers.get('If-None-Match')) == resource['eTag']:
+                return _Response(304, headers={'ETag': resource['eTag']})
+            return _Response(200, resource, {'ETag': resource['eTag']})
+
+        if method == 'DELETE':
+            del self._resources[resource_uri]
+            self._collections[resource_uri.rsplit('/', 1)[0]].remove(resource_uri)
+            return self.__start_task('Delete', resource)
+
+        if method not in ('PUT', 'PATCH'):
+            return _error(405, 'METHOD_NOT_ALLOWED', 'Method not allowed: %s' % method)
+        expected_etag = self.__strip_etag(headers.get('If-Match'))
+        if method == 'PUT' and isinstance(body, dict):
+            expected_etag = expected_etag or body.get('eTag')
+        if expected_etag and expected_etag not in ('*', resource['eTag']):
+            return _error(412, 'ETAG_MISMATCH', 'The resource was modified: %s' % resource_uri)
+
+        if method == 'PUT':
+            updated = dict(body or {})
+        else:
+            updated = dict(resource)
+            for operation in body or []:
+                if operation.get('op') == 'remove':
+                    updated.pop(operation['path'].strip('/'), None)
+                else:
+                    updated[operation['path'].strip('/')] = operation.get('value')
+        updated.update({'uri': resource_uri, 'eTag': self.__new_etag(), 'modified': self.__timestamp()})
+        self._resources[resource_uri] = updated
+        return self.__start_task('Update', updated)
+
+    def __get_page(self, path, collection_uri):
+        query = parse_qs(urlsplit(path).query)
+        try:
+            start = max(int(query.get('start', ['0'])[0]), 0)
+            count = int(query.get('count', ['-1'])[0])
+        except ValueError:
+            return _error(400, 'INVALID_QUERY', 'Invalid start or count')
+        if count < 0 or count > self.max_page_size:
+            count = self.max_page_size
+
+        members = self._collections[collection_uri]
+        for expression in query.get('filter', []):
+            if not FILTER_PATTERN.match(expression):
+                return _error(400, 'UNSUPPORTED_FILTER', 'Only equality filters are simulated: %s' % expression)
+            terms = FILTER_TERM_PATTERN.findall(expression)
+            members = [uri for uri in members
+                       if any(str(self._resources[uri].get(field)) == value for field, value in terms)]
+
+        page = [self._resources[uri] for uri in members[start:start + count]]
+        for member in page:
+            if member['uri'] in self._tasks:
+                self.__update_task(member)
+        next_start = start + len(page)
+        body = {'type': '%sCollection' % collection_uri.split('/')[-1], 'uri': path, 'category':
+                collection_uri.split('/')[-1], 'start': start, 'count': len(page), 'total': len(members),
+                'members': page, 'nextPageUri': None, 'prevPageUri': None}
+        if page and next_start < len(members):
+            body['nextPageUri'] = self.__page_uri(path, next_start)
+        if start > 0:
+            body['prevPageUri'] = self.__page_uri(path, max(start - count, 0))
+        return _Response(200, body)
+
+    @staticmethod
+    def __page_uri(path, start):
+        if START_PATTERN.search(path):
+            return START_PATTERN.sub(r'\g<1>start=%d' % start, path)
+        return '%s%sstart=%d' % (path, '&' if '?' in path else '?', start)
+
+    def __download(self, uri, headers):
+        content = self._downloads[uri]
+        match = RANGE_PATTERN.match(headers.get('Range') or '')
+        if not self.honor_range or not match:
+            self._stats['bytes_downloaded'] += len(content)
+            return _Response(200, content, {'Accept-Ranges': 'bytes', 'Content-Type': 'application/octet-stream'})
+
+        first = int(match.group(1))
+        last = min(int(match.group(2)), len(content) - 1) if match.group(2) else len(content) - 1
+        if first >= len(content):
+            return _Response(416, b'', {'Content-Range': 'bytes */%d' % len(content)})
+        self._stats['bytes_downloaded'] += last + 1 - first
+        return _Response(206, content[first:last + 1], {'Content-Range': 'bytes %d-%d/%d' % (first, last, len(content)),
+                                                        'Content-Type': 'application/octet-stream'})
+
+    def __add(self, collection_uri, resource):
+        self._next_id += 1
+        resource_uri = '%s/%d' % (collection_uri, self._next_id)
+        resource.update({'uri': resource_uri, 'eTag': self.__new_etag(), 'created': self.__timestamp(),
+                         'modified': self.__timestamp()})
+        self._resources[resource_uri] = resource
+        self._collections[collection_uri].append(resource_uri)
+        return resource
+
+    def __start_task(self, name, resource):
+        failed = bool(self.task_error_rate) and self._random.random() < self.task_error_rate
+        task = {'type': 'TaskResourceV2', 'category': 'tasks', 'name': name, 'taskState': 'Running',
+                'percentComplete': 0, 'computedPercentComplete': 0, 'taskErrors': [], 'created': self.__timestamp(),
+                'associatedResource': {'resourceUri': resource['uri'], 'resourceName': resource.get('name'),
+                                       'resourceCategory': resource.get('category')}}
+        task = self.__add(TASKS_URI, task)
+        self._tasks[task['uri']] = (time.time(), self.task_duration, failed)
+        self._stats['tasks'] += 1
+        self.__update_task(task)
+        return _Response(202, dict(task), {'Location': task['uri']})
+
+    def __update_task(self, task):
+        started, duration, failed = self._tasks[task['uri']]
+        elapsed = time.time() - started
+        if task['taskState'] != 'Running':
+            return
+        if elapsed < duration:
+            task['percentComplete'] = task['computedPercentComplete'] = int(100 * elapsed / duration)
+            return
+        if failed:
+            task.update({'taskState': 'Error', 'taskStatus': 'Simulated task error',
+                         'taskErrors': [{'errorCode': 'SIMULATED_TASK_ERROR', 'message': 'Task error injected'}]})
+        else:
+            task.update({'taskState': 'Completed', 'percentComplete': 100, 'computedPercentComplete': 100})
+        task.update({'eTag': self.__new_etag(), 'modified': self.__timestamp()})
+
+    def __new_etag(self):
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def __strip_etag(etag):
+        return etag.strip('"') if etag else None
+
+    @staticmethod
+    def __timestamp():
+        return time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+
+
+class _SimulatorServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def handle_error(self, request, client_address):
+        logger.debug('Simulator connection from %s failed' % (client_address,), exc_info=True)
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        self.__handle()
+
+    def do_POST(self):
+        self.__handle()
+
+    def do_PUT(self):
+        self.__handle()
+
+    def do_PATCH(self):
+        self.__handle()
+
+    def do_DELETE(self):
+        self.__handle()
+
+    def __handle(self):
+        body = self.__read_body()
+        response = self.server.simulator.handle(self.command, self.path, self.headers, body)
+        data = response.get_data()
+        head = ['HTTP/1.1 %d %s' % (response.status, self.responses.get(response.status, ('',))[0])]
+        headers = {'Content-Type': 'application/json'}
+        headers.update(response.headers)
+        encoding = self.__get_content_encoding(response, data)
+        if encoding:
+            name, wbits = encoding
+            compressor = zlib.compressobj(6, zlib.DEFLATED, wbits)
+            data = compressor.compress(data) + compressor.flush()
+            headers['Content-Encoding'] = name
+        headers['Content-Length'] = str(len(data))
+        head.extend('%s: %s' % (name, value) for name, value in headers.items())
+        # Head and body in a single write, to avoid the delay of small writes
+        self.wfile.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + data)
+
+    def __get_content_encoding(self, response, data):
+        if not self.server.simulator.compression or not data or response.status == 206:
+            return None
+        accepted = set()
+        for value in (self.headers.get('Accept-Encoding') or '').split(','):
+            name, _, parameters = value.partition(';')
+            if parameters.replace(' ', '') not in ('q=0', 'q=0.0'):
+                accepted.add(name.strip().lower())
+        for encoding in CONTENT_ENCODINGS:
+            if encoding[0] in accepted:
+                return encoding
+        return None
+
+    def __read_body(self):
+        remaining = int(self.headers.get('Content-Length') or 0)
+        if self.headers.get('Content-Type', '').startswith('multipart/form-data'):
+            # Uploads are counted, not kept
+            size = 0
+            while remaining > 0:
+                chunk = self.rfile.read(min(remaining, READ_CHUNK_SIZE))
+                if not chunk:
+                    break
+                size += len(chunk)
+                remaining -= len(chunk)
+            return _Upload(size)
+
+        data = self.rfile.read(remaining) if remaining else b''
+        try:
+            return json.loads(data.decode('utf-8')) if data else None
+        except ValueError:
+            return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local HTTPS server that simulates a OneView appliance.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8443)
+    parser.add_argument('--dataset', action='append', default=[], metavar='URI=COUNT',
+                        help='Resources generated in a collection, e.g. /rest/server-hardware=10000')
+    parser.add_argument('--large', action='store_true', help='Generates 10000 servers and 50000 alerts')
+    parser.add_argument('--latency', type=float, default=0)
+    parser.add_argument('--jitter', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--task-duration', type=float, default=0)
+    args = parser.parse_args()
+
+    datasets = dict(LARGE_DATASETS) if args.large else {}
+    for dataset in args.dataset:
+        collection_uri, _, count = dataset.partition('=')
+        datasets[collection_uri] = int(count)
+
+    simulator = ApplianceSimulator(args.host, args.port, datasets=datasets, latency=args.latency,
+                                   jitter=args.jitter, error_rate=args.error_rate, task_duration=args.task_duration)
+    simulator.start()
+    print('Simulating a OneView appliance on %s, press Ctrl+C to stop' % simulator.address)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+tracing.py
+~~~~~~~~~~~~
+
+This module traces the operations of the resource clients, with spans for their requests, pages and task polls
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+__title__ = 'tracing'
+__version__ = '0.0.1'
+__copyright__ = '(C) Copyright (2012-2016) Hewlett Packard Enterprise ' \
+                ' Development LP'
+__license__ = 'MIT'
+__status__ = 'Development'
+
+import threading
+import time
+
+# Attributes of the spans
+URI_ATTRIBUTE = 'oneview.uri'
+RESOURCE_URI_ATTRIBUTE = 'oneview.resource_uri'
+HTTP_METHOD_ATTRIBUTE = 'http.method'
+HTTP_STATUS_ATTRIBUTE = 'http.status_code'
+PAGE_INDEX_ATTRIBUTE = 'oneview.page.index'
+PAGE_MEMBERS_ATTRIBUTE = 'oneview.page.members'
+TASK_URI_ATTRIBUTE = 'oneview.task.uri'
+TASK_STATE_ATTRIBUTE = 'oneview.task.state'
+TASKS_RUNNING_ATTRIBUTE = 'oneview.tasks.running'
+
+
+class Span(object):
+    """
+    Span of a traced operation, used as a context manager: the span is current in the thread within the with
+    block, and ends when it exits. This base class does nothing, and is the span of the no-op tracer.
+    """
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class Tracer(object):
+    """
+    Tracer of the operations of a connection, set with connection.set_tracer. This base class is the default no-op
+    tracer: nothing is traced, and the operations skip the spans altogether while `enabled` is False.
+
+    Tracers are called by the threads that make the requests, and must be thread-safe.
+    """
+    enabled = False
+
+    def start_span(self, name, attributes=None, parent=None):
+        """
+        Starts a span, to use in a with block.
+
+        Args:
+            name: Name of the operation.
+            attributes: Dict of attributes of the span.
+            parent: Parent span. The current span of the thread by default; given for the spans of the requests
+                made by worker threads.
+
+        Returns:
+            Span
+        """
+        return NO_OP_SPAN
+
+    def get_current_span(self):
+        """
+        Gets the current span of the thread, or None.
+        """
+        return None
+
+
+NO_OP_SPAN = Span()
+NO_OP_TRACER = Tracer()
+
+
+def get_tracer(con):
+    """
+    Gets the tracer of a connection. Connections without tracing, such as the AsyncConnection of the asyncio clients,
+    get the no-op tracer.
+    """
+    get_connection_tracer = getattr(con, 'get_tracer', None)
+    return get_connection_tracer() if get_connection_tracer else NO_OP_TRACER
+
+
+class RecordedSpan(Span):
+    """
+    Span kept by a RecordingTracer once ended.
+    """
+
+    def __init__(self, tracer, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.error = None
+        self.start_time = None
+        self.end_time = None
+        self._tracer = tracer
+
+    @property
+    def duration(self):
+        return self.end_time - self.start_time if self.end_time is not None else None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.error = exception
+
+    def __enter__(self):
+        self.start_time = time.time()
+        self._tracer._push(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_value is not None:
+            self.record_exception(exc_value)
+        self.end_time = time.time()
+        self._tracer._pop(self)
+        return False
+
+
+class RecordingTracer(Tracer):
+    """
+    Tracer that keeps the ended spans in memory, to find where the time of an operation went without a tracing
+    backend::
+
+        tracer = RecordingTracer()
+        oneview_client.connection.set_tracer(tracer)
+        oneview_client.server_profiles.create(profile)
+        for span in tracer.spans:
+            print(span.name, span.duration, span.attributes)
+    """
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._spans = []
+
+    @property
+    def spans(self):
+        """
+        Gets the ended spans, in the order they ended.
+        """
+        with self._lock:
+            return list(self._spans)
+
+    def get_children(self, span):
+        return [child for child in self.spans if child.parent is span]
+
+    def clear(self):
+        with self._lock:
+            self._spans = []
+
+    def start_span(self, name, attributes=None, parent=None):
+        return RecordedSpan(self, name, attributes, parent or self.get_current_span())
+
+    def get_current_span(self):
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def _push(self, span):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        self._local.stack.append(span)
+
+    def _pop(self, span):
+        self._local.stack.remove(span)
+        with self._lock:
+            self._spans.append(span)
+
+
+class _OpenTelemetrySpan(Span):
+    def __init__(self, trace_api, span):
+        self._trace = trace_api
+        self._span = span
+        self._scope = None
+
+    def set_attribute(self, key, value):
+        self._span.set_attribute(key, value)
+
+    def record_exception(self, exception):
+        self._span.record_exception(exception)
+
+    def __enter__(self):
+        self._scope = self._trace.use_span(self._span, end_on_exit=True)
+        self._scope.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._scope.__exit__(exc_type, exc_value, traceback)
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Tracer that creates the spans with an OpenTelemetry tracer. Requires the opentelemetry-api package::
+
+        from opentelemetry import trace
+
+        oneview_client.connection.set_tracer(OpenTelemetryTracer(trace.get_tracer('hpOneView')))
+    """
+    enabled = True
+
+    def __init__(self, tracer):
+        from opentelemetry import trace
+        self._trace = trace
+        self._tracer = tracer
+
+    def start_span(self, name, attributes=None, parent=None):
+        context = self._trace.set_span_in_context(parent._span) if parent is not None else None
+        return _OpenTelemetrySpan(self._trace, self._tracer.start_span(name, context=context, attributes=attributes))
+
+    def get_current_span(self):
+        return _OpenTelemetrySpan(self._trace, self._trace.get_current_span())
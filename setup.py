@@ -32,4 +32,5 @@ setup(name='hpOneView',
       author='Hewlett Packard Enterprise Development LP',
       license='MIT',
       packages=find_packages(exclude=['examples*', 'tests*']),
-      install_requires=['future>=0.15.2'])
+      package_data={'hpOneView.testing': ['simulator.pem']},
+      install_requires=['future>=0.15.2', 'futures; python_version < "3.0"'])
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import http.client
+import json
+import sys
+import threading
+import time
+import unittest
+
+import mock
+
+from hpOneView.exceptions import HPOneViewException
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from hpOneView.aio.connection import AsyncConnection
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def __send(self, status, body, headers=None, chunked=False):
+        data = json.dumps(body).encode('utf-8')
+        head = ['HTTP/1.1 %s OK' % status]
+        for name, value in (headers or {}).items():
+            head.append('%s: %s' % (name, value))
+        if chunked:
+            head.append('Transfer-Encoding: chunked')
+            half = len(data) // 2
+            data = b''.join(b'%x\r\n%s\r\n' % (len(part), part) for part in (data[:half], data[half:])) + b'0\r\n\r\n'
+        else:
+            head.append('Content-Length: %s' % len(data))
+        self.wfile.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + data)
+
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        if self.path == '/rest/version':
+            self.__send(200, {'minimumVersion': 120, 'currentVersion': 300})
+        elif self.path == '/rest/chunked':
+            self.__send(200, {'members': [{'name': 'chunked'}]}, chunked=True)
+        elif self.path == '/rest/tasks/1':
+            self.__send(200, {'uri': '/rest/tasks/1', 'taskState': 'Completed'})
+        elif self.path == '/rest/error':
+            self.__send(404, {'message': 'Not found'})
+        elif self.path == '/rest/unavailable-once':
+            self.server.unavailable += 1
+            if self.server.unavailable == 1:
+                self.__send(503, {'message': 'Restarting'}, headers={'Retry-After': '0'})
+            else:
+                self.__send(200, {'name': 'available'})
+        elif self.path == '/rest/close':
+            # Closes the connection without announcing it
+            self.__send(200, {'name': 'closed'})
+            self.close_connection = True
+        else:
+            time.sleep(self.server.latency)
+            self.__send(200, {'uri': self.path})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length).decode('utf-8'))
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        if self.path == '/rest/login-sessions':
+            self.__send(200, {'sessionID': 'session-' + body['userName']})
+        elif self.path == '/rest/drop':
+            # Closes the connection without a response, as a server that timed out the kept-alive connection
+            self.close_connection = True
+        else:
+            self.__send(202, {}, headers={'Location': '/rest/tasks/1'})
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client requires Python 3.5')
+class AsyncConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.requests = []
+        self.server.latency = 0
+        self.server.unavailable = 0
+        self.server_thread = threading.Thread(target=self.server.serve_forever, args=(0.01,))
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.connection = AsyncConnection('127.0.0.1:%s' % self.server.server_address[1])
+        # The test server does not use TLS
+        patcher = mock.patch.object(AsyncConnection, 'get_ssl_context', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.connection.close())
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def __client_ports(self):
+        return set(request[2] for request in self.server.requests)
+
+    def test_get_should_reuse_the_connection(self):
+        first = self.__run(self.connection.get('/rest/items/1'))
+        second = self.__run(self.connection.get('/rest/items/2'))
+
+        self.assertEqual({'uri': '/rest/items/1'}, first)
+        self.assertEqual({'uri': '/rest/items/2'}, second)
+        self.assertEqual(1, len(self.__client_ports()))
+
+    def test_get_should_send_api_version_header(self):
+        self.__run(self.connection.get('/rest/items/1'))
+
+        headers = self.server.requests[0][3]
+        self.assertEqual('200', headers['X-API-Version'])
+        self.assertEqual('application/json', headers['Accept'])
+
+    def test_get_should_decode_chunked_response(self):
+        result = self.__run(self.connection.get('/rest/chunked'))
+
+        self.assertEqual({'members': [{'name': 'chunked'}]}, result)
+
+    def test_get_should_raise_on_error_status(self):
+        try:
+            self.__run(self.connection.get('/rest/error'))
+        except HPOneViewException as e:
+            self.assertEqual({'message': 'Not found'}, e.msg)
+        else:
+            self.fail()
+
+    def test_get_should_retry_when_reused_connection_was_closed(self):
+        self.__run(self.connection.get('/rest/close'))
+        # Lets the server close its side of the connection
+        self.__run(asyncio.sleep(0.1))
+
+        result = self.__run(self.connection.get('/rest/items/1'))
+
+        self.assertEqual({'uri': '/rest/items/1'}, result)
+        self.assertEqual(2, len(self.__client_ports()))
+
+    def test_post_should_not_be_sent_again_when_reused_connection_fails(self):
+        self.connection.set_retry_policy(None)
+        self.__run(self.connection.get('/rest/items/1'))
+
+        self.assertRaises((http.client.HTTPException, asyncio.IncompleteReadError, OSError), self.__run,
+                          self.connection.post('/rest/drop', {'name': 'item'}))
+
+        self.assertEqual(1, len([request for request in self.server.requests if request[1] == '/rest/drop']))
+
+    def test_post_should_get_task_from_location(self):
+        task, body = self.__run(self.connection.post('/rest/items', {'name': 'item'}))
+
+        self.assertEqual({'uri': '/rest/tasks/1', 'taskState': 'Completed'}, task)
+        self.assertEqual(('GET', '/rest/tasks/1'), self.server.requests[-1][:2])
+
+    def test_concurrent_requests_should_not_exceed_pool_size(self):
+        self.server.latency = 0.01
+        self.connection.set_connection_pool(size=3)
+
+        results = self.__run(asyncio.gather(*[self.connection.get('/rest/items/%s' % i) for i in range(30)]))
+
+        self.assertEqual([{'uri': '/rest/items/%s' % i} for i in range(30)], results)
+        self.assertTrue(len(self.__client_ports()) <= 3)
+
+    def test_login_should_validate_version_and_set_session(self):
+        self.__run(self.connection.login({'userName': 'admin', 'password': 'secret'}))
+
+        self.assertEqual('session-admin', self.connection.get_session_id())
+        self.assertEqual([('GET', '/rest/version'), ('POST', '/rest/login-sessions')],
+                         [request[:2] for request in self.server.requests])
+
+    def test_set_connection_pool_with_invalid_size(self):
+        self.assertRaises(ValueError, self.connection.set_connection_pool, 0)
+
+    def test_get_should_retry_on_service_unavailable(self):
+        result = self.__run(self.connection.get('/rest/unavailable-once'))
+
+        self.assertEqual({'name': 'available'}, result)
+        self.assertEqual(2, self.server.unavailable)
+        self.assertEqual({'503': 1}, self.connection.get_retry_policy().stats['reasons'])
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+###
+import sys
+import unittest
+
+import mock
+
+from hpOneView.oneview_client import OneViewClient
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from hpOneView.aio.connection import AsyncConnection
+    from hpOneView.aio.oneview_client import AsyncOneViewClient, RESOURCES
+    from hpOneView.aio.resource import AsyncResourceClient
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client requires Python 3.5')
+class AsyncOneViewClientTest(unittest.TestCase):
+    def setUp(self):
+        self.config = {"ip": "172.16.102.59",
+                       "credentials": {"userName": "administrator", "password": ""}}
+        self._oneview = AsyncOneViewClient(self.config)
+
+    def test_should_mirror_oneview_client_resources(self):
+        sync_properties = set(name for name, value in vars(OneViewClient).items()
+                              if isinstance(value, property) and name != 'connection')
+
+        self.assertEqual(sync_properties, set(name for name, _ in RESOURCES))
+
+    def test_resource_property_should_use_resource_uri(self):
+        for name, resource_class in RESOURCES:
+            resource_client = getattr(self._oneview, name)
+            self.assertIsInstance(resource_client, AsyncResourceClient)
+            self.assertEqual(resource_class.URI, resource_client._uri)
+
+    def test_resource_property_should_be_lazy_loaded(self):
+        self.assertIs(self._oneview.server_hardware, self._oneview.server_hardware)
+
+    def test_should_raise_when_proxy_is_configured(self):
+        self.config['proxy'] = '127.0.0.1:3128'
+
+        self.assertRaises(ValueError, AsyncOneViewClient, self.config)
+
+    @mock.patch.object(AsyncConnection, 'set_connection_pool')
+    def test_should_configure_connection_pool(self, mock_set_connection_pool):
+        self.config['connection_pool_size'] = 50
+
+        AsyncOneViewClient(self.config)
+
+        mock_set_connection_pool.assert_called_once_with(size=50, idle_timeout=None)
+
+    @mock.patch.object(AsyncConnection, 'close')
+    @mock.patch.object(AsyncConnection, 'login')
+    def test_context_manager_should_login_and_close(self, mock_login, mock_close):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        done = loop.create_future()
+        done.set_result(None)
+        mock_login.return_value = done
+        mock_close.return_value = done
+
+        loop.run_until_complete(self._oneview.__aenter__())
+        loop.run_until_complete(self._oneview.__aexit__(None, None, None))
+
+        mock_login.assert_called_once_with(self.config['credentials'])
+        mock_close.assert_called_once_with()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+###
+import inspect
+import sys
+import unittest
+
+import mock
+
+from hpOneView.exceptions import HPOneViewTaskError
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from hpOneView.aio.resource import AsyncResourceClient
+
+URI = '/rest/testuri'
+
+# Methods that make no request, or that return an asynchronous iterator
+NON_COROUTINE_METHODS = ['build_query_uri', 'build_uri', 'build_utilization_uri', 'get_cursor', 'iter_all']
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client requires Python 3.5')
+class AsyncResourceClientTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.connection = mock.Mock()
+        self.resource_client = AsyncResourceClient(self.connection, URI)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def __run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def __collect(self, iterator):
+        items = []
+        while True:
+            try:
+                items.append(self.__run(iterator.__anext__()))
+            except StopAsyncIteration:
+                return items
+
+    def __done(self, result):
+        future = self.loop.create_future()
+        future.set_result(result)
+        return future
+
+    def __set_responses(self, method, responses):
+        getattr(self.connection, method).side_effect = lambda uri, *args, **kwargs: self.__done(responses[uri])
+
+    def test_get_all_should_follow_next_page_uri(self):
+        self.__set_responses('get', {
+            URI + '?start=0&count=-1': {'members': [{'id': '1'}], 'nextPageUri': URI + '?start=1&count=1'},
+            URI + '?start=1&count=1': {'members': [{'id': '2'}], 'nextPageUri': None}})
+
+        result = self.__run(self.resource_client.get_all())
+
+        self.assertEqual([{'id': '1'}, {'id': '2'}], result)
+
+    def test_get_all_should_stop_at_count(self):
+        self.__set_responses('get', {
+            URI + '?start=0&count=1': {'members': [{'id': '1'}], 'nextPageUri': URI + '?start=1&count=1'}})
+
+        result = self.__run(self.resource_client.get_all(count=1))
+
+        self.assertEqual([{'id': '1'}], result)
+
+    def test_iter_all_should_yield_members_of_all_pages(self):
+        self.__set_responses('get', {
+            URI + '?start=0&count=-1': {'members': [{'id': '1'}, {'id': '2'}], 'nextPageUri': URI + '?start=2'},
+            URI + '?start=2': {'members': [{'id': '3'}]}})
+        iterator = self.resource_client.iter_all().__aiter__()
+        items = []
+
+        while True:
+            try:
+                items.append(self.__run(iterator.__anext__()))
+            except StopAsyncIteration:
+                break
+
+        self.assertEqual([{'id': '1'}, {'id': '2'}, {'id': '3'}], items)
+
+    def test_iter_all_should_request_next_page_while_consuming_current(self):
+        self.__set_responses('get', {
+            URI + '?start=0&count=-1': {'members': [{'id': '1'}, {'id': '2'}], 'nextPageUri': URI + '?start=2'},
+            URI + '?start=2': {'members': [{'id': '3'}]}})
+        iterator = self.resource_client.iter_all().__aiter__()
+
+        self.__run(iterator.__anext__())
+
+        self.assertEqual(2, self.connection.get.call_count)
+        iterator.close()
+
+    def test_get_by_name_should_filter_by_name(self):
+        self.__set_responses('get', {
+            URI + "?start=0&count=-1&filter=%22%27name%27%3D%27one%27%22": {'members': [{'name': 'one'}]}})
+
+        result = self.__run(self.resource_client.get_by_name('one'))
+
+        self.assertEqual({'name': 'one'}, result)
+
+    def test_get_should_return_the_resource(self):
+        self.__set_responses('get', {URI + '/1': {'uri': URI + '/1'}})
+
+        result = self.__run(self.resource_client.get('1'))
+
+        self.assertEqual({'uri': URI + '/1'}, result)
+
+    def test_create_without_task_should_return_entity(self):
+        self.connection.post.return_value = self.__done((None, {'name': 'created'}))
+
+        result = self.__run(self.resource_client.create({'name': 'created'}))
+
+        self.assertEqual({'name': 'created'}, result)
+        self.connection.post.assert_called_once_with(URI, {'name': 'created'}, custom_headers=None)
+
+    def test_create_should_wait_for_task(self):
+        task = {'uri': '/rest/tasks/1', 'category': 'tasks', 'type': 'TaskResourceV2', 'name': 'Create',
+                'taskState': 'Completed', 'associatedResource': {'resourceUri': URI + '/1'}}
+        self.connection.post.return_value = self.__done((task, {}))
+        self.__set_responses('get', {'/rest/tasks/1': task, URI + '/1': {'name': 'created'}})
+
+        result = self.__run(self.resource_client.create({'name': 'created'}))
+
+        self.assertEqual({'name': 'created'}, result)
+
+    @mock.patch('asyncio.sleep')
+    def test_update_should_wait_for_running_task(self, mock_sleep):
+        running = {'uri': '/rest/tasks/1', 'taskState': 'Running'}
+        completed = {'uri': '/rest/tasks/1', 'category': 'tasks', 'type': 'TaskResourceV2', 'name': 'Update',
+                     'taskState': 'Completed', 'associatedResource': {'resourceUri': URI + '/1'}}
+        tasks = [running, completed, completed]
+        mock_sleep.side_effect = lambda seconds: self.__done(None)
+        self.connection.put.return_value = self.__done((running, {}))
+        self.connection.get.side_effect = lambda uri: self.__done(tasks.pop(0) if uri == '/rest/tasks/1' else
+                                                                  {'name': 'updated'})
+
+        result = self.__run(self.resource_client.update({'uri': URI + '/1'}))
+
+        self.assertEqual({'name': 'updated'}, result)
+        mock_sleep.assert_called_once_with(1)
+
+    def test_delete_should_raise_task_error(self):
+        task = {'uri': '/rest/tasks/1', 'name': 'Delete', 'taskState': 'Error',
+                'taskErrors': [{'message': 'Failed'}]}
+        self.connection.delete.return_value = self.__done((task, {}))
+        self.__set_responses('get', {'/rest/tasks/1': task})
+
+        try:
+            self.__run(self.resource_client.delete('1'))
+        except HPOneViewTaskError as e:
+            self.assertEqual('Failed', e.msg)
+        else:
+            self.fail()
+
+    def test_delete_without_task_should_return_true(self):
+        self.connection.delete.return_value = self.__done((None, {}))
+
+        self.assertTrue(self.__run(self.resource_client.delete({'uri': URI + '/1'}, force=True)))
+        self.connection.delete.assert_called_once_with(URI + '/1?force=True', custom_headers=None)
+
+    def test_get_schema_should_return_the_schema(self):
+        self.__set_responses('get', {URI + '/schema': {'name': 'schema'}})
+
+        result = self.__run(self.resource_client.get_schema())
+
+        self.assertEqual({'name': 'schema'}, result)
+
+    def test_get_utilization_should_return_the_utilization(self):
+        self.__set_responses('get', {URI + '/1/utilization?fields=AmbientTemperature&refresh=true': {'metrics': []}})
+
+        result = self.__run(self.resource_client.get_utilization('1', fields='AmbientTemperature', refresh=True))
+
+        self.assertEqual({'metrics': []}, result)
+
+    def __page(self, start, total=5, count=2):
+        members = [{'id': str(i)} for i in range(start, min(start + count, total))]
+        page = {'members': members, 'total': total, 'count': len(members)}
+        if start + count < total:
+            page['nextPageUri'] = URI + '?start=%s&count=%s' % (start + count, count)
+        return page
+
+    def test_get_cursor_should_request_page_at_its_offset(self):
+        self.__set_responses('get', {URI + '?start=4&count=2': self.__page(4)})
+        cursor = self.resource_client.get_cursor(page_size=2)
+
+        members = self.__run(cursor.get_members(2))
+
+        self.assertEqual([{'id': '4'}], members)
+        self.assertEqual(5, cursor.total)
+        self.assertEqual(3, cursor.page_count)
+        self.connection.get.assert_called_once_with(URI + '?start=4&count=2')
+
+    def test_get_cursor_should_iterate_over_members_of_all_pages(self):
+        self.__set_responses('get', {URI + '?start=%s&count=2' % start: self.__page(start) for start in (0, 2, 4)})
+        cursor = self.resource_client.get_cursor(page_size=2)
+
+        self.assertEqual([{'id': str(i)} for i in range(5)], self.__collect(cursor.__aiter__()))
+        self.assertEqual(3, self.connection.get.call_count)
+
+    def test_get_cursor_should_follow_next_page_uri_without_total(self):
+        pages = {URI + '?start=%s&count=2' % start: self.__page(start) for start in (0, 2, 4)}
+        for page in pages.values():
+            del page['total']
+        self.__set_responses('get', pages)
+        cursor = self.resource_client.get_cursor(page_size=2)
+
+        self.assertEqual([2, 2, 1], [page['count'] for page in self.__collect(cursor.iter_pages())])
+
+    def test_get_cursor_should_correct_page_size_limited_by_appliance(self):
+        self.__set_responses('get', {URI + '?start=0&count=-1': self.__page(0),
+                                     URI + '?start=2&count=2': self.__page(2)})
+        cursor = self.resource_client.get_cursor()
+
+        self.assertEqual([URI + '?start=0&count=2', URI + '?start=2&count=2', URI + '?start=4&count=2'],
+                         self.__run(cursor.get_page_uris()))
+        self.assertEqual(self.__page(2), self.__run(cursor.get_page(1)))
+
+    def test_get_cursor_page_iterator_close_should_cancel_prefetched_pages(self):
+        self.__set_responses('get', {URI + '?start=%s&count=2' % start: self.__page(start) for start in (0, 2, 4)})
+        pages = self.resource_client.get_cursor(page_size=2, prefetch=2).iter_pages()
+
+        self.__run(pages.__anext__())
+        pages.close()
+
+        self.assertRaises(StopAsyncIteration, self.__run, pages.__anext__())
+
+    def test_public_methods_should_be_coroutines_or_not_supported(self):
+        for name, method in inspect.getmembers(self.resource_client, inspect.ismethod):
+            if name.startswith('_') or name in NON_COROUTINE_METHODS or inspect.iscoroutinefunction(method):
+                continue
+            self.assertRaises(NotImplementedError, method)
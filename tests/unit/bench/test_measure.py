@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import unittest
+
+import mock
+
+from hpOneView.bench import measure as measure_module
+from hpOneView.bench.measure import measure, measure_allocations, percentile
+
+
+class PercentileTest(unittest.TestCase):
+    def test_percentile_should_use_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(50, percentile(values, 50))
+        self.assertEqual(90, percentile(values, 90))
+        self.assertEqual(99, percentile(values, 99))
+        self.assertEqual(100, percentile(values, 100))
+
+    def test_percentile_of_a_single_value(self):
+        self.assertEqual(7, percentile([7], 99))
+
+    def test_percentile_of_no_values(self):
+        self.assertIsNone(percentile([], 50))
+
+
+class MeasureTest(unittest.TestCase):
+    def test_measure_should_call_the_function_for_each_iteration_and_warmup(self):
+        func = mock.Mock()
+
+        result = measure(func, 20, warmup=2)
+
+        self.assertEqual(22 + measure_module.ALLOCATION_ITERATIONS, func.call_count)
+        self.assertEqual(20, result['iterations'])
+
+    def test_measure_should_report_percentiles(self):
+        result = measure(lambda _: None, 10)
+
+        for key in ('total_seconds', 'ops_per_second', 'mean_ms', 'min_ms', 'max_ms', 'p50_ms', 'p90_ms', 'p99_ms'):
+            self.assertTrue(result[key] >= 0, key)
+        self.assertTrue(result['min_ms'] <= result['p50_ms'] <= result['p99_ms'] <= result['max_ms'])
+
+    def test_measure_should_pass_the_setup_value(self):
+        func = mock.Mock()
+
+        measure(func, 3, setup=lambda: 'task', warmup=0)
+
+        func.assert_called_with('task')
+
+    def test_measure_should_compute_the_throughput_in_units(self):
+        result = measure(lambda _: None, 10, units=1000)
+
+        self.assertAlmostEqual(1000, result['units_per_second'] / result['ops_per_second'])
+
+    @unittest.skipIf(measure_module.tracemalloc is None, 'tracemalloc requires Python 3.4')
+    def test_measure_allocations_should_report_the_peak(self):
+        result = measure_allocations(lambda _: bytearray(1024 * 1024), 3)
+
+        self.assertTrue(result['peak_bytes'] >= 1024 * 1024)
+        self.assertTrue(result['retained_bytes'] < 1024 * 1024)
+
+    def test_measure_allocations_without_tracemalloc(self):
+        with mock.patch.object(measure_module, 'tracemalloc', None):
+            self.assertIsNone(measure_allocations(lambda _: None, 3))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from hpOneView.bench.cases import CASES
+from hpOneView.bench.runner import main, parse_args, run
+
+
+class RunnerTest(unittest.TestCase):
+    def test_run_should_report_every_benchmark(self):
+        args = parse_args(['--iterations', '3', '--pages', '2', '--page-size', '10', '--upload-size', '1000',
+                           '--profile-size', '4'])
+
+        report = run(args)
+
+        self.assertEqual(list(CASES), list(report['results']))
+        for name, result in report['results'].items():
+            self.assertEqual(3, result['iterations'], name)
+            self.assertTrue(result['p99_ms'] >= result['p50_ms'], name)
+        self.assertEqual(3, report['options']['iterations'])
+        self.assertIn('python_version', report)
+
+    def test_main_should_write_json_output(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, 'results.json')
+
+        main(['--iterations', '2', '--only', 'do_http', '--only', 'json_decode', '--page-size', '10',
+              '--output', output])
+
+        with open(output) as results_file:
+            report = json.load(results_file)
+        self.assertEqual(['do_http', 'json_decode'], list(report['results']))
+        self.assertEqual(2, report['results']['do_http']['iterations'])
@@ -48,6 +48,25 @@ class TasksTest(TestCase):
                                                 '.resourceCatgory=\'appliance\'"',
                                          query='', sort='name:ascending', start=0, view='day')
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all(self, mock_get):
+        self._client.iter_all(fields='parentTaskUri,owner,name',
+                              filter="\"taskState='Running'&filter=associatedResource.resourceCatgory='appliance'\"",
+                              sort='name:ascending',
+                              view='day')
+
+        mock_get.assert_called_once_with(count=-1, fields='parentTaskUri,owner,name',
+                                         filter='"taskState=\'Running\'&filter=associatedResource'
+                                                '.resourceCatgory=\'appliance\'"',
+                                         query='', sort='name:ascending', start=0, view='day')
+
+    @mock.patch.object(ResourceClient, 'get_cursor')
+    def test_get_cursor(self, mock_get):
+        self._client.get_cursor(fields='parentTaskUri,owner,name', sort='name:ascending', view='day')
+
+        mock_get.assert_called_once_with(start=0, page_size=-1, fields='parentTaskUri,owner,name', filter='',
+                                         query='', sort='name:ascending', view='day')
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_specific(self, mock_get):
         self._client.get('35323930-4936-4450-5531-303153474820')
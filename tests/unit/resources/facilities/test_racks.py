@@ -45,6 +45,24 @@ class RacksTest(TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort, query='')
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        filter = 'name=TestName'
+        sort = 'name:ascending'
+
+        self._racks.iter_all(2, 500, filter=filter, sort=sort)
+
+        mock_iter_all.assert_called_once_with(2, 500, filter=filter, sort=sort, query='')
+
+    @mock.patch.object(ResourceClient, 'get_cursor')
+    def test_get_cursor_called_once(self, mock_get_cursor):
+        filter = 'name=TestName'
+        sort = 'name:ascending'
+
+        self._racks.get_cursor(2, 500, filter=filter, sort=sort)
+
+        mock_get_cursor.assert_called_once_with(2, 500, filter=filter, sort=sort, query='')
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all_called_once_with_default(self, mock_get_all):
         self._racks.get_all()
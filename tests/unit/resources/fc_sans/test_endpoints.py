@@ -43,6 +43,16 @@ class EndpointsTest(TestCase):
         self._resource.get_all()
         mock_get_all.assert_called_once_with(start=0, count=-1, query='', sort='')
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_with_defaults(self, mock_iter_all):
+        self._resource.iter_all()
+        mock_iter_all.assert_called_once_with(start=0, count=-1, query='', sort='')
+
+    @mock.patch.object(ResourceClient, 'get_cursor')
+    def test_get_cursor_with_defaults(self, mock_get_cursor):
+        self._resource.get_cursor()
+        mock_get_cursor.assert_called_once_with(start=0, page_size=-1, query='', sort='')
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all(self, mock_get_all):
         query_filter = "name EQ 'TestName'"
@@ -53,6 +53,24 @@ class ConnectionTemplatesTest(unittest.TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        filter = 'name=TestName'
+        sort = 'name:ascending'
+
+        self._connection_templates.iter_all(2, 500, filter, sort)
+
+        mock_iter_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
+
+    @mock.patch.object(ResourceClient, 'get_cursor')
+    def test_get_cursor_called_once(self, mock_get_cursor):
+        filter = 'name=TestName'
+        sort = 'name:ascending'
+
+        self._connection_templates.get_cursor(2, 500, filter, sort)
+
+        mock_get_cursor.assert_called_once_with(2, 500, filter=filter, sort=sort)
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         self._connection_templates.get_by(
@@ -44,6 +44,20 @@ class UplinkSetsTest(unittest.TestCase):
         self._uplink_sets.get_all(2, 500, filter, sort)
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        filter = 'name=TestName'
+        sort = 'name:ascending'
+        self._uplink_sets.iter_all(2, 500, filter, sort)
+        mock_iter_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
+
+    @mock.patch.object(ResourceClient, 'get_cursor')
+    def test_get_cursor_called_once(self, mock_get_cursor):
+        filter = 'name=TestName'
+        sort = 'name:ascending'
+        self._uplink_sets.get_cursor(2, 500, filter, sort)
+        mock_get_cursor.assert_called_once_with(2, 500, filter=filter, sort=sort)
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all_called_once_with_defaults(self, mock_get_all):
         self._uplink_sets.get_all()
@@ -49,6 +49,30 @@ class ConnectionsTest(TestCase):
         mock_get_all.assert_called_once_with(
             2, 500, filter=filter, sort=sort, view=view, fields=fields)
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        filter = 'interconnectUri=xxxx'
+        sort = 'name:ascending'
+        fields = 'name'
+        view = ''
+
+        self._connections.iter_all(2, 500, filter, sort, view, fields)
+
+        mock_iter_all.assert_called_once_with(
+            2, 500, filter=filter, sort=sort, view=view, fields=fields)
+
+    @mock.patch.object(ResourceClient, 'get_cursor')
+    def test_get_cursor_called_once(self, mock_get_cursor):
+        filter = 'interconnectUri=xxxx'
+        sort = 'name:ascending'
+        fields = 'name'
+        view = ''
+
+        self._connections.get_cursor(2, 500, filter, sort, view, fields)
+
+        mock_get_cursor.assert_called_once_with(
+            2, 500, filter=filter, sort=sort, view=view, fields=fields)
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all_called_once_with_defaults(self, mock_get_all):
         self._connections.get_all()
@@ -40,6 +40,16 @@ class ServerHardwareTypesTest(unittest.TestCase):
         self._server_hardware_types.get_all()
         mock_get_all.assert_called_once_with(0, -1, filter='', sort='')
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once_with_default(self, mock_iter_all):
+        self._server_hardware_types.iter_all()
+        mock_iter_all.assert_called_once_with(0, -1, filter='', sort='')
+
+    @mock.patch.object(ResourceClient, 'get_cursor')
+    def test_get_cursor_called_once_with_default(self, mock_get_cursor):
+        self._server_hardware_types.get_cursor()
+        mock_get_cursor.assert_called_once_with(0, -1, filter='', sort='')
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all_called_conce(self, mock_get_all):
         filter = 'name=TestName'
@@ -46,6 +46,22 @@ class ServerProfilesTest(TestCase):
         self._resource.get_all(start=2, count=500, filter=query_filter, sort=sort)
         mock_get_all.assert_called_once_with(start=2, count=500, filter=query_filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all(self, mock_iter_all):
+        query_filter = 'name=TestName'
+        sort = 'name:ascending'
+
+        self._resource.iter_all(start=2, count=500, filter=query_filter, sort=sort)
+        mock_iter_all.assert_called_once_with(start=2, count=500, filter=query_filter, sort=sort)
+
+    @mock.patch.object(ResourceClient, 'get_cursor')
+    def test_get_cursor(self, mock_get_cursor):
+        query_filter = 'name=TestName'
+        sort = 'name:ascending'
+
+        self._resource.get_cursor(start=2, page_size=500, filter=query_filter, sort=sort)
+        mock_get_cursor.assert_called_once_with(start=2, page_size=500, filter=query_filter, sort=sort)
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id(self, mock_get):
         id = "6fee02f3-b7c7-42bd-a528-04341e16bad6"
@@ -58,6 +58,22 @@ class FirmwareDriversTest(TestCase):
         self.resource.get_all(2, 500, filter_by, sort)
         mock_get_all.assert_called_once_with(2, 500, filter=filter_by, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all(self, mock_iter_all):
+        filter_by = 'name=TestName'
+        sort = 'name:ascending'
+
+        self.resource.iter_all(2, 500, filter_by, sort)
+        mock_iter_all.assert_called_once_with(2, 500, filter=filter_by, sort=sort)
+
+    @mock.patch.object(ResourceClient, 'get_cursor')
+    def test_get_cursor(self, mock_get_cursor):
+        filter_by = 'name=TestName'
+        sort = 'name:ascending'
+
+        self.resource.get_cursor(2, 500, filter_by, sort)
+        mock_get_cursor.assert_called_once_with(2, 500, filter=filter_by, sort=sort)
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_by(self, mock_get_all):
         property_name = 'name'
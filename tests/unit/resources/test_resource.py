@@ -26,8 +26,10 @@ import mock
 
 from mock import call
 from hpOneView.connection import connection
-from hpOneView.exceptions import HPOneViewUnknownType
+from hpOneView.exceptions import HPOneViewException, HPOneViewUnknownType
 from hpOneView.resources.resource import ResourceClient, RESOURCE_CLIENT_INVALID_ID, UNRECOGNIZED_URI, TaskMonitor
+from hpOneView.resources.task_monitor import NO_WAIT, TaskFuture
+from hpOneView.resource_cache import ResourceCache
 
 
 class FakeResource(object):
@@ -180,6 +182,193 @@ class ResourceTest(unittest.TestCase):
 
         self.assertEqual(result, [])
 
+    def __make_pages(self, total, page_size, base_uri='/rest/testuri'):
+        pages = {}
+        for start in range(0, total, page_size):
+            next_start = start + page_size
+            pages['{0}?start={1}&count={2}'.format(base_uri, start, page_size)] = {
+                'start': start,
+                'total': total,
+                'nextPageUri': '{0}?start={1}&count={2}'.format(base_uri, next_start, page_size)
+                if next_start < total else None,
+                'members': [{'id': str(i)} for i in range(start, min(next_start, total))]}
+        return pages
+
+    def __get_all_sequentially_and_concurrently(self, mock_get, pages, first_uri, **kwargs):
+        mock_get.side_effect = lambda uri: pages[first_uri if uri.startswith(self.URI + '?start=0&count=') else uri]
+
+        sequential = self.resource_client.get_all(**kwargs)
+        sequential_calls = sorted(c[0][0] for c in mock_get.call_args_list)
+        mock_get.reset_mock()
+
+        self.connection.set_page_workers(4)
+        concurrent = self.resource_client.get_all(**kwargs)
+        concurrent_calls = sorted(c[0][0] for c in mock_get.call_args_list)
+
+        return sequential, concurrent, sequential_calls, concurrent_calls
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_concurrently_should_return_same_items_as_sequentially(self, mock_get):
+        pages = self.__make_pages(total=23, page_size=5)
+
+        sequential, concurrent, sequential_calls, concurrent_calls = self.__get_all_sequentially_and_concurrently(
+            mock_get, pages, '/rest/testuri?start=0&count=5')
+
+        self.assertEqual([{'id': str(i)} for i in range(23)], concurrent)
+        self.assertEqual(sequential, concurrent)
+        self.assertEqual(sequential_calls, concurrent_calls)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_concurrently_with_count_should_request_only_needed_pages(self, mock_get):
+        pages = self.__make_pages(total=50, page_size=5)
+
+        sequential, concurrent, sequential_calls, concurrent_calls = self.__get_all_sequentially_and_concurrently(
+            mock_get, pages, '/rest/testuri?start=0&count=5', count=12)
+
+        self.assertEqual(sequential, concurrent)
+        self.assertEqual(15, len(concurrent))
+        self.assertEqual(sequential_calls, concurrent_calls)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_concurrently_should_follow_next_page_uri_when_it_diverges(self, mock_get):
+        pages = self.__make_pages(total=20, page_size=5)
+        # The server changes the page size on the second page
+        pages['/rest/testuri?start=5&count=5']['nextPageUri'] = '/rest/testuri?start=10&count=10'
+        pages['/rest/testuri?start=10&count=10'] = {
+            'start': 10, 'total': 20, 'nextPageUri': None, 'members': [{'id': str(i)} for i in range(10, 20)]}
+
+        sequential, concurrent, _, _ = self.__get_all_sequentially_and_concurrently(
+            mock_get, pages, '/rest/testuri?start=0&count=5')
+
+        self.assertEqual([{'id': str(i)} for i in range(20)], concurrent)
+        self.assertEqual(sequential, concurrent)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_concurrently_should_stop_at_empty_page(self, mock_get):
+        pages = self.__make_pages(total=20, page_size=5)
+        pages['/rest/testuri?start=10&count=5']['members'] = []
+
+        sequential, concurrent, _, _ = self.__get_all_sequentially_and_concurrently(
+            mock_get, pages, '/rest/testuri?start=0&count=5')
+
+        self.assertEqual([{'id': str(i)} for i in range(10)], concurrent)
+        self.assertEqual(sequential, concurrent)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_concurrently_should_raise_error_of_needed_page(self, mock_get):
+        pages = self.__make_pages(total=20, page_size=5)
+        self.connection.set_page_workers(4)
+
+        def get(uri):
+            if uri == '/rest/testuri?start=10&count=5':
+                raise HPOneViewException('Page error')
+            return pages['/rest/testuri?start=0&count=5' if uri.endswith('count=-1') else uri]
+
+        mock_get.side_effect = get
+
+        self.assertRaises(HPOneViewException, self.resource_client.get_all)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_should_request_pages_sequentially_without_total(self, mock_get):
+        self.connection.set_page_workers(4)
+        mock_get.side_effect = [{'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'id': '1'}]},
+                                {'nextPageUri': None, 'members': [{'id': '2'}]}]
+
+        result = self.resource_client.get_all()
+
+        self.assertEqual([{'id': '1'}, {'id': '2'}], result)
+        self.assertEqual([call('/rest/testuri?start=0&count=-1'), call('/rest/testuri?start=1&count=1')],
+                         mock_get.call_args_list)
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_use_given_arguments(self, mock_get):
+        mock_get.return_value = {"members": [{"member": "member"}]}
+
+        result = list(self.resource_client.iter_all(1, 500, "'name'='Test'", "name NE 'Wrong'", 'name:ascending',
+                                                    'expand', 'name'))
+
+        uri = '{resource_uri}?start=1' \
+              '&count=500' \
+              '&filter=%27name%27%3D%27Test%27' \
+              '&query=name%20NE%20%27Wrong%27' \
+              '&sort=name%3Aascending' \
+              '&view=expand' \
+              '&fields=name'.format(resource_uri=self.URI)
+
+        self.assertEqual([{'member': 'member'}], result)
+        mock_get.assert_called_once_with(uri)
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_yield_same_items_as_get_all(self, mock_get):
+        uri_list = ['/rest/testuri?start=0&count=-1',
+                    '/rest/testuri?start=3&count=3',
+                    '/rest/testuri?start=6&count=3']
+
+        results = [{'nextPageUri': uri_list[1], 'members': [{'id': '1'}, {'id': '2'}, {'id': '3'}]},
+                   {'nextPageUri': uri_list[2], 'members': [{'id': '4'}, {'id': '5'}, {'id': '6'}]},
+                   {'nextPageUri': None, 'members': [{'id': '7'}]}]
+
+        mock_get.side_effect = results
+        expected_items = self.resource_client.get_all()
+        mock_get.reset_mock()
+        mock_get.side_effect = results
+
+        result = list(self.resource_client.iter_all())
+
+        self.assertEqual(expected_items, result)
+        self.assertEqual([call(uri_list[0]), call(uri_list[1]), call(uri_list[2])], mock_get.call_args_list)
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_with_count_should_stop_requesting_pages(self, mock_get):
+        mock_get.side_effect = [{'nextPageUri': '/rest/testuri?start=2&count=2', 'members': [{'id': '1'}, {'id': '2'}]},
+                                {'nextPageUri': '/rest/testuri?start=4&count=2', 'members': [{'id': '3'}, {'id': '4'}]}]
+
+        result = list(self.resource_client.iter_all(count=3))
+
+        self.assertEqual([{'id': '1'}, {'id': '2'}, {'id': '3'}, {'id': '4'}], result)
+        self.assertEqual(2, mock_get.call_count)
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_request_pages_as_items_are_consumed(self, mock_get):
+        pages = {'/rest/testuri?start=0&count=-1': {'nextPageUri': '/rest/testuri?start=1&count=1',
+                                                    'members': [{'id': '1'}]},
+                 '/rest/testuri?start=1&count=1': {'nextPageUri': '/rest/testuri?start=2&count=1',
+                                                   'members': [{'id': '2'}]},
+                 '/rest/testuri?start=2&count=1': {'nextPageUri': None, 'members': [{'id': '3'}]}}
+        mock_get.side_effect = lambda uri: pages[uri]
+
+        items = self.resource_client.iter_all()
+        self.assertEqual(0, mock_get.call_count)
+
+        self.assertEqual({'id': '1'}, next(items))
+        items.close()
+
+        self.assertTrue(mock_get.call_count <= 2)
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_return_nothing_when_response_has_no_items(self, mock_get):
+        mock_get.return_value = {'nextPageUri': None, 'members': []}
+
+        self.assertEqual([], list(self.resource_client.iter_all()))
+
+    def test_iter_all_with_different_resource_uri_should_fail(self):
+        try:
+            self.resource_client.iter_all(uri='/rest/other/resource/12467836/subresources')
+        except HPOneViewUnknownType as e:
+            self.assertEqual(UNRECOGNIZED_URI, e.args[0])
+        else:
+            self.fail('Expected Exception was not raised')
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_raise_page_error(self, mock_get):
+        mock_get.side_effect = [{'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'id': '1'}]},
+                                HPOneViewException('Page error')]
+
+        items = self.resource_client.iter_all()
+
+        self.assertEqual({'id': '1'}, next(items))
+        self.assertRaises(HPOneViewException, next, items)
+
     @mock.patch.object(connection, 'delete')
     @mock.patch.object(TaskMonitor, 'wait_for_task')
     def test_delete_by_id_called_once(self, mock_wait4task, mock_delete):
@@ -201,6 +390,83 @@ class ResourceTest(unittest.TestCase):
 
         mock_delete.assert_called_once_with(mock.ANY, custom_headers={'Accept-Language': 'en_US'})
 
+    @mock.patch.object(connection, 'delete')
+    @mock.patch.object(TaskMonitor, 'wait_for_task')
+    def test_delete_no_wait_should_return_task_future(self, mock_wait4task, mock_delete):
+        future = TaskFuture(self.task)
+        mock_delete.return_value = self.task, self.response_body
+        mock_wait4task.return_value = future
+
+        result = self.resource_client.delete('1', timeout=NO_WAIT)
+
+        self.assertIs(future, result)
+        mock_wait4task.assert_called_once_with(self.task, NO_WAIT)
+
+    @mock.patch.object(connection, 'delete')
+    def test_delete_no_wait_without_task_should_return_done_future(self, mock_delete):
+        mock_delete.return_value = None, self.response_body
+
+        future = self.resource_client.delete('1', timeout=NO_WAIT)
+
+        self.assertTrue(future.done())
+        self.assertTrue(future.result())
+
+    @mock.patch.object(connection, 'post')
+    def test_create_no_wait_without_task_should_return_done_future(self, mock_post):
+        mock_post.return_value = None, {'name': 'resource'}
+
+        future = self.resource_client.create({'name': 'resource'}, timeout=NO_WAIT)
+
+        self.assertIsInstance(future, TaskFuture)
+        self.assertEqual({'name': 'resource'}, future.result())
+
+    @mock.patch.object(connection, 'put')
+    @mock.patch.object(TaskMonitor, 'wait_for_task')
+    def test_update_no_wait_should_return_task_future(self, mock_wait4task, mock_put):
+        future = TaskFuture(self.task)
+        mock_put.return_value = self.task, self.task
+        mock_wait4task.return_value = future
+
+        result = self.resource_client.update({'uri': 'a_uri'}, timeout=NO_WAIT)
+
+        self.assertIs(future, result)
+        mock_wait4task.assert_called_once_with(self.task, NO_WAIT)
+
+    @mock.patch.object(connection, 'do_http')
+    def test_get_should_read_through_resource_cache(self, mock_do_http):
+        self.connection.set_resource_cache(ResourceCache())
+        mock_do_http.return_value = mock.Mock(status=200), {'uri': self.URI + '/1'}
+
+        self.resource_client.get('1')
+        result = self.resource_client.get('1')
+
+        self.assertEqual({'uri': self.URI + '/1'}, result)
+        mock_do_http.assert_called_once_with('GET', self.URI + '/1', '', custom_headers=None)
+
+    @mock.patch.object(connection, 'do_http')
+    def test_get_by_name_should_read_through_resource_cache(self, mock_do_http):
+        self.connection.set_resource_cache(ResourceCache())
+        mock_do_http.return_value = mock.Mock(status=200), {'members': [{'name': 'one'}], 'nextPageUri': None}
+
+        self.resource_client.get_by_name('one')
+        result = self.resource_client.get_by_name('one')
+
+        self.assertEqual({'name': 'one'}, result)
+        self.assertEqual(1, mock_do_http.call_count)
+
+    @mock.patch.object(connection, 'put')
+    @mock.patch.object(connection, 'do_http')
+    def test_update_should_invalidate_resource_cache(self, mock_do_http, mock_put):
+        self.connection.set_resource_cache(ResourceCache())
+        mock_do_http.return_value = mock.Mock(status=200), {'uri': self.URI + '/1'}
+        mock_put.return_value = None, {'uri': self.URI + '/1'}
+
+        self.resource_client.get('1')
+        self.resource_client.update({'uri': self.URI + '/1'})
+        self.resource_client.get('1')
+
+        self.assertEqual(2, mock_do_http.call_count)
+
     def test_delete_dict_invalid_uri(self):
         dict_to_delete = {"task": "task",
                           "uri": ""}
@@ -21,13 +21,18 @@
 # THE SOFTWARE.
 ###
 
+import socket
+import threading
 import unittest
 from mock import mock, call
+from urllib.parse import quote
 
 from hpOneView.connection import connection
+from hpOneView.hooks import RequestHooks
 from hpOneView.resources.task_monitor import TaskMonitor, MSG_UNKNOWN_OBJECT_TYPE, MSG_TASK_TYPE_UNRECONIZED, \
-    MSG_TIMEOUT, MSG_UNKNOWN_EXCEPTION, MSG_INVALID_TASK
+    MSG_TIMEOUT, MSG_UNKNOWN_EXCEPTION, MSG_INVALID_TASK, TASKS_PER_REQUEST, NO_WAIT, TaskFuture, TaskPoller
 from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError
+from hpOneView.exceptions import HPOneViewException, HPOneViewMultipleTaskErrors
 
 
 class TaskMonitorTest(unittest.TestCase):
@@ -293,3 +298,345 @@ class TaskMonitorTest(unittest.TestCase):
     def test_get(self, mock_get):
         self.task_monitor.get({"uri": "an uri"})
         mock_get.assert_called_once_with("an uri")
+
+    def __make_task(self, task_id, state='Completed', name='Update'):
+        return {"uri": "/rest/tasks/" + task_id,
+                "type": "TaskResourceV2",
+                "category": "tasks",
+                "name": name,
+                "taskState": state,
+                "associatedResource": {"resourceUri": "/rest/resources/" + task_id}}
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_poll_tasks_together(self, mock_get, mock_sleep):
+        running = [self.__make_task(str(i), state='Running') for i in range(3)]
+        rounds = [[running[0], running[1], running[2]],
+                  [self.__make_task('0'), running[1], self.__make_task('2')],
+                  [self.__make_task('1')]]
+
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                return {'members': rounds.pop(0)}
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        result = self.task_monitor.wait_for_tasks(running)
+
+        self.assertEqual([{'uri': '/rest/resources/0'}, {'uri': '/rest/resources/1'}, {'uri': '/rest/resources/2'}],
+                         result)
+        task_requests = [c for c in mock_get.call_args_list if c[0][0].startswith('/rest/tasks?')]
+        self.assertEqual(3, len(task_requests))
+        self.assertEqual(call('/rest/tasks?filter=%22uri%3D%27/rest/tasks/0%27%20OR%20'
+                              'uri%3D%27/rest/tasks/1%27%20OR%20uri%3D%27/rest/tasks/2%27%22&count=3'),
+                         task_requests[0])
+        self.assertEqual(call('/rest/tasks?filter=%22uri%3D%27/rest/tasks/1%27%22&count=1'), task_requests[2])
+        mock_sleep.assert_has_calls([call(1), call(2)])
+
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_split_filter_in_chunks(self, mock_get):
+        tasks = [self.__make_task(str(i)) for i in range(TASKS_PER_REQUEST + 1)]
+
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                return {'members': [task for task in tasks if quote("'" + task['uri'] + "'") in uri]}
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        result = self.task_monitor.wait_for_tasks(tasks)
+
+        self.assertEqual(TASKS_PER_REQUEST + 1, len(result))
+        task_requests = [c for c in mock_get.call_args_list if c[0][0].startswith('/rest/tasks?')]
+        self.assertEqual(2, len(task_requests))
+
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_get_tasks_missing_from_filtered_response(self, mock_get):
+        tasks = [self.__make_task('0'), self.__make_task('1')]
+
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                return {'members': [tasks[0]]}
+            if uri == '/rest/tasks/1':
+                return tasks[1]
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        result = self.task_monitor.wait_for_tasks(tasks)
+
+        self.assertEqual([{'uri': '/rest/resources/0'}, {'uri': '/rest/resources/1'}], result)
+        mock_get.assert_any_call('/rest/tasks/1')
+
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_get_tasks_one_by_one_when_filter_is_rejected(self, mock_get):
+        tasks = [self.__make_task('0'), self.__make_task('1')]
+
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                raise HPOneViewException({'errorCode': 'UNSUPPORTED_FILTER', 'message': 'Unsupported filter'})
+            if uri.startswith('/rest/tasks/'):
+                return tasks[int(uri[-1])]
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        result = self.task_monitor.wait_for_tasks(tasks)
+
+        self.assertEqual([{'uri': '/rest/resources/0'}, {'uri': '/rest/resources/1'}], result)
+        mock_get.assert_any_call('/rest/tasks/0')
+        mock_get.assert_any_call('/rest/tasks/1')
+
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_raise_errors_in_order(self, mock_get):
+        failed = self.__make_task('1', state='Error')
+        failed['taskErrors'] = [{'message': 'Error Message'}]
+        tasks = [self.__make_task('0'), failed, self.__make_task('2', name='Delete')]
+
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                return {'members': tasks}
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        try:
+            self.task_monitor.wait_for_tasks(tasks)
+        except HPOneViewMultipleTaskErrors as e:
+            self.assertEqual([{'uri': '/rest/resources/0'}, None, True], e.results)
+            self.assertEqual([None, 'Error Message', None], [error and error.msg for error in e.errors])
+            self.assertIsInstance(e, HPOneViewTaskError)
+        else:
+            self.fail()
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(TaskMonitor, 'get_current_seconds')
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_timeout(self, mock_get, mock_seconds, mock_sleep):
+        mock_get.return_value = {'members': [self.__make_task('0', state='Running')]}
+        mock_seconds.side_effect = [0, 1, 3]
+
+        try:
+            self.task_monitor.wait_for_tasks([self.__make_task('0', state='Running')], timeout=2)
+        except HPOneViewTimeout as e:
+            self.assertEqual(MSG_TIMEOUT % 2, e.msg)
+        else:
+            self.fail()
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(TaskMonitor, 'get_current_seconds')
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_notify_hooks_of_each_task(self, mock_get, mock_seconds, mock_sleep):
+        hooks = mock.Mock(spec=RequestHooks)
+        self.connection.add_hooks(hooks)
+        mock_get.side_effect = lambda uri: {'members': [self.__make_task('0'), self.__make_task('1', state='Running')]}
+        mock_seconds.side_effect = [0, 1, 3]
+
+        self.assertRaises(HPOneViewTimeout, self.task_monitor.wait_for_tasks,
+                          [self.__make_task('0', state='Running'), self.__make_task('1', state='Running')], 2)
+
+        self.assertEqual([call('/rest/tasks/0', 'Completed', mock.ANY), call('/rest/tasks/1', 'Timeout', mock.ANY)],
+                         hooks.on_task_wait.call_args_list)
+
+    def test_wait_for_tasks_with_empty_task(self):
+        try:
+            self.task_monitor.wait_for_tasks([{'uri': '/rest/tasks/1'}, {}])
+        except HPOneViewUnknownType as e:
+            self.assertEqual(MSG_INVALID_TASK, e.msg)
+        else:
+            self.fail()
+
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_without_tasks(self, mock_get):
+        self.assertEqual([], self.task_monitor.wait_for_tasks([]))
+        mock_get.assert_not_called()
+
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_task_no_wait_should_return_future(self, mock_get):
+        task = self.__make_task('0', state='Running')
+
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                return {'members': [self.__make_task('0')]}
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        future = self.task_monitor.wait_for_task(task, timeout=NO_WAIT)
+
+        self.assertIsInstance(future, TaskFuture)
+        self.assertEqual({'uri': '/rest/resources/0'}, future.result(timeout=5))
+        self.assertTrue(future.done())
+        self.assertEqual('Completed', future.task_state)
+
+    @mock.patch('hpOneView.resources.task_monitor.MIN_POLL_INTERVAL', 0.01)
+    @mock.patch('hpOneView.resources.task_monitor.MAX_POLL_INTERVAL', 0.05)
+    @mock.patch.object(connection, 'get')
+    def test_task_poller_should_poll_tasks_together(self, mock_get):
+        all_submitted = threading.Event()
+        task_requests = []
+
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                task_requests.append(uri)
+                state = 'Completed' if all_submitted.is_set() else 'Running'
+                return {'members': [self.__make_task(str(i), state=state) for i in range(3)
+                                    if quote("'/rest/tasks/%s'" % i) in uri]}
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        futures = [self.task_monitor.wait_for_task(self.__make_task(str(i), state='Running'), timeout=NO_WAIT)
+                   for i in range(3)]
+        all_submitted.set()
+
+        results = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual([{'uri': '/rest/resources/0'}, {'uri': '/rest/resources/1'}, {'uri': '/rest/resources/2'}],
+                         results)
+        self.assertIn('count=3', task_requests[-1])
+
+    @mock.patch('hpOneView.resources.task_monitor.MIN_POLL_INTERVAL', 0.01)
+    @mock.patch.object(connection, 'get')
+    def test_task_future_should_report_progress(self, mock_get):
+        running = self.__make_task('0', state='Running')
+        running['computedPercentComplete'] = 50
+        progress_read = threading.Event()
+        rounds = [running, self.__make_task('0')]
+
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                if len(rounds) == 1:
+                    progress_read.wait(5)
+                return {'members': [rounds.pop(0)]}
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        future = self.task_monitor.wait_for_task(self.__make_task('0', state='New'), timeout=NO_WAIT)
+        for _ in range(500):
+            if future.percent_complete == 50:
+                break
+            threading.Event().wait(0.01)
+        percent_complete = future.percent_complete
+        progress_read.set()
+        future.result(timeout=5)
+
+        self.assertEqual(50, percent_complete)
+        self.assertEqual('Completed', future.task_state)
+
+    @mock.patch.object(connection, 'get')
+    def test_task_future_should_raise_task_error(self, mock_get):
+        failed = self.__make_task('0', state='Error')
+        failed['taskErrors'] = [{'message': 'Failed'}]
+        mock_get.return_value = {'members': [failed]}
+
+        future = self.task_monitor.wait_for_task(self.__make_task('0', state='Running'), timeout=NO_WAIT)
+
+        self.assertRaises(HPOneViewTaskError, future.result, 5)
+        self.assertEqual('Failed', future.exception().msg)
+
+    @mock.patch('hpOneView.resources.task_monitor.MIN_POLL_INTERVAL', 0.01)
+    @mock.patch.object(connection, 'get')
+    def test_task_future_should_raise_poll_error(self, mock_get):
+        mock_get.side_effect = HPOneViewInvalidResource('Failed')
+
+        future = self.task_monitor.wait_for_task(self.__make_task('0', state='Running'), timeout=NO_WAIT)
+
+        self.assertRaises(HPOneViewInvalidResource, future.result, 5)
+
+    @mock.patch('hpOneView.resources.task_monitor.MIN_POLL_INTERVAL', 0.01)
+    @mock.patch.object(connection, 'get')
+    def test_task_poller_should_keep_futures_pending_when_a_poll_fails(self, mock_get):
+        polls = []
+
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                polls.append(uri)
+                if len(polls) == 1:
+                    raise socket.error('Connection reset by peer')
+                return {'members': [self.__make_task(str(i)) for i in range(2)]}
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        futures = [TaskPoller.get_poller(self.connection).submit(self.__make_task(str(i), state='Running'))
+                   for i in range(2)]
+
+        self.assertEqual([{'uri': '/rest/resources/0'}, {'uri': '/rest/resources/1'}],
+                         [future.result(timeout=5) for future in futures])
+        self.assertEqual(2, len(polls))
+
+    @mock.patch('hpOneView.resources.task_monitor.MIN_POLL_INTERVAL', 0.01)
+    @mock.patch.object(connection, 'get')
+    def test_task_poller_should_fail_only_the_future_of_the_failed_task(self, mock_get):
+        def get(uri):
+            if uri.startswith('/rest/tasks?'):
+                raise socket.error('Connection reset by peer')
+            if uri == '/rest/tasks/0':
+                raise HPOneViewException({'errorCode': 'RESOURCE_NOT_FOUND', 'message': 'Not found'})
+            if uri == '/rest/tasks/1':
+                return self.__make_task('1')
+            return {'uri': uri}
+
+        mock_get.side_effect = get
+
+        futures = [TaskPoller.get_poller(self.connection).submit(self.__make_task(str(i), state='Running'))
+                   for i in range(2)]
+
+        self.assertRaises(HPOneViewException, futures[0].result, 5)
+        self.assertEqual({'uri': '/rest/resources/1'}, futures[1].result(timeout=5))
+
+    @mock.patch.object(connection, 'get')
+    def test_task_future_should_call_done_callback(self, mock_get):
+        mock_get.return_value = {'members': [self.__make_task('0', name='Delete')]}
+        done = threading.Event()
+        callback_futures = []
+
+        def callback(future):
+            callback_futures.append(future)
+            done.set()
+
+        future = self.task_monitor.wait_for_task(self.__make_task('0', state='Running'), timeout=NO_WAIT)
+        future.add_done_callback(callback)
+        done.wait(5)
+
+        self.assertEqual([future], callback_futures)
+        self.assertTrue(future.result())
+
+    @mock.patch('hpOneView.resources.task_monitor.MIN_POLL_INTERVAL', 0.01)
+    @mock.patch.object(connection, 'get')
+    def test_task_poller_should_stop_tracking_cancelled_future(self, mock_get):
+        mock_get.return_value = {'members': [self.__make_task('0', state='Running')]}
+        poller = TaskPoller.get_poller(self.connection)
+
+        future = poller.submit(self.__make_task('0', state='Running'))
+        self.assertTrue(future.cancel())
+
+        for _ in range(500):
+            if poller.pending() == 0:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(0, poller.pending())
+        self.assertTrue(future.cancelled())
+
+    def test_task_poller_should_be_shared_by_connection(self):
+        poller = TaskPoller.get_poller(self.connection)
+
+        self.assertIs(poller, TaskPoller.get_poller(self.connection))
+        self.assertIsNot(poller, TaskPoller.get_poller(connection(self.host)))
+
+    def test_task_poller_submit_with_invalid_task(self):
+        try:
+            TaskPoller.get_poller(self.connection).submit({})
+        except HPOneViewUnknownType as e:
+            self.assertEqual(MSG_INVALID_TASK, e.msg)
+        else:
+            self.fail()
+
+    def test_task_future_from_result_should_be_done(self):
+        future = TaskFuture.from_result({'name': 'resource'})
+
+        self.assertTrue(future.done())
+        self.assertEqual({'name': 'resource'}, future.result())
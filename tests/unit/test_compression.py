@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import io
+import unittest
+import zlib
+
+import http.client
+
+from hpOneView.compression import CompressionStats, DecodingReader, get_content_decoder
+
+CONTENT = b'{"members": [' + b', '.join(b'{"name": "server-hardware-%d"}' % i for i in range(1000)) + b']}'
+
+
+def compress(data, wbits):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, wbits)
+    return compressor.compress(data) + compressor.flush()
+
+
+class DecodingReaderTest(unittest.TestCase):
+    def __read(self, content_encoding, data, chunk_size=100):
+        reader = DecodingReader(io.BytesIO(data), get_content_decoder(content_encoding))
+        return reader.read_all(chunk_size), reader.wire_bytes
+
+    def test_should_decompress_gzip(self):
+        data = compress(CONTENT, 16 + zlib.MAX_WBITS)
+
+        self.assertEqual((CONTENT, len(data)), self.__read('gzip', data))
+
+    def test_should_decompress_deflate(self):
+        self.assertEqual(CONTENT, self.__read('Deflate', compress(CONTENT, zlib.MAX_WBITS))[0])
+
+    def test_should_decompress_raw_deflate(self):
+        self.assertEqual(CONTENT, self.__read('deflate', compress(CONTENT, -zlib.MAX_WBITS))[0])
+
+    def test_should_read_empty_body(self):
+        self.assertEqual((b'', 0), self.__read('gzip', b''))
+
+    def test_read_should_not_return_more_than_the_chunk_size(self):
+        content = b'0' * 10000000
+        reader = DecodingReader(io.BytesIO(compress(content, 16 + zlib.MAX_WBITS)), get_content_decoder('gzip'))
+
+        chunks = list(iter(lambda: reader.read(65536), b''))
+
+        self.assertEqual(content, b''.join(chunks))
+        self.assertEqual(65536, max(len(chunk) for chunk in chunks))
+
+    def test_decompress_should_keep_the_data_over_max_length(self):
+        decoder = get_content_decoder('deflate')
+
+        data = decoder.decompress(compress(CONTENT, zlib.MAX_WBITS), 100)
+
+        self.assertEqual(CONTENT[:100], data)
+        self.assertTrue(decoder.unconsumed_tail)
+        while decoder.unconsumed_tail:
+            data += decoder.decompress(b'', 100)
+        self.assertEqual(CONTENT, data + decoder.flush())
+
+    def test_truncated_body_should_raise_incomplete_read(self):
+        data = compress(CONTENT, 16 + zlib.MAX_WBITS)
+
+        self.assertRaises(http.client.IncompleteRead, self.__read, 'gzip', data[:len(data) // 2])
+
+    def test_unsupported_encodings_should_not_be_decoded(self):
+        self.assertIsNone(get_content_decoder(None))
+        self.assertIsNone(get_content_decoder('identity'))
+        self.assertIsNone(get_content_decoder('br'))
+
+
+class CompressionStatsTest(unittest.TestCase):
+    def test_stats(self):
+        stats = CompressionStats()
+
+        stats.record(100, 400, True)
+        stats.record(100, 100, False)
+
+        self.assertEqual({'responses': 2, 'compressed_responses': 1, 'wire_bytes': 200, 'decoded_bytes': 500,
+                          'ratio': 0.4}, stats.stats)
@@ -20,13 +20,27 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 ###
+import hashlib
+import io
 import json
+import os
+import shutil
+import socket
+import tempfile
+import ssl
+import threading
 import mock
 import unittest
 
-from http.client import HTTPSConnection
-from hpOneView.connection import connection
+import http.client
+from http.client import HTTPConnection, HTTPSConnection
+from hpOneView.connection import connection, _ResumableHTTPSConnection, _TLSSessionCache, SSL_SESSION_SUPPORTED, \
+    MULTIPART_CHUNK_SIZE
 from hpOneView.exceptions import HPOneViewException
+from hpOneView.json_codec import JsonCodec
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.retry import RetryPolicy
+from hpOneView.testing.simulator import ApplianceSimulator
 from mock import call
 
 
@@ -394,3 +408,684 @@ class ConnectionTest(unittest.TestCase):
             self.assertEqual(e.msg, self.expected_response_body)
         else:
             self.fail()
+
+    @mock.patch.object(HTTPSConnection, 'request')
+    @mock.patch.object(HTTPSConnection, 'getresponse')
+    def test_do_http_should_reuse_open_connection(self, mock_response, mock_request):
+        mock_response.return_value = self.__make_http_response(status=200)
+        conn = self.connection.get_connection()
+        conn.sock = mock.Mock()
+
+        with mock.patch.object(self.connection, 'get_connection', return_value=conn) as mock_get_connection:
+            with mock.patch('select.select', return_value=([], [], [])):
+                self.connection.get('/path')
+                self.connection.get('/path')
+
+        mock_get_connection.assert_called_once_with()
+        self.assertEqual(2, mock_request.call_count)
+
+    @mock.patch.object(HTTPSConnection, 'request')
+    @mock.patch.object(HTTPSConnection, 'getresponse')
+    def test_do_http_should_retry_with_new_connection_when_reused_one_fails(self, mock_response, mock_request):
+        mock_response.return_value = self.__make_http_response(status=200)
+        stale_conn = mock.Mock()
+        mock_acquire = mock.Mock(side_effect=[(stale_conn, True), (self.connection.get_connection(), False)])
+        stale_conn.request.side_effect = socket.error('Connection reset by peer')
+
+        with mock.patch.object(self.connection, '_acquire_connection', mock_acquire):
+            result = self.connection.get('/path')
+
+        self.assertEqual(self.expected_response_body, result)
+        stale_conn.close.assert_called_once_with()
+        mock_request.assert_called_once_with('GET', '/path', '', self.default_headers)
+
+    def test_do_http_should_not_send_post_again_when_reused_connection_fails(self):
+        stale_conn = mock.Mock()
+        stale_conn.getresponse.side_effect = http.client.RemoteDisconnected('Remote end closed connection')
+        mock_acquire = mock.Mock(side_effect=[(stale_conn, True), (mock.Mock(), False)])
+
+        with mock.patch.object(self.connection, '_acquire_connection', mock_acquire):
+            self.assertRaises(http.client.RemoteDisconnected, self.connection.post, '/path', {'name': 'name'})
+
+        stale_conn.request.assert_called_once_with('POST', '/path', mock.ANY, mock.ANY)
+        stale_conn.close.assert_called_once_with()
+        self.assertEqual(1, mock_acquire.call_count)
+
+    @mock.patch.object(HTTPSConnection, 'request')
+    def test_do_http_should_raise_when_new_connection_fails(self, mock_request):
+        self.connection.set_retry_policy(None)
+        mock_request.side_effect = socket.error('Connection refused')
+
+        self.assertRaises(socket.error, self.connection.get, '/path')
+
+    def test_set_trusted_ssl_bundle_should_close_idle_connections(self):
+        conn = mock.Mock()
+        self.connection._release_connection(conn)
+
+        self.connection.set_trusted_ssl_bundle('/path/to/bundle.pem')
+
+        conn.close.assert_called_once_with()
+
+    def test_set_proxy_should_close_idle_connections(self):
+        conn = mock.Mock()
+        self.connection._release_connection(conn)
+
+        self.connection.set_proxy('10.0.0.1', 3128)
+
+        conn.close.assert_called_once_with()
+
+    def test_set_connection_pool(self):
+        self.connection.set_connection_pool(size=4, idle_timeout=15)
+
+        self.assertEqual(4, self.connection._pool.maxsize)
+        self.assertEqual(15, self.connection._pool.idle_timeout)
+
+    @mock.patch('ssl.SSLContext.load_verify_locations')
+    def test_get_connection_should_build_ssl_context_once(self, mock_load_verify_locations):
+        self.connection.set_trusted_ssl_bundle('/path/to/bundle.pem')
+
+        first = self.connection.get_connection()
+        second = self.connection.get_connection()
+
+        self.assertIs(first._context, second._context)
+        mock_load_verify_locations.assert_called_once_with('/path/to/bundle.pem')
+
+    @mock.patch('ssl.SSLContext.load_verify_locations')
+    def test_set_trusted_ssl_bundle_should_rebuild_ssl_context(self, mock_load_verify_locations):
+        context = self.connection.get_ssl_context()
+
+        self.connection.set_trusted_ssl_bundle('/path/to/bundle.pem')
+
+        self.assertIsNot(context, self.connection.get_ssl_context())
+        self.assertEqual(ssl.CERT_REQUIRED, self.connection.get_ssl_context().verify_mode)
+
+    def test_set_proxy_should_rebuild_ssl_context(self):
+        context = self.connection.get_ssl_context()
+        self.connection._tls_session_cache.session = 'session'
+
+        self.connection.set_proxy('10.0.0.1', 3128)
+        conn = self.connection.get_connection()
+
+        self.assertIsNot(context, conn._context)
+        self.assertIsNone(self.connection._tls_session_cache.session)
+        self.assertEqual('10.0.0.1', conn.host)
+        self.assertEqual(self.host, conn._tunnel_host)
+
+    def test_get_connection_should_not_verify_certificates_by_default(self):
+        conn = self.connection.get_connection()
+
+        self.assertEqual(ssl.CERT_NONE, conn._context.verify_mode)
+
+    @unittest.skipUnless(SSL_SESSION_SUPPORTED, 'TLS session resumption requires Python 3.6')
+    @mock.patch.object(HTTPConnection, 'connect')
+    def test_connect_should_resume_last_tls_session(self, mock_connect):
+        session_cache = _TLSSessionCache()
+        session_cache.session = 'previous session'
+        context = mock.Mock()
+        context.wrap_socket.return_value = mock.Mock(session='new session', session_reused=True)
+        conn = _ResumableHTTPSConnection(self.host, context=context, session_cache=session_cache)
+
+        conn.connect()
+
+        context.wrap_socket.assert_called_once_with(mock.ANY, server_hostname=self.host, session='previous session')
+        self.assertEqual('new session', session_cache.session)
+
+    @unittest.skipUnless(SSL_SESSION_SUPPORTED, 'TLS session resumption requires Python 3.6')
+    @mock.patch.object(HTTPConnection, 'connect')
+    def test_connect_should_do_full_handshake_when_session_is_from_other_context(self, mock_connect):
+        session_cache = _TLSSessionCache()
+        session_cache.session = 'previous session'
+        context = mock.Mock()
+        context.wrap_socket.side_effect = [ValueError(), mock.Mock(session='new session', session_reused=False)]
+        conn = _ResumableHTTPSConnection(self.host, context=context, session_cache=session_cache)
+
+        conn.connect()
+
+        self.assertEqual([call(mock.ANY, server_hostname=self.host, session='previous session'),
+                          call(mock.ANY, server_hostname=self.host)], context.wrap_socket.call_args_list)
+        self.assertEqual('new session', session_cache.session)
+
+    def test_default_page_workers(self):
+        self.assertEqual(1, self.connection.get_page_workers())
+
+    def test_set_page_workers(self):
+        self.connection.set_page_workers(8)
+
+        self.assertEqual(8, self.connection.get_page_workers())
+
+    def test_set_page_workers_should_fail_when_less_than_one(self):
+        self.assertRaises(ValueError, self.connection.set_page_workers, 0)
+
+    def __make_upload_file(self, content):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_path = os.path.join(directory, 'spp.iso')
+        with open(file_path, 'wb') as upload_file:
+            upload_file.write(content)
+        return file_path
+
+    def __mock_upload_connection(self, mock_get_connection):
+        mock_conn = mock.Mock()
+        mock_conn.sent = b''
+
+        def send(data):
+            mock_conn.sent += bytes(data)
+
+        mock_conn.send.side_effect = send
+        mock_conn.getresponse.return_value.read.return_value = json.dumps({'uri': '/rest/tasks/1'}).encode('utf-8')
+        mock_get_connection.return_value = mock_conn
+        return mock_conn
+
+    @mock.patch.object(connection, 'get_connection')
+    def test_post_multipart_should_stream_the_file(self, mock_get_connection):
+        content = b'\x00\x01spp' * (MULTIPART_CHUNK_SIZE // 2)
+        file_path = self.__make_upload_file(content)
+        mock_conn = self.__mock_upload_connection(mock_get_connection)
+        self.connection._headers['auth'] = 'session'
+
+        response, body = self.connection.post_multipart('/rest/firmware-bundles', None, file_path, 'spp.iso')
+
+        self.assertEqual({'uri': '/rest/tasks/1'}, body)
+        self.assertTrue(mock_conn.sent.startswith(b'------------ThIs_Is_tHe_bouNdaRY_$\r\n'))
+        self.assertTrue(b'filename="spp.iso"' in mock_conn.sent)
+        self.assertTrue(mock_conn.sent.endswith(b'\r\n------------ThIs_Is_tHe_bouNdaRY_$--\r\n\r\n'))
+        self.assertTrue(content in mock_conn.sent)
+        mock_conn.putheader.assert_any_call('Content-Length', len(mock_conn.sent))
+        mock_conn.putheader.assert_any_call('auth', 'session')
+        mock_conn.close.assert_called_once_with()
+        self.assertFalse(os.path.exists(file_path + '.b64'))
+
+    @mock.patch.object(connection, 'get_connection')
+    def test_post_multipart_should_report_progress(self, mock_get_connection):
+        file_path = self.__make_upload_file(b'x' * (MULTIPART_CHUNK_SIZE + 10))
+        mock_conn = self.__mock_upload_connection(mock_get_connection)
+        self.connection._headers['auth'] = 'session'
+        progress_callback = mock.Mock()
+
+        self.connection.post_multipart('/rest/firmware-bundles', None, file_path, 'spp.iso',
+                                       progress_callback=progress_callback)
+
+        total = len(mock_conn.sent)
+        sent = [args[0] for args, kwargs in progress_callback.call_args_list]
+        self.assertEqual(3, len(sent))
+        self.assertEqual(sorted(sent), sent)
+        self.assertEqual(total, sent[-1])
+        for args, kwargs in progress_callback.call_args_list:
+            self.assertEqual(total, args[1])
+            self.assertTrue(args[2] >= 0)
+
+    @mock.patch.object(connection, 'get_connection')
+    def test_post_multipart_should_close_the_connection_on_error(self, mock_get_connection):
+        file_path = self.__make_upload_file(b'spp')
+        mock_conn = self.__mock_upload_connection(mock_get_connection)
+        mock_conn.send.side_effect = socket.error('Broken pipe')
+        self.connection._headers['auth'] = 'session'
+
+        self.assertRaises(socket.error, self.connection.post_multipart, '/rest/firmware-bundles', None, file_path,
+                          'spp.iso')
+        mock_conn.close.assert_called_once_with()
+
+    def __make_download_response(self, status, content, headers=None, fail_after=None):
+        stream = io.BytesIO(content)
+        mock_response = mock.Mock(status=status)
+        headers = dict(headers or {})
+        mock_response.getheader.side_effect = lambda name, default=None: headers.get(name, default)
+
+        def read(size=-1):
+            if fail_after is not None and stream.tell() >= fail_after:
+                raise socket.error('Connection reset')
+            return stream.read(size)
+
+        mock_response.read.side_effect = read
+        return mock_response
+
+    def __mock_download_connection(self, mock_acquire, *responses):
+        mock_conn = mock.Mock()
+        mock_conn.getresponse.side_effect = list(responses)
+        mock_acquire.return_value = (mock_conn, False)
+        return mock_conn
+
+    def __make_download_path(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        return os.path.join(directory, 'appliance.bkp')
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_download_should_write_the_response_in_chunks(self, mock_acquire, mock_release):
+        content = os.urandom(10000)
+        file_path = self.__make_download_path()
+        response = self.__make_download_response(200, content, {'Content-Length': str(len(content))})
+        mock_conn = self.__mock_download_connection(mock_acquire, response)
+        progress_callback = mock.Mock()
+
+        checksum = self.connection.download('/rest/backups/archive/1', file_path, progress_callback=progress_callback,
+                                            chunk_size=4096)
+
+        with open(file_path, 'rb') as downloaded:
+            self.assertEqual(content, downloaded.read())
+        self.assertEqual(hashlib.sha256(content).hexdigest(), checksum)
+        self.assertFalse(os.path.exists(file_path + '.part'))
+        response.read.assert_called_with(4096)
+        self.assertEqual([4096, 8192, 10000], [args[0] for args, kwargs in progress_callback.call_args_list])
+        self.assertEqual(10000, progress_callback.call_args[0][1])
+        mock_conn.request.assert_called_once_with('GET', '/rest/backups/archive/1', '', self.default_headers)
+        mock_release.assert_called_once_with(mock_conn)
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_download_should_resume_from_part_file(self, mock_acquire, mock_release):
+        content = b'0123456789' * 100
+        file_path = self.__make_download_path()
+        with open(file_path + '.part', 'wb') as part:
+            part.write(content[:300])
+        response = self.__make_download_response(206, content[300:], {'Content-Length': '700'})
+        mock_conn = self.__mock_download_connection(mock_acquire, response)
+
+        checksum = self.connection.download('/rest/backups/archive/1', file_path)
+
+        with open(file_path, 'rb') as downloaded:
+            self.assertEqual(content, downloaded.read())
+        self.assertEqual(hashlib.sha256(content).hexdigest(), checksum)
+        self.assertEqual('bytes=300-', mock_conn.request.call_args[0][3]['Range'])
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_download_should_start_over_when_range_is_not_honored(self, mock_acquire, mock_release):
+        content = b'0123456789' * 100
+        file_path = self.__make_download_path()
+        with open(file_path + '.part', 'wb') as part:
+            part.write(b'stale content')
+        response = self.__make_download_response(200, content, {'Content-Length': '1000'})
+        self.__mock_download_connection(mock_acquire, response)
+
+        checksum = self.connection.download('/rest/backups/archive/1', file_path)
+
+        with open(file_path, 'rb') as downloaded:
+            self.assertEqual(content, downloaded.read())
+        self.assertEqual(hashlib.sha256(content).hexdigest(), checksum)
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_download_should_resume_when_connection_is_lost(self, mock_acquire, mock_release):
+        content = b'0123456789' * 100
+        file_path = self.__make_download_path()
+        interrupted = self.__make_download_response(200, content, {'Content-Length': '1000'}, fail_after=400)
+        resumed = self.__make_download_response(206, content[400:], {'Content-Length': '600'})
+        mock_conn = self.__mock_download_connection(mock_acquire, interrupted, resumed)
+
+        checksum = self.connection.download('/rest/backups/archive/1', file_path, chunk_size=100)
+
+        with open(file_path, 'rb') as downloaded:
+            self.assertEqual(content, downloaded.read())
+        self.assertEqual(hashlib.sha256(content).hexdigest(), checksum)
+        self.assertEqual('bytes=400-', mock_conn.request.call_args[0][3]['Range'])
+        mock_conn.close.assert_called_once_with()
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_download_should_resume_when_response_is_incomplete(self, mock_acquire, mock_release):
+        content = b'0123456789' * 100
+        file_path = self.__make_download_path()
+        truncated = self.__make_download_response(200, content[:400], {'Content-Length': '1000'})
+        resumed = self.__make_download_response(206, content[400:], {'Content-Length': '600'})
+        self.__mock_download_connection(mock_acquire, truncated, resumed)
+
+        self.connection.download('/rest/backups/archive/1', file_path)
+
+        with open(file_path, 'rb') as downloaded:
+            self.assertEqual(content, downloaded.read())
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_download_should_give_up_after_max_resumes(self, mock_acquire, mock_release):
+        file_path = self.__make_download_path()
+        responses = [self.__make_download_response(200, b'content', fail_after=0) for i in range(4)]
+        self.__mock_download_connection(mock_acquire, *responses)
+
+        self.assertRaises(socket.error, self.connection.download, '/rest/backups/archive/1', file_path)
+        self.assertFalse(os.path.exists(file_path))
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_download_should_raise_on_error_status(self, mock_acquire, mock_release):
+        file_path = self.__make_download_path()
+        response = self.__make_download_response(404, b'{"message": "Not found"}')
+        self.__mock_download_connection(mock_acquire, response)
+
+        try:
+            self.connection.download('/rest/backups/archive/1', file_path)
+        except HPOneViewException as e:
+            self.assertEqual({'message': 'Not found'}, e.msg)
+        else:
+            self.fail()
+        self.assertFalse(os.path.exists(file_path))
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_download_should_follow_redirect(self, mock_acquire, mock_release):
+        file_path = self.__make_download_path()
+        redirect = self.__make_download_response(302, b'', {'Location': '/rest/backups/archive/2'})
+        response = self.__make_download_response(200, b'content')
+        mock_conn = self.__mock_download_connection(mock_acquire, redirect, response)
+
+        self.connection.download('/rest/backups/archive/1', file_path)
+
+        self.assertEqual('/rest/backups/archive/2', mock_conn.request.call_args[0][1])
+        with open(file_path, 'rb') as downloaded:
+            self.assertEqual(b'content', downloaded.read())
+
+    def __mock_responses(self, mock_acquire, *responses):
+        mock_conn = mock.Mock()
+        mock_conn.getresponse.side_effect = list(responses)
+        mock_acquire.return_value = (mock_conn, False)
+        return mock_conn
+
+    def __make_retry_response(self, status, headers=None):
+        mock_response = mock.Mock(status=status)
+        mock_response.read.return_value = json.dumps(self.response_body).encode('utf-8')
+        mock_response.getheader.side_effect = lambda name, default=None: (headers or {}).get(name, default)
+        return mock_response
+
+    def test_default_retry_policy(self):
+        policy = self.connection.get_retry_policy()
+
+        self.assertTrue(isinstance(policy, RetryPolicy))
+        self.assertEqual(4, policy.max_attempts)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_retry_on_service_unavailable(self, mock_acquire, mock_release, mock_sleep):
+        mock_conn = self.__mock_responses(mock_acquire, self.__make_retry_response(503),
+                                          self.__make_retry_response(200))
+
+        response, body = self.connection.do_http('GET', '/path', '')
+
+        self.assertEqual(200, response.status)
+        self.assertEqual(self.expected_response_body, body)
+        self.assertEqual(2, mock_conn.request.call_count)
+        self.assertEqual(1, mock_sleep.call_count)
+        self.assertEqual({'retries': 1, 'gave_up': 0, 'backoff_seconds': mock_sleep.call_args[0][0],
+                          'reasons': {'503': 1}}, self.connection.get_retry_policy().stats)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_honor_retry_after(self, mock_acquire, mock_release, mock_sleep):
+        self.__mock_responses(mock_acquire, self.__make_retry_response(429, {'Retry-After': '7'}),
+                              self.__make_retry_response(200))
+
+        self.connection.do_http('GET', '/path', '')
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_return_last_response_after_max_attempts(self, mock_acquire, mock_release, mock_sleep):
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=3))
+        mock_conn = self.__mock_responses(mock_acquire, *[self.__make_retry_response(503) for i in range(3)])
+
+        response, body = self.connection.do_http('GET', '/path', '')
+
+        self.assertEqual(503, response.status)
+        self.assertEqual(3, mock_conn.request.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertEqual(1, self.connection.get_retry_policy().stats['gave_up'])
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_not_retry_post_on_status(self, mock_acquire, mock_release, mock_sleep):
+        mock_conn = self.__mock_responses(mock_acquire, self.__make_retry_response(503))
+
+        response, body = self.connection.do_http('POST', '/path', '{}')
+
+        self.assertEqual(503, response.status)
+        self.assertEqual(1, mock_conn.request.call_count)
+        mock_sleep.assert_not_called()
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_retry_on_connection_error(self, mock_acquire, mock_release, mock_sleep):
+        mock_conn = self.__mock_responses(mock_acquire, socket.error('Connection reset by peer'),
+                                          self.__make_retry_response(200))
+
+        response, body = self.connection.do_http('GET', '/path', '')
+
+        self.assertEqual(200, response.status)
+        mock_conn.close.assert_called_once_with()
+        self.assertEqual({socket.error.__name__: 1}, self.connection.get_retry_policy().stats['reasons'])
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_not_retry_post_on_connection_reset(self, mock_acquire, mock_release, mock_sleep):
+        self.__mock_responses(mock_acquire, socket.error('Connection reset by peer'))
+
+        self.assertRaises(socket.error, self.connection.do_http, 'POST', '/path', '{}')
+        mock_sleep.assert_not_called()
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_retry_bad_status_line_a_limited_times(self, mock_acquire, mock_release, mock_sleep):
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=2))
+        mock_conn = self.__mock_responses(mock_acquire, *[http.client.BadStatusLine('') for i in range(2)])
+
+        self.assertRaises(http.client.BadStatusLine, self.connection.do_http, 'GET', '/path', '')
+        self.assertEqual(2, mock_conn.request.call_count)
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_wait_for_rate_limiter(self, mock_acquire, mock_release):
+        rate_limiter = mock.MagicMock()
+        self.connection.set_rate_limiter(rate_limiter)
+        self.__mock_responses(mock_acquire, self.__make_retry_response(200))
+
+        self.connection.do_http('GET', '/rest/tasks/1', '')
+
+        rate_limiter.limit.assert_called_once_with('GET', '/rest/tasks/1')
+        rate_limiter.limit.return_value.__enter__.assert_called_once_with()
+        rate_limiter.limit.return_value.__exit__.assert_called_once_with(None, None, None)
+
+    @mock.patch.object(connection, 'get_connection')
+    def test_post_multipart_should_wait_for_rate_limiter(self, mock_get_connection):
+        rate_limiter = mock.MagicMock()
+        self.connection.set_rate_limiter(rate_limiter)
+        file_path = self.__make_upload_file(b'spp')
+        self.__mock_upload_connection(mock_get_connection)
+        self.connection._headers['auth'] = 'session'
+
+        self.connection.post_multipart('/rest/firmware-bundles', None, file_path, 'spp.iso')
+
+        rate_limiter.limit.assert_called_once_with('POST', '/rest/firmware-bundles')
+
+    def __make_body_response(self, data):
+        mock_response = mock.Mock(status=200)
+        mock_response.read.return_value = data
+        return mock_response
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_decode_the_body_with_the_json_codec(self, mock_acquire, mock_release):
+        codec = mock.Mock(spec=JsonCodec)
+        codec.loads.return_value = {'decoded': True}
+        self.connection.set_json_codec(codec)
+        self.__mock_responses(mock_acquire, self.__make_body_response(b'{"name": "enclosure"}'))
+
+        response, body = self.connection.do_http('GET', '/rest/enclosures/1', '')
+
+        codec.loads.assert_called_once_with(b'{"name": "enclosure"}')
+        self.assertEqual({'decoded': True}, body)
+
+    @mock.patch.object(connection, '_release_connection')
+    @mock.patch.object(connection, '_acquire_connection')
+    def test_do_http_should_return_text_and_binary_bodies(self, mock_acquire, mock_release):
+        self.__mock_responses(mock_acquire, self.__make_body_response(b'not json'),
+                              self.__make_body_response(b'\xff\xfe'),
+                              self.__make_body_response(b''))
+
+        self.assertEqual('not json', self.connection.do_http('GET', '/rest/text', '')[1])
+        self.assertEqual(b'\xff\xfe', self.connection.do_http('GET', '/rest/binary', '')[1])
+        self.assertEqual('', self.connection.do_http('GET', '/rest/empty', '')[1])
+
+    @mock.patch.object(connection, 'do_http')
+    def test_post_should_encode_the_body_with_the_json_codec(self, mock_do_http):
+        codec = mock.Mock(spec=JsonCodec)
+        codec.dumps.return_value = '{"encoded": true}'
+        self.connection.set_json_codec(codec)
+        mock_do_http.return_value = (mock.Mock(status=200), {})
+
+        self.connection.post('/rest/enclosures', {'name': 'enclosure'})
+
+        codec.dumps.assert_called_once_with({'name': 'enclosure'})
+        mock_do_http.assert_called_once_with(method='POST', path='/rest/enclosures', body='{"encoded": true}',
+                                             custom_headers=None)
+
+    def test_default_json_codec(self):
+        self.assertEqual('stdlib', self.connection.get_json_codec().name)
+
+
+class ConnectionLoginAgainTest(unittest.TestCase):
+    def setUp(self):
+        self.simulator = ApplianceSimulator(datasets={'/rest/server-hardware': 3},
+                                            credentials={'administrator': 'secret'})
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.connection = connection(self.simulator.address)
+        self.addCleanup(self.connection.close_connections)
+        self.connection.login({'userName': 'administrator', 'password': 'secret'})
+
+    def test_expired_session_should_log_in_again_and_send_the_request_again(self):
+        expired_session = self.connection.get_session_id()
+        self.simulator.expire_sessions()
+
+        members = self.connection.get('/rest/server-hardware')['members']
+
+        self.assertEqual(3, len(members))
+        self.assertNotEqual(expired_session, self.connection.get_session_id())
+        stats = self.connection.get_login_stats()
+        self.assertEqual(1, stats['logins_again'])
+        self.assertEqual(0, stats['failed_logins_again'])
+        self.assertTrue(stats['login_again_seconds'] >= stats['max_login_again_seconds'] > 0)
+
+    def test_concurrent_requests_should_log_in_again_once(self):
+        self.simulator.latency = 0.05
+        self.simulator.expire_sessions()
+        results = []
+
+        def get_members():
+            results.append(len(self.connection.get('/rest/server-hardware')['members']))
+
+        threads = [threading.Thread(target=get_members) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([3] * 8, results)
+        self.assertEqual(1, self.connection.get_login_stats()['logins_again'])
+        self.assertEqual(1, self.simulator.stats['sessions'])
+
+    def test_failed_login_again_should_raise(self):
+        self.simulator.expire_sessions()
+        self.simulator.credentials = {'administrator': 'changed'}
+
+        self.assertRaises(HPOneViewException, self.connection.get, '/rest/server-hardware')
+        self.assertEqual(1, self.connection.get_login_stats()['failed_logins_again'])
+        self.assertEqual(0, self.connection.get_login_stats()['logins_again'])
+
+    def test_other_unauthorized_error_should_not_log_in_again(self):
+        unauthorized = (mock.Mock(status=401), {'errorCode': 'AUTHN_AUTH_FAIL', 'message': 'Not allowed'})
+
+        with mock.patch.object(self.connection, '_connection__do_http', return_value=unauthorized) as mock_do_http:
+            self.assertRaises(HPOneViewException, self.connection.get, '/rest/server-hardware')
+
+        mock_do_http.assert_called_once_with('GET', '/rest/server-hardware', '', mock.ANY, None)
+        self.assertEqual(0, self.connection.get_login_stats()['logins_again'])
+
+    def test_unauthorized_version_request_during_login_again_should_not_deadlock(self):
+        expired = (mock.Mock(status=401), {'errorCode': 'AUTHORIZATION', 'message': 'Session expired'})
+        self.connection._validateVersion = False
+        errors = []
+
+        def get():
+            try:
+                self.connection.get('/rest/server-hardware')
+            except HPOneViewException as e:
+                errors.append(e)
+
+        with mock.patch.object(self.connection, '_connection__do_http', return_value=expired):
+            thread = threading.Thread(target=get)
+            thread.daemon = True
+            thread.start()
+            thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(1, len(errors))
+        self.assertEqual(1, self.connection.get_login_stats()['failed_logins_again'])
+
+    def test_request_without_session_should_not_log_in(self):
+        con = connection(self.simulator.address)
+        self.addCleanup(con.close_connections)
+
+        self.assertRaises(HPOneViewException, con.get, '/rest/server-hardware')
+        self.assertEqual(0, con.get_login_stats()['logins_again'])
+
+
+class ConnectionCompressionTest(unittest.TestCase):
+    def setUp(self):
+        self.simulator = ApplianceSimulator(datasets={'/rest/server-hardware': 50}, max_page_size=10)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.connection = connection(self.simulator.address)
+        self.addCleanup(self.connection.close_connections)
+        self.connection.set_compression(True)
+        self.connection.login({'userName': 'administrator', 'password': 'password'})
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_get_all_pages_should_be_decompressed(self):
+        self.connection.set_page_workers(3)
+
+        items = ResourceClient(self.connection, '/rest/server-hardware').get_all()
+
+        self.assertEqual(['server-hardware-%d' % i for i in range(50)], [item['name'] for item in items])
+        stats = self.connection.get_compression_stats()
+        self.assertTrue(stats['compressed_responses'] >= 5)
+        self.assertTrue(stats['wire_bytes'] < stats['decoded_bytes'])
+
+    def test_download_should_be_decompressed(self):
+        content = b'appliance backup ' * 10000
+        self.simulator.add_download('/rest/backups/archive/1', content)
+        file_path = os.path.join(self.directory, 'appliance.bkp')
+
+        checksum = self.connection.download('/rest/backups/archive/1', file_path, chunk_size=1000)
+
+        self.assertEqual(hashlib.sha256(content).hexdigest(), checksum)
+        stats = self.connection.get_compression_stats()
+        self.assertTrue(stats['wire_bytes'] < len(content) // 10)
+
+    def test_download_should_resume_uncompressed(self):
+        content = b'appliance backup ' * 10000
+        self.simulator.add_download('/rest/backups/archive/1', content)
+        file_path = os.path.join(self.directory, 'appliance.bkp')
+        with open(file_path + '.part', 'wb') as part:
+            part.write(content[:1000])
+
+        checksum = self.connection.download('/rest/backups/archive/1', file_path)
+
+        self.assertEqual(hashlib.sha256(content).hexdigest(), checksum)
+        self.assertEqual(len(content) - 1000, self.simulator.stats['bytes_downloaded'])
+
+    def test_disabled_compression_should_not_accept_encodings(self):
+        self.connection.set_compression(False)
+        responses = self.connection.get_compression_stats()['responses']
+
+        self.connection.get('/rest/server-hardware')
+
+        self.assertNotIn('Accept-Encoding', self.connection._headers)
+        self.assertEqual(responses, self.connection.get_compression_stats()['responses'])
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import socket
+import threading
+import unittest
+
+import mock
+
+from hpOneView.connection_pool import ConnectionPool
+
+KEY = ('127.0.0.1', None, None)
+
+
+class FakeConnection(object):
+    def __init__(self):
+        self.sock = mock.Mock()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+        self.sock = None
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(FakeConnection, maxsize=2, idle_timeout=60)
+
+    @mock.patch('select.select')
+    def test_acquire_should_reuse_released_connection(self, mock_select):
+        mock_select.return_value = [], [], []
+        conn, reused = self.pool.acquire(KEY)
+        self.pool.release(KEY, conn)
+
+        conn_again, reused_again = self.pool.acquire(KEY)
+
+        self.assertFalse(reused)
+        self.assertTrue(reused_again)
+        self.assertIs(conn, conn_again)
+
+    def test_acquire_should_not_share_connections_between_keys(self):
+        conn, _ = self.pool.acquire(KEY)
+        self.pool.release(KEY, conn)
+
+        other, reused = self.pool.acquire(('127.0.0.1', 'proxy', 3128))
+
+        self.assertFalse(reused)
+        self.assertIsNot(conn, other)
+
+    @mock.patch('select.select')
+    def test_acquire_should_discard_connection_closed_by_peer(self, mock_select):
+        conn, _ = self.pool.acquire(KEY)
+        mock_select.return_value = [conn.sock], [], []
+        self.pool.release(KEY, conn)
+
+        new_conn, reused = self.pool.acquire(KEY)
+
+        self.assertFalse(reused)
+        self.assertTrue(conn.closed)
+        self.assertIsNot(conn, new_conn)
+
+    @mock.patch('select.select')
+    def test_acquire_should_discard_connection_with_invalid_socket(self, mock_select):
+        mock_select.side_effect = socket.error()
+        conn, _ = self.pool.acquire(KEY)
+        self.pool.release(KEY, conn)
+
+        _, reused = self.pool.acquire(KEY)
+
+        self.assertFalse(reused)
+        self.assertTrue(conn.closed)
+
+    @mock.patch('time.time')
+    def test_acquire_should_discard_expired_connection(self, mock_time):
+        mock_time.return_value = 1000
+        conn, _ = self.pool.acquire(KEY)
+        self.pool.release(KEY, conn)
+
+        mock_time.return_value = 1061
+        _, reused = self.pool.acquire(KEY)
+
+        self.assertFalse(reused)
+        self.assertTrue(conn.closed)
+
+    def test_release_should_close_connections_over_the_limit(self):
+        conns = [self.pool.acquire(KEY)[0] for _ in range(3)]
+        for conn in conns:
+            self.pool.release(KEY, conn)
+
+        self.assertEqual(2, self.pool.size(KEY))
+        self.assertTrue(conns[2].closed)
+
+    def test_release_should_close_connection_when_pool_disabled(self):
+        self.pool.configure(maxsize=0)
+        conn, _ = self.pool.acquire(KEY)
+
+        self.pool.release(KEY, conn)
+
+        self.assertTrue(conn.closed)
+        self.assertEqual(0, self.pool.size())
+
+    def test_release_should_not_keep_connection_without_socket(self):
+        conn, _ = self.pool.acquire(KEY)
+        conn.sock = None
+
+        self.pool.release(KEY, conn)
+
+        self.assertEqual(0, self.pool.size())
+
+    def test_configure_should_close_idle_connections_over_the_new_limit(self):
+        conns = [self.pool.acquire(KEY)[0] for _ in range(2)]
+        for conn in conns:
+            self.pool.release(KEY, conn)
+
+        self.pool.configure(maxsize=1, idle_timeout=30)
+
+        self.assertEqual(1, self.pool.size(KEY))
+        self.assertEqual(1, self.pool.maxsize)
+        self.assertEqual(30, self.pool.idle_timeout)
+
+    def test_clear_should_close_all_idle_connections(self):
+        conn, _ = self.pool.acquire(KEY)
+        self.pool.release(KEY, conn)
+
+        self.pool.clear()
+
+        self.assertTrue(conn.closed)
+        self.assertEqual(0, self.pool.size())
+
+    @mock.patch('select.select')
+    def test_concurrent_acquire_should_never_hand_out_the_same_connection(self, mock_select):
+        mock_select.return_value = [], [], []
+        self.pool.configure(maxsize=8)
+        in_use = set()
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(200):
+                conn, _ = self.pool.acquire(KEY)
+                with lock:
+                    if id(conn) in in_use:
+                        errors.append(conn)
+                    in_use.add(id(conn))
+                with lock:
+                    in_use.discard(id(conn))
+                self.pool.release(KEY, conn)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertTrue(self.pool.size(KEY) <= 8)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import mock
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.fleet_client import FleetClient, FleetResource, FleetTimeout, APPLIANCE_KEY
+from hpOneView.testing.simulator import ApplianceSimulator
+
+
+class FleetClientTest(unittest.TestCase):
+    def setUp(self):
+        self.simulators = []
+        for servers in (3, 2):
+            simulator = ApplianceSimulator(datasets={'/rest/server-hardware': servers},
+                                           credentials={'administrator': 'secret'})
+            simulator.start()
+            self.addCleanup(simulator.stop)
+            self.simulators.append(simulator)
+        self.configs = [self.__make_config(simulator.address) for simulator in self.simulators]
+
+    def __make_config(self, address, password='secret'):
+        return {'ip': address, 'credentials': {'userName': 'administrator', 'password': password}}
+
+    def __make_fleet(self, configs=None, **kwargs):
+        fleet = FleetClient(configs or self.configs, **kwargs)
+        self.addCleanup(fleet.close)
+        return fleet
+
+    def test_should_log_in_to_all_appliances(self):
+        fleet = self.__make_fleet()
+
+        self.assertEqual([simulator.address for simulator in self.simulators], list(fleet.clients))
+        self.assertEqual({}, fleet.login_errors)
+
+    def test_should_log_in_concurrently(self):
+        barrier = threading.Event()
+        logged_in = []
+
+        def login(con, cred, verbose=False):
+            logged_in.append(con)
+            if len(logged_in) == 2:
+                barrier.set()
+            # Only completes when both logins are in progress
+            self.assertTrue(barrier.wait(5))
+
+        with mock.patch.object(connection, 'login', autospec=True, side_effect=login):
+            self.__make_fleet()
+
+        self.assertEqual(2, len(logged_in))
+
+    def test_get_all_should_merge_results_tagged_with_appliance(self):
+        fleet = self.__make_fleet()
+
+        servers = fleet.server_hardware.get_all()
+
+        self.assertEqual(5, len(servers))
+        self.assertEqual(3, len([server for server in servers if server[APPLIANCE_KEY] == self.simulators[0].address]))
+        self.assertEqual(2, len(servers.results[self.simulators[1].address]))
+        self.assertFalse(servers.partial)
+
+    def test_get_by_should_query_all_appliances(self):
+        fleet = self.__make_fleet()
+
+        servers = fleet.server_hardware.get_by('name', 'server-hardware-1')
+
+        self.assertEqual(sorted(simulator.address for simulator in self.simulators),
+                         sorted(server[APPLIANCE_KEY] for server in servers))
+
+    def test_should_return_partial_results_when_an_appliance_fails(self):
+        fleet = self.__make_fleet()
+        self.simulators[1].error_rate = 1
+        self.simulators[1].error_status = 500
+
+        servers = fleet.server_hardware.get_all()
+
+        self.assertEqual(3, len(servers))
+        self.assertTrue(servers.partial)
+        self.assertIsInstance(servers.errors[self.simulators[1].address], HPOneViewException)
+
+    def test_should_report_appliances_that_fail_to_log_in(self):
+        configs = [self.configs[0], self.__make_config(self.simulators[1].address, password='wrong')]
+
+        fleet = self.__make_fleet(configs)
+        servers = fleet.server_hardware.get_all()
+
+        self.assertEqual([self.simulators[0].address], list(fleet.clients))
+        self.assertEqual([self.simulators[1].address], list(fleet.login_errors))
+        self.assertEqual(3, len(servers))
+        self.assertEqual([self.simulators[1].address], list(servers.errors))
+
+    def test_should_report_appliances_that_time_out(self):
+        fleet = self.__make_fleet(timeout=0.5)
+        self.simulators[1].latency = 2
+
+        servers = fleet.server_hardware.get_all()
+
+        self.assertEqual(3, len(servers))
+        self.assertIsInstance(servers.errors[self.simulators[1].address], FleetTimeout)
+
+    def test_resource_properties(self):
+        fleet = self.__make_fleet()
+
+        self.assertIsInstance(fleet.server_profiles, FleetResource)
+        self.assertIs(fleet.server_profiles, fleet.server_profiles)
+        self.assertFalse(hasattr(fleet, 'connection'))
+
+    def test_call_should_run_a_function_with_each_client(self):
+        fleet = self.__make_fleet()
+
+        result = fleet.call(lambda client: client.connection.get_host())
+
+        self.assertEqual(dict((simulator.address, simulator.address) for simulator in self.simulators), result.results)
+
+    def test_should_tag_copies_of_the_resources(self):
+        fleet = self.__make_fleet()
+        shared = {'name': 'shared'}
+
+        result = fleet.call(lambda client: shared)
+
+        self.assertEqual({'name': 'shared'}, shared)
+        self.assertEqual([simulator.address for simulator in self.simulators],
+                         [resource[APPLIANCE_KEY] for resource in result])
+        self.assertIs(shared, result.results[self.simulators[0].address])
+
+    def test_from_json_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_name = os.path.join(directory, 'fleet.json')
+        with open(file_name, 'w') as fleet_file:
+            json.dump(self.configs, fleet_file)
+
+        fleet = FleetClient.from_json_file(file_name)
+        self.addCleanup(fleet.close)
+
+        self.assertEqual(2, len(fleet.clients))
+
+    def test_should_require_appliances(self):
+        self.assertRaises(ValueError, FleetClient, [])
+
+    def test_should_reject_duplicated_appliances(self):
+        self.assertRaises(ValueError, FleetClient, [self.configs[0], self.configs[0]])
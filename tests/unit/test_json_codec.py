@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import unittest
+
+from hpOneView.json_codec import CODECS, JsonCodec, get_installed_json_codecs, make_json_codec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+RESOURCE = {'type': 'server-hardware', 'uri': '/rest/server-hardware/1', 'name': 'Encl1, bay 1', 'position': 1,
+            'powerState': None, 'memoryMb': 262144, 'processorSpeedMhz': 2.4, 'portMap': {'deviceSlots': []},
+            'description': u'café'}
+
+
+class JsonCodecTest(unittest.TestCase):
+    def test_installed_codecs_should_decode_bytes_and_encode_str(self):
+        for name in get_installed_json_codecs():
+            codec = make_json_codec(name)
+            data = codec.dumps(RESOURCE)
+
+            self.assertEqual(name, codec.name)
+            self.assertIsInstance(data, type(u''), name)
+            self.assertEqual(RESOURCE, codec.loads(data.encode('utf-8')), name)
+
+    def test_installed_codecs_should_raise_value_error_for_invalid_json(self):
+        for name in get_installed_json_codecs():
+            self.assertRaises(ValueError, make_json_codec(name).loads, b'not json')
+
+    def test_installed_codecs_should_encode_non_str_keys(self):
+        for name in get_installed_json_codecs():
+            self.assertEqual({'1': 'one'}, make_json_codec(name).loads(make_json_codec(name).dumps({1: 'one'})))
+
+    def test_stdlib_is_always_installed(self):
+        self.assertIn('stdlib', get_installed_json_codecs())
+
+    def test_auto_should_get_the_fastest_installed_codec(self):
+        codec = make_json_codec('auto')
+
+        self.assertEqual(get_installed_json_codecs()[0], codec.name)
+        self.assertEqual(list(CODECS).index(codec.name), min(list(CODECS).index(name)
+                                                             for name in get_installed_json_codecs()))
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_auto_should_prefer_orjson(self):
+        self.assertEqual('orjson', make_json_codec('auto').name)
+
+    def test_codec_should_be_returned_as_is(self):
+        codec = JsonCodec()
+
+        self.assertIs(codec, make_json_codec(codec))
+
+    def test_unknown_codec_should_raise(self):
+        self.assertRaises(ValueError, make_json_codec, 'yaml')
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import mock
+import unittest
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewTaskError
+from hpOneView.hooks import RequestHooks
+from hpOneView.metrics import MetricsCollector, get_uri_template
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.resources.task_monitor import NO_WAIT, TaskMonitor
+from hpOneView.retry import RetryPolicy
+from hpOneView.testing.simulator import ApplianceSimulator
+
+
+class GetUriTemplateTest(unittest.TestCase):
+    def test_should_replace_ids(self):
+        self.assertEqual('/rest/server-hardware/{id}/environmentalConfiguration',
+                         get_uri_template('/rest/server-hardware/30303437-3034-4D32/environmentalConfiguration'))
+
+    def test_should_remove_the_query(self):
+        self.assertEqual('/rest/server-hardware', get_uri_template('/rest/server-hardware?start=10&count=5'))
+
+    def test_should_keep_names_of_collections_with_digits(self):
+        self.assertEqual('/rest/storage-systems/{id}/managedPorts/{id}',
+                         get_uri_template('/rest/storage-systems/TXQ1010307/managedPorts/1A2B'))
+        self.assertEqual('/rest/appliance/nodeinfo/version', get_uri_template('/rest/appliance/nodeinfo/version'))
+
+
+class MetricsCollectorTest(unittest.TestCase):
+    def setUp(self):
+        self.collector = MetricsCollector(latency_buckets=(0.1, 1.0), task_wait_buckets=(10.0,))
+
+    def test_to_dict_should_group_by_method_and_uri_template(self):
+        self.collector.after_response('GET', '/rest/server-hardware/1', 200, 0.05, 0, 100)
+        self.collector.after_response('GET', '/rest/server-hardware/2?view=expand', 404, 0.5, 0, 20)
+        self.collector.after_response('PUT', '/rest/server-hardware/1', 202, 2.0, 50, 10)
+
+        requests = self.collector.to_dict()['requests']
+
+        self.assertEqual([('GET', '/rest/server-hardware/{id}'), ('PUT', '/rest/server-hardware/{id}')],
+                         [(request['method'], request['uri']) for request in requests])
+        self.assertEqual({'count': 2, 'sum': 0.55, 'buckets': {'0.1': 1, '1.0': 2, '+Inf': 2}},
+                         requests[0]['latency'])
+        self.assertEqual(120, requests[0]['response_bytes'])
+        self.assertEqual({'200': 1, '404': 1}, requests[0]['statuses'])
+        self.assertEqual(50, requests[1]['request_bytes'])
+        self.assertEqual({'+Inf': 1, '0.1': 0, '1.0': 0}, requests[1]['latency']['buckets'])
+
+    def test_to_dict_should_count_errors_retries_and_task_waits(self):
+        self.collector.on_error('GET', '/rest/tasks/1', ValueError('reset'), 0.01)
+        self.collector.on_retry('GET', '/rest/tasks/1', 1, 'ValueError', 0.5)
+        self.collector.on_task_wait('/rest/tasks/1', 'Completed', 3.0)
+        self.collector.on_task_wait('/rest/tasks/2', 'Timeout', 60.0)
+
+        metrics = self.collector.to_dict()
+
+        self.assertEqual({'ValueError': 1}, metrics['requests'][0]['errors'])
+        self.assertEqual({'ValueError': 1}, metrics['requests'][0]['retries'])
+        self.assertEqual(1, metrics['task_waits']['Completed']['buckets']['10.0'])
+        self.assertEqual(0, metrics['task_waits']['Timeout']['buckets']['10.0'])
+        self.assertEqual(60.0, metrics['task_waits']['Timeout']['sum'])
+
+    def test_to_prometheus(self):
+        self.collector.after_response('GET', '/rest/server-hardware/1', 200, 0.05, 0, 100)
+        self.collector.on_retry('GET', '/rest/server-hardware/1', 1, '503', 0.5)
+        self.collector.on_task_wait('/rest/tasks/1', 'Completed', 3.0)
+
+        lines = self.collector.to_prometheus().splitlines()
+
+        labels = 'method="GET",uri="/rest/server-hardware/{id}"'
+        self.assertIn('# TYPE oneview_request_duration_seconds histogram', lines)
+        self.assertIn('oneview_request_duration_seconds_bucket{%s,le="0.1"} 1' % labels, lines)
+        self.assertIn('oneview_request_duration_seconds_bucket{%s,le="+Inf"} 1' % labels, lines)
+        self.assertIn('oneview_request_duration_seconds_count{%s} 1' % labels, lines)
+        self.assertIn('oneview_response_bytes_total{%s} 100' % labels, lines)
+        self.assertIn('oneview_responses_total{%s,status="200"} 1' % labels, lines)
+        self.assertIn('oneview_request_retries_total{%s,reason="503"} 1' % labels, lines)
+        self.assertIn('oneview_task_wait_seconds_sum{state="Completed"} 3.0', lines)
+        self.assertNotIn('oneview_request_errors_total', '\n'.join(lines))
+
+    def test_to_prometheus_should_escape_label_values(self):
+        self.collector.after_response('GET', '/rest/a"b\\c', 200, 0.05, 0, 1)
+
+        self.assertIn('uri="/rest/a\\"b\\\\c"', self.collector.to_prometheus())
+
+    def test_to_prometheus_should_be_empty_without_metrics(self):
+        self.assertEqual('', self.collector.to_prometheus())
+
+    def test_reset(self):
+        self.collector.after_response('GET', '/rest/server-hardware', 200, 0.05, 0, 100)
+
+        self.collector.reset()
+
+        self.assertEqual({'requests': [], 'task_waits': {}}, self.collector.to_dict())
+
+
+class ConnectionHooksTest(unittest.TestCase):
+    def setUp(self):
+        self.simulator = ApplianceSimulator(datasets={'/rest/server-hardware': 25}, max_page_size=10)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.connection = connection(self.simulator.address)
+        self.addCleanup(self.connection.close_connections)
+        self.connection.login({'userName': 'administrator', 'password': 'password'})
+        self.collector = MetricsCollector()
+        self.connection.add_hooks(self.collector)
+
+    def __get_request_metrics(self, method, uri):
+        for request in self.collector.to_dict()['requests']:
+            if (request['method'], request['uri']) == (method, uri):
+                return request
+
+    def test_should_collect_the_requests(self):
+        ResourceClient(self.connection, '/rest/server-hardware').get_all()
+
+        metrics = self.__get_request_metrics('GET', '/rest/server-hardware')
+        self.assertEqual(3, metrics['latency']['count'])
+        self.assertEqual({'200': 3}, metrics['statuses'])
+        self.assertTrue(metrics['response_bytes'] > 0)
+
+    def test_should_call_the_hooks_around_each_request(self):
+        hooks = mock.Mock(spec=RequestHooks)
+        self.connection.add_hooks(hooks)
+
+        self.connection.get('/rest/server-hardware?start=0&count=1')
+
+        hooks.before_request.assert_called_once_with('GET', '/rest/server-hardware?start=0&count=1', mock.ANY)
+        args = hooks.after_response.call_args[0]
+        self.assertEqual(('GET', '/rest/server-hardware?start=0&count=1', 200), args[:3])
+        hooks.on_error.assert_not_called()
+
+    def test_should_count_the_retries(self):
+        self.simulator.error_rate = 1
+        self.simulator.error_status = 503
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=3, backoff_factor=0))
+
+        response, body = self.connection.do_http('GET', '/rest/server-hardware', '')
+
+        metrics = self.__get_request_metrics('GET', '/rest/server-hardware')
+        self.assertEqual(503, response.status)
+        self.assertEqual({'503': 3}, metrics['statuses'])
+        self.assertEqual({'503': 2}, metrics['retries'])
+
+    def test_should_collect_the_task_waits(self):
+        ResourceClient(self.connection, '/rest/server-hardware').create({'name': 'new server'})
+
+        task_waits = self.collector.to_dict()['task_waits']
+        self.assertEqual(1, task_waits['Completed']['count'])
+
+    def test_should_collect_the_task_waits_of_wait_for_tasks(self):
+        self.simulator.task_duration = 0.5
+        tasks = [self.connection.post('/rest/server-hardware', {'name': 'server %d' % i})[0] for i in range(3)]
+
+        TaskMonitor(self.connection).wait_for_tasks(tasks)
+
+        task_waits = self.collector.to_dict()['task_waits']
+        self.assertEqual(3, task_waits['Completed']['count'])
+        self.assertTrue(task_waits['Completed']['sum'] > 0)
+
+    @mock.patch('hpOneView.resources.task_monitor.MIN_POLL_INTERVAL', 0.05)
+    def test_should_collect_the_task_waits_of_task_futures(self):
+        self.simulator.task_duration = 0.2
+        self.simulator.task_error_rate = 1
+        resource_client = ResourceClient(self.connection, '/rest/server-hardware')
+
+        futures = [resource_client.create({'name': 'server %d' % i}, timeout=NO_WAIT) for i in range(2)]
+        for future in futures:
+            self.assertRaises(HPOneViewTaskError, future.result, 10)
+
+        task_waits = self.collector.to_dict()['task_waits']
+        self.assertEqual(2, task_waits['Error']['count'])
+
+    def test_failing_hooks_should_not_fail_the_requests(self):
+        hooks = mock.Mock(spec=RequestHooks)
+        hooks.after_response.side_effect = ValueError('failing hook')
+        self.connection.add_hooks(hooks)
+
+        members = self.connection.get('/rest/server-hardware')['members']
+
+        self.assertEqual(10, len(members))
+        self.assertEqual(1, self.__get_request_metrics('GET', '/rest/server-hardware')['latency']['count'])
+
+    def test_remove_hooks(self):
+        self.connection.remove_hooks(self.collector)
+
+        self.connection.get('/rest/server-hardware')
+
+        self.assertEqual((), self.connection.get_hooks())
+        self.assertEqual([], self.collector.to_dict()['requests'])
@@ -22,12 +22,19 @@
 ###
 
 import io
+import os
+import shutil
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 import mock
 
 from hpOneView.connection import connection
 from hpOneView.oneview_client import OneViewClient
+from hpOneView.recording import TransportRecorder, TransportReplayer
+from hpOneView.testing.simulator import ApplianceSimulator
+from hpOneView.tracing import RecordingTracer
 from hpOneView.resources.data_services.metric_streaming import MetricStreaming
 from hpOneView.resources.facilities.power_devices import PowerDevices
 from hpOneView.resources.facilities.racks import Racks
@@ -46,6 +53,7 @@ from hpOneView.resources.servers.server_profiles import ServerProfiles
 from hpOneView.resources.storage.storage_volume_attachments import StorageVolumeAttachments
 from hpOneView.resources.storage.storage_volume_templates import StorageVolumeTemplates
 from hpOneView.resources.storage.volumes import Volumes
+from hpOneView.session_store import FileSessionStore, SessionStore
 from tests.test_utils import mock_builtin
 
 
@@ -132,6 +140,258 @@ class OneViewClientTest(unittest.TestCase):
 
         self.assertEqual(300, oneview_client.connection._apiVersion)
 
+    @mock.patch.object(connection, 'login')
+    @mock.patch.object(connection, 'set_connection_pool')
+    def test_configured_connection_pool(self, mock_set_connection_pool, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "connection_pool_size": 4,
+                  "connection_pool_idle_timeout": 15,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        OneViewClient(config)
+
+        mock_set_connection_pool.assert_called_once_with(size=4, idle_timeout=15)
+
+    @mock.patch.object(connection, 'login')
+    @mock.patch.object(connection, 'set_connection_pool')
+    def test_default_connection_pool(self, mock_set_connection_pool, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        OneViewClient(config)
+
+        mock_set_connection_pool.assert_not_called()
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_page_workers(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "page_workers": 4,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertEqual(4, oneview_client.connection.get_page_workers())
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_json_codec(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "json_codec": "stdlib",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertEqual("stdlib", oneview_client.connection.get_json_codec().name)
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_unknown_json_codec(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "json_codec": "yaml",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        self.assertRaises(ValueError, OneViewClient, config)
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_compression(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "compression": True,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertTrue(oneview_client.connection.get_compression())
+
+    @mock.patch.object(connection, 'login')
+    def test_compression_disabled_by_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertFalse(oneview_client.connection.get_compression())
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_record_path(self, mock_login):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        config = {"ip": "172.16.102.59",
+                  "record_path": os.path.join(directory, 'recording.jsonl.gz'),
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+        oneview_client.connection.get_transport().close()
+
+        self.assertIsInstance(oneview_client.connection.get_transport(), TransportRecorder)
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_replay_path(self, mock_login):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'recording.jsonl.gz')
+        TransportRecorder(path).close()
+        config = {"ip": "172.16.102.59",
+                  "replay_path": path,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertIsInstance(oneview_client.connection.get_transport(), TransportReplayer)
+
+    def test_record_and_replay_paths_should_raise(self):
+        config = {"ip": "172.16.102.59",
+                  "record_path": "recording.jsonl.gz",
+                  "replay_path": "recording.jsonl.gz",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        self.assertRaises(ValueError, OneViewClient, config)
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_tracer(self, mock_login):
+        tracer = RecordingTracer()
+        config = {"ip": "172.16.102.59",
+                  "tracer": tracer,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertIs(tracer, oneview_client.connection.get_tracer())
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_resource_cache(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "resource_cache_ttl": 30,
+                  "resource_cache_ttls": {"/rest/server-hardware-types": 3600},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        cache = oneview_client.connection.get_resource_cache()
+        self.assertEqual(30, cache.get_ttl('/rest/enclosure-groups'))
+        self.assertEqual(3600, cache.get_ttl('/rest/server-hardware-types'))
+
+    @mock.patch.object(connection, 'login')
+    def test_resource_cache_disabled_by_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertIsNone(oneview_client.connection.get_resource_cache())
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_retry_policy(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "retry_max_attempts": 6,
+                  "retry_deadline": 600,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        policy = oneview_client.connection.get_retry_policy()
+        self.assertEqual(6, policy.max_attempts)
+        self.assertEqual(600, policy.deadline)
+        self.assertEqual(0.5, policy.backoff_factor)
+
+    @mock.patch.object(connection, 'login')
+    def test_default_retry_policy(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertEqual(4, oneview_client.connection.get_retry_policy().max_attempts)
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_rate_limiter(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "rate_limits": {"read": {"rate": 20, "max_in_flight": 8},
+                                  "write": {"rate": 2, "burst": 1}},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertEqual(['poll', 'read', 'write'], sorted(oneview_client.connection.get_rate_limiter().stats))
+
+    @mock.patch.object(connection, 'login')
+    def test_rate_limiter_disabled_by_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertIsNone(oneview_client.connection.get_rate_limiter())
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_session_store_file(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "session_store": "/tmp/sessions.json",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        store = oneview_client.connection.get_session_store()
+        self.assertIsInstance(store, FileSessionStore)
+        self.assertEqual("/tmp/sessions.json", store.path)
+
+    @mock.patch.object(connection, 'login')
+    def test_configured_session_store_object(self, mock_login):
+        store = SessionStore()
+        config = {"ip": "172.16.102.59",
+                  "session_store": store,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertIs(store, oneview_client.connection.get_session_store())
+
+    @mock.patch.object(connection, 'login')
+    def test_session_store_disabled_by_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": ""}}
+
+        oneview_client = OneViewClient(config)
+
+        self.assertIsNone(oneview_client.connection.get_session_store())
+
     def test_fc_networks_has_right_type(self):
         self.assertIsInstance(self._oneview.fc_networks, FcNetworks)
 
@@ -402,3 +662,42 @@ class OneViewClientTest(unittest.TestCase):
     def test_lazy_loading_server_profiles(self):
         server_profiles = self._oneview.server_profiles
         self.assertEqual(server_profiles, self._oneview.server_profiles)
+
+
+class OneViewClientThreadSafetyTest(unittest.TestCase):
+    def setUp(self):
+        self.simulator = ApplianceSimulator(datasets={'/rest/server-hardware': 100}, max_page_size=10,
+                                            credentials={'administrator': 'secret'})
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self._oneview = OneViewClient({"ip": self.simulator.address,
+                                       "credentials": {"userName": "administrator", "password": "secret"}})
+        self.addCleanup(self._oneview.connection.close_connections)
+        self.uris = [resource['uri'] for resource in self._oneview.server_hardware.get_all()]
+
+    def __read(self, index):
+        uri = self.uris[index % len(self.uris)]
+        if index % 3 == 0:
+            con = self._oneview.connection
+            start = index % 90
+            con.get('/rest/server-hardware?start=%d&count=10' % start)
+            return [member['name'] for member in con.getNextPage()] == \
+                ['server-hardware-%d' % i for i in range(start + 10, min(start + 20, 100))]
+        if index % 3 == 1:
+            return self._oneview.server_hardware.get(uri)['uri'] == uri
+        start = index % 100
+        return len(self._oneview.server_hardware.get_all(start=start, count=5)) == min(5, 100 - start)
+
+    def test_shared_client_should_serve_thousands_of_concurrent_reads(self):
+        def read(index):
+            if index == 1000:
+                # Sessions expire and the compression changes the headers while the reads are in progress
+                self.simulator.expire_sessions()
+                self._oneview.connection.set_compression(True)
+            return self.__read(index)
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(read, range(3000)))
+
+        self.assertEqual([True] * 3000, results)
+        self.assertEqual(1, self._oneview.connection.get_login_stats()['logins_again'])
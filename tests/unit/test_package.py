@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import hpOneView
+from hpOneView.common import resource_compare
+from hpOneView.exceptions import HPOneViewTaskError
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(hpOneView.__file__))
+
+
+def run_python(code):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = PACKAGE_DIRECTORY
+    return json.loads(subprocess.check_output([sys.executable, '-W', 'ignore', '-c', code], env=env).decode('utf-8'))
+
+
+class PackageTest(unittest.TestCase):
+    def test_import_package_should_not_import_the_connection(self):
+        modules = run_python('import json, sys\n'
+                             'import hpOneView\n'
+                             'print(json.dumps(sorted(sys.modules)))')
+
+        imported = set(module for module in modules if module.startswith('hpOneView.'))
+        self.assertEqual(set(['hpOneView.exception_handler', 'hpOneView.exceptions']), imported)
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'the legacy modules are imported with the package')
+    def test_connection_should_stay_the_legacy_class_when_its_module_is_imported(self):
+        names = run_python('import json\n'
+                           'import hpOneView\n'
+                           'import hpOneView.oneview_client\n'
+                           'print(json.dumps([hpOneView.connection.__module__, hpOneView.connection.__name__]))')
+
+        self.assertEqual(['hpOneView.connection', 'connection'], names)
+
+    def test_import_client_should_not_import_the_legacy_and_resource_modules(self):
+        modules = run_python('import json, sys\n'
+                             'import hpOneView.oneview_client\n'
+                             'print(json.dumps(sorted(sys.modules)))')
+
+        legacy_modules = set('hpOneView.' + name for name in hpOneView.LEGACY_MODULES) - {
+            'hpOneView.common', 'hpOneView.connection', 'hpOneView.exceptions'}
+        self.assertEqual([], [module for module in modules if module in legacy_modules])
+        self.assertEqual([], [module for module in modules if module.startswith('hpOneView.resources')])
+
+    def test_import_star_should_export_the_legacy_names(self):
+        names = run_python('import json\n'
+                           'from hpOneView import *\n'
+                           'print(json.dumps([connection.__name__, servers.__name__, uncategorized.__name__,\n'
+                           '                  HPOneViewException.__name__, resource_compare.__name__]))')
+
+        self.assertEqual(['connection', 'servers', 'uncategorized', 'HPOneViewException', 'resource_compare'], names)
+
+    def test_legacy_names_should_be_imported_on_access(self):
+        self.assertIs(resource_compare, hpOneView.resource_compare)
+        self.assertIs(HPOneViewTaskError, hpOneView.HPOneViewTaskError)
+
+    def test_unknown_name_should_raise_attribute_error(self):
+        self.assertRaises(AttributeError, getattr, hpOneView, 'unknown_name')
+        self.assertFalse(hasattr(hpOneView, '__wrapped__'))
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import threading
+import time
+import unittest
+
+import mock
+
+from hpOneView.common import pages
+from hpOneView.connection import connection
+from hpOneView.pagination import CollectionCursor, PageCursor, get_uri_parameter, set_uri_parameter
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.testing.simulator import ApplianceSimulator
+
+
+def make_page(start, count=10, total=25):
+    uri = '/rest/server-hardware?start=%d&count=%d'
+    return {'members': [{'index': index} for index in range(start, min(start + count, total))],
+            'total': total,
+            'count': min(count, total - start),
+            'nextPageUri': uri % (start + count, count) if start + count < total else None,
+            'prevPageUri': uri % (start - count, count) if start > 0 else None}
+
+
+class UriParameterTest(unittest.TestCase):
+    def test_get_uri_parameter(self):
+        self.assertEqual(10, get_uri_parameter('/rest/alerts?start=10&count=-1', 'start'))
+        self.assertEqual(-1, get_uri_parameter('/rest/alerts?start=10&count=-1', 'count'))
+        self.assertEqual(0, get_uri_parameter('/rest/alerts?filter=restart%3D1', 'start', 0))
+
+    def test_set_uri_parameter(self):
+        self.assertEqual('/rest/alerts?start=20&count=10',
+                         set_uri_parameter('/rest/alerts?start=0&count=10', 'start', 20))
+        self.assertEqual('/rest/alerts?filter=x&start=5', set_uri_parameter('/rest/alerts?filter=x', 'start', 5))
+        self.assertEqual('/rest/alerts?start=5', set_uri_parameter('/rest/alerts', 'start', 5))
+
+
+class PageCursorTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = mock.Mock()
+        self.connection.get.side_effect = lambda page_uri: make_page(int(page_uri.split('start=')[1].split('&')[0]))
+
+    def test_update_should_only_set_the_fields_of_the_page(self):
+        cursor = PageCursor(self.connection, make_page(10))
+
+        cursor.update({'name': 'not a page'})
+
+        self.assertEqual('/rest/server-hardware?start=20&count=10', cursor.next_page_uri)
+        self.assertEqual('/rest/server-hardware?start=0&count=10', cursor.prev_page_uri)
+        self.assertEqual(25, cursor.total)
+        self.assertEqual(10, cursor.count)
+
+    def test_get_next_and_prev_pages_should_move_the_cursor(self):
+        cursor = PageCursor(self.connection, make_page(0))
+
+        members = cursor.get_next_page()
+
+        self.assertEqual(list(range(10, 20)), [member['index'] for member in members])
+        self.assertEqual('/rest/server-hardware?start=20&count=10', cursor.next_page_uri)
+        self.assertEqual(list(range(0, 10)), [member['index'] for member in cursor.get_prev_page()])
+
+    def test_get_last_and_first_pages_should_request_them_at_once(self):
+        cursor = PageCursor(self.connection, make_page(0))
+
+        self.assertEqual([20, 21, 22, 23, 24], [member['index'] for member in cursor.get_last_page()])
+        self.assertIsNone(cursor.get_last_page())
+        self.assertEqual(list(range(0, 10)), [member['index'] for member in cursor.get_first_page()])
+        self.assertEqual([mock.call('/rest/server-hardware?start=20&count=10'),
+                          mock.call('/rest/server-hardware?start=0&count=10')], self.connection.get.call_args_list)
+
+    def test_get_last_page_should_follow_the_pages_without_a_total(self):
+        pages_by_uri = {'/rest/alerts?page=2': {'members': [{'index': 1}], 'nextPageUri': '/rest/alerts?page=3'},
+                        '/rest/alerts?page=3': {'members': [{'index': 2}], 'nextPageUri': None}}
+        self.connection.get.side_effect = pages_by_uri.get
+        cursor = PageCursor(self.connection, {'members': [{'index': 0}], 'nextPageUri': '/rest/alerts?page=2'})
+
+        self.assertEqual([{'index': 2}], cursor.get_last_page())
+        self.assertEqual(2, self.connection.get.call_count)
+
+    def test_copy_should_not_move_with_the_original(self):
+        cursor = PageCursor(self.connection, make_page(0))
+        copy = cursor.copy()
+
+        cursor.get_next_page()
+
+        self.assertEqual('/rest/server-hardware?start=10&count=10', copy.next_page_uri)
+
+
+class ConnectionPaginationTest(unittest.TestCase):
+    def setUp(self):
+        self.simulator = ApplianceSimulator(datasets={'/rest/server-hardware': 25, '/rest/enclosures': 25},
+                                            max_page_size=10)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.connection = connection(self.simulator.address)
+        self.addCleanup(self.connection.close_connections)
+        self.connection.login({'userName': 'administrator', 'password': 'password'})
+
+    def test_get_next_page_should_follow_the_page_got_by_the_thread(self):
+        self.connection.get('/rest/server-hardware')
+
+        members = self.connection.getNextPage()
+
+        self.assertEqual(['server-hardware-%d' % i for i in range(10, 20)], [member['name'] for member in members])
+        self.assertEqual(25, self.connection.get_page_cursor().total)
+
+    def test_threads_should_not_move_the_pages_of_each_other(self):
+        names = {}
+        errors = []
+        barrier = threading.Barrier(2)
+
+        def walk(collection):
+            try:
+                self.connection.get(collection)
+                barrier.wait()
+                names[collection] = [member['name'] for member in self.connection.getLastPage()]
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=walk, args=(collection,))
+                   for collection in ('/rest/server-hardware', '/rest/enclosures')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(['server-hardware-%d' % i for i in range(20, 25)], names['/rest/server-hardware'])
+        self.assertEqual(['enclosures-%d' % i for i in range(20, 25)], names['/rest/enclosures'])
+
+    def test_pages_should_not_be_moved_by_other_requests(self):
+        first_page = self.connection.get('/rest/server-hardware')
+        iterator = pages(first_page['members'], self.connection)
+
+        self.connection.get('/rest/enclosures?start=20&count=10')
+        next_pages = list(iterator)
+
+        self.assertEqual([['server-hardware-%d' % i for i in range(10, 20)],
+                          ['server-hardware-%d' % i for i in range(20, 25)]],
+                         [[member['name'] for member in page] for page in next_pages])
+
+
+class CollectionCursorTest(unittest.TestCase):
+    def setUp(self):
+        self.simulator = ApplianceSimulator(datasets={'/rest/server-hardware': 95}, max_page_size=10)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.connection = connection(self.simulator.address)
+        self.addCleanup(self.connection.close_connections)
+        self.connection.login({'userName': 'administrator', 'password': 'password'})
+        self.resource_client = ResourceClient(self.connection, '/rest/server-hardware')
+
+    def __get_names(self, members):
+        return [member['name'] for member in members]
+
+    def __count_requests(self):
+        return self.simulator.stats['requests']
+
+    def test_get_page_should_request_only_that_page(self):
+        cursor = self.resource_client.get_cursor(page_size=10)
+        requests = self.__count_requests()
+
+        members = cursor.get_members(7)
+
+        self.assertEqual(['server-hardware-%d' % i for i in range(70, 80)], self.__get_names(members))
+        self.assertEqual(requests + 1, self.__count_requests())
+        self.assertEqual(95, cursor.total)
+        self.assertEqual(10, cursor.page_count)
+
+    def test_page_size_should_be_learned_from_the_pages(self):
+        cursor = self.resource_client.get_cursor(start=5)
+
+        members = cursor.get_members(2)
+
+        self.assertEqual(10, cursor.count)
+        self.assertEqual(9, cursor.page_count)
+        self.assertEqual(['server-hardware-%d' % i for i in range(25, 35)], self.__get_names(members))
+        self.assertEqual('/rest/server-hardware?start=85&count=10', cursor.page_uris[-1])
+
+    def test_page_size_should_be_corrected_when_the_appliance_limits_it(self):
+        cursor = self.resource_client.get_cursor(start=5, page_size=50)
+
+        members = cursor.get_members(1)
+
+        self.assertEqual(10, cursor.count)
+        self.assertEqual(['server-hardware-%d' % i for i in range(15, 25)], self.__get_names(members))
+        self.assertEqual('/rest/server-hardware?start=85&count=10', cursor.page_uris[-1])
+
+    def test_iteration_should_yield_all_the_members(self):
+        for prefetch in (0, 1, 3):
+            cursor = self.resource_client.get_cursor(prefetch=prefetch)
+
+            self.assertEqual(['server-hardware-%d' % i for i in range(95)], self.__get_names(cursor), prefetch)
+
+    def test_iter_pages_should_resume_from_a_page(self):
+        cursor = self.resource_client.get_cursor(page_size=10)
+        requests = self.__count_requests()
+
+        pages = list(cursor.iter_pages(first=8))
+
+        self.assertEqual([['server-hardware-%d' % i for i in range(80, 90)],
+                          ['server-hardware-%d' % i for i in range(90, 95)]],
+                         [self.__get_names(page['members']) for page in pages])
+        self.assertEqual(requests + 2, self.__count_requests())
+
+    def test_prefetch_should_be_bounded(self):
+        cursor = self.resource_client.get_cursor(page_size=10, prefetch=2)
+        requests = self.__count_requests()
+
+        iterator = cursor.iter_pages()
+        next(iterator)
+        time.sleep(0.2)
+
+        self.assertEqual(requests + 3, self.__count_requests())
+        iterator.close()
+
+    def test_empty_collection(self):
+        cursor = self.resource_client.get_cursor(filter="\"'name'='missing'\"")
+
+        self.assertEqual([], list(cursor))
+        self.assertEqual(0, cursor.page_count)
+
+    def test_cursor_without_total_should_follow_the_next_pages(self):
+        con = mock.Mock()
+        con.get.side_effect = lambda page_uri: {
+            '/rest/alerts?start=0&count=-1': {'members': [1, 2], 'nextPageUri': '/rest/alerts?after=2'},
+            '/rest/alerts?after=2': {'members': [3], 'nextPageUri': None}}[page_uri]
+
+        self.assertEqual([1, 2, 3], list(CollectionCursor(con, '/rest/alerts?start=0&count=-1')))
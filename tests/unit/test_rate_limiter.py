@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import threading
+import time
+import unittest
+
+from hpOneView.rate_limiter import RateLimiter, RequestBudget, READ, WRITE, POLL
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_get_request_type_of_batched_task_poll(self):
+        self.assertEqual(POLL, RateLimiter.get_request_type(
+            'GET', '/rest/tasks?filter=%22uri%3D%27/rest/tasks/1%27%20OR%20uri%3D%27/rest/tasks/2%27%22&count=2'))
+
+    def test_get_request_type(self):
+        self.assertEqual(READ, RateLimiter.get_request_type('GET', '/rest/server-hardware'))
+        self.assertEqual(READ, RateLimiter.get_request_type('get', '/rest/server-hardware'))
+        self.assertEqual(POLL, RateLimiter.get_request_type('GET', '/rest/tasks/1'))
+        self.assertEqual(POLL, RateLimiter.get_request_type('GET', '/rest/tasks'))
+        self.assertEqual(READ, RateLimiter.get_request_type('GET', '/rest/tasks-archive'))
+        self.assertEqual(WRITE, RateLimiter.get_request_type('POST', '/rest/server-profiles'))
+        self.assertEqual(WRITE, RateLimiter.get_request_type('DELETE', '/rest/tasks/1'))
+
+    def test_rate_should_space_requests_after_the_burst(self):
+        rate_limiter = RateLimiter(read=RequestBudget(rate=50, burst=2))
+
+        start = time.time()
+        for _ in range(6):
+            with rate_limiter.limit('GET', '/rest/alerts'):
+                pass
+        elapsed = time.time() - start
+
+        # 2 requests of burst, then 4 at 50 per second
+        self.assertTrue(elapsed >= 0.07, elapsed)
+        self.assertEqual(6, rate_limiter.stats[READ]['requests'])
+        self.assertTrue(rate_limiter.stats[READ]['wait_seconds'] >= 0.07)
+
+    def test_budgets_should_be_independent(self):
+        rate_limiter = RateLimiter(write=RequestBudget(rate=0.01, burst=1))
+
+        with rate_limiter.limit('POST', '/rest/server-profiles'):
+            pass
+        start = time.time()
+        for _ in range(20):
+            with rate_limiter.limit('GET', '/rest/alerts'):
+                pass
+
+        self.assertTrue(time.time() - start < 0.5)
+
+    def test_max_in_flight_should_limit_concurrent_requests(self):
+        rate_limiter = RateLimiter(read=RequestBudget(max_in_flight=2))
+        lock = threading.Lock()
+        concurrency = {'current': 0, 'max': 0}
+
+        def request():
+            with rate_limiter.limit('GET', '/rest/alerts'):
+                with lock:
+                    concurrency['current'] += 1
+                    concurrency['max'] = max(concurrency['max'], concurrency['current'])
+                time.sleep(0.01)
+                with lock:
+                    concurrency['current'] -= 1
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(2, concurrency['max'])
+        self.assertEqual(0, rate_limiter.stats[READ]['in_flight'])
+        self.assertTrue(rate_limiter.stats[READ]['max_wait_seconds'] > 0)
+
+    def test_stats_should_report_waiting_requests(self):
+        rate_limiter = RateLimiter(poll=RequestBudget(max_in_flight=1))
+        permit = rate_limiter.limit('GET', '/rest/tasks/1')
+        permit.__enter__()
+        waiting = threading.Thread(target=lambda: rate_limiter.limit('GET', '/rest/tasks/2').__enter__())
+        waiting.daemon = True
+        waiting.start()
+
+        for _ in range(100):
+            if rate_limiter.stats[POLL]['waiting']:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(1, rate_limiter.stats[POLL]['waiting'])
+        self.assertEqual(1, rate_limiter.stats[POLL]['in_flight'])
+        permit.__exit__(None, None, None)
+        waiting.join(1)
+        self.assertEqual(0, rate_limiter.stats[POLL]['waiting'])
+
+    def test_invalid_budgets(self):
+        self.assertRaises(ValueError, RequestBudget, rate=0)
+        self.assertRaises(ValueError, RequestBudget, max_in_flight=0)
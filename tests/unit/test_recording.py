@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewReplayError
+from hpOneView.recording import RecordedResponse, TransportRecorder, TransportReplayer, get_body_hash
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.testing.simulator import ApplianceSimulator
+
+CREDENTIALS = {'userName': 'administrator', 'password': 'secret'}
+
+
+class RecordedResponseTest(unittest.TestCase):
+    def test_getheader_should_ignore_case(self):
+        response = RecordedResponse(202, 'Accepted', [('Location', '/rest/tasks/1')])
+
+        self.assertEqual('/rest/tasks/1', response.getheader('location'))
+        self.assertEqual('default', response.getheader('ETag', 'default'))
+        self.assertEqual([('Location', '/rest/tasks/1')], response.getheaders())
+
+
+class TransportRecorderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'recording.jsonl.gz')
+
+    def __read_entries(self):
+        with gzip.open(self.path, 'rb') as recording:
+            return [json.loads(line.decode('utf-8')) for line in recording]
+
+    def test_should_record_the_responses_without_the_request_bodies(self):
+        response = RecordedResponse(200, 'OK', [('ETag', '"1"'), ('Content-Encoding', 'gzip')])
+        send_request = mock.Mock(return_value=(response, b'{"name": "one"}'))
+
+        with TransportRecorder(self.path) as recorder:
+            result = recorder.send(send_request, 'POST', '/rest/users', '{"password": "secret"}', {})
+
+        entry, = self.__read_entries()
+        self.assertEqual((response, b'{"name": "one"}'), result)
+        self.assertEqual(1, recorder.count)
+        self.assertEqual('POST', entry['method'])
+        self.assertEqual('/rest/users', entry['uri'])
+        self.assertEqual(get_body_hash('{"password": "secret"}'), entry['body_sha256'])
+        self.assertEqual(200, entry['status'])
+        self.assertEqual([['ETag', '"1"']], entry['headers'])
+        self.assertEqual('{"name": "one"}', entry['body'])
+        self.assertNotIn('secret', json.dumps(entry))
+
+    def test_should_redact_the_session_id_and_auth_headers(self):
+        response = RecordedResponse(200, 'OK', [('Set-Cookie', 'sessionID=token-1'), ('ETag', '"1"')])
+        send_request = mock.Mock(return_value=(response, b'{"partnerData": {}, "sessionID": "token-1"}'))
+
+        with TransportRecorder(self.path) as recorder:
+            result = recorder.send(send_request, 'POST', '/rest/login-sessions', '{"password": "secret"}', {})
+
+        entry, = self.__read_entries()
+        self.assertEqual(b'{"partnerData": {}, "sessionID": "token-1"}', result[1])
+        self.assertEqual('{"partnerData": {}, "sessionID": "REDACTED"}', entry['body'])
+        self.assertEqual([['Set-Cookie', 'REDACTED'], ['ETag', '"1"']], entry['headers'])
+        self.assertIsNone(entry['body_sha256'])
+        self.assertNotIn('token-1', json.dumps(entry))
+
+    def test_should_not_redact_when_disabled(self):
+        send_request = mock.Mock(return_value=(RecordedResponse(200, 'OK', []), b'{"sessionID": "token-1"}'))
+
+        with TransportRecorder(self.path, redact=False) as recorder:
+            recorder.send(send_request, 'POST', '/rest/login-sessions', '{"password": "secret"}', {})
+
+        entry, = self.__read_entries()
+        self.assertEqual('{"sessionID": "token-1"}', entry['body'])
+        self.assertEqual(get_body_hash('{"password": "secret"}'), entry['body_sha256'])
+
+    def test_should_record_binary_bodies(self):
+        send_request = mock.Mock(return_value=(RecordedResponse(200, 'OK', []), b'\xff\x00'))
+        with TransportRecorder(self.path) as recorder:
+            recorder.send(send_request, 'GET', '/rest/backups/1', '', {})
+
+        replayer = TransportReplayer(self.path)
+
+        self.assertEqual(b'\xff\x00', replayer.send(None, 'GET', '/rest/backups/1', '', {})[1])
+
+    def test_closed_recorder_should_raise(self):
+        recorder = TransportRecorder(self.path)
+        recorder.close()
+
+        self.assertRaises(ValueError, recorder.send, mock.Mock(return_value=(RecordedResponse(200, 'OK', []), b'')),
+                          'GET', '/rest/version', '', {})
+
+
+class TransportReplayerTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'recording.jsonl.gz')
+
+    def __record(self, *entries):
+        with gzip.open(self.path, 'wb') as recording:
+            for entry in entries:
+                entry.setdefault('body_sha256', get_body_hash(''))
+                entry.setdefault('reason', '')
+                entry.setdefault('headers', [])
+                entry.setdefault('elapsed', 0)
+                entry.setdefault('encoding', 'utf-8')
+                recording.write(json.dumps(entry).encode('utf-8') + b'\n')
+
+    def test_should_serve_the_responses_in_order_then_the_last_one(self):
+        self.__record({'method': 'GET', 'uri': '/rest/tasks/1', 'status': 200, 'body': '{"taskState": "Running"}'},
+                      {'method': 'GET', 'uri': '/rest/tasks/1', 'status': 200, 'body': '{"taskState": "Completed"}'})
+        replayer = TransportReplayer(self.path)
+
+        bodies = [replayer.send(None, 'GET', '/rest/tasks/1', '', {})[1] for i in range(3)]
+
+        self.assertEqual([b'{"taskState": "Running"}'] + [b'{"taskState": "Completed"}'] * 2, bodies)
+        self.assertEqual({'replayed': 3, 'missed': 0}, replayer.stats)
+
+    def test_should_match_the_request_body_first(self):
+        self.__record({'method': 'POST', 'uri': '/rest/fake', 'status': 201, 'body': 'one',
+                       'body_sha256': get_body_hash('{"name": "one"}')},
+                      {'method': 'POST', 'uri': '/rest/fake', 'status': 201, 'body': 'two',
+                       'body_sha256': get_body_hash('{"name": "two"}')})
+        replayer = TransportReplayer(self.path)
+
+        self.assertEqual(b'two', replayer.send(None, 'POST', '/rest/fake', '{"name": "two"}', {})[1])
+        self.assertEqual(b'one', replayer.send(None, 'POST', '/rest/fake', '{"name": "other"}', {})[1])
+
+    def test_missing_request_should_raise(self):
+        self.__record({'method': 'GET', 'uri': '/rest/version', 'status': 200, 'body': '{}'})
+        replayer = TransportReplayer(self.path)
+
+        self.assertRaises(HPOneViewReplayError, replayer.send, None, 'GET', '/rest/other', '', {})
+        self.assertEqual({'replayed': 0, 'missed': 1}, replayer.stats)
+
+    @mock.patch.object(time, 'sleep')
+    def test_should_replay_the_latency(self, mock_sleep):
+        self.__record({'method': 'GET', 'uri': '/rest/version', 'status': 200, 'body': '{}', 'elapsed': 0.25})
+
+        TransportReplayer(self.path).send(None, 'GET', '/rest/version', '', {})
+        mock_sleep.assert_not_called()
+        TransportReplayer(self.path, replay_latency=True).send(None, 'GET', '/rest/version', '', {})
+        mock_sleep.assert_called_once_with(0.25)
+
+
+class ConnectionRecordingTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'crawl.jsonl.gz')
+        self.simulator = ApplianceSimulator(datasets={'/rest/server-hardware': 25}, max_page_size=10,
+                                            credentials={'administrator': 'secret'})
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.address = self.simulator.address
+
+    def __make_connection(self, transport):
+        con = connection(self.address)
+        self.addCleanup(con.close_connections)
+        con.set_transport(transport)
+        return con
+
+    def test_replay_should_serve_a_recorded_crawl_without_the_appliance(self):
+        with TransportRecorder(self.path) as recorder:
+            con = self.__make_connection(recorder)
+            con.login(CREDENTIALS)
+            recorded = ResourceClient(con, '/rest/server-hardware').get_all()
+            created = ResourceClient(con, '/rest/server-hardware').create({'name': 'new server'})
+        self.simulator.stop()
+
+        con = self.__make_connection(TransportReplayer(self.path))
+        con.login({'userName': 'administrator', 'password': 'other'})
+        replayed = ResourceClient(con, '/rest/server-hardware').get_all()
+
+        self.assertEqual(recorded, replayed)
+        self.assertEqual(created, ResourceClient(con, '/rest/server-hardware').create({'name': 'new server'}))
+        self.assertEqual(0, con.get_transport().stats['missed'])
+
+    def test_recording_should_not_hold_the_session_id(self):
+        with TransportRecorder(self.path) as recorder:
+            con = self.__make_connection(recorder)
+            con.login(CREDENTIALS)
+            session_id = con.get_session_id()
+            recorded = con.get('/rest/server-hardware')
+        self.simulator.stop()
+
+        with gzip.open(self.path, 'rb') as recording:
+            self.assertNotIn(session_id.encode('utf-8'), recording.read())
+        con = self.__make_connection(TransportReplayer(self.path))
+        con.login(CREDENTIALS)
+        self.assertEqual(recorded, con.get('/rest/server-hardware'))
+
+    def test_recording_should_hold_the_decompressed_bodies(self):
+        with TransportRecorder(self.path) as recorder:
+            con = self.__make_connection(recorder)
+            con.set_compression(True)
+            con.login(CREDENTIALS)
+            recorded = con.get('/rest/server-hardware')
+
+        con = self.__make_connection(TransportReplayer(self.path))
+
+        self.assertEqual(recorded, con.get('/rest/server-hardware'))
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+###
+import unittest
+
+import mock
+
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.resource_cache import ResourceCache
+
+TYPE = '/rest/enclosure-groups'
+URI = TYPE + '/1'
+
+
+class FakeResponse(object):
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+
+class ResourceCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResourceCache(ttl=60, ttls={'/rest/server-hardware-types': 600}, max_bytes=1000)
+        self.connection = mock.Mock()
+        self.connection.do_http.return_value = FakeResponse(200), {'uri': URI, 'eTag': '1'}
+
+    def test_get_should_request_resource_once(self):
+        first = self.cache.get(self.connection, URI, TYPE)
+        second = self.cache.get(self.connection, URI, TYPE)
+
+        self.assertEqual({'uri': URI, 'eTag': '1'}, first)
+        self.assertEqual(first, second)
+        self.connection.do_http.assert_called_once_with('GET', URI, '', custom_headers=None)
+        self.assertEqual(1, self.cache.stats['hits'])
+        self.assertEqual(1, self.cache.stats['misses'])
+
+    def test_get_should_return_copies(self):
+        self.cache.get(self.connection, URI, TYPE)['name'] = 'changed'
+
+        self.assertNotIn('name', self.cache.get(self.connection, URI, TYPE))
+
+    @mock.patch('time.time')
+    def test_get_should_revalidate_expired_entry_with_etag(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.get(self.connection, URI, TYPE)
+        self.connection.do_http.return_value = FakeResponse(304), ''
+
+        mock_time.return_value = 1061
+        result = self.cache.get(self.connection, URI, TYPE)
+
+        self.assertEqual({'uri': URI, 'eTag': '1'}, result)
+        self.connection.do_http.assert_called_with('GET', URI, '', custom_headers={'If-None-Match': '1'})
+        self.assertEqual(1, self.cache.stats['revalidations'])
+
+        mock_time.return_value = 1100
+        self.cache.get(self.connection, URI, TYPE)
+        self.assertEqual(2, self.connection.do_http.call_count)
+
+    @mock.patch('time.time')
+    def test_get_should_replace_modified_entry(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.get(self.connection, URI, TYPE)
+        self.connection.do_http.return_value = FakeResponse(200), {'uri': URI, 'eTag': '2'}
+
+        mock_time.return_value = 1061
+        self.cache.get(self.connection, URI, TYPE)
+        result = self.cache.get(self.connection, URI, TYPE)
+
+        self.assertEqual({'uri': URI, 'eTag': '2'}, result)
+        self.assertEqual(2, self.connection.do_http.call_count)
+
+    @mock.patch('time.time')
+    def test_get_should_use_ttl_of_resource_type(self, mock_time):
+        uri = '/rest/server-hardware-types/1'
+        mock_time.return_value = 1000
+        self.cache.get(self.connection, uri, '/rest/server-hardware-types')
+
+        mock_time.return_value = 1500
+        self.cache.get(self.connection, uri, '/rest/server-hardware-types')
+
+        self.connection.do_http.assert_called_once_with('GET', uri, '', custom_headers=None)
+
+    def test_get_should_raise_on_error_status(self):
+        self.connection.do_http.return_value = FakeResponse(404), {'message': 'Not found'}
+
+        self.assertRaises(HPOneViewException, self.cache.get, self.connection, URI, TYPE)
+        self.assertEqual(0, self.cache.stats['entries'])
+
+    def test_put_should_evict_least_recently_used_entries(self):
+        self.connection.do_http.side_effect = lambda method, uri, body, custom_headers: \
+            (FakeResponse(200), {'uri': uri, 'data': 'x' * 250})
+        for index in range(3):
+            self.cache.get(self.connection, '{0}/{1}'.format(TYPE, index), TYPE)
+        # Uses the first entry, so the second is the least recently used
+        self.cache.get(self.connection, TYPE + '/0', TYPE)
+
+        self.cache.get(self.connection, TYPE + '/3', TYPE)
+
+        self.assertEqual(1, self.cache.stats['evictions'])
+        self.assertTrue(self.cache.stats['bytes'] <= 1000)
+        calls_before = self.connection.do_http.call_count
+        self.cache.get(self.connection, TYPE + '/0', TYPE)
+        self.assertEqual(calls_before, self.connection.do_http.call_count)
+        self.cache.get(self.connection, TYPE + '/1', TYPE)
+        self.assertEqual(calls_before + 1, self.connection.do_http.call_count)
+
+    def test_invalidate_should_remove_entries_of_the_type(self):
+        self.cache.get(self.connection, URI, TYPE)
+        self.cache.get(self.connection, '/rest/racks/1', '/rest/racks')
+
+        self.cache.invalidate(TYPE)
+
+        self.assertEqual(1, self.cache.stats['entries'])
+        self.cache.get(self.connection, URI, TYPE)
+        self.assertEqual(3, self.connection.do_http.call_count)
+
+    def test_invalidate_should_discard_read_in_progress(self):
+        def do_http(method, uri, body, custom_headers):
+            self.cache.invalidate(TYPE)
+            return FakeResponse(200), {'uri': URI}
+
+        self.connection.do_http.side_effect = do_http
+
+        self.cache.get(self.connection, URI, TYPE)
+
+        self.assertEqual(0, self.cache.stats['entries'])
+
+    def test_clear_should_remove_all_entries(self):
+        self.cache.get(self.connection, URI, TYPE)
+
+        self.cache.clear()
+
+        self.assertEqual(0, self.cache.stats['entries'])
+        self.assertEqual(0, self.cache.stats['bytes'])
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import errno
+import http.client
+import socket
+import time
+import unittest
+
+import mock
+
+from hpOneView.retry import RetryPolicy
+from email.utils import formatdate
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=4, backoff_factor=1, max_backoff=5, deadline=60, jitter=False)
+
+    def test_backoff_should_grow_exponentially_up_to_the_maximum(self):
+        self.assertEqual([1, 2, 4, 5, 5], [self.policy.get_backoff(retry) for retry in range(1, 6)])
+
+    def test_backoff_with_jitter_should_not_exceed_the_backoff(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+        for _ in range(100):
+            self.assertTrue(0 <= policy.get_backoff(3) <= 4)
+
+    def test_get_retry_delay_should_retry_statuses_of_idempotent_methods(self):
+        attempts = self.policy.begin()
+
+        self.assertEqual(1, self.policy.get_retry_delay(attempts, 'GET', '/rest/servers', status=503))
+        self.assertEqual(2, self.policy.get_retry_delay(attempts, 'PUT', '/rest/servers/1', status=502))
+        self.assertEqual(3, attempts.count)
+
+    def test_get_retry_delay_should_not_retry_other_statuses(self):
+        self.assertIsNone(self.policy.get_retry_delay(self.policy.begin(), 'GET', '/rest/servers', status=500))
+
+    def test_get_retry_delay_should_not_retry_post(self):
+        self.assertIsNone(self.policy.get_retry_delay(self.policy.begin(), 'POST', '/rest/servers', status=503))
+        self.assertIsNone(self.policy.get_retry_delay(self.policy.begin(), 'POST', '/rest/servers',
+                                                      error=socket.error(errno.ECONNRESET, 'Connection reset')))
+
+    def test_get_retry_delay_should_retry_post_when_connection_is_refused(self):
+        error = socket.error(errno.ECONNREFUSED, 'Connection refused')
+
+        self.assertEqual(1, self.policy.get_retry_delay(self.policy.begin(), 'POST', '/rest/servers', error=error))
+
+    def test_get_retry_delay_should_retry_http_errors(self):
+        error = http.client.BadStatusLine('')
+
+        self.assertEqual(1, self.policy.get_retry_delay(self.policy.begin(), 'GET', '/rest/servers', error=error))
+
+    def test_get_retry_delay_should_not_retry_other_errors(self):
+        self.assertIsNone(self.policy.get_retry_delay(self.policy.begin(), 'GET', '/rest/servers',
+                                                      error=ValueError()))
+
+    def test_get_retry_delay_should_give_up_after_max_attempts(self):
+        attempts = self.policy.begin()
+
+        delays = [self.policy.get_retry_delay(attempts, 'GET', '/rest/servers', status=503) for i in range(4)]
+
+        self.assertEqual([1, 2, 4, None], delays)
+        self.assertEqual(1, self.policy.stats['gave_up'])
+
+    def test_get_retry_delay_should_give_up_after_the_deadline(self):
+        policy = RetryPolicy(deadline=10, jitter=False, backoff_factor=1)
+        attempts = policy.begin()
+
+        with mock.patch('time.time', return_value=time.time() + 9.5):
+            self.assertIsNone(policy.get_retry_delay(attempts, 'GET', '/rest/servers', status=503))
+
+    def test_get_retry_delay_should_honor_retry_after_seconds(self):
+        delay = self.policy.get_retry_delay(self.policy.begin(), 'GET', '/rest/servers', status=429,
+                                            retry_after='12')
+
+        self.assertEqual(12, delay)
+
+    def test_get_retry_delay_should_honor_retry_after_date(self):
+        retry_after = formatdate(time.time() + 30, usegmt=True)
+
+        delay = self.policy.get_retry_delay(self.policy.begin(), 'GET', '/rest/servers', status=503,
+                                            retry_after=retry_after)
+
+        self.assertTrue(28 <= delay <= 30)
+
+    def test_get_retry_delay_should_give_up_when_retry_after_exceeds_the_deadline(self):
+        self.assertIsNone(self.policy.get_retry_delay(self.policy.begin(), 'GET', '/rest/servers', status=503,
+                                                      retry_after='3600'))
+
+    def test_get_retry_delay_should_call_on_retry(self):
+        on_retry = mock.Mock()
+        policy = RetryPolicy(jitter=False, backoff_factor=1, on_retry=on_retry)
+
+        policy.get_retry_delay(policy.begin(), 'GET', '/rest/servers', status=503)
+
+        on_retry.assert_called_once_with('GET', '/rest/servers', 1, '503', 1)
+
+    def test_stats(self):
+        attempts = self.policy.begin()
+        self.policy.get_retry_delay(attempts, 'GET', '/rest/servers', status=503)
+        self.policy.get_retry_delay(attempts, 'GET', '/rest/servers', error=http.client.BadStatusLine(''))
+
+        self.assertEqual({'retries': 2, 'gave_up': 0, 'backoff_seconds': 3,
+                          'reasons': {'503': 1, 'BadStatusLine': 1}}, self.policy.stats)
+
+    def test_max_attempts_should_be_at_least_one(self):
+        self.assertRaises(ValueError, RetryPolicy, max_attempts=0)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.session_store import FileSessionStore, SessionStore, get_session_key, is_session_of
+from hpOneView.testing.simulator import ApplianceSimulator
+
+CREDENTIALS = {'userName': 'administrator', 'password': 'secret'}
+
+
+class SessionStoreTest(unittest.TestCase):
+    def test_get_session_key(self):
+        self.assertEqual('administrator@10.0.0.1', get_session_key('10.0.0.1', CREDENTIALS))
+        self.assertEqual('LOCAL\\administrator@10.0.0.1',
+                         get_session_key('10.0.0.1', dict(CREDENTIALS, authLoginDomain='LOCAL')))
+
+    def test_set_get_and_delete(self):
+        store = SessionStore()
+
+        store.set('administrator@10.0.0.1', {'sessionID': 'abc', 'apiVersion': 200})
+
+        self.assertEqual({'sessionID': 'abc', 'apiVersion': 200}, store.get('administrator@10.0.0.1'))
+        self.assertIsNone(store.get('administrator@10.0.0.2'))
+        store.delete('administrator@10.0.0.1')
+        self.assertIsNone(store.get('administrator@10.0.0.1'))
+
+
+class FileSessionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'store', 'sessions.json')
+        self.store = FileSessionStore(self.path)
+
+    def test_sessions_should_be_shared_through_the_file(self):
+        self.store.set('administrator@10.0.0.1', {'sessionID': 'abc', 'apiVersion': 200})
+        self.store.set('administrator@10.0.0.2', {'sessionID': 'def', 'apiVersion': 300})
+        self.store.delete('administrator@10.0.0.2')
+
+        other_store = FileSessionStore(self.path)
+        self.assertEqual({'sessionID': 'abc', 'apiVersion': 200}, other_store.get('administrator@10.0.0.1'))
+        self.assertIsNone(other_store.get('administrator@10.0.0.2'))
+
+    @unittest.skipIf(os.name == 'nt', 'File modes are not supported')
+    def test_file_should_be_private(self):
+        self.store.set('administrator@10.0.0.1', {'sessionID': 'abc', 'apiVersion': 200})
+
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+        self.assertEqual(0o700, stat.S_IMODE(os.stat(os.path.dirname(self.path)).st_mode))
+        self.assertEqual(['sessions.json'], os.listdir(os.path.dirname(self.path)))
+
+    def test_missing_or_invalid_file_should_have_no_sessions(self):
+        self.assertIsNone(self.store.get('administrator@10.0.0.1'))
+
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as sessions_file:
+            sessions_file.write('{invalid')
+
+        self.assertIsNone(self.store.get('administrator@10.0.0.1'))
+        self.store.set('administrator@10.0.0.1', {'sessionID': 'abc', 'apiVersion': 200})
+        self.assertEqual('abc', self.store.get('administrator@10.0.0.1')['sessionID'])
+
+
+class ConnectionSessionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.simulator = ApplianceSimulator(credentials={'administrator': 'secret'})
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.store = SessionStore()
+
+    def __make_connection(self, api_version=200):
+        con = connection(self.simulator.address, api_version)
+        con.set_session_store(self.store)
+        self.addCleanup(con.close_connections)
+        return con
+
+    def test_login_should_reuse_the_stored_session(self):
+        self.simulator.add_resources('/rest/server-hardware', 2)
+        first = self.__make_connection()
+        first.login(CREDENTIALS)
+        requests = self.simulator.stats['requests']
+
+        second = self.__make_connection()
+        second.login(CREDENTIALS)
+
+        self.assertEqual(first.get_session_id(), second.get_session_id())
+        # Only the API version is validated
+        self.assertEqual(requests + 1, self.simulator.stats['requests'])
+        self.assertEqual(1, self.simulator.stats['sessions'])
+        self.assertEqual(2, len(second.get('/rest/server-hardware')['members']))
+
+    def test_login_should_not_reuse_a_session_of_another_api_version(self):
+        self.__make_connection().login(CREDENTIALS)
+
+        self.__make_connection(api_version=300).login(CREDENTIALS)
+
+        self.assertEqual(2, self.simulator.stats['sessions'])
+        self.assertEqual(300, self.store.get(get_session_key(self.simulator.address, CREDENTIALS))['apiVersion'])
+
+    def test_login_with_other_credentials_should_not_reuse_the_stored_session(self):
+        self.__make_connection().login(CREDENTIALS)
+
+        con = self.__make_connection()
+        self.assertRaises(HPOneViewException, con.login, {'userName': 'administrator', 'password': 'wrong'})
+        self.assertEqual(1, self.simulator.stats['sessions'])
+
+    def test_login_should_not_reuse_a_session_stored_without_the_credentials_hash(self):
+        key = get_session_key(self.simulator.address, CREDENTIALS)
+        self.__make_connection().login(CREDENTIALS)
+        session = self.store.get(key)
+        self.store.set(key, {'sessionID': session['sessionID'], 'apiVersion': session['apiVersion']})
+
+        con = self.__make_connection()
+        con.login(CREDENTIALS)
+
+        self.assertNotEqual(session['sessionID'], con.get_session_id())
+        self.assertEqual(2, self.simulator.stats['sessions'])
+
+    def test_login_should_validate_the_api_version_of_the_stored_session(self):
+        self.__make_connection().login(CREDENTIALS)
+        session = self.store.get(get_session_key(self.simulator.address, CREDENTIALS))
+        session['apiVersion'] = 100000
+        self.store.set(get_session_key(self.simulator.address, CREDENTIALS), session)
+
+        con = self.__make_connection(api_version=100000)
+        self.assertRaises(HPOneViewException, con.login, CREDENTIALS)
+
+    def test_stored_session_should_not_keep_the_password(self):
+        self.__make_connection().login(CREDENTIALS)
+
+        session = self.store.get(get_session_key(self.simulator.address, CREDENTIALS))
+
+        self.assertNotIn(CREDENTIALS['password'], str(session))
+        self.assertTrue(is_session_of(session, CREDENTIALS))
+        self.assertFalse(is_session_of(session, {'userName': 'administrator', 'password': 'wrong'}))
+
+    def test_expired_session_should_log_in_again(self):
+        self.simulator.add_resources('/rest/server-hardware', 2)
+        con = self.__make_connection()
+        con.login(CREDENTIALS)
+        expired_session = con.get_session_id()
+        self.simulator.expire_sessions()
+
+        members = con.get('/rest/server-hardware')['members']
+
+        self.assertEqual(2, len(members))
+        self.assertNotEqual(expired_session, con.get_session_id())
+        self.assertEqual(con.get_session_id(),
+                         self.store.get(get_session_key(self.simulator.address, CREDENTIALS))['sessionID'])
+
+    def test_rejected_login_should_raise(self):
+        con = self.__make_connection()
+        con.login(CREDENTIALS)
+        self.simulator.expire_sessions()
+        self.simulator.credentials = {'administrator': 'changed'}
+
+        self.assertRaises(HPOneViewException, con.get, '/rest/server-hardware')
+
+    def test_logout_should_remove_the_stored_session(self):
+        con = self.__make_connection()
+        con.login(CREDENTIALS)
+
+        con.logout()
+
+        self.assertIsNone(self.store.get(get_session_key(self.simulator.address, CREDENTIALS)))
+        self.assertEqual(0, self.simulator.stats['sessions'])
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import threading
+import unittest
+
+from hpOneView.connection import connection
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.testing.simulator import ApplianceSimulator
+from hpOneView.tracing import NO_OP_SPAN, NO_OP_TRACER, RecordingTracer, OpenTelemetryTracer, get_tracer
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+    TracerProvider = None
+
+
+class TracerTest(unittest.TestCase):
+    def test_no_op_tracer_should_be_disabled(self):
+        self.assertFalse(NO_OP_TRACER.enabled)
+        self.assertIs(NO_OP_SPAN, NO_OP_TRACER.start_span('operation', {'key': 'value'}))
+        self.assertIsNone(NO_OP_TRACER.get_current_span())
+
+    def test_get_tracer_should_default_to_no_op(self):
+        self.assertIs(NO_OP_TRACER, get_tracer(None))
+        self.assertIs(NO_OP_TRACER, get_tracer(connection('127.0.0.1')))
+
+    def test_recording_tracer_should_nest_spans(self):
+        tracer = RecordingTracer()
+
+        with tracer.start_span('parent', {'key': 'value'}) as parent:
+            with tracer.start_span('child') as child:
+                child.set_attribute('status', 200)
+                self.assertIs(child, tracer.get_current_span())
+            self.assertIs(parent, tracer.get_current_span())
+
+        self.assertEqual([child, parent], tracer.spans)
+        self.assertEqual([child], tracer.get_children(parent))
+        self.assertEqual({'key': 'value'}, parent.attributes)
+        self.assertEqual({'status': 200}, child.attributes)
+        self.assertTrue(parent.duration >= child.duration >= 0)
+        self.assertIsNone(tracer.get_current_span())
+
+    def test_recording_tracer_should_record_exceptions(self):
+        tracer = RecordingTracer()
+        error = ValueError('failed')
+
+        with self.assertRaises(ValueError):
+            with tracer.start_span('operation'):
+                raise error
+
+        self.assertIs(error, tracer.spans[0].error)
+
+    def test_recording_tracer_should_keep_a_current_span_per_thread(self):
+        tracer = RecordingTracer()
+        current_spans = []
+
+        with tracer.start_span('parent') as parent:
+            thread = threading.Thread(target=lambda: current_spans.append(tracer.get_current_span()))
+            thread.start()
+            thread.join()
+            with tracer.start_span('child', parent=parent):
+                pass
+
+        self.assertEqual([None], current_spans)
+        self.assertIs(parent, tracer.spans[0].parent)
+
+    @unittest.skipIf(TracerProvider is None, 'opentelemetry-sdk is not installed')
+    def test_open_telemetry_tracer(self):
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = OpenTelemetryTracer(provider.get_tracer('hpOneView'))
+
+        with tracer.start_span('parent'):
+            with tracer.start_span('child', {'status': 200}):
+                pass
+
+        child, parent = exporter.get_finished_spans()
+        self.assertEqual(parent.context.span_id, child.parent.span_id)
+        self.assertEqual(200, child.attributes['status'])
+
+
+class ResourceClientTracingTest(unittest.TestCase):
+    def setUp(self):
+        self.simulator = ApplianceSimulator(datasets={'/rest/server-hardware': 25}, max_page_size=10)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.connection = connection(self.simulator.address)
+        self.addCleanup(self.connection.close_connections)
+        self.connection.login({'userName': 'administrator', 'password': 'password'})
+        self.tracer = RecordingTracer()
+        self.connection.set_tracer(self.tracer)
+        self.resource_client = ResourceClient(self.connection, '/rest/server-hardware')
+
+    def __get_spans(self, name):
+        return [span for span in self.tracer.spans if span.name == name]
+
+    def test_get_all_should_trace_the_pages(self):
+        self.resource_client.get_all()
+
+        operation, = self.__get_spans('ResourceClient.get_all')
+        pages = self.tracer.get_children(operation)
+        self.assertEqual(['ResourceClient.page'] * 3, [page.name for page in pages])
+        self.assertEqual([0, 1, 2], [page.attributes['oneview.page.index'] for page in pages])
+        self.assertEqual([10, 10, 5], [page.attributes['oneview.page.members'] for page in pages])
+        requests = self.tracer.get_children(pages[0])
+        self.assertEqual(['HTTP GET'], [request.name for request in requests])
+        self.assertEqual(200, requests[0].attributes['http.status_code'])
+        self.assertEqual(pages[0].attributes['oneview.uri'], requests[0].attributes['oneview.uri'])
+
+    def test_get_all_with_page_workers_should_trace_the_pages_under_the_operation(self):
+        self.connection.set_page_workers(4)
+
+        self.resource_client.get_all()
+
+        operation, = self.__get_spans('ResourceClient.get_all')
+        pages = self.tracer.get_children(operation)
+        self.assertEqual([0, 1, 2], sorted(page.attributes['oneview.page.index'] for page in pages))
+
+    def test_iter_all_should_trace_the_pages(self):
+        with self.tracer.start_span('iteration') as iteration:
+            items = list(self.resource_client.iter_all())
+
+        pages = self.tracer.get_children(iteration)
+        self.assertEqual(25, len(items))
+        self.assertEqual([0, 1, 2], [page.attributes['oneview.page.index'] for page in pages])
+
+    def test_create_should_trace_the_request_and_the_task_polls(self):
+        self.simulator.task_duration = 0.5
+
+        self.resource_client.create({'name': 'new server'})
+
+        operation, = self.__get_spans('ResourceClient.create')
+        self.assertEqual('/rest/server-hardware', operation.attributes['oneview.resource_uri'])
+        children = self.tracer.get_children(operation)
+        self.assertEqual(['HTTP POST', 'HTTP GET', 'TaskMonitor.wait_for_task'], [child.name for child in children])
+        self.assertEqual(202, children[0].attributes['http.status_code'])
+        wait = children[2]
+        self.assertEqual('Completed', wait.attributes['oneview.task.state'])
+        polls = [child for child in self.tracer.get_children(wait) if child.name == 'TaskMonitor.poll']
+        self.assertEqual('Running', polls[0].attributes['oneview.task.state'])
+        self.assertEqual('Completed', polls[-1].attributes['oneview.task.state'])
+        self.assertEqual(['HTTP GET'], [child.name for child in self.tracer.get_children(polls[0])])
+
+    def test_errors_should_be_recorded(self):
+        self.assertRaises(Exception, self.resource_client.get, 'missing')
+
+        operation, = self.__get_spans('ResourceClient.get')
+        self.assertIsNotNone(operation.error)
+        self.assertEqual(404, self.tracer.get_children(operation)[0].attributes['http.status_code'])
+
+    def test_disabled_tracer_should_not_trace(self):
+        self.connection.set_tracer(None)
+
+        self.resource_client.get_all()
+
+        self.assertIs(NO_OP_TRACER, self.connection.get_tracer())
+        self.assertEqual([], self.tracer.spans)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2016) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from hpOneView.connection import connection
+from hpOneView.exceptions import HPOneViewException, HPOneViewTaskError
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.resources.settings.firmware_bundles import FirmwareBundles
+from hpOneView.resources.task_monitor import NO_WAIT, TaskMonitor
+from hpOneView.testing.simulator import ApplianceSimulator
+
+
+class ApplianceSimulatorTest(unittest.TestCase):
+    def setUp(self):
+        self.simulator = ApplianceSimulator(datasets={'/rest/server-hardware': 25}, max_page_size=10, seed=1)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.connection = connection(self.simulator.address)
+        self.connection.login({'userName': 'administrator', 'password': 'password'})
+        self.addCleanup(self.connection.close_connections)
+        self.resource_client = ResourceClient(self.connection, '/rest/server-hardware')
+
+    def test_get_all_should_follow_the_pages(self):
+        items = self.resource_client.get_all()
+
+        self.assertEqual(['server-hardware-%d' % i for i in range(25)], [item['name'] for item in items])
+
+    def test_get_all_with_page_workers(self):
+        self.connection.set_page_workers(4)
+
+        items = self.resource_client.get_all()
+
+        self.assertEqual(['server-hardware-%d' % i for i in range(25)], [item['name'] for item in items])
+
+    def test_get_page_should_report_total_and_next_page(self):
+        page = self.connection.get('/rest/server-hardware?start=10&count=5')
+
+        self.assertEqual(25, page['total'])
+        self.assertEqual(5, page['count'])
+        self.assertEqual('/rest/server-hardware?start=15&count=5', page['nextPageUri'])
+        self.assertEqual('/rest/server-hardware?start=5&count=5', page['prevPageUri'])
+
+    def test_get_by_should_filter(self):
+        result = self.resource_client.get_by('name', 'server-hardware-7')
+
+        self.assertEqual(['server-hardware-7'], [item['name'] for item in result])
+
+    def test_create_update_and_delete_should_run_tasks(self):
+        created = self.resource_client.create({'name': 'new server'})
+        created['name'] = 'renamed server'
+        updated = self.resource_client.update(created)
+        patched = self.resource_client.patch(created['uri'], 'replace', '/name', 'patched server')
+        deleted = self.resource_client.delete(patched)
+
+        self.assertEqual('renamed server', updated['name'])
+        self.assertEqual('patched server', patched['name'])
+        self.assertTrue(deleted)
+        self.assertEqual(25, len(self.resource_client.get_all()))
+        self.assertEqual(4, self.simulator.stats['tasks'])
+
+    def test_task_should_run_for_task_duration(self):
+        self.simulator.task_duration = 60
+
+        task, body = self.connection.post('/rest/server-hardware', {'name': 'new server'})
+
+        self.assertEqual('Running', self.connection.get(task['uri'])['taskState'])
+
+    def test_task_error_should_raise(self):
+        self.simulator.task_error_rate = 1
+
+        self.assertRaises(HPOneViewTaskError, self.resource_client.create, {'name': 'new server'})
+
+    def test_get_all_should_filter_with_or(self):
+        result = self.resource_client.get_all(filter="\"name='server-hardware-3' OR name='server-hardware-12'\"")
+
+        self.assertEqual(['server-hardware-3', 'server-hardware-12'], [item['name'] for item in result])
+
+    def test_get_all_should_reject_unsupported_filter(self):
+        self.assertRaises(HPOneViewException, self.resource_client.get_all,
+                          filter="\"name='server-hardware-3' AND model='DL360'\"")
+
+    def test_wait_for_tasks_should_poll_the_tasks_together(self):
+        self.simulator.task_duration = 0.5
+        tasks = [self.connection.post('/rest/server-hardware', {'name': 'server %d' % i})[0] for i in range(3)]
+
+        with mock.patch.object(self.connection, 'get', wraps=self.connection.get) as mock_get:
+            result = TaskMonitor(self.connection).wait_for_tasks(tasks)
+
+        self.assertEqual(['server 0', 'server 1', 'server 2'], [item['name'] for item in result])
+        task_requests = [c[0][0] for c in mock_get.call_args_list if c[0][0].startswith('/rest/tasks')]
+        self.assertTrue(task_requests)
+        self.assertTrue(all(uri.startswith('/rest/tasks?filter=') for uri in task_requests))
+
+    @mock.patch('hpOneView.resources.task_monitor.MIN_POLL_INTERVAL', 0.05)
+    def test_no_wait_futures_should_resolve_together(self):
+        self.simulator.task_duration = 0.2
+
+        with mock.patch.object(self.connection, 'get', wraps=self.connection.get) as mock_get:
+            futures = [self.resource_client.create({'name': 'server %d' % i}, timeout=NO_WAIT) for i in range(3)]
+            results = [future.result(timeout=10) for future in futures]
+
+        self.assertEqual(['server 0', 'server 1', 'server 2'], [item['name'] for item in results])
+        task_requests = [c[0][0] for c in mock_get.call_args_list if c[0][0].startswith('/rest/tasks')]
+        # Only the tasks of the Location headers are requested one by one
+        self.assertEqual(3, len([uri for uri in task_requests if not uri.startswith('/rest/tasks?filter=')]))
+        self.assertEqual(28, len(self.resource_client.get_all()))
+
+    def test_get_should_answer_not_modified_for_matching_etag(self):
+        resource = self.resource_client.get_all(count=1)[0]
+
+        response, body = self.connection.do_http('GET', resource['uri'], '',
+                                                 custom_headers={'If-None-Match': resource['eTag']})
+
+        self.assertEqual(304, response.status)
+
+    def test_update_should_fail_for_stale_etag(self):
+        resource = self.resource_client.get_all(count=1)[0]
+        self.resource_client.patch(resource['uri'], 'replace', '/name', 'patched server')
+
+        self.assertRaises(HPOneViewException, self.resource_client.update, resource)
+
+    def test_requests_should_require_a_session(self):
+        self.simulator.expire_sessions()
+        con = connection(self.simulator.address)
+        self.addCleanup(con.close_connections)
+
+        self.assertRaises(HPOneViewException, ResourceClient(con, '/rest/server-hardware').get_all)
+
+    def test_login_should_check_credentials(self):
+        self.simulator.credentials = {'administrator': 'secret'}
+
+        self.assertRaises(HPOneViewException, self.connection.login, {'userName': 'administrator',
+                                                                      'password': 'wrong'})
+
+    def test_error_rate_should_inject_errors(self):
+        self.simulator.error_rate = 1
+        self.simulator.error_status = 503
+        self.connection.set_retry_policy(None)
+
+        response, body = self.connection.do_http('GET', '/rest/server-hardware', '')
+
+        self.assertEqual(503, response.status)
+        self.assertEqual('SIMULATED_ERROR', body['errorCode'])
+        self.assertEqual(1, self.simulator.stats['errors'])
+
+    def test_post_multipart_should_upload_the_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_path = os.path.join(directory, 'spp.iso')
+        with open(file_path, 'wb') as upload_file:
+            upload_file.write(b'x' * 100000)
+
+        response, body = self.connection.post_multipart('/rest/firmware-bundles', None, file_path, 'spp.iso')
+
+        self.assertEqual(202, response.status)
+        self.assertTrue(self.simulator.stats['bytes_uploaded'] > 100000)
+        bundles = self.connection.get('/rest/firmware-bundles')['members']
+        self.assertEqual(['spp.iso'], [bundle['name'] for bundle in bundles])
+
+    def test_firmware_bundle_upload_should_wait_for_the_task(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_path = os.path.join(directory, 'spp.iso')
+        with open(file_path, 'wb') as upload_file:
+            upload_file.write(b'x' * 1000)
+
+        bundle = FirmwareBundles(self.connection).upload(file_path)
+
+        self.assertEqual('spp.iso', bundle['name'])
+
+    def test_task_should_report_the_computed_percent_complete(self):
+        self.simulator.task_duration = 60
+        response, body = self.connection.post_multipart('/rest/firmware-bundles', None, __file__, 'spp.iso')
+
+        self.assertEqual(response.getheader('Location'), body['uri'])
+        self.assertEqual('Running', body['taskState'])
+        self.assertEqual(body['percentComplete'], body['computedPercentComplete'])
+
+    def test_download_should_resume_with_range(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_path = os.path.join(directory, 'appliance.bkp')
+        content = os.urandom(100000)
+        self.simulator.add_download('/rest/backups/archive/1', content)
+        with open(file_path + '.part', 'wb') as part:
+            part.write(content[:40000])
+
+        checksum = self.connection.download('/rest/backups/archive/1', file_path)
+
+        self.assertEqual(hashlib.sha256(content).hexdigest(), checksum)
+        self.assertEqual(60000, self.simulator.stats['bytes_downloaded'])